@@ -1,6 +1,8 @@
 import subprocess
 import time
 
+from config_app.settings import settings
+from core.clock import clock_of
 from interfaces.state_interface import State
 
 def _play_ready_beep():
@@ -38,7 +40,11 @@ class ListeningState(State):
                 print("[ListeningState] Waiting for transcript...")
                 self._waiting_logged = True
 
-            time.sleep(0.1)
+            waiter = getattr(manager, "wait_for_event", None)
+            if waiter:
+                waiter(0.1)
+            else:
+                clock_of(manager).sleep(0.1)
             return None
 
         print(f"[ListeningState] Handling: {user_input}")
@@ -51,22 +57,31 @@ class ListeningState(State):
             wait = manager.speaking_cooldown_remaining()
             if wait > 0:
                 print(f"[ListeningState] Waiting {wait:.2f}s to avoid echo...")
-                time.sleep(wait)
+                clock_of(manager).sleep(wait)
 
-        # Record audio to a fixed scratch file
-        audio_path = "audio/input.wav"
+        # Open the progressive connection while the ready beep plays.
+        session = self._open_progressive_session()
 
         _play_ready_beep()
-        time.sleep(0.3)
+        clock_of(manager).sleep(0.3)
 
         print("[ListeningState] Recording... speak now!")
-        self.mic.record_to_file(audio_path, duration=5)
+        on_chunk = session.send if session else None
+        wav_bytes = self.mic.record_to_wav_bytes(duration=5, on_chunk=on_chunk)
+        recorded_at = time.monotonic()
 
         # Transcribe
         print("[ListeningState] Transcribing...")
         transcript = ""
         if self.stt:
-            transcript = self.stt.transcribe(audio_path)
+            transcript = session.finish() if session else None
+            mode = "progressive"
+            if transcript is None:
+                # No progressive session (or it failed): upload the in-memory buffer.
+                mode = "in-memory"
+                transcript = self.stt.transcribe_audio(wav_bytes) if wav_bytes else ""
+            latency_ms = (time.monotonic() - recorded_at) * 1000.0
+            print(f"[ListeningState] Transcript ready {latency_ms:.0f} ms after recording ended ({mode})")
             if not transcript:
                 print("[ListeningState] No transcript captured.")
             else:
@@ -79,3 +94,14 @@ class ListeningState(State):
 
         # Move to Processing
         return manager.processing_state
+
+    def _open_progressive_session(self):
+        if not settings.PROGRESSIVE_STT or not self.stt:
+            return None
+        opener = getattr(self.stt, "open_progressive_session", None)
+        if not opener:
+            return None
+        return opener(
+            sample_rate=getattr(self.mic, "sample_rate", 16000),
+            channels=getattr(self.mic, "channels", 1),
+        )
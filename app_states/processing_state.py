@@ -1,3 +1,5 @@
+from core.cancellation import Cancelled, run_cancellable
+from core.tracing import tracer
 from interfaces.state_interface import State
 
 
@@ -13,6 +15,7 @@ class ProcessingState(State):
 
     def handle(self, manager, user_input):
         text = manager.last_user_text or user_input
+        tracer.mark("processing_enter")
         print(f"[ProcessingState] Handling: {text}")
 
         if not text:
@@ -21,6 +24,14 @@ class ProcessingState(State):
             manager.set_post_speech_state(manager.listening_state)
             return manager.speaking_state
 
+        if getattr(manager, "turn_pipeline", None):
+            # The pipeline's think stage calls the LLM; SpeakingState follows the turn.
+            manager.start_turn(text=text)
+            manager.last_bot_text = None
+            manager.set_post_speech_state(manager.listening_state)
+            manager.last_user_text = None
+            return manager.speaking_state
+
         # --- LLM CALL HERE ---
         reply = "Okay."
 
@@ -28,7 +39,12 @@ class ProcessingState(State):
         if llm_engine:
             try:
                 print("[ProcessingState] Generating LLM response...")
-                reply = llm_engine.generate(text)
+                # On a helper thread so a sleep command returns control before the reply arrives.
+                with manager.cancellable_work() as token:
+                    reply = run_cancellable(llm_engine.generate, text, cancel=token, name="BaymaxLLM")
+            except Cancelled:
+                print("[ProcessingState] LLM request cancelled")
+                return None  # the queued directive takes over at the end of this tick
             except Exception as e:
                 print("[ProcessingState] LLM error:", e)
 
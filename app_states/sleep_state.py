@@ -1,5 +1,5 @@
-import time
-
+from config_app.settings import settings
+from core.clock import clock_of
 from core.events import WakeEventType
 from interfaces.state_interface import State
 
@@ -20,7 +20,7 @@ class SleepState(State):
         if hasattr(manager, "sleep_guard_active") and manager.sleep_guard_active():
             if hasattr(manager, "clear_wake_events"):
                 manager.clear_wake_events()
-            time.sleep(self._poll_interval)
+            self._pause(manager)
             return None
 
         # Streaming wake events take precedence when available
@@ -31,6 +31,16 @@ class SleepState(State):
                 manager.clear_transcripts()
             if hasattr(manager, "clear_wake_events"):
                 manager.clear_wake_events()
+            query = getattr(wake_event, "query", "")
+            if query and settings.WAKE_QUERY_FAST_PATH:
+                # "Hey Baymax, <question>": answer now instead of greeting and making them repeat it.
+                print(f"[SleepState] Wake word with query (stream) -> {query}")
+                if hasattr(manager, "drop_next_transcript"):
+                    # Its final may still be on the way; it must not be answered again.
+                    manager.drop_next_transcript(wake_event.transcript)
+                manager.last_user_text = query
+                manager.mark_user_activity()
+                return manager.processing_state
             print("[SleepState] Wake word detected (stream)")
             return manager.wake_state
 
@@ -41,7 +51,11 @@ class SleepState(State):
             return manager.wake_state
 
         if manager.streaming_enabled:
-            time.sleep(self._poll_interval)
+            suspender = getattr(manager, "stream_suspender", None)
+            # While suspended the policy reads the mic itself, so do not poll-sleep.
+            if suspender and suspender.tick():
+                return None
+            self._pause(manager, due_in=suspender.next_due() if suspender else None)
             return None
 
         mic = getattr(manager, "mic", None)
@@ -54,7 +68,7 @@ class SleepState(State):
                 audio_chunk = mic.read_audio_chunk()
             except Exception as exc:
                 print("[SleepState] Mic read error:", exc)
-                time.sleep(self._poll_interval)
+                clock_of(manager).sleep(self._poll_interval)
                 return None
 
             if audio_chunk:
@@ -70,9 +84,17 @@ class SleepState(State):
                     print("[SleepState] Wake detector error:", exc)
             else:
                 # No audio available yet; fall through to sleep
-                time.sleep(self._poll_interval)
+                clock_of(manager).sleep(self._poll_interval)
                 return None
 
         # Either no hardware configured or wake word not found – pause briefly
-        time.sleep(self._poll_interval)
+        clock_of(manager).sleep(self._poll_interval)
         return None
+
+    def _pause(self, manager, due_in=None) -> None:
+        """Wait for the next stream event (or poll tick) instead of spinning."""
+        waiter = getattr(manager, "wait_for_event", None)
+        if waiter:
+            waiter(self._poll_interval, due_in=due_in)
+        else:
+            clock_of(manager).sleep(self._poll_interval)
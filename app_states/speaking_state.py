@@ -1,7 +1,9 @@
 import os
-import subprocess
-import time
 
+from audio.playback import AudioPlayer
+from core.cancellation import Cancelled, run_cancellable
+from core.clock import clock_of
+from core.tracing import tracer
 from interfaces.state_interface import State
 from config_app.settings import settings
 
@@ -10,11 +12,14 @@ class SpeakingState(State):
     SpeakingState:
     - Uses ElevenLabsTTS.speak() to generate audio
     - Audio saved automatically by the TTS class
-    - Plays the output using macOS `afplay`
+    - Plays the output using macOS `afplay`, stopping early on barge-in
+    - Abandons synthesis or playback as soon as a sleep command cancels the turn
     """
 
-    def __init__(self, tts=None):
+    def __init__(self, tts=None, player=None):
         self.tts = tts
+        self.player = player or AudioPlayer()
+        self._announced_turn = None
 
     def on_enter(self):
         print("[State] >>> SpeakingState")
@@ -23,6 +28,9 @@ class SpeakingState(State):
         print("[State] <<< SpeakingState")
 
     def handle(self, manager, user_input):
+        if getattr(manager, "turn_pipeline", None):
+            return self._handle_pipelined(manager)
+
         print("[SpeakingState] Handling:", user_input)
 
         # Get the bot reply
@@ -36,36 +44,96 @@ class SpeakingState(State):
         manager.notify_speaking_start()
 
         audio_duration = 0.0
+        interrupted = False
         try:
             # Generate speech audio
             tts_engine = self.tts or getattr(manager, "tts", None)
             if tts_engine:
                 try:
-                    tts_engine.speak(response_text)
-                    audio_duration = getattr(tts_engine, "last_duration", 0.0)
-
-                    output_path = getattr(tts_engine, "output_path", "audio/output.wav")
-                    skip_playback = os.getenv("BAYMAX_SKIP_AUDIO") == "1"
-                    if skip_playback:
-                        pass
-                    elif not os.path.exists(output_path):
-                        print(f"[SpeakingState] Expected audio file not found at {output_path}")
-                    else:
-                        # Use subprocess for better error reporting than os.system
-                        subprocess.run(["afplay", output_path], check=True)
-                        settle_time = max(settings.TTS_POST_BUFFER / 2.0, 0.0)
-                        if settle_time:
-                            time.sleep(settle_time)
+                    with manager.cancellable_work() as token:
+                        run_cancellable(tts_engine.speak, response_text, cancel=token, name="BaymaxTTS")
+                        audio_duration = getattr(tts_engine, "last_duration", 0.0)
+
+                        output_path = getattr(tts_engine, "output_path", "audio/output.wav")
+                        skip_playback = os.getenv("BAYMAX_SKIP_AUDIO") == "1"
+                        if skip_playback:
+                            pass
+                        elif manager.barge_in_requested():
+                            interrupted = True
+                        elif not os.path.exists(output_path):
+                            print(f"[SpeakingState] Expected audio file not found at {output_path}")
+                        else:
+                            manager.notify_playback_start(output_path)
+                            tracer.mark("playback_start")
+                            self.player.play(output_path)
+                            interrupted = self._wait_for_playback(manager, token)
+                            tracer.mark("playback_end", interrupted=interrupted or token.cancelled)
+                            settle_time = max(settings.TTS_POST_BUFFER / 2.0, 0.0)
+                            if settle_time and not interrupted and not token.cancelled:
+                                clock_of(manager).sleep(settle_time)
 
+                except Cancelled:
+                    print("[SpeakingState] Speech cancelled")
                 except Exception as e:
                     print("[SpeakingState] TTS error:", e)
             else:
                 print("[SpeakingState] No TTS engine available.")
         finally:
-            manager.notify_speaking_end(audio_duration)
+            manager.notify_speaking_end(audio_duration, interrupted=interrupted)
 
         # Prevent the same line from replaying if we loop back here without new text
         manager.last_bot_text = None
 
         next_state = manager.consume_post_speech_state() or manager.idle_state
+        if interrupted:
+            # The user cut in: hand the floor straight back to them.
+            return manager.listening_state
+        return next_state
+
+    def _handle_pipelined(self, manager):
+        """Follow the active pipeline turn without blocking the main loop."""
+        if manager.last_bot_text:
+            # A new line (greeting, sleep directive) replaces whatever is in flight.
+            response_text = manager.last_bot_text
+            manager.last_bot_text = None
+            print(f"[SpeakingState] Speaking: {response_text}")
+            manager.start_turn(reply=response_text)
+            return None
+
+        turn = manager.active_turn
+        if turn is None:
+            print("[SpeakingState] No bot response available.")
+            return manager.idle_state
+
+        if turn.first_audio_at is not None and self._announced_turn != turn.turn_id:
+            self._announced_turn = turn.turn_id
+            manager.notify_speaking_start()
+
+        interrupted = False
+        if self._announced_turn == turn.turn_id and manager.barge_in_requested():
+            print("[SpeakingState] Playback interrupted by user (barge-in)")
+            manager.cancel_turn()
+            interrupted = True
+        elif not turn.done.is_set():
+            manager.wait_for_event(0.02)
+            return None
+
+        manager.active_turn = None
+        manager.notify_speaking_end(turn.spoken_seconds, interrupted=interrupted)
+        next_state = manager.consume_post_speech_state() or manager.idle_state
+        if interrupted:
+            return manager.listening_state
         return next_state
+
+    def _wait_for_playback(self, manager, token) -> bool:
+        """Block until playback ends; stop early on barge-in (returns True) or a cancelled `token`."""
+        while not self.player.wait(timeout=0.02):
+            if token.cancelled:
+                self.player.stop()
+                print("[SpeakingState] Playback cancelled")
+                return False
+            if manager.barge_in_requested():
+                self.player.stop()
+                print("[SpeakingState] Playback interrupted by user (barge-in)")
+                return True
+        return False
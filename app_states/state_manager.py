@@ -1,10 +1,13 @@
 # app_states/state_manager.py
 
+import os
 import threading
 import time
-from collections import deque
-from typing import Deque, Optional
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
 
+from audio.framing import FramingMode
+from audio.playback import load_wav_samples
 from config_app.settings import settings
 
 from interfaces.state_interface import State
@@ -14,7 +17,24 @@ from app_states.listening_state import ListeningState
 from app_states.processing_state import ProcessingState
 from app_states.speaking_state import SpeakingState
 from app_states.idle_state import IdleState
-from core.events import TranscriptEvent, WakeEvent, WakeEventType
+from core.cancellation import CancelToken
+from core.clock import Clock, system_clock
+from core.events import CONTROL, TRANSCRIPT, WAKE, EventBus, TranscriptEvent, WakeEvent, WakeEventType, wake_topic
+from core.metrics import metrics
+from core.pipeline import TurnHandle, TurnPipeline
+from core.timers import TimedFlag, TimerScheduler, timers_for
+from core.tracing import tracer
+from stt.stream_suspension import StreamSuspender
+
+_TRANSITIONS = metrics.counter("baymax_state_transitions_total", "State machine transitions", ("to",))
+_ACTIVE_STATE = metrics.gauge("baymax_active_state", "1 for the current state, 0 otherwise", ("state",))
+_QUEUE_DEPTH = metrics.gauge("baymax_queue_depth", "Items waiting in internal queues", ("queue",))
+_PREEMPTED = metrics.counter("baymax_turns_preempted_total", "In-flight turns cancelled by a sleep command", ("event",))
+
+
+def _state_name(state) -> str:
+    return type(state).__name__.replace("State", "").lower()
+
 
 class StateManager:
     """
@@ -24,11 +44,33 @@ class StateManager:
     - Owns instances of all states (Sleep, Wake, Listening, Processing, Speaking, Idle).
     - Injects external modules (mic, stt, tts, llm, streaming_stt) into relevant states.
     - Guarantees on_exit/on_enter hooks fire on every transition.
-    - Routes wake/transcript events from the streaming STT to appropriate handlers.
-    - Tracks idle timers and user activity timestamps.
+    - Queues wake/transcript events from the streaming STT on its `EventBus`
+      (control lane first) for the states to consume.
+    - Tracks user activity and keeps its deadlines (sleep guard, speech
+      cooldown, barge-in confirmation) as timers on a shared `TimerScheduler`.
+    - Wakes the main loop when events arrive instead of letting states poll.
     """
 
-    def __init__(self, mic=None, stt=None, tts=None, wake=None, llm=None, stt_stream=None):
+    def __init__(
+        self,
+        mic=None,
+        stt=None,
+        tts=None,
+        wake=None,
+        llm=None,
+        stt_stream=None,
+        *,
+        player=None,
+        audio_dir: str = "audio",
+        on_wakeup: Optional[Callable[[], None]] = None,
+        clock: Optional[Clock] = None,
+        timers: Optional[TimerScheduler] = None,
+        stream_suspend_after: Optional[float] = None,
+    ):
+        # Deadlines and waits go through the clock so scenario tests can run on virtual time.
+        self.clock = clock or system_clock
+        self.timers = timers or timers_for(self.clock)
+
         # External modules
         self.mic = mic
         self.stt = stt
@@ -41,7 +83,7 @@ class StateManager:
         self.last_user_text = None
         self.last_bot_text = None
 
-        now = time.time()
+        now = self.clock.time()
         self._last_user_activity_ts = now
         self._last_awake_ts = 0.0
         self._idle_warning_message = "I'm here if you need me."
@@ -51,26 +93,90 @@ class StateManager:
         self._pending_sleep_message = "I cannot deactivate until you say 'you are satisfied with my care'."
         self._satisfaction_confirmation = "Thank you. I am grateful that you are satisfied with my care. Entering sleep mode."
 
-        self._event_lock = threading.Lock()
-        self._wake_events: Deque[WakeEvent] = deque()
-        self._transcript_events: Deque[TranscriptEvent] = deque()
-        self._speech_cooldown_until = 0.0
-        self._sleep_guard_until = 0.0
+        # Signalled by stream listeners and state changes; idle states block on it.
+        self._loop_wakeup = threading.Condition()
+        self._loop_signalled = False
+        self.event_driven = settings.STATE_LOOP_MODE != "poll"
+        self.loop_waits = 0
+        # Externally stepped managers (server sessions) never block: `wait_for_event`
+        # records how long the state wants to wait and signals call `on_wakeup`.
+        self._on_wakeup = on_wakeup
+        self.next_wakeup_in: Optional[float] = None
+        # Work handed over from timer threads; run at the start of the next `update()`.
+        self._loop_calls: List[Callable[[], None]] = []
+        self.events = EventBus(queued=(CONTROL, WAKE, TRANSCRIPT))
+        self._drop_transcript: Optional[str] = None
+        self._activity_listeners: List[Callable[[], None]] = []
+        self._speech_cooldown = TimedFlag(self.timers)
+        # Armed by sleep directives, started on entering SleepState; its end re-checks wake events.
+        self._sleep_guard = TimedFlag(self.timers, on_expire=self.wake_loop)
         self._sleep_guard_pending = 0.0
+        self._barge_in_event = threading.Event()
+        self._barge_in_unconfirmed = TimedFlag(self.timers, on_expire=self._on_barge_in_unconfirmed)
 
         if self.streaming_stt:
             self.streaming_stt.add_wake_listener(self._on_wake_event)
             self.streaming_stt.add_transcript_listener(self._on_transcript_event)
             self.streaming_stt.add_error_listener(self._on_stream_error)
 
+        # Close the websocket during long sleeps and wake it on local energy bursts.
+        self.stream_suspender: Optional[StreamSuspender] = None
+        if stream_suspend_after is None:
+            stream_suspend_after = settings.STREAM_SUSPEND_AFTER
+        if (
+            self.streaming_stt
+            and self.mic
+            and self.wake
+            and stream_suspend_after > 0
+            and hasattr(self.streaming_stt, "suspend")
+        ):
+            self.stream_suspender = StreamSuspender(
+                self.streaming_stt,
+                self.mic,
+                self.wake,
+                suspend_after=stream_suspend_after,
+                preroll_seconds=settings.STREAM_PREROLL_SECONDS,
+                wake_confirm_window=settings.STREAM_WAKE_CONFIRM_WINDOW,
+                clock=self.clock,
+                on_resumed=self.wake_loop,
+            )
+
         # Instantiate states (inject dependencies here)
         self.sleep_state = SleepState()
         self.wake_state = WakeState()
         self.listening_state = ListeningState(mic=self.mic, stt=self.stt)
         self.processing_state = ProcessingState(llm=self.llm)
-        self.speaking_state = SpeakingState(tts=self.tts)
+        self.speaking_state = SpeakingState(tts=self.tts, player=player)
         self.idle_state = IdleState()
 
+        # Optional staged turn pipeline; states still decide every transition.
+        self.turn_pipeline: Optional[TurnPipeline] = None
+        self.active_turn: Optional[TurnHandle] = None
+        # Token of the LLM/TTS/playback work a blocking state is doing now (non-pipelined turns).
+        self._work_token: Optional[CancelToken] = None
+        if settings.TURN_PIPELINE and self.tts:
+            self.turn_pipeline = TurnPipeline(
+                self.llm,
+                self.tts,
+                self.speaking_state.player,
+                on_done=lambda _handle: self.wake_loop(),
+                on_playback_start=self._on_turn_audio,
+                play_audio=os.getenv("BAYMAX_SKIP_AUDIO") != "1",
+                queue_size=settings.TURN_PIPELINE_QUEUE,
+                audio_dir=audio_dir,
+            )
+            self.turn_pipeline.start()
+        # The queue-depth and active-state gauges and the tracer's current turn are
+        # process-global: only a single-device manager owns them. Stepped managers
+        # are one session among many (the server aggregates theirs).
+        self._owns_process_telemetry = on_wakeup is None
+        if self._owns_process_telemetry:
+            if self.turn_pipeline is not None:
+                for stage in (self.turn_pipeline.think, self.turn_pipeline.synthesize, self.turn_pipeline.play):
+                    _QUEUE_DEPTH.labels(f"pipeline_{stage.name}").set_function(lambda stage=stage: stage.depth)
+            _QUEUE_DEPTH.labels("wake_events").set_function(self.pending_wake_events)
+            _QUEUE_DEPTH.labels("transcripts").set_function(self.pending_transcripts)
+
         # Initial state
         self.current_state: State = self.sleep_state
 
@@ -78,6 +184,9 @@ class StateManager:
         enter_hook = getattr(self.current_state, "on_enter", None)
         if enter_hook:
             enter_hook()
+        if self._owns_process_telemetry:
+            _ACTIVE_STATE.labels(_state_name(self.current_state)).set(1)
+        self._update_framing_mode()
 
     def set_state(self, new_state: State) -> None:
         """Transition to `new_state`, invoking exit/enter hooks as needed."""
@@ -95,22 +204,38 @@ class StateManager:
         # Switch state
         previous_state = self.current_state
         self.current_state = new_state
+        _TRANSITIONS.labels(_state_name(new_state)).inc()
+        if self._owns_process_telemetry:
+            _ACTIVE_STATE.labels(_state_name(previous_state)).set(0)
+            _ACTIVE_STATE.labels(_state_name(new_state)).set(1)
+
+        if previous_state is self.speaking_state and self.active_turn is not None:
+            # Left SpeakingState abruptly (sleep directive): silence the pipeline too.
+            self.cancel_turn()
 
         # Enter new state
         enter_hook = getattr(self.current_state, "on_enter", None)
         if enter_hook:
             enter_hook()
 
+        self._update_framing_mode()
+
+        # Transitions requested from other threads (idle monitor) must not wait out a block.
+        self.wake_loop()
+
         if new_state is self.sleep_state:
             if self._sleep_guard_pending > 0.0:
-                self._sleep_guard_until = time.time() + self._sleep_guard_pending
+                self._sleep_guard.set_for(self._sleep_guard_pending)
                 self._sleep_guard_pending = 0.0
             self._mark_sleep()
         elif previous_state is self.sleep_state:
+            if self.stream_suspender:
+                self.stream_suspender.leave_sleep()
             self._mark_awake()
 
     def update(self, user_input=None):
         """Run one tick of the state machine, processing events and delegating to the current state."""
+        self._run_loop_calls()
         if self.streaming_enabled and self._process_wake_directives():
             return
 
@@ -130,10 +255,11 @@ class StateManager:
         return event
 
     def consume_transcript(self) -> Optional[str]:
-        with self._event_lock:
-            if not self._transcript_events:
-                return None
-            event = self._transcript_events.popleft()
+        event = self.events.pop(TRANSCRIPT)
+        if event is None:
+            return None
+        # A transcript after a barge-in confirms the interruption was real speech.
+        self._barge_in_unconfirmed.clear()
         self.last_user_text = event.text
         self.mark_user_activity()
         return event.text
@@ -155,25 +281,127 @@ class StateManager:
         return self._last_user_activity_ts
 
     def peek_wake_event(self) -> Optional[WakeEvent]:
-        with self._event_lock:
-            return self._wake_events[0] if self._wake_events else None
+        return self.events.peek(WAKE)
+
+    def wait_for_event(self, poll_interval: float, *, due_in: Optional[float] = None) -> bool:
+        """Pause a state that has nothing to do; True when woken by a signal.
+
+        Polling mode sleeps `poll_interval`. Event mode blocks until a stream
+        event, state change or expiring timer (the sleep guard, say) is
+        signalled, or until the caller's `due_in`.
+        A non-positive `poll_interval` only consumes a pending signal.
+        Stepped managers return at once and leave the timeout in `next_wakeup_in`.
+        """
+        self.loop_waits += 1
+        if not self.event_driven and self._on_wakeup is None:
+            self.clock.sleep(poll_interval)
+            return False
+
+        timeout = settings.STATE_LOOP_MAX_WAIT if poll_interval > 0 else 0.0
+        if due_in is not None:
+            timeout = min(timeout, due_in)
+        if self._on_wakeup is not None:
+            self.next_wakeup_in = timeout if self.next_wakeup_in is None else min(self.next_wakeup_in, timeout)
+            with self._loop_wakeup:
+                signalled = self._loop_signalled
+                self._loop_signalled = False
+            return signalled
+        with self._loop_wakeup:
+            if not self._loop_signalled and timeout > 0:
+                self.clock.wait(self._loop_wakeup, timeout)
+            signalled = self._loop_signalled
+            self._loop_signalled = False
+        return signalled
+
+    def consume_next_wakeup(self) -> Optional[float]:
+        """Seconds until a stepped manager wants its next tick (None: no wait was requested)."""
+        delay, self.next_wakeup_in = self.next_wakeup_in, None
+        return delay
+
+    def start_turn(self, *, text: Optional[str] = None, reply: Optional[str] = None) -> TurnHandle:
+        """Hand a turn to the pipeline: `text` goes through the LLM, `reply` is spoken as is."""
+        self.cancel_turn()
+        self.active_turn = self.turn_pipeline.submit(text=text, reply=reply)
+        return self.active_turn
+
+    @contextmanager
+    def cancellable_work(self) -> Iterator[CancelToken]:
+        """Token for blocking LLM/TTS/playback work in a state; SLEEP/SATISFIED cancel it meanwhile."""
+        token = CancelToken()
+        self._work_token = token
+        try:
+            yield token
+        finally:
+            if self._work_token is token:
+                self._work_token = None
+
+    def cancel_turn(self) -> None:
+        if self.turn_pipeline and self.active_turn is not None:
+            self.turn_pipeline.cancel(self.active_turn)
+        self.active_turn = None
+
+    def shutdown(self) -> None:
+        if self.turn_pipeline:
+            self.cancel_turn()
+            self.turn_pipeline.stop()
+            print("[Pipeline] Stage stats:", self.turn_pipeline.stats())
+
+    def call_on_loop(self, callback: Callable[[], None]) -> None:
+        """Run `callback()` on the state-machine thread at the start of the next tick."""
+        with self._loop_wakeup:
+            self._loop_calls.append(callback)
+        self.wake_loop()
+
+    def _run_loop_calls(self) -> None:
+        with self._loop_wakeup:
+            calls, self._loop_calls = self._loop_calls, []
+        for callback in calls:
+            callback()
+
+    def wake_loop(self) -> None:
+        """Release a pending `wait_for_event()` so the next tick runs now."""
+        with self._loop_wakeup:
+            self._loop_signalled = True
+            self._loop_wakeup.notify_all()
+        if self._on_wakeup is not None:
+            self._on_wakeup()
 
     def notify_speaking_start(self) -> None:
+        self._barge_in_event.clear()
         if self.streaming_stt:
             self.streaming_stt.set_speaking(True)
 
-    def notify_speaking_end(self, duration: float = 0.0) -> None:
+    def notify_playback_start(self, audio_path: str) -> None:
+        """Arm barge-in detection against the audio that is about to play."""
+        if not getattr(self.streaming_stt, "barge_in_enabled", False):
+            return
+        # Sleep-bound lines (goodbye, idle sleep) are not interruptible.
+        if self._post_speech_state is self.sleep_state:
+            return
+        self.streaming_stt.arm_barge_in(load_wav_samples(audio_path))
+
+    def barge_in_requested(self) -> bool:
+        return self._barge_in_event.is_set()
+
+    def notify_speaking_end(self, duration: float = 0.0, *, interrupted: bool = False) -> None:
         post_sleep_transition = self._post_speech_state is self.sleep_state
 
         buffer = max(settings.TTS_POST_BUFFER, 0.0)
         if post_sleep_transition:
             buffer = max(buffer, settings.SLEEP_ENTRY_GUARD)
+        if interrupted:
+            # The user is already talking; do not mute the first words of their reply.
+            buffer = 0.0
+            self._barge_in_unconfirmed.set_for(settings.BARGE_IN_CONFIRM_WINDOW)
 
         if self.streaming_stt:
             self.streaming_stt.set_speaking(False)
             self.streaming_stt.notify_response_sent(duration, buffer_override=buffer)
 
-        self._speech_cooldown_until = max(self._speech_cooldown_until, time.time() + buffer)
+        self._speech_cooldown.set_for(buffer)
+        if self._owns_process_telemetry:
+            tracer.mark("unmute", at=time.monotonic() + buffer)
+            tracer.end_turn()
 
         mic = getattr(self, "mic", None)
         if mic and hasattr(mic, "mute_for"):
@@ -191,26 +419,41 @@ class StateManager:
         return state
 
     def mark_user_activity(self) -> None:
-        self._last_user_activity_ts = time.time()
+        self._last_user_activity_ts = self.clock.time()
+        for callback in self._activity_listeners:
+            callback()
+
+    def add_activity_listener(self, callback: Callable[[], None]) -> None:
+        """Call `callback()` whenever user activity is recorded (the idle timer re-arms on it)."""
+        self._activity_listeners.append(callback)
+
+    def pending_wake_events(self) -> int:
+        return self.events.depth(CONTROL) + self.events.depth(WAKE)
+
+    def pending_transcripts(self) -> int:
+        return self.events.depth(TRANSCRIPT)
 
     def clear_transcripts(self) -> None:
         self._clear_transcripts()
 
+    def drop_next_transcript(self, text: str) -> None:
+        """Discard `text` if it is the next final transcript (the wake utterance of a fast-path query)."""
+        self._drop_transcript = text
+
     def sleep_guard_active(self) -> bool:
-        return time.time() < self._sleep_guard_until
+        return bool(self._sleep_guard)
 
     def arm_sleep_guard(self, duration: float) -> None:
         self._sleep_guard_pending = max(self._sleep_guard_pending, max(duration, 0.0))
 
     def clear_wake_events(self) -> None:
-        with self._event_lock:
-            self._wake_events.clear()
+        self.events.clear(CONTROL, WAKE)
 
     def speaking_cooldown_active(self) -> bool:
-        return self.speaking_cooldown_remaining() > 0.0
+        return bool(self._speech_cooldown)
 
     def speaking_cooldown_remaining(self) -> float:
-        return max(self._speech_cooldown_until - time.time(), 0.0)
+        return self._speech_cooldown.remaining()
 
     def queue_idle_prompt(self) -> None:
         if not self.is_awake:
@@ -242,83 +485,101 @@ class StateManager:
     # Streaming event listeners
     # ------------------------------------------------------------------
     def _on_wake_event(self, event: WakeEvent) -> None:
-        with self._event_lock:
-            self._wake_events.append(event)
+        if event.event_type == WakeEventType.BARGE_IN:
+            self._barge_in_event.set()
+            self.mark_user_activity()
+            self.wake_loop()
+            return
+        self.events.publish(wake_topic(event), event)
+        if event.event_type in (WakeEventType.SLEEP, WakeEventType.SATISFIED):
+            self._preempt_inflight(event.event_type)
+        self.wake_loop()
         if event.event_type == WakeEventType.WAKE:
+            if self.stream_suspender:
+                self.stream_suspender.note_wake()
             self.mark_user_activity()
 
+    def _preempt_inflight(self, event_type: WakeEventType) -> None:
+        """Cancel the LLM/TTS/playback in flight so the directive is handled now (STT thread)."""
+        if not self.is_awake or self._post_speech_state is self.sleep_state:
+            return  # nothing to cut short, or already saying goodbye
+        reason = event_type.name.lower()
+        cancelled = False
+        turn = self.active_turn
+        if turn is not None:
+            cancelled = turn.token.cancel(reason)
+        token = self._work_token
+        if token is not None:
+            cancelled = token.cancel(reason) or cancelled
+        if cancelled:
+            _PREEMPTED.labels(reason).inc()
+            print(f"[StateManager] {event_type.name} cancelled the turn in flight")
+
     def _on_transcript_event(self, event: TranscriptEvent) -> None:
         if not event.is_final or not event.should_process:
             return
-        with self._event_lock:
-            self._transcript_events.append(event)
+        dropped, self._drop_transcript = self._drop_transcript, None
+        if dropped is not None and event.text == dropped:
+            return
+        self.events.publish(TRANSCRIPT, event)
+        self.wake_loop()
         self.mark_user_activity()
 
+    def _on_turn_audio(self, audio_path: str) -> None:
+        """A pipeline segment is about to play (called from the play worker)."""
+        self.notify_playback_start(audio_path)
+        self.wake_loop()
+
     def _on_stream_error(self, exc: Exception) -> None:
         print("[STT] Streaming error:", exc)
 
     def _pop_wake_event(self) -> Optional[WakeEvent]:
-        with self._event_lock:
-            if self._wake_events:
-                return self._wake_events.popleft()
-        return None
+        return self.events.pop(WAKE)
 
     def _process_wake_directives(self) -> bool:
-        transitioned = False
-
-        while True:
-            event = self.peek_wake_event()
-            if not event or event.event_type == WakeEventType.WAKE:
-                break
-
-            # Consume the event and transition to SleepState
-            self._pop_wake_event()
+        """Handle queued SLEEP/SATISFIED ahead of any wake event or transcript."""
+        for _topic, event in self.events.drain((CONTROL,)):
+            if self.current_state is self.sleep_state:
+                continue
             if event.event_type == WakeEventType.SLEEP:
-                if self.current_state is self.sleep_state:
-                    continue
-                self.last_user_text = None
                 self.last_bot_text = self._pending_sleep_message
-                self.set_post_speech_state(self.sleep_state)
-                self._clear_transcripts()
-                self.arm_sleep_guard(settings.SLEEP_ENTRY_GUARD)
-                self.clear_wake_events()
-                if self.current_state is not self.speaking_state:
-                    self.set_state(self.speaking_state)
-                    transitioned = True
-                continue
-
-            if event.event_type == WakeEventType.SATISFIED:
-                if self.current_state is self.sleep_state:
-                    continue
-                self.last_user_text = None
+            else:
                 self.last_bot_text = self._satisfaction_confirmation
-                self.set_post_speech_state(self.sleep_state)
-                self._clear_transcripts()
-                self.arm_sleep_guard(settings.SLEEP_ENTRY_GUARD)
-                self.clear_wake_events()
-                if self.current_state is not self.speaking_state:
-                    self.set_state(self.speaking_state)
-                    transitioned = True
-                continue
-
-            if self.current_state is not self.sleep_state:
-                self.last_user_text = None
-                self.last_bot_text = None
-                self.arm_sleep_guard(settings.SLEEP_ENTRY_GUARD)
-                self.clear_wake_events()
-                self.set_state(self.sleep_state)
-                transitioned = True
-
-        return transitioned
+            self.last_user_text = None
+            self.set_post_speech_state(self.sleep_state)
+            self._clear_transcripts()
+            self.arm_sleep_guard(settings.SLEEP_ENTRY_GUARD)
+            # Anything queued behind the directive belongs to the conversation being closed.
+            self.clear_wake_events()
+            if self.current_state is not self.speaking_state:
+                self.set_state(self.speaking_state)
+                return True
+            return False
+        return False
+
+    def _update_framing_mode(self) -> None:
+        if not self.streaming_stt or not hasattr(self.streaming_stt, "set_framing_mode"):
+            return
+        if self.current_state is self.sleep_state:
+            mode = FramingMode.ASLEEP
+        elif self.current_state is self.speaking_state:
+            mode = FramingMode.MUTED
+        else:
+            mode = FramingMode.ACTIVE
+        self.streaming_stt.set_framing_mode(mode)
+
+    def _on_barge_in_unconfirmed(self) -> None:
+        """Count a barge-in as false when no transcript followed it in time."""
+        if self.streaming_stt and hasattr(self.streaming_stt, "mark_barge_in_false_trigger"):
+            self.streaming_stt.mark_barge_in_false_trigger()
+            print("[BargeIn] No speech followed the interruption:", self.streaming_stt.barge_in_stats())
 
     def _clear_transcripts(self) -> None:
-        with self._event_lock:
-            self._transcript_events.clear()
+        self.events.clear(TRANSCRIPT)
 
     def _mark_awake(self) -> None:
-        now = time.time()
-        self._last_awake_ts = now
-        self._last_user_activity_ts = now
+        self._last_awake_ts = self.clock.time()
+        self.mark_user_activity()
 
     def _mark_sleep(self) -> None:
-        self._last_awake_ts = time.time()
+        self._last_awake_ts = self.clock.time()
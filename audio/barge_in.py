@@ -0,0 +1,162 @@
+"""Barge-in detection: notice the user talking over Baymax's own playback.
+
+While a reply plays, the microphone hears both the speaker echo and any
+near-field speech. The detector knows what is being played, so it can predict
+how loud the echo should be at each instant and only fire when the mic energy
+clearly exceeds that prediction for a sustained run of short frames.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import List, Optional
+
+import numpy as np
+
+
+class BargeInDetector:
+    """Energy-vs-expected-echo detector fed with raw int16 mic chunks."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16000,
+        frame_ms: float = 20.0,
+        margin: float = 1.3,
+        min_rms: float = 400.0,
+        required_frames: int = 6,
+        echo_coupling: float = 0.3,
+        calibration_s: float = 0.3,
+        alignment_s: float = 0.15,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self._frame = max(int(sample_rate * frame_ms / 1000.0), 1)
+        self._margin = max(margin, 1.0)
+        self._min_rms = max(min_rms, 1.0)
+        self._required = max(required_frames, 1)
+        self._default_coupling = max(echo_coupling, 0.0)
+        self._calibration_s = max(calibration_s, 0.0)
+        self._alignment_frames = max(int(alignment_s * sample_rate / self._frame), 0)
+
+        self.triggers = 0
+        self.false_triggers = 0
+        self.latencies: List[float] = []
+
+        self._armed = False
+        self._envelope = np.zeros(0, dtype=np.float32)
+        self._ratios: List[float] = []
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self, reference: Optional[np.ndarray] = None, now: Optional[float] = None) -> None:
+        """Arm the detector for one playback of `reference` (int16 mono samples)."""
+        self._started_at = time.monotonic() if now is None else now
+        self._elapsed_samples = 0
+        self._hits = 0
+        self._onset_at: Optional[float] = None
+        self._coupling = self._default_coupling
+        self._ratios = []
+        self._envelope = self._reference_envelope(reference)
+        self._armed = True
+
+    def stop(self) -> None:
+        self._armed = False
+        self._hits = 0
+        self._onset_at = None
+        self._elapsed_samples = 0
+        self._started_at = 0.0
+
+    @property
+    def armed(self) -> bool:
+        return self._armed
+
+    def mark_false_trigger(self) -> None:
+        self.false_triggers += 1
+
+    # ------------------------------------------------------------------
+    # Detection
+    # ------------------------------------------------------------------
+    def process(self, chunk: bytes, now: Optional[float] = None) -> bool:
+        """Feed one mic chunk; True exactly once when barge-in is detected."""
+        if not self._armed or not chunk:
+            return False
+
+        now = time.monotonic() if now is None else now
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        usable = len(samples) - len(samples) % self._frame
+        if not usable:
+            return False
+
+        frames = samples[:usable].astype(np.float32).reshape(-1, self._frame)
+        mic_rms = np.sqrt(np.mean(frames * frames, axis=1))
+
+        first = self._elapsed_samples // self._frame
+        self._elapsed_samples += len(samples)
+        indices = np.arange(first, first + len(mic_rms))
+        echo = self._expected_echo(indices)
+
+        elapsed = self._elapsed_samples / self.sample_rate
+        if elapsed <= self._calibration_s:
+            # Early playback is almost always pure echo: learn the room coupling.
+            audible = echo > 1.0
+            if audible.any():
+                self._ratios.extend((mic_rms[audible] / echo[audible]).tolist())
+                self._coupling = float(np.percentile(self._ratios, 90))
+            return False
+
+        threshold = np.maximum(self._margin * self._coupling * echo, self._min_rms)
+        frame_s = self._frame / self.sample_rate
+        chunk_start = now - len(samples) / self.sample_rate
+        for offset, loud in enumerate(mic_rms > threshold):
+            if not loud:
+                # Decay rather than reset so syllable gaps do not restart the count.
+                self._hits = max(self._hits - 1, 0)
+                if not self._hits:
+                    self._onset_at = None
+                continue
+            if self._hits == 0:
+                self._onset_at = chunk_start + offset * frame_s
+            self._hits += 1
+            if self._hits >= self._required:
+                self.triggers += 1
+                self.latencies.append(now - (self._onset_at or now))
+                self._armed = False
+                return True
+        return False
+
+    def stats(self) -> dict:
+        latencies = np.array(self.latencies or [0.0])
+        return {
+            "triggers": self.triggers,
+            "false_triggers": self.false_triggers,
+            "latency_p50_ms": float(np.percentile(latencies, 50) * 1000.0),
+            "latency_p95_ms": float(np.percentile(latencies, 95) * 1000.0),
+        }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _reference_envelope(self, reference: Optional[np.ndarray]) -> np.ndarray:
+        """Per-frame RMS of the playback, max-filtered to absorb output latency."""
+        if reference is None or not len(reference):
+            return np.zeros(0, dtype=np.float32)
+
+        usable = len(reference) - len(reference) % self._frame
+        padded = reference[:usable].astype(np.float32).reshape(-1, self._frame)
+        envelope = np.sqrt(np.mean(padded * padded, axis=1))
+        if self._alignment_frames:
+            pad = self._alignment_frames
+            extended = np.pad(envelope, (pad, pad))
+            windows = np.lib.stride_tricks.sliding_window_view(extended, 2 * pad + 1)
+            envelope = windows.max(axis=1)
+        return envelope.astype(np.float32)
+
+    def _expected_echo(self, indices: np.ndarray) -> np.ndarray:
+        if not len(self._envelope):
+            # Unknown playback: assume loud echo so only strong speech triggers.
+            return np.full(len(indices), self._min_rms, dtype=np.float32)
+        clipped = np.clip(indices, 0, len(self._envelope) - 1)
+        echo = self._envelope[clipped]
+        return np.where(indices < len(self._envelope), echo, 0.0)
@@ -0,0 +1,293 @@
+"""Single-capture audio fan-out.
+
+One capture thread reads the microphone and publishes into a ring buffer;
+every consumer (Deepgram sender, wake detector, recorder, meters) reads
+through its own `BusSubscription` cursor. The publisher never waits for
+readers: a subscriber that falls more than a window behind skips to the
+write head (its backlog is stale by then) and the dropped frames are
+counted against it alone.
+
+The ring is mirrored (each frame is stored at `i` and `i + capacity`), so any
+window up to the readable size is one contiguous slice and reads return
+read-only views without copying. A view stays valid until its subscriber
+falls a full window behind; copy it if it must outlive that.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from audio.recorder import record_from, to_wav_bytes
+from core.clock import Clock, system_clock
+from core.timers import TimedFlag, timers_for
+from interfaces.audio_interface import AudioInterface
+
+
+class BusSubscription:
+    """Independent read cursor with lag and overrun accounting."""
+
+    def __init__(self, bus: "AudioBus", name: str, cursor: int) -> None:
+        self.name = name
+        self._bus = bus
+        self.cursor = cursor
+        self.delivered_frames = 0
+        self.dropped_frames = 0
+        self.overruns = 0
+        self.max_lag_frames = 0
+        self.closed = False
+
+    def pending(self) -> int:
+        """Frames published but not yet read (after any overrun skip)."""
+        with self._bus._cond:
+            self._catch_up_locked()
+            return self._bus.written - self.cursor
+
+    def lag_seconds(self) -> float:
+        return self.pending() / self._bus.sample_rate
+
+    def read(self, frames: Optional[int] = None, timeout: Optional[float] = 1.0) -> Optional[np.ndarray]:
+        """Next `frames` frames (default: everything pending) as a read-only view.
+
+        Blocks until enough audio is published; returns None on timeout or
+        when the bus stops.
+        """
+        bus = self._bus
+        with bus._cond:
+            want = min(frames or 1, bus.window)
+            ready = bus._cond.wait_for(
+                lambda: self.closed or not bus.running or self._available_locked() >= want,
+                timeout,
+            )
+            if not ready or self.closed or bus.written - self.cursor < want:
+                return None
+            count = min(frames or bus.written - self.cursor, bus.window)
+            start = self.cursor % bus.capacity
+            view = bus._ring[start:start + count]
+            self.cursor += count
+            self.delivered_frames += count
+
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def skip_to_head(self) -> int:
+        """Discard everything pending (e.g. while muted); returns frames skipped."""
+        with self._bus._cond:
+            skipped = self._bus.written - self.cursor
+            self.cursor = self._bus.written
+            return skipped
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "delivered_frames": self.delivered_frames,
+            "dropped_frames": self.dropped_frames,
+            "overruns": self.overruns,
+            "lag_frames": self.pending(),
+            "max_lag_frames": self.max_lag_frames,
+        }
+
+    def _available_locked(self) -> int:
+        self._catch_up_locked()
+        return self._bus.written - self.cursor
+
+    def _catch_up_locked(self) -> None:
+        lag = self._bus.written - self.cursor
+        self.max_lag_frames = max(self.max_lag_frames, lag)
+        if lag > self._bus.window:
+            # Resume with live audio: seconds of backlog would only be scored late.
+            self.cursor = self._bus.written
+            self.dropped_frames += lag
+            self.overruns += 1
+
+
+class AudioBus:
+    """Mirrored ring of int16 frames with any number of subscribers."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        *,
+        capacity_seconds: float = 5.0,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        # Mute windows and capture back-off run on this clock, as in `Microphone`.
+        self.clock = clock or system_clock
+        self.channels = channels
+        self.capacity = max(int(sample_rate * capacity_seconds), 1024)
+        # Keep a quarter of the ring between readers and the write head so an
+        # in-flight publish never lands on frames a reader is about to view.
+        self.window = self.capacity - self.capacity // 4
+        self._ring = np.zeros((self.capacity * 2, channels), dtype=np.int16)
+        self.written = 0
+        self.running = True
+        self._cond = threading.Condition()
+        self._subscriptions: List[BusSubscription] = []
+        self._muted = TimedFlag(timers_for(self.clock))
+        self._capture_thread: Optional[threading.Thread] = None
+        self._source: Optional[AudioInterface] = None
+
+    # -- publishing ---------------------------------------------------------
+    def publish(self, block) -> None:
+        """Append captured frames (bytes or int16 array) and wake readers."""
+        if isinstance(block, (bytes, bytearray, memoryview)):
+            block = np.frombuffer(block, dtype=np.int16)
+        if not len(block):
+            return
+        block = block.reshape(-1, self.channels)
+        with self._cond:
+            self._store(block)
+            self._cond.notify_all()
+
+    def _store(self, block: np.ndarray) -> None:
+        cap = self.capacity
+        if len(block) > cap:
+            self.written += len(block) - cap
+            block = block[-cap:]
+        count = len(block)
+        pos = self.written % cap
+        first = min(count, cap - pos)
+        self._ring[pos:pos + first] = block[:first]
+        self._ring[pos + cap:pos + cap + first] = block[:first]
+        rest = count - first
+        if rest:
+            self._ring[:rest] = block[first:]
+            self._ring[cap:cap + rest] = block[first:]
+        self.written += count
+
+    # -- subscriptions ------------------------------------------------------
+    def subscribe(self, name: str) -> BusSubscription:
+        """New cursor starting at the current write head."""
+        with self._cond:
+            subscription = BusSubscription(self, name, self.written)
+            self._subscriptions.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: BusSubscription) -> None:
+        with self._cond:
+            subscription.closed = True
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            self._cond.notify_all()
+
+    def tap(self, name: str) -> "MicrophoneTap":
+        """Microphone-compatible reader for consumers written against `Microphone`."""
+        return MicrophoneTap(self, name)
+
+    # -- mute (shared by every tap) -----------------------------------------
+    def mute_for(self, duration: float) -> None:
+        self._muted.set_for(duration)
+
+    def unmute(self) -> None:
+        self._muted.clear()
+
+    @property
+    def muted(self) -> bool:
+        return bool(self._muted)
+
+    def mute_remaining(self) -> float:
+        return self._muted.remaining()
+
+    # -- capture ------------------------------------------------------------
+    def start(self, source: AudioInterface, block_frames: int = 320) -> None:
+        """Spawn the single capture thread reading `source`."""
+        if self._capture_thread and self._capture_thread.is_alive():
+            return
+        self._source = source
+        self.running = True
+        source.start_stream()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, args=(source, block_frames), name="AudioBus", daemon=True
+        )
+        self._capture_thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._capture_thread:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
+        if self._source:
+            self._source.stop_stream()
+
+    def _capture_loop(self, source: AudioInterface, block_frames: int) -> None:
+        while self.running:
+            try:
+                chunk = source.read_audio_chunk(block_frames)
+            except Exception as exc:
+                print("[AudioBus] Capture error:", exc)
+                self.clock.sleep(0.05)
+                continue
+            self.publish(chunk)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._cond:
+            subscriptions = list(self._subscriptions)
+        return {subscription.name: subscription.stats() for subscription in subscriptions}
+
+
+class MicrophoneTap(AudioInterface):
+    """Bus subscription exposing the `Microphone` API used across the app."""
+
+    def __init__(self, bus: AudioBus, name: str, chunk_size: int = 1024, clock: Optional[Clock] = None) -> None:
+        self.bus = bus
+        self.name = name
+        self.clock = clock or bus.clock
+        self.sample_rate = bus.sample_rate
+        self.channels = bus.channels
+        self._chunk_size = chunk_size
+        self.subscription = bus.subscribe(name)
+
+    def start_stream(self):
+        """Capture is owned by the bus; nothing to open per consumer."""
+
+    def stop_stream(self):
+        """Leave the shared capture running for the other consumers."""
+
+    def mute_for(self, duration: float) -> None:
+        self.bus.mute_for(duration)
+
+    def unmute(self) -> None:
+        self.bus.unmute()
+
+    def pending_frames(self) -> int:
+        return self.subscription.pending()
+
+    def discard_pending(self) -> int:
+        return self.subscription.skip_to_head()
+
+    def read_audio_chunk(self, frames: Optional[int] = None) -> bytes:
+        if self.bus.muted:
+            self.clock.sleep(0.05)
+            self.subscription.skip_to_head()
+            return b""
+        view = self.subscription.read(frames or self._chunk_size)
+        return view.tobytes() if view is not None else b""
+
+    def record(self, duration: float = 3, on_chunk: Optional[Callable[[bytes], None]] = None) -> Optional[np.ndarray]:
+        """Same contract as `Microphone.record`, fed from the bus instead of a new stream."""
+        wait_timeout = self.bus.mute_remaining()
+        if wait_timeout > 0:
+            self.clock.sleep(wait_timeout)
+
+        self.subscription.skip_to_head()
+        return record_from(
+            lambda frames: self.subscription.read(frames, timeout=0.2),
+            self.sample_rate,
+            self.channels,
+            duration,
+            on_chunk,
+        )
+
+    def record_to_wav_bytes(self, duration: float = 3, on_chunk: Optional[Callable[[bytes], None]] = None) -> bytes:
+        audio = self.record(duration, on_chunk=on_chunk)
+        print(f"[Audio] Captured {len(audio) / self.sample_rate:.1f}s in memory")
+        return to_wav_bytes(audio, self.sample_rate, self.channels)
@@ -0,0 +1,77 @@
+"""Keeps a blocking PortAudio input stream's backlog bounded.
+
+Skipping reads during a mute window lets PortAudio's buffer fill (and
+overflow), so the first reads after the mute return stale audio and lag
+creeps up over a long-running session. `CaptureHealth` drains the stream
+while muted, flushes whatever is left when the mute ends, trims backlog
+beyond a ceiling and records overflow flags and capture latency.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+
+class CaptureHealth:
+    """Backlog housekeeping and metrics for one `sd.InputStream`-like object."""
+
+    def __init__(self, sample_rate: int, *, max_lag_ms: float = 500.0) -> None:
+        self.sample_rate = sample_rate
+        self.max_lag_frames = int(sample_rate * max(max_lag_ms, 0.0) / 1000.0)
+        self.overflows = 0
+        self.drained_frames = 0
+        self.flushed_frames = 0
+        self.trimmed_frames = 0
+        self.capture_latency = 0.0
+        self.max_capture_latency = 0.0
+        self._muted = False
+
+    @staticmethod
+    def _available(stream) -> int:
+        try:
+            return int(stream.read_available)
+        except Exception:
+            return 0
+
+    def _discard(self, stream, frames: int) -> int:
+        if frames <= 0:
+            return 0
+        _, overflowed = stream.read(frames)
+        if overflowed:
+            self.overflows += 1
+        return frames
+
+    def drain(self, stream) -> None:
+        """Called instead of a read while muted: throw away what has queued up."""
+        self._muted = True
+        self.drained_frames += self._discard(stream, self._available(stream))
+
+    def before_read(self, stream) -> None:
+        """Flush after a mute ends and trim backlog beyond the lag ceiling."""
+        if self._muted:
+            self._muted = False
+            self.flushed_frames += self._discard(stream, self._available(stream))
+            return
+        if self.max_lag_frames:
+            excess = self._available(stream) - self.max_lag_frames
+            self.trimmed_frames += self._discard(stream, excess)
+
+    def after_read(self, stream, overflowed: bool) -> None:
+        """Record the overflow flag and the audio still queued behind this read."""
+        if overflowed:
+            self.overflows += 1
+        device_latency = getattr(stream, "latency", 0.0) or 0.0
+        if isinstance(device_latency, (tuple, list)):
+            device_latency = device_latency[0]
+        self.capture_latency = self._available(stream) / self.sample_rate + float(device_latency)
+        self.max_capture_latency = max(self.max_capture_latency, self.capture_latency)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "overflows": self.overflows,
+            "drained_frames": self.drained_frames,
+            "flushed_frames": self.flushed_frames,
+            "trimmed_frames": self.trimmed_frames,
+            "capture_latency_s": round(self.capture_latency, 4),
+            "max_capture_latency_s": round(self.max_capture_latency, 4),
+        }
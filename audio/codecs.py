@@ -0,0 +1,198 @@
+"""Wire codecs for the live Deepgram audio stream.
+
+Microphone frames arrive as 16-bit little-endian PCM. A codec transcodes them
+on the sender thread before they hit the websocket and describes the matching
+`encoding`/`sample_rate` pair that must be advertised in `LiveOptions`.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class WireCodec:
+    """Base class: passthrough linear16 at the capture sample rate."""
+
+    name = "linear16"
+    encoding = "linear16"
+
+    def __init__(self, sample_rate: int = 16000, channels: int = 1) -> None:
+        self.input_rate = sample_rate
+        self.channels = max(channels, 1)
+
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of the encoded stream, as advertised to Deepgram."""
+        return self.input_rate
+
+    def encode(self, pcm: bytes) -> bytes:
+        """Transcode one chunk of int16 PCM into the wire format."""
+        return bytes(pcm)
+
+    def encode_packets(self, pcm: bytes) -> List[bytes]:
+        """Return the websocket payloads for one chunk (one message each)."""
+        payload = self.encode(pcm)
+        return [payload] if payload else []
+
+    def reset(self) -> None:
+        """Drop any state carried between chunks (e.g. after a reconnect)."""
+
+
+def _build_mulaw_table() -> np.ndarray:
+    """Precompute the G.711 mu-law byte for every possible int16 sample."""
+    samples = np.arange(-32768, 32768, dtype=np.int32)
+    # G.711 works on 14-bit magnitudes; mirror the reference (and audioop) steps.
+    scaled = samples >> 2
+    mask = np.where(scaled < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(scaled), 8159) + 0x21
+    segment = np.searchsorted(_MULAW_SEGMENT_ENDS, magnitude)
+    encoded = ((segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)) ^ mask
+    encoded = np.where(segment >= 8, 0x7F ^ mask, encoded)
+    table = np.empty(65536, dtype=np.uint8)
+    # Index the table by the raw uint16 bit pattern of each sample.
+    table[samples.astype(np.int16).view(np.uint16)] = encoded.astype(np.uint8)
+    return table
+
+
+_MULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+_MULAW_TABLE = _build_mulaw_table()
+
+
+def mulaw_decode(data: bytes) -> np.ndarray:
+    """Expand mu-law bytes back to int16 samples (used by tests and benchmarks)."""
+    encoded = ~np.frombuffer(data, dtype=np.uint8).astype(np.int32) & 0xFF
+    sign = encoded & 0x80
+    exponent = (encoded >> 4) & 0x07
+    mantissa = encoded & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(sign != 0, -magnitude, magnitude).astype(np.int16)
+
+
+class MulawCodec(WireCodec):
+    """G.711 mu-law, 8 bits per sample at the capture rate (2x smaller)."""
+
+    name = "mulaw"
+    encoding = "mulaw"
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype=np.uint16)
+        return _MULAW_TABLE[samples].tobytes()
+
+
+def _lowpass_taps(factor: int, num_taps: int) -> np.ndarray:
+    """Windowed-sinc anti-aliasing filter for decimation by `factor`."""
+    cutoff = 0.9 / (2.0 * factor)
+    n = np.arange(num_taps) - (num_taps - 1) / 2.0
+    taps = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * np.hamming(num_taps)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+class DownsampledLinear16Codec(WireCodec):
+    """linear16 decimated to a lower rate (8 kHz by default) with filter state."""
+
+    name = "linear16_8k"
+    encoding = "linear16"
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        *,
+        target_rate: int = 8000,
+        num_taps: int = 31,
+    ) -> None:
+        super().__init__(sample_rate, channels)
+        if target_rate <= 0 or sample_rate % target_rate:
+            raise ValueError(f"Cannot decimate {sample_rate} Hz to {target_rate} Hz")
+        self._target_rate = target_rate
+        self._factor = sample_rate // target_rate
+        self._taps = _lowpass_taps(self._factor, num_taps)[::-1].copy()
+        self.reset()
+
+    @property
+    def sample_rate(self) -> int:
+        return self._target_rate
+
+    def reset(self) -> None:
+        self._history = np.zeros((len(self._taps) - 1, self.channels), dtype=np.float32)
+        self._phase = 0
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, self.channels)
+        if not len(samples):
+            return b""
+
+        buffered = np.concatenate((self._history, samples.astype(np.float32)))
+        # Only evaluate the filter at the output instants we keep.
+        windows = np.lib.stride_tricks.sliding_window_view(buffered, len(self._taps), axis=0)
+        filtered = windows[self._phase::self._factor] @ self._taps
+
+        self._history = buffered[len(buffered) - (len(self._taps) - 1):]
+        self._phase = (self._phase - len(samples)) % self._factor
+
+        return np.clip(np.rint(filtered), -32768, 32767).astype(np.int16).tobytes()
+
+
+class OpusCodec(WireCodec):
+    """Packetized Opus (20 ms frames) via the optional `opuslib` package."""
+
+    name = "opus"
+    encoding = "opus"
+
+    def __init__(self, sample_rate: int = 16000, channels: int = 1, *, bitrate: int = 24000) -> None:
+        super().__init__(sample_rate, channels)
+        try:
+            import opuslib  # type: ignore
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise ImportError(f"Opus wire codec requires opuslib: {exc}") from exc
+
+        self._encoder = opuslib.Encoder(sample_rate, self.channels, opuslib.APPLICATION_VOIP)
+        self._encoder.bitrate = bitrate
+        self._frame_samples = sample_rate // 50
+        self._frame_bytes = self._frame_samples * self.channels * 2
+        self._pending = b""
+
+    def reset(self) -> None:
+        self._pending = b""
+
+    def encode(self, pcm: bytes) -> bytes:
+        return b"".join(self.encode_packets(pcm))
+
+    def encode_packets(self, pcm: bytes) -> List[bytes]:
+        data = self._pending + bytes(pcm)
+        usable = len(data) - len(data) % self._frame_bytes
+        self._pending = data[usable:]
+        return [
+            self._encoder.encode(data[offset:offset + self._frame_bytes], self._frame_samples)
+            for offset in range(0, usable, self._frame_bytes)
+        ]
+
+
+CodecFactory = Callable[..., WireCodec]
+
+_CODECS: Dict[str, CodecFactory] = {
+    WireCodec.name: WireCodec,
+    MulawCodec.name: MulawCodec,
+    DownsampledLinear16Codec.name: DownsampledLinear16Codec,
+    OpusCodec.name: OpusCodec,
+}
+
+
+def register_codec(name: str, factory: CodecFactory) -> None:
+    """Register a wire codec factory taking `(sample_rate, channels)`."""
+    _CODECS[name.lower()] = factory
+
+
+def available_codecs() -> List[str]:
+    return sorted(_CODECS)
+
+
+def create_codec(name: Optional[str], sample_rate: int = 16000, channels: int = 1) -> WireCodec:
+    """Instantiate the codec registered under `name` (defaults to linear16)."""
+    key = (name or WireCodec.name).lower()
+    factory = _CODECS.get(key)
+    if factory is None:
+        raise ValueError(f"Unknown wire codec '{name}'. Available: {', '.join(available_codecs())}")
+    return factory(sample_rate, channels)
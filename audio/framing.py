@@ -0,0 +1,59 @@
+"""State-aware framing for the live audio sender.
+
+Small frames keep capture-to-wire latency low during a conversation; large
+frames cut syscalls and websocket messages while Baymax sleeps or is muted.
+When the sender falls behind, queued audio is coalesced into one send.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Dict, Optional
+
+
+class FramingMode(Enum):
+    """Framing profile selected from the state machine's current state."""
+
+    ACTIVE = "active"
+    MUTED = "muted"
+    ASLEEP = "asleep"
+
+
+class FramingPolicy:
+    """Maps the current mode to a read size and coalesces backlog."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        *,
+        active_ms: float = 20.0,
+        muted_ms: float = 100.0,
+        asleep_ms: float = 200.0,
+        max_coalesce: int = 8,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self._frames: Dict[FramingMode, int] = {
+            FramingMode.ACTIVE: self._to_frames(active_ms),
+            FramingMode.MUTED: self._to_frames(muted_ms),
+            FramingMode.ASLEEP: self._to_frames(asleep_ms),
+        }
+        self._max_coalesce = max(max_coalesce, 1)
+        self.mode = FramingMode.ACTIVE
+
+    @property
+    def smallest_frame(self) -> int:
+        return min(self._frames.values())
+
+    def frame_size(self, mode: Optional[FramingMode] = None) -> int:
+        return self._frames[mode or self.mode]
+
+    def next_read_size(self, backlog: int = 0) -> int:
+        """Frames to read next: one frame, or whole queued frames when behind."""
+        frame = self.frame_size()
+        if backlog <= frame:
+            return frame
+        queued = backlog - backlog % frame
+        return min(queued, frame * self._max_coalesce)
+
+    def _to_frames(self, milliseconds: float) -> int:
+        return max(int(self.sample_rate * milliseconds / 1000.0), 1)
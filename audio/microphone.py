@@ -1,27 +1,36 @@
+import io
 import time
 import numpy as np
 import sounddevice as sd
 import wave
-from typing import Optional
+from typing import Callable, Optional
 
+from audio.capture_health import CaptureHealth
+from audio.recorder import EarlyStopRecorder
 from config_app.settings import settings
+from core.clock import Clock, system_clock
+from core.timers import TimedFlag, timers_for
 from interfaces.audio_interface import AudioInterface
 
 
-def _current_time() -> float:
-    return time.time()
-
-
 class Microphone(AudioInterface):
     """Real microphone input using sounddevice."""
 
     def __init__(self, sample_rate: int = 16000, channels: int = 1,
-                 chunk_size: Optional[int] = None):
+                 chunk_size: Optional[int] = None, block_size: Optional[int] = None,
+                 clock: Optional[Clock] = None):
         self.sample_rate = sample_rate
+        # Mute windows run on this clock; capture deadlines follow the real device.
+        self.clock = clock or system_clock
         self.channels = channels
         self._chunk_size = chunk_size or settings.CHUNK_SIZE
+        # PortAudio block size; smaller than the chunk when reads are adaptive.
+        self._block_size = block_size or self._chunk_size
         self._stream = None
-        self._mute_until: float = 0.0
+        self._muted = TimedFlag(timers_for(self.clock))
+        # Keep reading (and discarding) while muted so PortAudio never backs up.
+        self._drain_while_muted = settings.MIC_DRAIN_WHILE_MUTED
+        self._health = CaptureHealth(sample_rate, max_lag_ms=settings.MIC_MAX_LAG_MS)
 
     def start_stream(self):
         """Start a streaming audio capture session."""
@@ -33,7 +42,7 @@ class Microphone(AudioInterface):
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype="int16",
-                blocksize=self._chunk_size
+                blocksize=self._block_size
             )
             self._stream.start()
         except Exception as exc:
@@ -42,9 +51,22 @@ class Microphone(AudioInterface):
 
     def mute_for(self, duration: float) -> None:
         """Temporarily suppress capture for the given duration in seconds."""
-        self._mute_until = max(self._mute_until, _current_time() + max(duration, 0.0))
+        self._muted.set_for(duration)
 
-    def read_audio_chunk(self) -> bytes:
+    def unmute(self) -> None:
+        """Cancel any pending mute window (e.g. after a barge-in)."""
+        self._muted.clear()
+
+    def pending_frames(self) -> int:
+        """Frames already captured and waiting to be read."""
+        if not self._stream:
+            return 0
+        try:
+            return int(self._stream.read_available)
+        except Exception:
+            return 0
+
+    def read_audio_chunk(self, frames: Optional[int] = None) -> bytes:
         """Read a chunk from the active stream (starts stream if needed)."""
         if not self._stream:
             self.start_stream()
@@ -52,22 +74,35 @@ class Microphone(AudioInterface):
         if not self._stream:
             return b""
 
-        if _current_time() < self._mute_until:
-            time.sleep(0.05)
+        if self._muted:
+            if self._drain_while_muted:
+                try:
+                    self._health.drain(self._stream)
+                except Exception as exc:
+                    print("[Audio] Failed to drain muted stream:", exc)
+            self.clock.sleep(0.05)
             return b""
 
         try:
-            frames, _ = self._stream.read(self._chunk_size)
-            return frames.tobytes()
+            if self._drain_while_muted:
+                self._health.before_read(self._stream)
+            data, overflowed = self._stream.read(frames or self._chunk_size)
+            self._health.after_read(self._stream, overflowed)
+            return data.tobytes()
         except Exception as exc:
             print("[Audio] Failed to read audio chunk:", exc)
             return b""
 
+    def capture_stats(self) -> dict:
+        """Overflow, drain/flush and capture-latency counters for the live stream."""
+        return self._health.stats()
+
     def stop_stream(self):
         """Stop and dispose of the active stream."""
         if not self._stream:
             return
 
+        print("[Audio] Capture stats:", self.capture_stats())
         try:
             self._stream.stop()
             self._stream.close()
@@ -76,61 +111,69 @@ class Microphone(AudioInterface):
         finally:
             self._stream = None
 
-    def record_to_file(self, filename: str, duration: int = 3):
-        """Record audio with early stop on silence detection."""
-        print(f"[Audio] Recording up to {duration}s -> {filename}")
-
-        wait_timeout = max(self._mute_until - _current_time(), 0.0)
+    def record(self, duration: float = 3, on_chunk: Optional[Callable[[bytes], None]] = None) -> Optional[np.ndarray]:
+        """Record int16 audio with early stop on silence; `on_chunk` sees each chunk live."""
+        wait_timeout = self._muted.remaining()
         if wait_timeout > 0:
-            time.sleep(wait_timeout)
-
-        chunk_duration = 0.1  # 100ms chunks
-        chunk_samples = int(chunk_duration * self.sample_rate)
-        max_chunks = int(duration / chunk_duration)
-        silence_threshold = 50  # Very low RMS threshold for quiet mics
-        silence_chunks_to_stop = 12  # Stop after 1.2s of silence (after speech detected)
-        min_speech_chunks = 5  # Require at least 0.5s of speech before allowing early stop
-        
-        all_audio = []
-        speech_chunks = 0
-        consecutive_silence = 0
+            self.clock.sleep(wait_timeout)
+
+        recorder = EarlyStopRecorder(self.sample_rate, self.channels, duration)
+        deadline = time.time() + duration + 1.0
 
         try:
-            for _ in range(max_chunks):
-                chunk = sd.rec(
-                    chunk_samples,
-                    samplerate=self.sample_rate,
-                    channels=self.channels,
-                    dtype="int16"
-                )
-                sd.wait()
-                all_audio.append(chunk)
-                
-                # Calculate RMS volume
-                rms = np.sqrt(np.mean(chunk.astype(np.float32) ** 2))
-                print(f"[Audio] RMS: {rms:.0f}")
-                
-                if rms > silence_threshold:
-                    speech_chunks += 1
-                    consecutive_silence = 0
-                elif speech_chunks >= min_speech_chunks:
-                    consecutive_silence += 1
-                    if consecutive_silence >= silence_chunks_to_stop:
-                        print("[Audio] Silence detected, stopping early")
+            # One stream for the whole utterance: no per-chunk open/close gaps.
+            with sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                dtype="int16",
+                blocksize=recorder.chunk_samples,
+                callback=recorder.callback,
+            ):
+                while not recorder.process_ready(on_chunk):
+                    if time.time() > deadline:
+                        print("[Audio] Recording stalled, returning captured audio")
                         break
+                    recorder.wait(0.1)
+
+            if recorder.stopped_early:
+                print("[Audio] Silence detected, stopping early")
+            if recorder.overflows:
+                print(f"[Audio] {recorder.overflows} input overflow(s) during recording")
+            print(f"[Audio] Peak RMS: {recorder.peak_rms:.0f}")
+            return recorder.audio()
+        except Exception as e:
+            print("[Audio] Microphone error:", e)
+            return None
 
-            # Combine all chunks
-            audio = np.concatenate(all_audio)
+    def record_to_wav_bytes(self, duration: float = 3, on_chunk: Optional[Callable[[bytes], None]] = None) -> bytes:
+        """Record into an in-memory WAV container (no scratch file)."""
+        audio = self.record(duration, on_chunk=on_chunk)
+        if audio is None:
+            return b""
 
-            # Save WAV
-            with wave.open(filename, "wb") as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(2)  # int16 → 2 bytes
-                wf.setframerate(self.sample_rate)
-                wf.writeframes(audio.tobytes())
+        buffer = io.BytesIO()
+        self._write_wav(buffer, audio)
+        print(f"[Audio] Captured {len(audio) / self.sample_rate:.1f}s in memory")
+        return buffer.getvalue()
 
+    def record_to_file(self, filename: str, duration: int = 3):
+        """Record audio with early stop on silence detection."""
+        print(f"[Audio] Recording up to {duration}s -> {filename}")
+
+        audio = self.record(duration)
+        if audio is None:
+            return
+
+        try:
+            self._write_wav(filename, audio)
             actual_duration = len(audio) / self.sample_rate
             print(f"[Audio] Saved recording ({actual_duration:.1f}s) -> {filename}")
-
         except Exception as e:
             print("[Audio] Microphone error:", e)
+
+    def _write_wav(self, target, audio: np.ndarray) -> None:
+        with wave.open(target, "wb") as wf:
+            wf.setnchannels(self.channels)
+            wf.setsampwidth(2)  # int16 → 2 bytes
+            wf.setframerate(self.sample_rate)
+            wf.writeframes(audio.tobytes())
@@ -0,0 +1,67 @@
+"""Interruptible local playback for Baymax responses."""
+
+from __future__ import annotations
+
+import subprocess
+import wave
+from typing import Optional
+
+import numpy as np
+
+
+def load_wav_samples(path: str) -> Optional[np.ndarray]:
+    """Return mono int16 samples from a WAV file, or None when unreadable."""
+    try:
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                return None
+            frames = wf.readframes(wf.getnframes())
+            channels = max(wf.getnchannels(), 1)
+    except Exception:
+        return None
+
+    samples = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)[:, 0]
+    return samples
+
+
+class AudioPlayer:
+    """Plays WAV files through macOS `afplay` without blocking the caller."""
+
+    def __init__(self, command: str = "afplay") -> None:
+        self._command = command
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def is_playing(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def play(self, path: str) -> None:
+        self.stop()
+        self._process = subprocess.Popen([self._command, path])
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block up to `timeout` seconds; True once playback has finished."""
+        if self._process is None:
+            return True
+        try:
+            returncode = self._process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        self._process = None
+        if returncode:
+            raise RuntimeError(f"{self._command} exited with status {returncode}")
+        return True
+
+    def stop(self) -> None:
+        """Cut playback off immediately."""
+        process = self._process
+        self._process = None
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=0.5)
+        except subprocess.TimeoutExpired:  # pragma: no cover - stuck player
+            process.kill()
@@ -0,0 +1,159 @@
+"""Bounded utterance recorder fed by a single persistent input stream.
+
+The PortAudio callback only copies each block into a preallocated buffer; the
+recording thread walks completed 100 ms chunks, computes their RMS over
+strided views and applies the early-stop rules `Microphone.record` has always
+used (0.5 s of speech, then 1.2 s of silence).
+"""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+import wave
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+
+class EarlyStopRecorder:
+    """Preallocated capture buffer with chunk-wise silence detection."""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int,
+        duration: float,
+        *,
+        chunk_duration: float = 0.1,
+        silence_threshold: float = 50.0,
+        silence_chunks_to_stop: int = 12,
+        min_speech_chunks: int = 5,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk_samples = int(chunk_duration * sample_rate)
+        self.max_chunks = int(duration / chunk_duration)
+        self.silence_threshold = silence_threshold
+        self.silence_chunks_to_stop = silence_chunks_to_stop
+        self.min_speech_chunks = min_speech_chunks
+
+        self._buffer = np.empty((self.max_chunks * self.chunk_samples, channels), dtype=np.int16)
+        self._written = 0  # frames copied in by the capture callback
+        self._processed_chunks = 0
+        self._speech_chunks = 0
+        self._consecutive_silence = 0
+        self._stopped = False
+        self._ready = threading.Event()
+
+        self.overflows = 0
+        self.peak_rms = 0.0
+        self.stopped_early = False
+
+    @property
+    def finished(self) -> bool:
+        return self._stopped or self._processed_chunks >= self.max_chunks
+
+    def callback(self, indata, frames, time_info, status) -> None:  # pragma: no cover - PortAudio thread
+        """`sd.InputStream` callback: copy only, no analysis."""
+        if status and getattr(status, "input_overflow", False):
+            self.overflows += 1
+        self.write(indata)
+
+    def write(self, block: np.ndarray) -> None:
+        """Append captured frames; anything past the buffer end or the stop point is dropped."""
+        if self._stopped:
+            return
+        start = self._written
+        count = min(len(block), len(self._buffer) - start)
+        if count > 0:
+            self._buffer[start:start + count] = block[:count].reshape(count, self.channels)
+            self._written = start + count
+        self._ready.set()
+
+    def wait(self, timeout: float) -> None:
+        self._ready.wait(timeout)
+        self._ready.clear()
+
+    def process_ready(self, on_chunk: Optional[Callable[[bytes], None]] = None) -> bool:
+        """Analyse every newly completed chunk; return True once recording is over."""
+        complete = min(self._written // self.chunk_samples, self.max_chunks)
+        first = self._processed_chunks
+        if complete > first and not self._stopped:
+            span = self._buffer[first * self.chunk_samples:complete * self.chunk_samples]
+            chunks = span.reshape(complete - first, self.chunk_samples * self.channels)
+            as_float = chunks.astype(np.float32)
+            rms = np.sqrt(np.mean(as_float * as_float, axis=1))
+
+            for offset, level in enumerate(rms):
+                self._processed_chunks = first + offset + 1
+                self.peak_rms = max(self.peak_rms, float(level))
+                if on_chunk:
+                    on_chunk(chunks[offset].tobytes())
+
+                if level > self.silence_threshold:
+                    self._speech_chunks += 1
+                    self._consecutive_silence = 0
+                elif self._speech_chunks >= self.min_speech_chunks:
+                    self._consecutive_silence += 1
+                    if self._consecutive_silence >= self.silence_chunks_to_stop:
+                        self._stopped = True
+                        self.stopped_early = True
+                        break
+        return self.finished
+
+    def audio(self) -> np.ndarray:
+        """View of the recording up to the last analysed chunk."""
+        return self._buffer[: self._processed_chunks * self.chunk_samples]
+
+
+def record_from(
+    read_block: Callable[[int], Optional[np.ndarray]],
+    sample_rate: int,
+    channels: int,
+    duration: float,
+    on_chunk: Optional[Callable[[bytes], None]] = None,
+) -> np.ndarray:
+    """Run an `EarlyStopRecorder` off a pull-style reader (bus tap, shared-memory ring)."""
+    recorder = EarlyStopRecorder(sample_rate, channels, duration)
+    deadline = time.time() + duration + 1.0
+    while not recorder.process_ready(on_chunk):
+        if time.time() > deadline:
+            print("[Audio] Recording stalled, returning captured audio")
+            break
+        block = read_block(recorder.chunk_samples)
+        if block is not None:
+            recorder.write(block)
+
+    if recorder.stopped_early:
+        print("[Audio] Silence detected, stopping early")
+    return recorder.audio()
+
+
+def to_wav_bytes(audio: np.ndarray, sample_rate: int, channels: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio.tobytes())
+    return buffer.getvalue()
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Mono 16-bit PCM WAV bytes for `samples`."""
+    return to_wav_bytes(np.ascontiguousarray(samples, dtype=np.int16), sample_rate, 1)
+
+
+def read_wav(audio: bytes) -> Tuple[np.ndarray, int]:
+    """Decode 16-bit PCM WAV bytes into mono int16 samples and the sample rate."""
+    with wave.open(io.BytesIO(audio), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError("expected 16-bit PCM WAV")
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
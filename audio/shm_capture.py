@@ -0,0 +1,445 @@
+"""Out-of-process audio capture over a shared-memory ring.
+
+Capture (and optional local DSP such as the wake energy gate) runs in a child
+process, so it no longer competes for the GIL with Deepgram result parsing,
+HTTP clients and logging. The child writes frames into a mirrored ring in
+`multiprocessing.shared_memory`; the main process reads read-only views of
+that ring without copying, blocking on a cross-process event the child sets
+after each block rather than polling. A supervisor thread restarts the child
+when it dies or its heartbeat stalls; readers keep their cursors across
+restarts.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from audio.recorder import record_from, to_wav_bytes
+from core.timers import TimedFlag, timers_for
+from interfaces.audio_interface import AudioInterface
+
+# Header slots (int64)
+_WRITTEN, _BLOCKS, _HEARTBEAT_NS, _WAKE_EVENTS, _PID, _STOP, _LAST_WAKE_NS = range(7)
+_HEADER_SLOTS = 8
+
+
+@dataclass(frozen=True)
+class RingSpec:
+    capacity: int
+    channels: int
+    stamp_slots: int
+
+    @property
+    def nbytes(self) -> int:
+        return _HEADER_SLOTS * 8 + self.stamp_slots * 16 + self.capacity * 2 * self.channels * 2
+
+
+class SharedRing:
+    """Header + capture timestamps + mirrored int16 ring in one shared block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: RingSpec, owner: bool) -> None:
+        self.shm = shm
+        self.spec = spec
+        self.owner = owner
+        buf = shm.buf
+        offset = _HEADER_SLOTS * 8
+        self.header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=buf)
+        self.stamps = np.ndarray((spec.stamp_slots, 2), dtype=np.float64, buffer=buf, offset=offset)
+        offset += spec.stamp_slots * 16
+        self.ring = np.ndarray((spec.capacity * 2, spec.channels), dtype=np.int16, buffer=buf, offset=offset)
+
+    @classmethod
+    def create(cls, spec: RingSpec) -> "SharedRing":
+        shm = shared_memory.SharedMemory(create=True, size=spec.nbytes)
+        ring = cls(shm, spec, owner=True)
+        ring.header[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, spec: RingSpec) -> "SharedRing":
+        # Spawned children share the parent's resource tracker, so attaching
+        # here does not schedule a second unlink.
+        return cls(shared_memory.SharedMemory(name=name), spec, owner=False)
+
+    @property
+    def written(self) -> int:
+        return int(self.header[_WRITTEN])
+
+    def store(self, block: np.ndarray) -> None:
+        """Single-writer append; the frame counter is published after the data."""
+        cap = self.spec.capacity
+        block = block.reshape(-1, self.spec.channels)
+        written = int(self.header[_WRITTEN])
+        if len(block) > cap:
+            written += len(block) - cap
+            block = block[-cap:]
+        count = len(block)
+        pos = written % cap
+        first = min(count, cap - pos)
+        self.ring[pos:pos + first] = block[:first]
+        self.ring[pos + cap:pos + cap + first] = block[:first]
+        rest = count - first
+        if rest:
+            self.ring[:rest] = block[first:]
+            self.ring[cap:cap + rest] = block[first:]
+
+        blocks = int(self.header[_BLOCKS])
+        self.stamps[blocks % self.spec.stamp_slots] = (written + count, time.monotonic())
+        self.header[_WRITTEN] = written + count
+        self.header[_BLOCKS] = blocks + 1
+
+    def close(self) -> None:
+        # Drop numpy views before closing so the buffer can be released.
+        del self.header, self.stamps, self.ring
+        try:
+            self.shm.close()
+        except BufferError:
+            # A reader still holds a view; the mapping goes away with it.
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+
+def run_capture(
+    ring: SharedRing,
+    source: AudioInterface,
+    block_frames: int,
+    dsp: Optional[Callable[[bytes], bool]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+    data_ready=None,
+) -> None:
+    """Capture loop shared by the child process and the in-process benchmark path.
+
+    `data_ready` (an event) is set after every stored block to wake the reader.
+    """
+    stop = stop or (lambda: bool(ring.header[_STOP]))
+    while not stop():
+        ring.header[_HEARTBEAT_NS] = time.monotonic_ns()
+        chunk = source.read_audio_chunk(block_frames)
+        if not chunk:
+            continue
+        ring.store(np.frombuffer(chunk, dtype=np.int16))
+        if data_ready is not None:
+            data_ready.set()
+        if dsp is not None and dsp(chunk):
+            ring.header[_LAST_WAKE_NS] = time.monotonic_ns()
+            ring.header[_WAKE_EVENTS] += 1
+
+
+def _child_main(name, spec, source_factory, dsp_factory, block_frames, data_ready) -> None:  # pragma: no cover - child process
+    ring = SharedRing.attach(name, spec)
+    source = source_factory()
+    source.start_stream()
+    # `dsp_factory` builds a detector exposing `detect(bytes) -> bool` (e.g. WakeWordDetector).
+    dsp = dsp_factory().detect if dsp_factory else None
+    ring.header[_HEARTBEAT_NS] = time.monotonic_ns()
+    ring.header[_PID] = mp.current_process().pid or 0
+    try:
+        run_capture(ring, source, block_frames, dsp, data_ready=data_ready)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.stop_stream()
+
+
+class SyntheticSource(AudioInterface):
+    """Real-time paced ramp signal; picklable so it can run in the child."""
+
+    def __init__(self, sample_rate: int = 16000) -> None:
+        self.sample_rate = sample_rate
+        self._t0 = 0.0
+        self._produced = 0
+
+    def start_stream(self):
+        self._t0 = time.perf_counter()
+        self._produced = 0
+
+    def stop_stream(self):
+        pass
+
+    def read_audio_chunk(self, frames: Optional[int] = None) -> bytes:
+        frames = frames or 320
+        delay = self._t0 + (self._produced + frames) / self.sample_rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        ramp = (np.arange(self._produced, self._produced + frames) % 32768).astype(np.int16)
+        self._produced += frames
+        return ramp.tobytes()
+
+
+def _default_source_factory(sample_rate: int, channels: int, block_frames: int):  # pragma: no cover - needs device
+    from audio.microphone import Microphone
+
+    return Microphone(sample_rate=sample_rate, channels=channels, block_size=block_frames)
+
+
+class SharedMemoryCapture(AudioInterface):
+    """Microphone-compatible reader of a supervised capture child process."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        *,
+        capacity_seconds: float = 5.0,
+        block_frames: int = 320,
+        chunk_size: int = 1024,
+        source_factory: Optional[Callable[[], AudioInterface]] = None,
+        dsp_factory: Optional[Callable[[], Any]] = None,
+        heartbeat_timeout: float = 1.0,
+        startup_grace: float = 10.0,
+        supervise_interval: float = 0.5,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._block_frames = block_frames
+        self._chunk_size = chunk_size
+        capacity = max(int(sample_rate * capacity_seconds), block_frames * 4)
+        self._spec = RingSpec(capacity=capacity, channels=channels, stamp_slots=capacity // block_frames + 1)
+        self.window = capacity - capacity // 4
+        self._source_factory = source_factory
+        self._dsp_factory = dsp_factory
+        self._heartbeat_timeout = heartbeat_timeout
+        self._startup_grace = startup_grace
+        self._supervise_interval = supervise_interval
+        self._ctx = mp.get_context("spawn")
+        # Set by the child after each block; the reader clears it before it waits.
+        self._data_ready = self._ctx.Event()
+
+        self._ring: Optional[SharedRing] = None
+        self._process = None
+        self._supervisor: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._muted = TimedFlag(timers_for())
+        self._wake_seen = 0
+
+        self.cursor = 0
+        self.restarts = 0
+        self.dropped_frames = 0
+        self.overruns = 0
+
+    # -- lifecycle ------------------------------------------------------------
+    def start_stream(self):
+        with self._lock:
+            if self._ring is not None:
+                return
+            self._ring = SharedRing.create(self._spec)
+            self._stopping.clear()
+            self._spawn()
+        self._supervisor = threading.Thread(target=self._supervise_loop, name="ShmCaptureSupervisor", daemon=True)
+        self._supervisor.start()
+
+    def stop_stream(self):
+        with self._lock:
+            if self._ring is None:
+                return
+            self._stopping.set()
+            self._ring.header[_STOP] = 1
+            self._data_ready.set()  # release a blocked reader
+            self._reap(timeout=1.0)
+            self._ring.close()
+            self._ring = None
+        if self._supervisor:
+            self._supervisor.join(timeout=1.0)
+            self._supervisor = None
+
+    def _spawn(self) -> None:
+        factory = self._source_factory or _partial_default(self.sample_rate, self.channels, self._block_frames)
+        self._ring.header[_STOP] = 0
+        self._ring.header[_PID] = 0
+        self._ring.header[_HEARTBEAT_NS] = time.monotonic_ns()
+        self._process = self._ctx.Process(
+            target=_child_main,
+            args=(self._ring.shm.name, self._spec, factory, self._dsp_factory, self._block_frames, self._data_ready),
+            name="AudioCapture",
+            daemon=True,
+        )
+        self._process.start()
+
+    def _reap(self, timeout: float) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+
+    def heartbeat_age(self) -> float:
+        ring = self._ring
+        if ring is None:
+            return 0.0
+        return (time.monotonic_ns() - int(ring.header[_HEARTBEAT_NS])) / 1e9
+
+    def supervise(self) -> bool:
+        """Restart the child if it exited or stopped heart-beating; True when restarted."""
+        with self._lock:
+            if self._ring is None or self._stopping.is_set():
+                return False
+            alive = self._process is not None and self._process.is_alive()
+            # A freshly spawned child gets longer to import and open the device.
+            booting = int(self._ring.header[_PID]) == 0
+            limit = self._startup_grace if booting else self._heartbeat_timeout
+            if alive and self.heartbeat_age() < limit:
+                return False
+            print("[ShmCapture] Capture process unhealthy, restarting")
+            if self._process is not None:
+                self._process.terminate()
+            self._reap(timeout=1.0)
+            self._spawn()
+            self.restarts += 1
+            return True
+
+    def _supervise_loop(self) -> None:
+        while not self._stopping.wait(self._supervise_interval):
+            try:
+                self.supervise()
+            except Exception as exc:  # pragma: no cover - defensive
+                print("[ShmCapture] Supervisor error:", exc)
+
+    # -- reading --------------------------------------------------------------
+    def pending_frames(self) -> int:
+        ring = self._ring
+        if ring is None:
+            return 0
+        return self._available(ring)
+
+    def _available(self, ring: SharedRing) -> int:
+        self._catch_up(ring)
+        return ring.written - self.cursor
+
+    def _catch_up(self, ring: SharedRing) -> None:
+        lag = ring.written - self.cursor
+        if lag > self.window:
+            # Same policy as `BusSubscription`: resume with live audio, not a stale window.
+            self.cursor = ring.written
+            self.dropped_frames += lag
+            self.overruns += 1
+
+    def read(self, frames: int, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """Next `frames` frames as a read-only view into shared memory."""
+        ring = self._ring
+        if ring is None:
+            return None
+        frames = min(frames, self.window)
+        deadline = time.monotonic() + timeout
+        while self._available(ring) < frames:
+            # Clear, then re-check: a block stored in between is seen now or sets the event again.
+            self._data_ready.clear()
+            if self._available(ring) >= frames:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping.is_set():
+                return None
+            self._data_ready.wait(remaining)
+            if self._stopping.is_set():
+                return None
+        start = self.cursor % self._spec.capacity
+        view = ring.ring[start:start + frames].view()
+        view.flags.writeable = False
+        self.cursor += frames
+        return view
+
+    def read_audio_chunk(self, frames: Optional[int] = None) -> bytes:
+        if self._ring is None:
+            self.start_stream()
+        if self._muted:
+            time.sleep(0.05)
+            self.discard_pending()
+            return b""
+        view = self.read(frames or self._chunk_size)
+        return view.tobytes() if view is not None else b""
+
+    def record(self, duration: float = 3, on_chunk: Optional[Callable[[bytes], None]] = None) -> Optional[np.ndarray]:
+        """Same contract as `Microphone.record`, read from the shared ring."""
+        wait_timeout = self._muted.remaining()
+        if wait_timeout > 0:
+            time.sleep(wait_timeout)
+        if self._ring is None:
+            self.start_stream()
+        self.discard_pending()
+        return record_from(
+            lambda frames: self.read(frames, timeout=0.2), self.sample_rate, self.channels, duration, on_chunk
+        )
+
+    def record_to_wav_bytes(self, duration: float = 3, on_chunk: Optional[Callable[[bytes], None]] = None) -> bytes:
+        audio = self.record(duration, on_chunk=on_chunk)
+        print(f"[Audio] Captured {len(audio) / self.sample_rate:.1f}s in memory")
+        return to_wav_bytes(audio, self.sample_rate, self.channels)
+
+    def discard_pending(self) -> int:
+        ring = self._ring
+        if ring is None:
+            return 0
+        skipped = ring.written - self.cursor
+        self.cursor = ring.written
+        return skipped
+
+    def mute_for(self, duration: float) -> None:
+        self._muted.set_for(duration)
+
+    def unmute(self) -> None:
+        self._muted.clear()
+
+    def wake_events(self, max_age: float = 0.5) -> int:
+        """Wake detections made by the child's DSP since the last call.
+
+        Detections are only reported while recent, so bursts heard while the
+        app was awake do not fire the moment it goes back to sleep.
+        """
+        ring = self._ring
+        if ring is None:
+            return 0
+        total = int(ring.header[_WAKE_EVENTS])
+        fresh, self._wake_seen = total - self._wake_seen, total
+        age = (time.monotonic_ns() - int(ring.header[_LAST_WAKE_NS])) / 1e9
+        return max(fresh, 0) if age <= max_age else 0
+
+    def wake_detector(self) -> "ChildWakeGate":
+        """Drop-in for `WakeWordDetector` that reports the child's DSP decisions."""
+        return ChildWakeGate(self)
+
+    def capture_stamps(self) -> np.ndarray:
+        """(end_frame, monotonic time) for the most recent captured blocks, oldest first."""
+        ring = self._ring
+        if ring is None:
+            return np.zeros((0, 2))
+        blocks = int(ring.header[_BLOCKS])
+        slots = self._spec.stamp_slots
+        if blocks <= slots:
+            return ring.stamps[:blocks].copy()
+        split = blocks % slots
+        return np.concatenate((ring.stamps[split:], ring.stamps[:split]))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "restarts": self.restarts,
+            "dropped_frames": self.dropped_frames,
+            "overruns": self.overruns,
+            "lag_frames": self.pending_frames(),
+            "heartbeat_age_s": round(self.heartbeat_age(), 3),
+        }
+
+
+class ChildWakeGate:
+    """`detect()` answers from wake events counted in the capture process."""
+
+    def __init__(self, capture: SharedMemoryCapture) -> None:
+        self._capture = capture
+
+    def detect(self, _audio_chunk: Optional[bytes] = None) -> bool:
+        return self._capture.wake_events() > 0
+
+
+def _partial_default(sample_rate: int, channels: int, block_frames: int):
+    from functools import partial
+
+    return partial(_default_source_factory, sample_rate, channels, block_frames)
@@ -0,0 +1,95 @@
+"""Barge-in detector benchmark on synthetic playback echo.
+
+For each echo coupling it replays playback-only trials (false triggers) and
+playback-plus-user-speech trials (detection latency from speech onset, misses).
+
+    python3 -m benchmarks.barge_in_bench --trials 50
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional
+
+import numpy as np
+
+from audio.barge_in import BargeInDetector
+
+SAMPLE_RATE = 16000
+CHUNK = 1024
+
+
+def _speech_like(rng: np.random.Generator, seconds: float, rms: float) -> np.ndarray:
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    syllables = 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3.0, 5.0) * t + rng.uniform(0, 6.28))
+    carrier = np.sin(2 * np.pi * rng.uniform(110, 220) * t) + 0.4 * rng.normal(0, 1, n)
+    signal = syllables * carrier
+    return signal / (np.sqrt(np.mean(signal ** 2)) + 1e-9) * rms
+
+
+def _run_trial(
+    rng: np.random.Generator,
+    coupling: float,
+    speech_at: Optional[float],
+    seconds: float = 6.0,
+) -> Optional[float]:
+    """Return the trigger time (s) for one playback, or None."""
+    reference = np.clip(_speech_like(rng, seconds, 5000.0), -32768, 32767).astype(np.int16)
+    delay = int(0.08 * SAMPLE_RATE)
+    mic = np.zeros(len(reference))
+    mic[delay:] = coupling * reference[:-delay]
+    mic += rng.normal(0, 60.0, len(mic))
+    if speech_at is not None:
+        start = int(speech_at * SAMPLE_RATE)
+        speech = _speech_like(rng, seconds, 3000.0)[: len(mic) - start]
+        mic[start:start + len(speech)] += speech
+    mic_pcm = np.clip(mic, -32768, 32767).astype(np.int16)
+
+    detector = BargeInDetector(sample_rate=SAMPLE_RATE)
+    detector.start(reference, now=0.0)
+    for offset in range(0, len(mic_pcm), CHUNK):
+        chunk = mic_pcm[offset:offset + CHUNK]
+        now = (offset + len(chunk)) / SAMPLE_RATE
+        if detector.process(chunk.tobytes(), now=now):
+            return now
+    return None
+
+
+def run(trials: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    print(f"{'coupling':>9}{'false/trial':>13}{'detected':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for coupling in (0.1, 0.3, 0.6, 1.0):
+        false_triggers = sum(_run_trial(rng, coupling, None) is not None for _ in range(trials))
+
+        latencies: List[float] = []
+        premature = 0
+        for _ in range(trials):
+            onset = float(rng.uniform(1.0, 4.0))
+            fired = _run_trial(rng, coupling, onset)
+            if fired is None:
+                continue
+            if fired < onset:
+                premature += 1
+                continue
+            latencies.append((fired - onset) * 1000.0)
+
+        detected = len(latencies) / trials
+        p50 = float(np.percentile(latencies, 50)) if latencies else float("nan")
+        p95 = float(np.percentile(latencies, 95)) if latencies else float("nan")
+        print(
+            f"{coupling:>9.1f}{(false_triggers + premature) / (2 * trials):>13.2f}"
+            f"{detected:>10.0%}{p50:>9.0f}{p95:>9.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+    run(args.trials, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""How fast "goodbye Baymax" cuts off a reply that is still being generated.
+
+Drives `StateManager` with a fake streaming LLM that emits one token every
+`--token-ms` for `--tokens` tokens. While `ProcessingState` waits for the
+reply, a SLEEP event arrives after `--after-ms`. Reports how long after the
+event the state loop got control back, the completion stream was closed,
+and the goodbye line started, plus how many tokens were streamed after the
+event (what an abandoned request still costs). An LLM that ignores the
+cancel token is the baseline: the loop is freed, but its request runs on.
+
+    python3 -m benchmarks.cancel_latency_bench --trials 5 --tokens 100 --token-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+from app_states.state_manager import StateManager
+from core.events import TranscriptEvent, WakeEvent, WakeEventType
+
+
+class _Stream:
+    def __init__(self):
+        self.wake, self.transcript = [], []
+
+    def add_wake_listener(self, callback):
+        self.wake.append(callback)
+
+    def add_transcript_listener(self, callback):
+        self.transcript.append(callback)
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+
+class _TTS:
+    output_path = "audio/_cancel_bench.wav"
+    last_duration = 0.0
+
+    def __init__(self):
+        self.started_at = None
+
+    def speak(self, text: str) -> None:
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+
+
+class _TokenLLM:
+    def __init__(self, tokens: int, token_s: float, honour_cancel: bool):
+        self.tokens, self.token_s = tokens, token_s
+        self.closed_at = None
+        self.streamed_at = []
+        if honour_cancel:
+            self.generate = self._generate_cancellable
+
+    def generate(self, text: str) -> str:
+        return self._stream(None)
+
+    def _generate_cancellable(self, text: str, *, cancel=None) -> str:
+        return self._stream(cancel)
+
+    def _stream(self, cancel) -> str:
+        closed = threading.Event()
+        if cancel is not None:
+            cancel.on_cancel(lambda: (setattr(self, "closed_at", time.monotonic()), closed.set()))
+        for _ in range(self.tokens):
+            if closed.wait(self.token_s):
+                break
+            self.streamed_at.append(time.monotonic())
+        return "word " * len(self.streamed_at)
+
+
+def _trial(tokens: int, token_s: float, after_s: float, honour_cancel: bool) -> dict:
+    stream, tts = _Stream(), _TTS()
+    llm = _TokenLLM(tokens, token_s, honour_cancel)
+    manager = StateManager(tts=tts, llm=llm, stt_stream=stream)
+    manager.set_state(manager.listening_state)
+    for callback in stream.transcript:
+        callback(TranscriptEvent(text="tell me a long story", is_final=True, should_process=True))
+    manager.update()
+
+    sent = {}
+
+    def goodbye() -> None:
+        sent["at"] = time.monotonic()
+        for callback in stream.wake:
+            callback(WakeEvent(WakeEventType.SLEEP, "goodbye baymax"))
+
+    threading.Timer(after_s, goodbye).start()
+    manager.update()
+    freed_at = time.monotonic()
+    while manager.current_state is not manager.sleep_state:
+        manager.update()
+    # Let an abandoned request run out so its wasted tokens are counted.
+    time.sleep(tokens * token_s)
+    sent_at = sent["at"]
+    return {
+        "freed_ms": (freed_at - sent_at) * 1000.0,
+        "closed_ms": (llm.closed_at - sent_at) * 1000.0 if llm.closed_at else None,
+        "goodbye_ms": (tts.started_at - sent_at) * 1000.0,
+        "wasted_tokens": sum(1 for at in llm.streamed_at if at > sent_at),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SLEEP-to-abort latency for an in-flight LLM reply")
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--after-ms", type=float, default=200.0, help="SLEEP this long into the reply")
+    args = parser.parse_args()
+    os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+
+    for label, honour in (("token-aware", True), ("ignores token", False)):
+        rows = [_trial(args.tokens, args.token_ms / 1000.0, args.after_ms / 1000.0, honour) for _ in range(args.trials)]
+        closed = [row["closed_ms"] for row in rows if row["closed_ms"] is not None]
+        print(
+            f"{label:<14} loop freed {statistics.median(row['freed_ms'] for row in rows):6.1f} ms  "
+            f"stream closed {statistics.median(closed) if closed else float('nan'):6.1f} ms  "
+            f"goodbye starts {statistics.median(row['goodbye_ms'] for row in rows):6.1f} ms  "
+            f"tokens after SLEEP {statistics.median(row['wasted_tokens'] for row in rows):5.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Capture jitter benchmark: in-process thread vs shared-memory child process.
+
+A real-time synthetic source is captured into the same shared ring either by a
+thread in this process or by a `SharedMemoryCapture` child, while worker
+threads here burn the GIL with JSON encode/decode (our Deepgram/HTTP load).
+Jitter is the deviation of block inter-arrival times from the block period.
+
+    python3 -m benchmarks.capture_jitter_bench --seconds 4 --load-threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+
+from audio.shm_capture import RingSpec, SharedMemoryCapture, SharedRing, SyntheticSource, run_capture
+
+SAMPLE_RATE = 16000
+BLOCK = 320
+
+_PAYLOAD = {"channel": {"alternatives": [{"transcript": "hello baymax " * 40, "words": [{"w": i} for i in range(200)]}]}}
+
+
+def _burn(stop: threading.Event) -> None:
+    while not stop.is_set():
+        json.loads(json.dumps(_PAYLOAD))
+
+
+def _jitter_ms(stamps: np.ndarray) -> np.ndarray:
+    if len(stamps) < 3:
+        return np.zeros(1)
+    period = np.diff(stamps[:, 0]) / SAMPLE_RATE
+    return np.abs(np.diff(stamps[:, 1]) - period) * 1000.0
+
+
+def _with_load(threads: int, body):
+    stop = threading.Event()
+    workers = [threading.Thread(target=_burn, args=(stop,), daemon=True) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    try:
+        return body()
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+
+def in_process(seconds: float, threads: int) -> np.ndarray:
+    capacity = int(SAMPLE_RATE * (seconds + 1))
+    ring = SharedRing.create(RingSpec(capacity, 1, capacity // BLOCK + 1))
+    done = threading.Event()
+    source = SyntheticSource(SAMPLE_RATE)
+    source.start_stream()
+    capture = threading.Thread(target=run_capture, args=(ring, source, BLOCK), kwargs={"stop": done.is_set})
+
+    def body():
+        capture.start()
+        time.sleep(seconds)
+        done.set()
+        capture.join()
+        blocks = int(ring.header[1])
+        return ring.stamps[:blocks].copy()
+
+    stamps = _with_load(threads, body)
+    ring.close()
+    return _jitter_ms(stamps)
+
+
+def out_of_process(seconds: float, threads: int) -> np.ndarray:
+    capture = SharedMemoryCapture(
+        SAMPLE_RATE, capacity_seconds=seconds + 1, block_frames=BLOCK, source_factory=SyntheticSource
+    )
+    capture.start_stream()
+    capture.read(BLOCK, timeout=20.0)  # wait for the child to come up
+
+    def body():
+        time.sleep(seconds)
+        return capture.capture_stamps()
+
+    stamps = _with_load(threads, body)
+    capture.stop_stream()
+    return _jitter_ms(stamps)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--load-threads", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'capture':<16}{'load':>6}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for load in sorted({0, args.load_threads}):
+        for name, runner in (("in-process", in_process), ("shm child", out_of_process)):
+            jitter = runner(args.seconds, load)
+            print(
+                f"{name:<16}{load:>6}{np.percentile(jitter, 50):>9.2f}"
+                f"{np.percentile(jitter, 99):>9.2f}{jitter.max():>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Event bus cost and control-event latency under a transcript flood.
+
+Publishes `--events` transcripts through `core.events.EventBus` (one queued
+lane, a subscriber) and compares the per-event cost with the lock + deque
+the state manager used before. Then a producer thread floods the transcript
+lane while SLEEP events are published every few milliseconds, and a consumer
+drains in batches of `--batch`: the control lane is served first, so SLEEP
+latency stays flat however deep the transcript backlog gets.
+
+    python3 -m benchmarks.event_bus_bench --events 200000 --batch 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections import deque
+
+from core.events import CONTROL, TRANSCRIPT, EventBus, TranscriptEvent, WakeEvent, WakeEventType
+
+
+def _per_event_ns(events: int) -> tuple:
+    event = TranscriptEvent(text="hello", is_final=True, should_process=True)
+
+    lock, queue = threading.Lock(), deque()
+    started = time.perf_counter()
+    for _ in range(events):
+        with lock:
+            queue.append(event)
+        with lock:
+            queue.popleft()
+    baseline = (time.perf_counter() - started) / events * 1e9
+
+    bus = EventBus(queued=(TRANSCRIPT,))
+    bus.subscribe(TRANSCRIPT, lambda _event: None)
+    started = time.perf_counter()
+    for _ in range(events):
+        bus.publish(TRANSCRIPT, event)
+        bus.pop(TRANSCRIPT)
+    single = (time.perf_counter() - started) / events * 1e9
+
+    started = time.perf_counter()
+    for _ in range(events // 64):
+        for _ in range(64):
+            bus.publish(TRANSCRIPT, event)
+        bus.drain(max_items=64)
+    batched = (time.perf_counter() - started) / (events // 64 * 64) * 1e9
+    return baseline, single, batched
+
+
+def _control_latency(seconds: float, batch: int) -> dict:
+    bus = EventBus(queued=(CONTROL, TRANSCRIPT))
+    stop = threading.Event()
+
+    def flood() -> None:
+        while not stop.is_set():
+            for _ in range(256):
+                bus.publish(TRANSCRIPT, TranscriptEvent(text="um", is_final=True, should_process=True))
+            time.sleep(0)
+
+    def control() -> None:
+        while not stop.is_set():
+            bus.publish(CONTROL, WakeEvent(WakeEventType.SLEEP, "goodbye"))
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=flood, daemon=True), threading.Thread(target=control, daemon=True)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if not bus.drain(max_items=batch):
+            time.sleep(0.001)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return bus.stats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EventBus overhead and control-lane latency")
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--seconds", type=float, default=3.0, help="flood duration")
+    parser.add_argument("--batch", type=int, default=32, help="events per drain")
+    args = parser.parse_args()
+
+    baseline, single, batched = _per_event_ns(args.events)
+    print(f"lock+deque   {baseline:7.0f} ns/event")
+    print(f"bus pop      {single:7.0f} ns/event")
+    print(f"bus drain    {batched:7.0f} ns/event (batches of 64)")
+
+    stats = _control_latency(args.seconds, args.batch)
+    for topic in ("control", "transcript"):
+        row = stats[topic]
+        print(
+            f"{topic:<10} published {row['published']:>8}  dropped {row['dropped']:>8}  "
+            f"latency avg {row['latency_avg_ms']:6.2f} ms  max {row['latency_max_ms']:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Framing benchmark: messages/s, sender CPU and capture-to-wire latency per mode.
+
+A real-time synthetic source stands in for the microphone; the sender loop
+mirrors `DeepgramStreamingService._read_chunk` and injects periodic stalls
+(network hiccups, GC pauses) to exercise backlog coalescing.
+
+    python3 -m benchmarks.framing_bench --seconds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from audio.framing import FramingMode, FramingPolicy
+
+SAMPLE_RATE = 16000
+
+
+class _RealtimeSource:
+    """Produces int16 frames at wall-clock rate, like a blocking PortAudio stream."""
+
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter()
+        self._consumed = 0
+
+    def pending_frames(self) -> int:
+        return int((time.perf_counter() - self._t0) * SAMPLE_RATE) - self._consumed
+
+    def read_audio_chunk(self, frames: int) -> bytes:
+        ready_at = self._t0 + (self._consumed + frames) / SAMPLE_RATE
+        delay = ready_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._consumed += frames
+        return bytes(frames * 2)
+
+    def capture_time(self, frame_index: int) -> float:
+        return self._t0 + frame_index / SAMPLE_RATE
+
+
+def _run(policy: Optional[FramingPolicy], seconds: float, stall_every: float, stall: float):
+    source = _RealtimeSource()
+    latencies: List[float] = []
+    messages = 0
+    consumed = 0
+    next_stall = stall_every
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    while time.perf_counter() - wall_start < seconds:
+        if policy is None:
+            size = 1024
+        else:
+            size = policy.next_read_size(source.pending_frames())
+        chunk = source.read_audio_chunk(size)
+        # Stand-in for websocket framing work on each send.
+        _ = bytes(chunk)
+        sent_at = time.perf_counter()
+        middle = source.capture_time(consumed + size // 2)
+        latencies.append(sent_at - middle)
+        consumed += size
+        messages += 1
+
+        if stall and sent_at - wall_start >= next_stall:
+            time.sleep(stall)
+            next_stall += stall_every
+
+    elapsed = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return messages / elapsed, cpu / elapsed * 100.0, np.array(latencies) * 1000.0
+
+
+def run(seconds: float, stall_every: float, stall: float) -> None:
+    scenarios = [("fixed-1024 (legacy)", None)]
+    for mode in FramingMode:
+        policy = FramingPolicy(SAMPLE_RATE)
+        policy.mode = mode
+        scenarios.append((f"{mode.value}", policy))
+    no_coalesce = FramingPolicy(SAMPLE_RATE, max_coalesce=1)
+    scenarios.append(("active, no coalesce", no_coalesce))
+
+    print(f"{'mode':<22}{'msgs/s':>8}{'cpu %':>8}{'lat p50 ms':>12}{'lat p99 ms':>12}")
+    for name, policy in scenarios:
+        rate, cpu, latency = _run(policy, seconds, stall_every, stall)
+        print(
+            f"{name:<22}{rate:>8.1f}{cpu:>8.2f}"
+            f"{np.percentile(latency, 50):>12.1f}{np.percentile(latency, 99):>12.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--stall-every", type=float, default=1.0)
+    parser.add_argument("--stall-ms", type=float, default=150.0)
+    args = parser.parse_args()
+    run(args.seconds, args.stall_every, args.stall_ms / 1000.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Keyword-spotter evaluation: detection rate/latency, false accepts per hour, RTF.
+
+Positive clips each contain the wake phrase once; latency is measured from
+the end of the phrase (voiced region) to the trigger. Negative audio should
+contain no wake phrase; every trigger there is a false accept. `--synthetic`
+generates tone-sequence "words" so the harness runs without recordings.
+
+    python3 -m benchmarks.kws_eval --model models/hey_baymax.npz --positives pos/ --negatives neg/
+    python3 -m benchmarks.kws_eval --synthetic --negative-minutes 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from audio.recorder import read_wav
+from wakeword.kws import KeywordModel, KeywordSpotter, enroll, voiced_bounds
+
+SAMPLE_RATE = 16000
+CHUNK = 1024
+
+
+def _tone_word(trajectory, seconds: float, rng, stretch: float = 1.0, amplitude: float = 3000.0) -> np.ndarray:
+    count = int(seconds * stretch * SAMPLE_RATE)
+    freq = np.interp(np.linspace(0, 1, count), np.linspace(0, 1, len(trajectory)), trajectory)
+    phase = 2 * np.pi * np.cumsum(freq) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    ramp = np.minimum(1.0, np.minimum(np.arange(count), count - np.arange(count)) / (0.03 * SAMPLE_RATE))
+    return voiced * ramp * amplitude + rng.standard_normal(count) * 100
+
+
+def synthetic_corpus(negative_minutes: float, positives: int = 20):
+    rng = np.random.default_rng(0)
+    keyword = [250, 350, 300, 500, 700, 450, 300]
+    pad = lambda: rng.standard_normal(int(0.3 * SAMPLE_RATE)) * 60  # noqa: E731
+    enroll_clips = [
+        np.concatenate([pad(), _tone_word(keyword, 0.7, rng, s), pad()]).astype(np.int16) for s in (0.9, 1.0, 1.1)
+    ]
+    positive_clips = [
+        np.concatenate([pad(), pad(), _tone_word(keyword, 0.7, rng, rng.uniform(0.85, 1.15)), pad()]).astype(np.int16)
+        for _ in range(positives)
+    ]
+    parts, total = [], 0
+    while total < negative_minutes * 60 * SAMPLE_RATE:
+        if rng.random() < 0.5:
+            piece = _tone_word(list(rng.uniform(150, 800, 7)), rng.uniform(0.3, 1.2), rng)
+        else:
+            piece = rng.standard_normal(int(rng.uniform(0.2, 1.5) * SAMPLE_RATE)) * rng.uniform(50, 600)
+        parts.append(piece)
+        total += len(piece)
+    negatives = [np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)]
+    return enroll_clips, positive_clips, negatives
+
+
+def _stream(spotter: KeywordSpotter, samples: np.ndarray) -> Tuple[List[float], float]:
+    """Feed `samples` in mic-sized chunks; return trigger times and processing seconds."""
+    triggers, spent = [], 0.0
+    for start in range(0, len(samples), CHUNK):
+        began = time.perf_counter()
+        fired = spotter.detect(samples[start:start + CHUNK].tobytes())
+        spent += time.perf_counter() - began
+        if fired:
+            triggers.append(min(start + CHUNK, len(samples)) / SAMPLE_RATE)
+    return triggers, spent
+
+
+def _keyword_end(samples: np.ndarray) -> float:
+    return voiced_bounds(samples, SAMPLE_RATE)[1] / SAMPLE_RATE
+
+
+def evaluate(model: KeywordModel, positives: List[np.ndarray], negatives: List[np.ndarray]) -> None:
+    latencies, detected, spent, audio = [], 0, 0.0, 0.0
+    for clip in positives:
+        spotter = KeywordSpotter(model)
+        triggers, cost = _stream(spotter, clip)
+        spent += cost
+        audio += len(clip) / SAMPLE_RATE
+        if triggers:
+            detected += 1
+            latencies.append((triggers[0] - _keyword_end(clip)) * 1000.0)
+
+    false_accepts, negative_seconds = 0, 0.0
+    for samples in negatives:
+        spotter = KeywordSpotter(model)
+        triggers, cost = _stream(spotter, samples)
+        false_accepts += len(triggers)
+        negative_seconds += len(samples) / SAMPLE_RATE
+        spent += cost
+        audio += len(samples) / SAMPLE_RATE
+
+    print(f"detection rate     {detected}/{len(positives)}")
+    if latencies:
+        print(f"latency p50 / p95  {np.percentile(latencies, 50):.0f} / {np.percentile(latencies, 95):.0f} ms after phrase end")
+    hours = max(negative_seconds / 3600.0, 1e-9)
+    print(f"false accepts      {false_accepts} in {negative_seconds / 60:.1f} min ({false_accepts / hours:.1f}/hour)")
+    print(f"real-time factor   {spent / max(audio, 1e-9):.4f}")
+
+
+def _load_dir(path: str) -> List[np.ndarray]:
+    clips = []
+    for name in sorted(glob.glob(os.path.join(path, "*.wav"))):
+        with open(name, "rb") as handle:
+            clips.append(read_wav(handle.read())[0])
+    return clips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model")
+    parser.add_argument("--positives")
+    parser.add_argument("--negatives")
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--negative-minutes", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        enroll_clips, positives, negatives = synthetic_corpus(args.negative_minutes)
+        model = enroll(enroll_clips, SAMPLE_RATE)
+    else:
+        if not (args.model and args.positives and args.negatives):
+            parser.error("--model, --positives and --negatives are required without --synthetic")
+        model = KeywordModel.load(args.model)
+        positives, negatives = _load_dir(args.positives), _load_dir(args.negatives)
+    evaluate(model, positives, negatives)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Long-form benchmark: wall time of chunked parallel uploads vs one request.
+
+Synthesizes a recording of speech-like bursts separated by pauses and
+transcribes it against the local Deepgram stand-in, whose latency grows with
+audio length like a real upload + decode.
+
+    python3 -m benchmarks.long_form_bench --minutes 10 --per-second 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from audio.recorder import encode_wav
+from stt.deepgram_http import DeepgramHTTPClient
+from stt.long_form import LongFormTranscriber
+from stt.standin_server import StandInDeepgramServer
+
+SAMPLE_RATE = 16000
+
+
+def _synthesize(minutes: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    parts = []
+    total = 0
+    while total < minutes * 60 * SAMPLE_RATE:
+        speech = rng.standard_normal(int(rng.uniform(2.0, 8.0) * SAMPLE_RATE)) * 3000
+        pause = rng.standard_normal(int(rng.uniform(0.4, 1.2) * SAMPLE_RATE)) * 20
+        parts.extend((speech, pause))
+        total += len(speech) + len(pause)
+    return np.concatenate(parts).astype(np.int16)
+
+
+def run(minutes: float, latency: float, per_second: float, chunk_counts) -> None:
+    samples = _synthesize(minutes)
+    audio = encode_wav(samples, SAMPLE_RATE)
+    duration = len(samples) / SAMPLE_RATE
+
+    with StandInDeepgramServer(latency=latency, latency_per_audio_second=per_second) as server:
+        client = DeepgramHTTPClient("bench", base_url=server.base_url)
+
+        start = time.perf_counter()
+        client.transcribe_bytes(audio)
+        baseline = time.perf_counter() - start
+
+        print(f"{duration:.0f}s of audio; single request {baseline:.2f}s")
+        print(f"{'target chunks':>14}{'actual':>8}{'wall s':>9}{'speedup':>9}")
+        for count in chunk_counts:
+            target = duration / count
+            transcriber = LongFormTranscriber(
+                client, workers=count, target_seconds=target, max_seconds=target * 2
+            )
+            start = time.perf_counter()
+            result = transcriber.transcribe(audio)
+            elapsed = time.perf_counter() - start
+            print(f"{count:>14}{len(result.segments):>8}{elapsed:>9.2f}{baseline / elapsed:>8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.2, help="fixed seconds per request")
+    parser.add_argument("--per-second", type=float, default=0.01, help="seconds per audio second")
+    parser.add_argument("--chunks", default="1,2,4,8,16")
+    args = parser.parse_args()
+    run(args.minutes, args.latency, args.per_second, [int(c) for c in args.chunks.split(",")])
+
+
+if __name__ == "__main__":
+    main()
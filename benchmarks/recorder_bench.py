@@ -0,0 +1,115 @@
+"""Recorder benchmark: capture gaps and CPU per recorded second.
+
+Compares the legacy per-chunk `sd.rec()` loop with the persistent-stream
+`EarlyStopRecorder`. With `--device` both run against the real microphone and
+gaps are measured (wall time not covered by audio for the legacy loop, ADC
+timestamp discontinuities for the stream). Without it, a synthetic real-time
+source measures the processing cost only.
+
+    python3 -m benchmarks.recorder_bench --seconds 5
+    python3 -m benchmarks.recorder_bench --seconds 5 --device
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+from typing import List, Tuple
+
+import numpy as np
+
+from audio.recorder import EarlyStopRecorder
+
+SAMPLE_RATE = 16000
+CHUNK = int(0.1 * SAMPLE_RATE)
+
+
+def _legacy_process(chunks: List[np.ndarray]) -> np.ndarray:
+    collected = []
+    for chunk in chunks:
+        collected.append(chunk)
+        rms = np.sqrt(np.mean(chunk.astype(np.float32) ** 2))
+        print(f"[Audio] RMS: {rms:.0f}")
+    return np.concatenate(collected)
+
+
+def synthetic(seconds: float, block: int) -> None:
+    rng = np.random.default_rng(0)
+    signal = (rng.standard_normal((int(seconds * SAMPLE_RATE), 1)) * 2000).astype(np.int16)
+
+    sink = io.StringIO()
+    cpu = time.process_time()
+    with redirect_stdout(sink):
+        for _ in range(20):
+            _legacy_process([signal[i:i + CHUNK].copy() for i in range(0, len(signal), CHUNK)])
+    legacy_cpu = (time.process_time() - cpu) / 20
+
+    cpu = time.process_time()
+    for _ in range(20):
+        recorder = EarlyStopRecorder(SAMPLE_RATE, 1, seconds)
+        for start in range(0, len(signal), block):
+            recorder.write(signal[start:start + block])
+            recorder.process_ready()
+    stream_cpu = (time.process_time() - cpu) / 20
+
+    print(f"{'recorder':<18}{'cpu ms / rec s':>16}")
+    print(f"{'legacy sd.rec':<18}{legacy_cpu / seconds * 1000:>16.3f}")
+    print(f"{'persistent stream':<18}{stream_cpu / seconds * 1000:>16.3f}")
+    print("(gaps need --device; the synthetic source has none by construction)")
+
+
+def _device_legacy(sd, seconds: float) -> Tuple[float, float]:
+    gaps = 0.0
+    cpu = time.process_time()
+    for _ in range(int(seconds / 0.1)):
+        began = time.perf_counter()
+        sd.rec(CHUNK, samplerate=SAMPLE_RATE, channels=1, dtype="int16")
+        sd.wait()
+        gaps += max(time.perf_counter() - began - 0.1, 0.0)
+    return gaps, time.process_time() - cpu
+
+
+def _device_stream(sd, seconds: float) -> Tuple[float, float]:
+    recorder = EarlyStopRecorder(SAMPLE_RATE, 1, seconds, silence_chunks_to_stop=10**9)
+    last_end = [None]
+    gaps = [0.0]
+
+    def callback(indata, frames, time_info, status):
+        adc = time_info.inputBufferAdcTime
+        if last_end[0] is not None and adc:
+            gaps[0] += max(adc - last_end[0], 0.0)
+        last_end[0] = adc + frames / SAMPLE_RATE if adc else None
+        recorder.callback(indata, frames, time_info, status)
+
+    cpu = time.process_time()
+    with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, dtype="int16", blocksize=CHUNK, callback=callback):
+        while not recorder.process_ready():
+            recorder.wait(0.1)
+    return gaps[0], time.process_time() - cpu
+
+
+def device(seconds: float) -> None:
+    import sounddevice as sd
+
+    print(f"{'recorder':<18}{'gap ms / rec s':>16}{'cpu ms / rec s':>16}")
+    for name, runner in (("legacy sd.rec", _device_legacy), ("persistent stream", _device_stream)):
+        gaps, cpu = runner(sd, seconds)
+        print(f"{name:<18}{gaps / seconds * 1000:>16.1f}{cpu / seconds * 1000:>16.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--block", type=int, default=1600, help="synthetic callback block size")
+    parser.add_argument("--device", action="store_true", help="measure against the real microphone")
+    args = parser.parse_args()
+    if args.device:
+        device(args.seconds)
+    else:
+        synthetic(args.seconds, args.block)
+
+
+if __name__ == "__main__":
+    main()
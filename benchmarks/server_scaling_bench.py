@@ -0,0 +1,124 @@
+"""Scaling of the sharded server from 1 to N worker processes.
+
+Starts `server.supervisor.Supervisor` with each worker count in turn and
+drives it with `server.client_sim` in a child process. Devices stream
+silence in real time and stay asleep (see `server_sessions_bench`); the STT
+stream is the same local stand-in. For each run it reports how evenly the
+hash ring spread the sessions, total worker CPU and the busiest worker's
+CPU: the busiest worker is what saturates first, so sessions divided by its
+core fraction is the capacity of that worker count, assuming one core per
+worker. Worker CPU is read from /proc (Linux).
+
+    python3 -m benchmarks.server_scaling_bench --processes 1 2 4 --sessions 400 --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from server.session import SharedResources
+from server.supervisor import Supervisor
+
+_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def offline_resources(store):
+    """No provider clients: idle devices never reach the LLM or TTS."""
+    return SharedResources(llm_factory=lambda: None, tts=object(), store=store)
+
+
+def _cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as handle:
+        fields = handle.read().rpartition(")")[2].split()
+    return (int(fields[11]) + int(fields[12])) / _TICKS
+
+
+def _measure(processes: int, sessions: int, seconds: float, warmup: float, threads: int, frame_ms: float) -> dict:
+    tmp = tempfile.TemporaryDirectory()
+    supervisor = Supervisor(
+        port=0,
+        processes=processes,
+        store_path=os.path.join(tmp.name, "shared.db"),
+        stream_factory="benchmarks.server_sessions_bench:DrainStream",
+        resources=f"{__name__}:offline_resources",
+        threads=threads,
+        audio_root=tmp.name,
+    )
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(supervisor.start(), loop).result(120.0)
+
+    client = subprocess.Popen(
+        [
+            sys.executable, "-m", "server.client_sim",
+            "--url", f"ws://127.0.0.1:{supervisor.port}",
+            "--sessions", str(sessions),
+            "--seconds", str(warmup + seconds + 1.0),
+            "--frame-ms", str(frame_ms),
+            "--ramp", str(min(warmup / 2, 5.0)),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        time.sleep(warmup)
+        pids = [worker.process.pid for worker in supervisor.workers]
+        before = [_cpu_seconds(pid) for pid in pids]
+        wall_before = time.monotonic()
+        time.sleep(seconds)
+        used = [_cpu_seconds(pid) - start for pid, start in zip(pids, before)]
+        wall = time.monotonic() - wall_before
+        routed = [worker.routed for worker in supervisor.workers]
+    finally:
+        client.wait(timeout=warmup + seconds + 30.0)
+        asyncio.run_coroutine_threadsafe(supervisor.stop(), loop).result(60.0)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5.0)
+        tmp.cleanup()
+
+    busiest = max(used) / wall
+    return {
+        "processes": processes,
+        "sessions": sum(routed),
+        "spread": f"{min(routed)}-{max(routed)}",
+        "cpu_pct": 100.0 * sum(used) / wall,
+        "busiest_pct": 100.0 * busiest,
+        "capacity": sum(routed) / busiest if busiest else float("inf"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded server scaling from 1 to N worker processes")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0, help="measurement window")
+    parser.add_argument("--warmup", type=float, default=8.0, help="worker start + connect + suspend time")
+    parser.add_argument("--suspend-after", type=float, default=1.0)
+    parser.add_argument("--frame-ms", type=float, default=100.0)
+    parser.add_argument("--threads", type=int, default=16, help="step threads per worker")
+    args = parser.parse_args()
+
+    # Workers are spawned processes: they read settings from the environment.
+    os.environ["SERVER_STREAM_SUSPEND_AFTER"] = str(args.suspend_after)
+    os.environ.pop("BAYMAX_SKIP_AUDIO", None)
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'sessions':>8} {'per worker':>10} {'worker cpu':>10} {'busiest':>8} {'capacity':>9}")
+    for processes in args.processes:
+        row = _measure(processes, args.sessions, args.seconds, args.warmup, args.threads, args.frame_ms)
+        print(
+            f"{row['processes']:>7} {row['sessions']:>8} {row['spread']:>10} {row['cpu_pct']:>9.1f}% "
+            f"{row['busiest_pct']:>7.1f}% {row['capacity']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Idle sessions per core for the multi-session server.
+
+Starts `BaymaxServer` in this process and drives it with `server.client_sim`
+in a child process, so this process's CPU time is the server's alone. Every
+device streams silence in real time and stays asleep: after
+`--suspend-after` seconds (`SERVER_STREAM_SUSPEND_AFTER`) its STT stream
+suspends and the wake gate watches the remote mic locally, which is the
+steady state of an idle fleet. The idle figures hold only with suspension
+on: with `--suspend-after 0` every session keeps its stream, and its sender
+thread, for as long as it is connected.
+
+`--stream standin` (default) is a local stand-in that drains the mic on a
+thread while connected, as the Deepgram sender does, and stops when
+suspended. `--stream deepgram` uses the server's real per-session Deepgram
+stream (needs `DEEPGRAM_API_KEY` and network access).
+
+    python3 -m benchmarks.server_sessions_bench --sessions 100 200 400 --seconds 20
+    python3 -m benchmarks.server_sessions_bench --sessions 100 --suspend-after 0
+    python3 -m benchmarks.server_sessions_bench --sessions 50 --stream deepgram --warmup 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from config_app.settings import settings
+from server.app import BaymaxServer, deepgram_stream_factory
+from server.session import SharedResources
+
+
+class DrainStream:
+    """Deepgram stand-in: reads the mic while connected, nothing while suspended."""
+
+    def __init__(self, mic) -> None:
+        self._mic = mic
+        self._sending = threading.Event()
+        self._thread = None
+
+    def add_wake_listener(self, callback):
+        pass
+
+    def add_transcript_listener(self, callback):
+        pass
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+    def start(self) -> None:
+        self._sending.set()
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._sending.clear()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+    def suspend(self) -> None:
+        self.stop()
+
+    def resume(self, preroll=()) -> bool:
+        self.start()
+        return True
+
+    def _drain(self) -> None:
+        while self._sending.is_set():
+            self._mic.read_audio_chunk()
+
+
+STREAMS = {"standin": DrainStream, "deepgram": deepgram_stream_factory}
+
+
+def _measure(sessions: int, seconds: float, warmup: float, workers: int, frame_ms: float, stream: str) -> dict:
+    tmp = tempfile.TemporaryDirectory()
+    shared = SharedResources(llm_factory=lambda: None, tts=object())
+    server = BaymaxServer(
+        port=0, shared=shared, stream_factory=STREAMS[stream], workers=workers, audio_root=tmp.name
+    )
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(10.0)
+
+    client = subprocess.Popen(
+        [
+            sys.executable, "-m", "server.client_sim",
+            "--url", f"ws://127.0.0.1:{server.port}",
+            "--sessions", str(sessions),
+            "--seconds", str(warmup + seconds + 1.0),
+            "--frame-ms", str(frame_ms),
+            "--ramp", str(min(warmup / 2, 5.0)),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        time.sleep(warmup)
+        connected = len(server.sessions)
+        suspended = sum(1 for s in list(server.sessions.values()) if getattr(s.manager.stream_suspender, "suspended", False))
+        steps_before = sum(s.steps for s in list(server.sessions.values()))
+        cpu_before, wall_before = time.process_time(), time.monotonic()
+        time.sleep(seconds)
+        cpu = time.process_time() - cpu_before
+        wall = time.monotonic() - wall_before
+        steps = sum(s.steps for s in list(server.sessions.values())) - steps_before
+        threads = threading.active_count()
+    finally:
+        client.wait(timeout=warmup + seconds + 30.0)
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result(30.0)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5.0)
+        tmp.cleanup()
+
+    core_fraction = cpu / wall
+    return {
+        "sessions": connected,
+        "suspended": suspended,
+        "cpu_pct": 100.0 * core_fraction,
+        "per_core": connected / core_fraction if core_fraction else float("inf"),
+        "steps_per_s": steps / wall,
+        "threads": threads,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Idle sessions per core for server mode")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--seconds", type=float, default=10.0, help="measurement window")
+    parser.add_argument("--warmup", type=float, default=6.0, help="connect + suspend time before measuring")
+    parser.add_argument(
+        "--suspend-after", type=float, default=1.0, help="0 keeps every stream open (SERVER_STREAM_SUSPEND_AFTER=0)"
+    )
+    parser.add_argument("--stream", choices=sorted(STREAMS), default="standin")
+    parser.add_argument("--frame-ms", type=float, default=100.0)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    args = parser.parse_args()
+
+    settings.SERVER_STREAM_SUSPEND_AFTER = args.suspend_after
+    os.environ.pop("BAYMAX_SKIP_AUDIO", None)
+    print(f"stream {args.stream}, suspend after {args.suspend_after:g}s")
+    print(f"{'sessions':>8} {'suspended':>9} {'server cpu':>10} {'sessions/core':>13} {'steps/s':>8} {'threads':>8}")
+    for count in args.sessions:
+        row = _measure(count, args.seconds, args.warmup, args.workers, args.frame_ms, args.stream)
+        print(
+            f"{row['sessions']:>8} {row['suspended']:>9} {row['cpu_pct']:>9.1f}% "
+            f"{row['per_core']:>13.0f} {row['steps_per_s']:>8.0f} {row['threads']:>8}"
+        )
+    print(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""State-loop reaction latency and idle wakeups: polling vs event-driven.
+
+Runs the real `StateManager` loop on a thread against a simulated stream.
+Latency is measured from a stream callback (wake event while asleep, final
+transcript while listening) to the resulting state transition. Idle wakeups
+count how often the loop ticks per second with nothing happening.
+
+    python3 -m benchmarks.state_loop_bench --trials 40 --idle-seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+
+from app_states.state_manager import StateManager
+from config_app.settings import settings
+from core.events import TranscriptEvent, WakeEvent, WakeEventType
+
+
+class SimulatedStream:
+    def __init__(self):
+        self._wake, self._transcript = [], []
+
+    def add_wake_listener(self, callback):
+        self._wake.append(callback)
+
+    def add_transcript_listener(self, callback):
+        self._transcript.append(callback)
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+    def wake(self) -> None:
+        for callback in self._wake:
+            callback(WakeEvent(WakeEventType.WAKE, "hey baymax"))
+
+    def transcript(self, text: str) -> None:
+        for callback in self._transcript:
+            callback(TranscriptEvent(text=text, is_final=True, should_process=True))
+
+
+class TimedManager(StateManager):
+    """Records when each transition happens and how many ticks the loop runs."""
+
+    def __init__(self, *args, **kwargs):
+        self.ticks = 0
+        self.transitions = []
+        super().__init__(*args, **kwargs)
+
+    def set_state(self, new_state):
+        if new_state is not self.current_state:
+            self.transitions.append((new_state, time.monotonic()))
+        super().set_state(new_state)
+
+    def update(self, user_input=None):
+        self.ticks += 1
+        super().update(user_input)
+
+
+class _Loop:
+    def __init__(self, manager: TimedManager):
+        self.manager = manager
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while self.running:
+            self.manager.update()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_exc):
+        self.running = False
+        self.manager.wake_loop()
+        self.thread.join(timeout=10.0)
+
+
+def _manager(start_state: str) -> tuple:
+    stream = SimulatedStream()
+    manager = TimedManager(stt_stream=stream)
+    manager.set_state(getattr(manager, start_state))
+    manager.wait_for_event(0.0)
+    manager.transitions.clear()
+    return manager, stream
+
+
+def _latency(start_state: str, target: str, fire) -> float:
+    manager, stream = _manager(start_state)
+    with _Loop(manager):
+        time.sleep(random.uniform(0.05, 0.35))
+        fired = time.monotonic()
+        fire(stream)
+        deadline = fired + 10.0
+        while time.monotonic() < deadline:
+            hits = [at for state, at in manager.transitions if state is getattr(manager, target)]
+            if hits:
+                return hits[0] - fired
+            time.sleep(0.001)
+    raise RuntimeError(f"no transition to {target}")
+
+
+def _idle_rate(seconds: float) -> float:
+    manager, _stream = _manager("sleep_state")
+    with _Loop(manager):
+        before = manager.ticks
+        time.sleep(seconds)
+        ticks = manager.ticks - before
+    return ticks / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=40)
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+    random.seed(0)
+
+    cases = (
+        ("wake -> WakeState", "sleep_state", "wake_state", lambda stream: stream.wake()),
+        ("transcript -> Processing", "listening_state", "processing_state",
+         lambda stream: stream.transcript("how are you")),
+    )
+    for mode in ("poll", "event"):
+        settings.STATE_LOOP_MODE = mode
+        print(f"--- {mode} ---")
+        for label, start, target, fire in cases:
+            samples = sorted(_latency(start, target, fire) * 1000.0 for _ in range(args.trials))
+            p95 = samples[int(0.95 * (len(samples) - 1))]
+            print(f"{label:<26} p50 {statistics.median(samples):6.1f} ms  p95 {p95:6.1f} ms")
+        print(f"{'idle loop wakeups':<26} {_idle_rate(args.idle_seconds):6.2f} /s while asleep")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Shared timer heap vs one polling idle thread per session.
+
+Arms an idle timer for each of `--sessions` sessions on one
+`TimerScheduler` (re-armed whenever it fires) and lets it run for
+`--seconds`; the baseline runs one thread per session that wakes every
+`--poll` seconds to compare timestamps, like the old `IdleMonitor`. Reports
+process CPU, threads used, timers fired and how late: the heap fires at the
+deadline, polling is late by half the poll interval on average. Then times
+the activity path: pushing an idle timer back and re-arming a mute window.
+
+    python3 -m benchmarks.timer_bench --sessions 2000 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+
+from core.timers import TimedFlag, TimerScheduler
+
+
+def _run_heap(sessions: int, seconds: float, idle_after: float) -> dict:
+    timers = TimerScheduler()
+    handles = []
+    fired = [0]
+
+    def arm(index: int) -> None:
+        def on_idle() -> None:
+            fired[0] += 1
+            handles[index].reschedule(idle_after)
+
+        handles.append(timers.call_later(random.uniform(0.0, idle_after), on_idle))
+
+    for index in range(sessions):
+        arm(index)
+    cpu_start = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+
+    # Activity: push idle timers back and re-arm mute windows, as transcripts and replies do.
+    mutes = [TimedFlag(timers) for _ in range(sessions)]
+    pushes = 20000
+    started = time.perf_counter()
+    for step in range(pushes):
+        index = step % sessions
+        handles[index].reschedule(idle_after)
+        mutes[index].set_for(0.6)
+    per_op_us = (time.perf_counter() - started) / (2 * pushes) * 1e6
+    stats = timers.stats()
+    timers.stop()
+    return {"cpu": cpu, "threads": 1, "fired": fired[0], "per_op_us": per_op_us, **stats}
+
+
+def _run_polling(sessions: int, seconds: float, poll: float, idle_after: float) -> dict:
+    stop = threading.Event()
+    fired = [0]
+
+    def monitor(deadline: list) -> None:
+        while not stop.wait(poll):
+            if time.time() >= deadline[0]:
+                fired[0] += 1
+                deadline[0] = time.time() + idle_after
+
+    threads = []
+    for _ in range(sessions):
+        thread = threading.Thread(target=monitor, args=([time.time() + idle_after],), daemon=True)
+        thread.start()
+        threads.append(thread)
+    cpu_start = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {"cpu": cpu, "threads": sessions, "fired": fired[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Timer heap vs per-session polling threads")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--idle-after", type=float, default=2.0, help="idle threshold (s), short to see timers fire")
+    parser.add_argument("--poll", type=float, default=1.0, help="baseline poll interval (s)")
+    args = parser.parse_args()
+
+    heap = _run_heap(args.sessions, args.seconds, args.idle_after)
+    print(
+        f"heap     threads {heap['threads']:>5}  cpu {heap['cpu']:6.2f}s  fired {heap['fired']:>6}  "
+        f"late avg {heap['late_avg_ms']:6.2f} ms  max {heap['late_max_ms']:7.2f} ms"
+    )
+    print(f"activity {heap['per_op_us']:.2f} us per reschedule/mute, heap {heap['heap']} entries for {heap['pending']} timers")
+    polling = _run_polling(args.sessions, args.seconds, args.poll, args.idle_after)
+    print(
+        f"polling  threads {polling['threads']:>5}  cpu {polling['cpu']:6.2f}s  fired {polling['fired']:>6}  "
+        f"late avg ~{args.poll * 500:4.0f} ms  max ~{args.poll * 1000:5.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
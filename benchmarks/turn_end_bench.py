@@ -0,0 +1,173 @@
+"""Replay synthetic utterances through the local turn-end predictor.
+
+Reports end-of-speech-to-commit latency and the premature-cut rate (turns
+committed during a mid-utterance pause) for Deepgram endpointing alone and for
+a few predictor threshold settings.
+
+    python3 -m benchmarks.turn_end_bench --utterances 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from stt.turn_end import TurnDecision, TurnEndPredictor
+
+TICK = 0.02
+NETWORK_DELAY = 0.15
+FINALIZE_RTT = 0.12
+
+
+@dataclass
+class Utterance:
+    segments: List[Tuple[float, float]]
+    words: List[str]
+    punctuated: bool
+
+    @property
+    def end(self) -> float:
+        return self.segments[-1][1]
+
+
+@dataclass(order=True)
+class _NetEvent:
+    at: float
+    kind: str = field(compare=False)
+    text: str = field(compare=False, default="")
+    ends_turn: bool = field(compare=False, default=False)
+
+
+def _make_utterance(rng: random.Random) -> Utterance:
+    segments = []
+    t = 0.3
+    for index in range(rng.randint(1, 3)):
+        if index:
+            t += rng.uniform(0.15, 0.7)  # hesitation pause
+        length = rng.uniform(0.6, 2.0)
+        segments.append((t, t + length))
+        t += length
+    words = [f"w{i}" for i in range(int(sum(e - s for s, e in segments) / 0.3) + 1)]
+    return Utterance(segments, words, punctuated=rng.random() < 0.6)
+
+
+def _text_at(utt: Utterance, t: float, final: bool = False) -> str:
+    spoken = sum(max(min(e, t) - s, 0.0) for s, e in utt.segments)
+    total = sum(e - s for s, e in utt.segments)
+    count = max(int(len(utt.words) * spoken / total), 1)
+    text = " ".join(utt.words[:count])
+    if final and count == len(utt.words) and utt.punctuated:
+        text += "."
+    return text
+
+
+def _network_events(utt: Utterance, endpoint_s: float) -> List[_NetEvent]:
+    events: List[_NetEvent] = []
+    for s, e in utt.segments:
+        t = s + 0.15
+        while t < e:
+            events.append(_NetEvent(t + NETWORK_DELAY, "interim", _text_at(utt, t)))
+            t += 0.15
+    # Deepgram endpoints after `endpoint_s` of silence, including inside pauses.
+    for index, (_, e) in enumerate(utt.segments):
+        next_start = utt.segments[index + 1][0] if index + 1 < len(utt.segments) else None
+        if next_start is None or next_start - e > endpoint_s:
+            events.append(_NetEvent(e + endpoint_s + NETWORK_DELAY, "final", _text_at(utt, e, True), True))
+    return events
+
+
+def _replay(utt: Utterance, predictor: Optional[TurnEndPredictor], endpoint_s: float) -> Tuple[float, bool]:
+    """Return (commit latency after true end, premature) for one utterance."""
+    rng = np.random.default_rng(len(utt.words))
+    queue = _network_events(utt, endpoint_s)
+    heapq.heapify(queue)
+    finals_seen = 0
+    horizon = utt.end + endpoint_s + 2.0
+    t = 0.0
+    premature = False
+
+    while t < horizon:
+        while queue and queue[0].at <= t:
+            event = heapq.heappop(queue)
+            if predictor is None:
+                if event.kind == "final":
+                    if t < utt.end:
+                        premature = True
+                    else:
+                        return t - utt.end, premature
+                continue
+            if event.kind == "interim":
+                predictor.observe_interim(event.text, now=t)
+            else:
+                finals_seen += 1
+                predictor.observe_final(event.text, speech_final=event.ends_turn, now=t)
+
+        if predictor is not None:
+            speaking = any(s <= t < e for s, e in utt.segments)
+            amplitude = 2500.0 if speaking else 40.0
+            frame = (rng.normal(0, amplitude, int(16000 * TICK))).astype(np.int16)
+            predictor.observe_audio(frame.tobytes(), now=t)
+
+            decision = predictor.decide(now=t)
+            if decision is TurnDecision.FINALIZE:
+                predictor.mark_finalize_requested()
+                heapq.heappush(queue, _NetEvent(t + FINALIZE_RTT, "final", _text_at(utt, t, True), True))
+            elif decision is TurnDecision.COMMIT:
+                predictor.commit()
+                if t < utt.end:
+                    premature = True
+                else:
+                    return t - utt.end, premature
+
+        t += TICK
+
+    return horizon - utt.end, premature
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def run(utterances: int, endpoint_ms: float, seed: int) -> None:
+    rng = random.Random(seed)
+    corpus = [_make_utterance(rng) for _ in range(utterances)]
+    endpoint_s = endpoint_ms / 1000.0
+
+    configs = [
+        ("deepgram-only", None),
+        ("predictor-default", {}),
+        ("predictor-fast", {"silence_ms": 350, "stable_ms": 200, "commit_confidence": 0.75}),
+        ("predictor-safe", {"silence_ms": 700, "stable_ms": 400, "finalize_confidence": 0.7}),
+    ]
+
+    print(f"{'mode':<20}{'p50 ms':>9}{'p95 ms':>9}{'premature':>11}")
+    for name, kwargs in configs:
+        latencies: List[float] = []
+        cuts = 0
+        for utt in corpus:
+            predictor = TurnEndPredictor(**kwargs) if kwargs is not None else None
+            latency, premature = _replay(utt, predictor, endpoint_s)
+            latencies.append(latency * 1000.0)
+            cuts += int(premature)
+        print(
+            f"{name:<20}{_percentile(latencies, 50):>9.0f}{_percentile(latencies, 95):>9.0f}"
+            f"{cuts / len(corpus):>10.1%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--utterances", type=int, default=300)
+    parser.add_argument("--endpoint-ms", type=float, default=200.0)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    run(args.utterances, args.endpoint_ms, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Sequential vs staged turn handling: time to first audio, turn time, stage stats.
+
+Simulated LLM, TTS (fixed request latency plus per-word synthesis time) and
+playback (speech rate). The sequential path mirrors the synchronous states:
+generate, synthesize the whole reply, play it. The pipeline synthesizes
+sentence by sentence while earlier sentences play.
+
+    python3 -m benchmarks.turn_pipeline_bench --turns 5 --speed 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+
+from core.pipeline import TurnPipeline
+
+REPLY = (
+    "On a scale of one to ten, how would you rate your pain? "
+    "A headache can come from dehydration, so please drink some water. "
+    "Resting in a quiet, dark room may also help. "
+    "If the pain is severe or sudden, you should contact a doctor."
+)
+WORDS_PER_SECOND = 2.7
+
+
+class SimulatedLLM:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate(self, text: str) -> str:
+        time.sleep(self.latency)
+        return REPLY
+
+
+class SimulatedTTS:
+    def __init__(self, request_latency: float, per_word: float, speed: float):
+        self.request_latency = request_latency
+        self.per_word = per_word
+        self.speed = speed
+
+    def synthesize_to(self, text: str, path: str) -> float:
+        words = len(text.split())
+        time.sleep(self.request_latency + self.per_word * words)
+        return words / WORDS_PER_SECOND / self.speed
+
+
+class SimulatedPlayer:
+    def __init__(self):
+        self._ends_at = 0.0
+        self.durations = {}
+
+    def play(self, path: str) -> None:
+        self._ends_at = time.monotonic() + self.durations.get(path, 0.0)
+
+    def wait(self, timeout=None) -> bool:
+        remaining = self._ends_at - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(remaining, timeout if timeout is not None else remaining))
+        return time.monotonic() >= self._ends_at
+
+    def stop(self) -> None:
+        self._ends_at = 0.0
+
+
+class _RecordingTTS(SimulatedTTS):
+    """Lets the simulated player know how long each segment file 'plays'."""
+
+    def __init__(self, player: SimulatedPlayer, *args):
+        super().__init__(*args)
+        self.player = player
+
+    def synthesize_to(self, text: str, path: str) -> float:
+        duration = super().synthesize_to(text, path)
+        open(path, "wb").close()
+        self.player.durations[path] = duration
+        return duration
+
+
+def sequential_turn(llm, tts) -> tuple:
+    started = time.monotonic()
+    reply = llm.generate("I have a headache")
+    duration = tts.synthesize_to(reply, "")
+    first_audio = time.monotonic() - started
+    time.sleep(duration)
+    return first_audio, time.monotonic() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="TTS request latency per call")
+    parser.add_argument("--tts-per-word", type=float, default=0.04, help="synthesis seconds per word")
+    parser.add_argument("--speed", type=float, default=1.0, help="divide all simulated delays by this")
+    args = parser.parse_args()
+    scale = 1.0 / args.speed
+    llm = SimulatedLLM(args.llm_latency * scale)
+
+    rows = [sequential_turn(llm, SimulatedTTS(args.tts_latency * scale, args.tts_per_word * scale, args.speed))
+            for _ in range(args.turns)]
+    print(f"sequential  first audio {statistics.median(r[0] for r in rows) / scale:5.2f} s  "
+          f"turn {statistics.median(r[1] for r in rows) / scale:5.2f} s")
+
+    player = SimulatedPlayer()
+    tts = _RecordingTTS(player, args.tts_latency * scale, args.tts_per_word * scale, args.speed)
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = TurnPipeline(llm, tts, player, audio_dir=tmp)
+        pipeline.start()
+        rows = []
+        for _ in range(args.turns):
+            handle = pipeline.submit(text="I have a headache")
+            handle.done.wait()
+            rows.append((handle.first_audio_at - handle.submitted_at, time.monotonic() - handle.submitted_at))
+        stats = pipeline.stats()
+        pipeline.stop()
+    print(f"pipelined   first audio {statistics.median(r[0] for r in rows) / scale:5.2f} s  "
+          f"turn {statistics.median(r[1] for r in rows) / scale:5.2f} s")
+    for name, stage in stats.items():
+        print(f"  {name:<11} items {stage['items']:3d}  utilization {stage['utilization']:.2f}  "
+              f"queue wait p50/p95 {stage['queue_wait_p50_ms'] / 1000 / scale:.2f}/"
+              f"{stage['queue_wait_p95_ms'] / 1000 / scale:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Wake-to-answer latency for "Hey Baymax, <question>" with and without the fast path.
+
+Drives the real state machine with a simulated stream, LLM and TTS. Without
+the fast path the question is dropped on wake, the greeting is synthesized
+and played, and the user repeats the question; with it the question goes
+straight to the LLM. Latency runs from the wake utterance's final transcript
+to the first audio of the answer. `--speed` compresses all simulated delays
+(state-loop polling is not scaled, so keep it near 1 for realistic numbers).
+
+    python3 -m benchmarks.wake_query_bench --trials 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+from app_states.state_manager import StateManager
+from config_app.settings import settings
+from core.events import TranscriptEvent, WakeEvent, WakeEventType
+from stt.deepgram_live import extract_wake_query
+
+UTTERANCE = "Hey Baymax, what should I do about a headache?"
+WORDS_PER_SECOND = 2.7
+
+
+class SimulatedStream:
+    def __init__(self):
+        self._wake, self._transcript = [], []
+
+    def add_wake_listener(self, callback):
+        self._wake.append(callback)
+
+    def add_transcript_listener(self, callback):
+        self._transcript.append(callback)
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+    def final(self, text: str) -> None:
+        query = extract_wake_query(text)
+        if query or text.lower().startswith("hey baymax"):
+            for callback in self._wake:
+                callback(WakeEvent(WakeEventType.WAKE, text, query=query))
+        for callback in self._transcript:
+            callback(TranscriptEvent(text=text, is_final=True, should_process=True))
+
+
+class SimulatedLLM:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate(self, text: str) -> str:
+        time.sleep(self.latency)
+        return f"ANSWER:{text}"
+
+
+class SimulatedTTS:
+    """Blocks for synthesis + playback; records when the answer's first audio would start."""
+
+    output_path = "audio/output.wav"
+
+    def __init__(self, synth_latency: float, speed: float, on_spoken):
+        self.synth_latency = synth_latency
+        self.speed = speed
+        self.on_spoken = on_spoken
+        self.last_duration = 0.0
+        self.answer_at = None
+
+    def speak(self, text: str) -> None:
+        time.sleep(self.synth_latency)
+        if text.startswith("ANSWER:") and self.answer_at is None:
+            self.answer_at = time.monotonic()
+            return
+        self.last_duration = len(text.split()) / WORDS_PER_SECOND / self.speed
+        time.sleep(self.last_duration)
+        self.on_spoken(text)
+
+
+def run_trial(fast_path: bool, *, llm_latency: float, synth_latency: float, endpoint: float, speed: float) -> float:
+    settings.WAKE_QUERY_FAST_PATH = fast_path
+    stream = SimulatedStream()
+    question = extract_wake_query(UTTERANCE)
+
+    def on_spoken(_text):
+        # The user heard the greeting and asks again.
+        delay = len(question.split()) / WORDS_PER_SECOND / speed + endpoint
+        threading.Timer(delay, stream.final, args=(question,)).start()
+
+    tts = SimulatedTTS(synth_latency, speed, on_spoken)
+    manager = StateManager(tts=tts, llm=SimulatedLLM(llm_latency), stt_stream=stream)
+    started = time.monotonic()
+    stream.final(UTTERANCE)
+    while tts.answer_at is None and time.monotonic() - started < 30.0:
+        manager.update()
+    if tts.answer_at is None:
+        raise RuntimeError("no answer within 30 s")
+    return tts.answer_at - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--synth-latency", type=float, default=0.4, help="TTS time to first audio")
+    parser.add_argument("--endpoint", type=float, default=0.4, help="end of speech to final transcript")
+    parser.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+    delays = dict(llm_latency=args.llm_latency / args.speed, synth_latency=args.synth_latency / args.speed,
+                  endpoint=args.endpoint / args.speed, speed=args.speed)
+    for label, fast in (("greeting + repeat", False), ("fast path", True)):
+        samples = [run_trial(fast, **delays) * 1000.0 for _ in range(args.trials)]
+        print(f"{label:<18} wake-to-answer median {statistics.median(samples):7.0f} ms  "
+              f"(min {min(samples):.0f}, max {max(samples):.0f})")
+
+
+if __name__ == "__main__":
+    main()
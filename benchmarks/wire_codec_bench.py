@@ -0,0 +1,66 @@
+"""Benchmark wire codecs: upstream bytes and encoder CPU per second of audio.
+
+Run from the repository root:
+
+    python3 -m benchmarks.wire_codec_bench --seconds 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from audio.codecs import available_codecs, create_codec
+
+
+def _synthetic_speech(seconds: float, sample_rate: int) -> np.ndarray:
+    """Voiced-ish tones with noise bursts and pauses, roughly speech shaped."""
+    rng = np.random.default_rng(7)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    voiced = np.sin(2 * np.pi * 140 * t) + 0.5 * np.sin(2 * np.pi * 1100 * t)
+    envelope = (np.sin(2 * np.pi * 0.7 * t) > -0.2).astype(np.float32)
+    signal = 4000 * voiced * envelope + rng.normal(0, 300, len(t))
+    return np.clip(signal, -32768, 32767).astype(np.int16)
+
+
+def run(seconds: float, sample_rate: int, chunk_size: int) -> None:
+    audio = _synthetic_speech(seconds, sample_rate)
+    chunks = [audio[i:i + chunk_size].tobytes() for i in range(0, len(audio), chunk_size)]
+
+    print(f"{'codec':<14}{'kbit/s':>10}{'ratio':>8}{'cpu us/s':>12}{'msgs/s':>9}")
+    for name in available_codecs():
+        try:
+            codec = create_codec(name, sample_rate, 1)
+        except ImportError as exc:
+            print(f"{name:<14}skipped ({exc})")
+            continue
+
+        sent = 0
+        messages = 0
+        start = time.process_time()
+        for chunk in chunks:
+            for payload in codec.encode_packets(chunk):
+                sent += len(payload)
+                messages += 1
+        cpu = time.process_time() - start
+
+        print(
+            f"{name:<14}{sent * 8 / seconds / 1000:>10.1f}"
+            f"{len(audio) * 2 / max(sent, 1):>8.2f}"
+            f"{cpu / seconds * 1e6:>12.1f}{messages / seconds:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    args = parser.parse_args()
+    run(args.seconds, args.sample_rate, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
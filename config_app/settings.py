@@ -19,13 +19,88 @@ class Settings:
         # Optional: add future settings here
         self.SAMPLE_RATE = int(os.getenv("SAMPLE_RATE", 16000))
         self.CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 1024))
-        self.WAKE_ENERGY_THRESHOLD = int(os.getenv("WAKE_ENERGY_THRESHOLD", 220))
+        # Minimum wake onset RMS; the real threshold follows the measured noise floor
+        self.WAKE_ENERGY_THRESHOLD = int(os.getenv("WAKE_ENERGY_THRESHOLD", 120))
+        # Wake engine: "energy" (noise-floor gate) or "kws" (local keyword spotter)
+        self.WAKE_ENGINE = os.getenv("WAKE_ENGINE", "energy")
+        self.WAKE_KWS_MODEL = os.getenv("WAKE_KWS_MODEL", "models/hey_baymax.npz")
+        self.WAKE_ON_RATIO = float(os.getenv("WAKE_ON_RATIO", 3.0))
+        self.WAKE_OFF_RATIO = float(os.getenv("WAKE_OFF_RATIO", 1.8))
         self.WAKE_REQUIRED_HITS = int(os.getenv("WAKE_REQUIRED_HITS", 2))
         self.WAKE_DEBUG_INTERVAL = float(os.getenv("WAKE_DEBUG_INTERVAL", 0.0))
+        # "Hey Baymax, <question>" answers the question directly instead of greeting first
+        self.WAKE_QUERY_FAST_PATH = os.getenv("WAKE_QUERY_FAST_PATH", "1") == "1"
+        self.WAKE_QUERY_MIN_WORDS = int(os.getenv("WAKE_QUERY_MIN_WORDS", 2))
         self.TTS_POST_BUFFER = float(os.getenv("TTS_POST_BUFFER", 0.05))
         self.DEEPGRAM_ENDPOINT_MS = int(os.getenv("DEEPGRAM_ENDPOINT_MS", 200))
         self.MIN_TRANSCRIPT_WORDS = int(os.getenv("MIN_TRANSCRIPT_WORDS", 2))
         self.SLEEP_ENTRY_GUARD = float(os.getenv("SLEEP_ENTRY_GUARD", 0.6))
+        # Live stream wire format: linear16, mulaw, linear16_8k or opus
+        self.WIRE_CODEC = os.getenv("WIRE_CODEC", "linear16")
+        # Local end-of-turn predictor (commits turns before Deepgram endpointing)
+        self.TURN_PREDICTOR = os.getenv("TURN_PREDICTOR", "0") == "1"
+        self.TURN_SILENCE_MS = float(os.getenv("TURN_SILENCE_MS", 500))
+        self.TURN_STABLE_MS = float(os.getenv("TURN_STABLE_MS", 300))
+        self.TURN_SPEECH_RMS = float(os.getenv("TURN_SPEECH_RMS", 250))
+        self.TURN_FINALIZE_CONFIDENCE = float(os.getenv("TURN_FINALIZE_CONFIDENCE", 0.6))
+        self.TURN_COMMIT_CONFIDENCE = float(os.getenv("TURN_COMMIT_CONFIDENCE", 0.85))
+        self.TURN_UTTERANCE_END_MS = int(os.getenv("TURN_UTTERANCE_END_MS", 0))
+        # Barge-in: let near-field speech interrupt playback
+        self.BARGE_IN_ENABLED = os.getenv("BARGE_IN_ENABLED", "0") == "1"
+        self.BARGE_IN_MARGIN = float(os.getenv("BARGE_IN_MARGIN", 1.3))
+        self.BARGE_IN_MIN_RMS = float(os.getenv("BARGE_IN_MIN_RMS", 400))
+        self.BARGE_IN_FRAMES = int(os.getenv("BARGE_IN_FRAMES", 6))
+        self.BARGE_IN_CONFIRM_WINDOW = float(os.getenv("BARGE_IN_CONFIRM_WINDOW", 3.0))
+        # Close the Deepgram stream after this many seconds asleep (0 disables)
+        self.STREAM_SUSPEND_AFTER = float(os.getenv("STREAM_SUSPEND_AFTER", 0))
+        self.STREAM_PREROLL_SECONDS = float(os.getenv("STREAM_PREROLL_SECONDS", 1.5))
+        self.STREAM_WAKE_CONFIRM_WINDOW = float(os.getenv("STREAM_WAKE_CONFIRM_WINDOW", 4.0))
+        # State-aware framing: frame length per mode and max frames per coalesced send
+        self.ADAPTIVE_FRAMING = os.getenv("ADAPTIVE_FRAMING", "0") == "1"
+        self.FRAME_MS_ACTIVE = float(os.getenv("FRAME_MS_ACTIVE", 20))
+        self.FRAME_MS_MUTED = float(os.getenv("FRAME_MS_MUTED", 100))
+        self.FRAME_MS_ASLEEP = float(os.getenv("FRAME_MS_ASLEEP", 200))
+        self.FRAME_MAX_COALESCE = int(os.getenv("FRAME_MAX_COALESCE", 8))
+        # Non-streaming listening: transcribe while recording instead of after
+        self.PROGRESSIVE_STT = os.getenv("PROGRESSIVE_STT", "1") == "1"
+        # Long recordings: split at pauses and transcribe chunks in parallel
+        self.LONG_FORM_MIN_SECONDS = float(os.getenv("LONG_FORM_MIN_SECONDS", 120))
+        self.LONG_FORM_CHUNK_SECONDS = float(os.getenv("LONG_FORM_CHUNK_SECONDS", 30))
+        self.LONG_FORM_WORKERS = int(os.getenv("LONG_FORM_WORKERS", 4))
+        # Optional: drain the device during mutes, flush stale frames after, cap queued lag (MIC_MAX_LAG_MS)
+        self.MIC_DRAIN_WHILE_MUTED = os.getenv("MIC_DRAIN_WHILE_MUTED", "0") == "1"
+        self.MIC_MAX_LAG_MS = float(os.getenv("MIC_MAX_LAG_MS", 500))
+        # Capture once and fan audio out to every consumer through a ring buffer
+        self.AUDIO_BUS = os.getenv("AUDIO_BUS", "0") == "1"
+        self.AUDIO_BUS_SECONDS = float(os.getenv("AUDIO_BUS_SECONDS", 5.0))
+        # Capture (and the wake energy gate) in a supervised child process
+        self.CAPTURE_PROCESS = os.getenv("CAPTURE_PROCESS", "0") == "1"
+        self.DEEPGRAM_BASE_URL = os.getenv("DEEPGRAM_BASE_URL", "https://api.deepgram.com")
+        # State loop: "event" blocks until a wake/transcript/timer is due; "poll" sleeps fixed ticks
+        self.STATE_LOOP_MODE = os.getenv("STATE_LOOP_MODE", "event")
+        # Upper bound on one event-mode wait, as a safety net for unsignalled changes
+        self.STATE_LOOP_MAX_WAIT = float(os.getenv("STATE_LOOP_MAX_WAIT", 5.0))
+        # Run LLM, TTS and playback as concurrent pipeline stages (sentence-level overlap)
+        self.TURN_PIPELINE = os.getenv("TURN_PIPELINE", "0") == "1"
+        self.TURN_PIPELINE_QUEUE = int(os.getenv("TURN_PIPELINE_QUEUE", 2))
+        # Per-turn latency trace (JSONL); analyze with `python3 -m core.tracing <file>`
+        self.TRACE_FILE = os.getenv("TRACE_FILE", "")
+        # Local telemetry endpoint (/metrics, /json, /); 0 disables it
+        self.METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+        self.METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+        # Multi-session server (`python3 -m server.app`): bind address, step threads, per-device mic buffer
+        self.SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+        self.SERVER_PORT = int(os.getenv("SERVER_PORT", 8770))
+        self.SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 16))
+        self.SERVER_MIC_BUFFER_SECONDS = float(os.getenv("SERVER_MIC_BUFFER_SECONDS", 2.0))
+        # Server sessions suspend their Deepgram stream after this long asleep (0 keeps it open);
+        # an open stream costs a websocket and a sender thread per idle device
+        self.SERVER_STREAM_SUSPEND_AFTER = float(os.getenv("SERVER_STREAM_SUSPEND_AFTER", 30))
+        # Sharded server (`python3 -m server.supervisor`): worker processes, shared SQLite store, cache lifetimes
+        self.SERVER_PROCESSES = int(os.getenv("SERVER_PROCESSES", os.cpu_count() or 1))
+        self.SHARED_STORE_PATH = os.getenv("SHARED_STORE_PATH", ".baymax_shared.db")
+        self.LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 86400))
+        self.SESSION_SNAPSHOT_TTL = float(os.getenv("SESSION_SNAPSHOT_TTL", 86400))
 
 # Create a single shared instance
 settings = Settings()
@@ -0,0 +1,121 @@
+"""Cooperative cancellation for work a sleep command should cut short.
+
+A `CancelToken` travels with one turn through the LLM, TTS and playback
+calls. Cancelling it (from the STT thread, on SLEEP or SATISFIED) sets a
+flag the long-running loops check, wakes anything waiting on it, and runs
+the callbacks registered with `on_cancel` on the cancelling thread, which is
+how in-flight HTTP streams get closed. Code that cannot check the flag
+itself (a blocking request before its first byte) runs under
+`run_cancellable`, so the caller gets control back at once while the
+abandoned call winds down on its own thread.
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+from typing import Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Cancelled(Exception):
+    """Raised by work whose `CancelToken` was cancelled."""
+
+
+class CancelToken:
+    """One-shot cancellation flag with callbacks."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason = ""
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "") -> bool:
+        """Cancel and run the registered callbacks; False when already cancelled."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:  # pragma: no cover - closing an already broken stream
+                print("[Cancel] Callback failed:", exc)
+        return True
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run `callback()` on cancel (at once if already cancelled); returns an unregister function."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def unregister() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return unregister
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise Cancelled(self.reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep up to `timeout`; True as soon as the token is cancelled."""
+        return self._event.wait(timeout)
+
+
+def accepts_cancel(fn: Callable) -> bool:
+    """Whether `fn` takes a `cancel=` keyword (engines without one are only checked around)."""
+    try:
+        parameters = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return "cancel" in parameters or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+
+
+def call_with_cancel(fn: Callable[..., T], *args, cancel: Optional[CancelToken] = None) -> T:
+    """`fn(*args, cancel=cancel)`, or `fn(*args)` for callables that take no token."""
+    if cancel is None:
+        return fn(*args)
+    cancel.raise_if_cancelled()
+    result = fn(*args, cancel=cancel) if accepts_cancel(fn) else fn(*args)
+    cancel.raise_if_cancelled()
+    return result
+
+
+def run_cancellable(fn: Callable[..., T], *args, cancel: CancelToken, name: str = "BaymaxCancellable") -> T:
+    """Run `call_with_cancel(fn, *args)` on a helper thread; raise `Cancelled` as soon as `cancel` fires."""
+    cancel.raise_if_cancelled()
+    done = threading.Event()
+    outcome: dict = {}
+
+    def target() -> None:
+        try:
+            outcome["result"] = call_with_cancel(fn, *args, cancel=cancel)
+        except BaseException as exc:  # handed to the caller below
+            outcome["error"] = exc
+        finally:
+            done.set()
+
+    unregister = cancel.on_cancel(done.set)
+    threading.Thread(target=target, name=name, daemon=True).start()
+    try:
+        done.wait()
+    finally:
+        unregister()
+    if "error" in outcome:
+        raise outcome["error"]
+    if "result" not in outcome:
+        raise Cancelled(cancel.reason)
+    return outcome["result"]
@@ -0,0 +1,110 @@
+"""Injectable time source.
+
+Components that keep deadlines (idle thresholds, sleep guard, speech
+cooldown, mute windows, stream suspension) read time and sleep through a
+`Clock` instead of the `time` module, defaulting to `system_clock`. Tests
+pass a `VirtualClock`: sleeping or waiting on it advances virtual time
+instantly, firing the timers scheduled on it (`core.timers`) at their exact
+deadlines on the way, so an hour of conversation runs in milliseconds. Latency
+measurements of real I/O (HTTP, audio devices, tracing) stay on real time.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class Clock:
+    """Wall time, monotonic time and blocking waits."""
+
+    def time(self) -> float:
+        raise NotImplementedError
+
+    def monotonic(self) -> float:
+        raise NotImplementedError
+
+    def sleep(self, seconds: float) -> None:
+        raise NotImplementedError
+
+    def wait(self, condition: threading.Condition, timeout: float) -> bool:
+        """`condition.wait(timeout)` (call with the condition held)."""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(max(seconds, 0.0))
+
+    def wait(self, condition: threading.Condition, timeout: float) -> bool:
+        return condition.wait(timeout)
+
+
+class VirtualClock(Clock):
+    """Time that only moves when advanced; sleeps and waits return at once.
+
+    Waits never block: nothing else runs in a virtual scenario while the
+    caller waits, so a wait lasts until the first attached timer fires
+    (which may signal the condition) or else the full timeout.
+    """
+
+    def __init__(self, start: float = 1_700_000_000.0) -> None:
+        self._lock = threading.Lock()
+        self._epoch = start
+        self._elapsed = 0.0
+        self._timers: list = []
+
+    def attach_timers(self, scheduler) -> None:
+        """Drive `scheduler`: advancing time runs its timers at their deadlines."""
+        self._timers.append(scheduler)
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed
+
+    def time(self) -> float:
+        return self._epoch + self._elapsed
+
+    def monotonic(self) -> float:
+        return self._elapsed
+
+    def advance(self, seconds: float) -> None:
+        self._run_until(self._elapsed + max(seconds, 0.0))
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    def wait(self, condition: threading.Condition, timeout: float) -> bool:
+        """True when a timer fired before `timeout` ran out."""
+        return self._run_until(self._elapsed + max(timeout, 0.0), stop_after_fire=True)
+
+    def _run_until(self, target: float, *, stop_after_fire: bool = False) -> bool:
+        fired = False
+        while True:
+            deadlines = [d for d in (timers.next_deadline() for timers in self._timers) if d is not None]
+            due = min(deadlines, default=None)
+            if due is None or due > target:
+                break
+            with self._lock:
+                self._elapsed = max(self._elapsed, due)
+            for timers in list(self._timers):
+                fired = timers.run_due() > 0 or fired
+            if fired and stop_after_fire:
+                return True
+        with self._lock:
+            self._elapsed = max(self._elapsed, target)
+        return fired
+
+
+system_clock = SystemClock()
+
+
+def clock_of(owner) -> Clock:
+    """The clock of `owner` (a state manager, say), or the system clock."""
+    return getattr(owner, "clock", None) or system_clock
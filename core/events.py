@@ -1,8 +1,33 @@
-"""Event primitives shared across Baymax subsystems."""
+"""Event primitives shared across Baymax subsystems.
 
-from dataclasses import dataclass
-from enum import Enum, auto
-from typing import Optional
+Events travel on an `EventBus` under typed `Topic`s. Subscribers are called
+synchronously on the publishing thread (the STT receive thread, say);
+topics the bus was asked to queue are also kept in bounded per-topic
+lanes for a consumer to peek, pop or drain in batches. Draining always
+empties higher-priority lanes first, so control events (SLEEP, SATISFIED)
+are handled before wake events and transcripts that arrived earlier. Every
+event carries the monotonic time it was created; the bus counts published,
+dropped and drained events per topic and the publish-to-drain latency.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum, auto
+from typing import Callable, Deque, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+_PUBLISHED = metrics.counter("baymax_events_published_total", "Events published on an event bus", ("topic",))
+_DROPPED = metrics.counter("baymax_events_dropped_total", "Events dropped by a full topic queue", ("topic",))
+_LATENCY = metrics.histogram(
+    "baymax_event_queue_seconds", "Event creation to consumption from a topic queue", ("topic",)
+)
 
 
 class WakeEventType(Enum):
@@ -11,6 +36,7 @@ class WakeEventType(Enum):
     WAKE = auto()
     SLEEP = auto()
     SATISFIED = auto()
+    BARGE_IN = auto()
 
 
 @dataclass(frozen=True)
@@ -19,6 +45,9 @@ class WakeEvent:
 
     event_type: WakeEventType
     transcript: str
+    # Request spoken after the wake phrase ("Hey Baymax, <query>"), if any.
+    query: str = ""
+    timestamp: float = field(default_factory=time.monotonic, compare=False)
 
 
 @dataclass(frozen=True)
@@ -28,4 +57,199 @@ class TranscriptEvent:
     text: str
     is_final: bool
     should_process: bool
-    raw: Optional[object] = None
\ No newline at end of file
+    raw: Optional[object] = None
+    timestamp: float = field(default_factory=time.monotonic, compare=False)
+
+
+class Priority(IntEnum):
+    """Drain order of topic lanes: lower values are drained first."""
+
+    CONTROL = 0
+    NORMAL = 1
+    BULK = 2
+
+
+class Overflow(Enum):
+    """What a full topic queue does with one more event."""
+
+    DROP_OLDEST = auto()
+    DROP_NEWEST = auto()
+    RAISE = auto()
+
+
+class QueueFull(RuntimeError):
+    """Raised by `EventBus.publish` on a full `Overflow.RAISE` topic."""
+
+
+@dataclass(frozen=True, eq=False)
+class Topic(Generic[T]):
+    """A named, typed event stream with its queueing policy (compared by identity)."""
+
+    name: str
+    event_type: Type[T]
+    priority: Priority = Priority.NORMAL
+    capacity: int = 64
+    overflow: Overflow = Overflow.DROP_OLDEST
+
+
+# SLEEP and SATISFIED end a conversation and must not wait behind anything else.
+CONTROL = Topic("control", WakeEvent, Priority.CONTROL, capacity=8)
+WAKE = Topic("wake", WakeEvent, capacity=8)
+TRANSCRIPT = Topic("transcript", TranscriptEvent, capacity=32)
+INTERIM = Topic("interim", TranscriptEvent, Priority.BULK, capacity=32)
+STREAM_ERROR = Topic("stream_error", Exception, capacity=8)
+
+
+def wake_topic(event: WakeEvent) -> Topic:
+    if event.event_type in (WakeEventType.SLEEP, WakeEventType.SATISFIED):
+        return CONTROL
+    return WAKE
+
+
+def transcript_topic(event: TranscriptEvent) -> Topic:
+    return TRANSCRIPT if event.is_final else INTERIM
+
+
+class _Lane:
+    __slots__ = ("items", "published", "dropped", "drained", "latency_total", "latency_max", "metrics")
+
+    def __init__(self, topic: Topic) -> None:
+        self.items: Deque[Tuple[float, object]] = deque()
+        self.metrics = (_PUBLISHED.labels(topic.name), _DROPPED.labels(topic.name), _LATENCY.labels(topic.name))
+        self.published = 0
+        self.dropped = 0
+        self.drained = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+
+class EventBus:
+    """Typed publish/subscribe with bounded, prioritized queues for chosen topics."""
+
+    def __init__(
+        self,
+        queued: Iterable[Topic] = (),
+        *,
+        on_subscriber_error: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Topic, List[Callable]] = {}
+        self._lanes: Dict[Topic, _Lane] = {topic: _Lane(topic) for topic in queued}
+        self._counts: Dict[Topic, _Lane] = dict(self._lanes)
+        self._order = sorted(self._lanes, key=lambda topic: topic.priority)
+        self._on_subscriber_error = on_subscriber_error
+
+    def subscribe(self, topic: Topic[T], callback: Callable[[T], None]) -> Callable[[], None]:
+        """Call `callback(event)` on every publish to `topic`; returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers[topic] = self._subscribers.get(topic, []) + [callback]
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers[topic] = [cb for cb in self._subscribers.get(topic, []) if cb is not callback]
+
+        return unsubscribe
+
+    def has_subscribers(self, topic: Topic) -> bool:
+        return bool(self._subscribers.get(topic))
+
+    def publish(self, topic: Topic[T], event: T) -> bool:
+        """Deliver `event` to subscribers and its queue; False when the queue dropped it."""
+        accepted = True
+        queued = topic in self._lanes
+        with self._lock:
+            lane = self._counts.get(topic)
+            if lane is None:
+                lane = self._counts[topic] = _Lane(topic)
+            if queued:
+                if len(lane.items) >= topic.capacity:
+                    if topic.overflow is Overflow.RAISE:
+                        raise QueueFull(f"event topic {topic.name!r} is full ({topic.capacity})")
+                    lane.dropped += 1
+                    lane.metrics[1].inc()
+                    if topic.overflow is Overflow.DROP_OLDEST:
+                        lane.items.popleft()
+                    else:
+                        accepted = False
+                if accepted:
+                    lane.items.append((getattr(event, "timestamp", None) or time.monotonic(), event))
+            lane.published += 1
+            subscribers = self._subscribers.get(topic, ())
+        lane.metrics[0].inc()
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as exc:  # pragma: no cover - subscriber failure
+                if self._on_subscriber_error is not None and topic is not STREAM_ERROR:
+                    self._on_subscriber_error(exc)
+                else:
+                    print(f"[Events] {topic.name} subscriber raised:", exc)
+        return accepted
+
+    def peek(self, topic: Topic[T]) -> Optional[T]:
+        with self._lock:
+            lane = self._lanes.get(topic)
+            return lane.items[0][1] if lane and lane.items else None
+
+    def pop(self, topic: Topic[T]) -> Optional[T]:
+        with self._lock:
+            lane = self._lanes.get(topic)
+            if not lane or not lane.items:
+                return None
+            created, event = lane.items.popleft()
+            self._record(topic, lane, created, time.monotonic())
+        return event
+
+    def drain(self, topics: Optional[Iterable[Topic]] = None, max_items: Optional[int] = None) -> List[Tuple[Topic, object]]:
+        """Take up to `max_items` queued events, highest-priority lanes first, FIFO within a lane."""
+        wanted = self._order if topics is None else sorted(topics, key=lambda topic: topic.priority)
+        batch: List[Tuple[Topic, object]] = []
+        now = time.monotonic()
+        with self._lock:
+            for topic in wanted:
+                lane = self._lanes.get(topic)
+                while lane and lane.items and (max_items is None or len(batch) < max_items):
+                    created, event = lane.items.popleft()
+                    self._record(topic, lane, created, now)
+                    batch.append((topic, event))
+        return batch
+
+    def clear(self, *topics: Topic) -> int:
+        with self._lock:
+            cleared = 0
+            for topic in topics:
+                lane = self._lanes.get(topic)
+                if lane:
+                    cleared += len(lane.items)
+                    lane.items.clear()
+            return cleared
+
+    def depth(self, topic: Optional[Topic] = None) -> int:
+        if topic is not None:
+            lane = self._lanes.get(topic)
+            return len(lane.items) if lane else 0
+        return sum(len(lane.items) for lane in self._lanes.values())
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-topic counters: published, dropped, drained, depth and queue latency (ms)."""
+        with self._lock:
+            return {
+                topic.name: {
+                    "published": lane.published,
+                    "dropped": lane.dropped,
+                    "drained": lane.drained,
+                    "depth": len(lane.items),
+                    "latency_avg_ms": 1000.0 * lane.latency_total / lane.drained if lane.drained else 0.0,
+                    "latency_max_ms": 1000.0 * lane.latency_max,
+                }
+                for topic, lane in self._counts.items()
+            }
+
+    @staticmethod
+    def _record(topic: Topic, lane: _Lane, created: float, now: float) -> None:
+        latency = max(now - created, 0.0)
+        lane.drained += 1
+        lane.latency_total += latency
+        if latency > lane.latency_max:
+            lane.latency_max = latency
+        lane.metrics[2].observe(latency)
@@ -1,14 +1,25 @@
-"""Background idle monitor for Baymax 2.0."""
+"""Idle monitor for Baymax 2.0, driven by a deadline timer instead of a polling thread."""
 
 from __future__ import annotations
 
-import threading
-import time
 from typing import Optional
 
+from core.clock import Clock, system_clock
+from core.timers import TimerHandle, TimerScheduler, timers_for
+
+# While Baymax is speaking the idle check is deferred; look again this much later.
+_SPEAKING_RETRY = 1.0
+_WARNING_INTERVAL = 10.0
+
 
 class IdleMonitor:
-    """Monitors user inactivity and nudges Baymax to sleep when idle."""
+    """Monitors user inactivity and nudges Baymax to sleep when idle.
+
+    One timer sits at the next threshold (last activity + `warn_after`, then
+    + `sleep_after`); user activity pushes it back. The timer thread only
+    hands `check()` to the manager's loop (`call_on_loop`), so transitions
+    happen on the thread that runs `update()`, as every other one does.
+    """
 
     def __init__(
         self,
@@ -16,62 +27,103 @@ class IdleMonitor:
         *,
         warn_after: float = 45.0,
         sleep_after: float = 60.0,
-        poll_interval: float = 1.0,
+        clock: Optional[Clock] = None,
+        timers: Optional[TimerScheduler] = None,
     ) -> None:
         self._manager = manager
+        self._clock = clock or getattr(manager, "clock", None) or system_clock
+        self._timers = timers or getattr(manager, "timers", None) or timers_for(self._clock)
         self._warn_after = warn_after
         self._sleep_after = max(sleep_after, warn_after)
-        self._poll_interval = max(poll_interval, 0.5)
 
-        self._stop_event = threading.Event()
-        self._thread: Optional[threading.Thread] = None
+        self._timer: Optional[TimerHandle] = None
+        self._running = False
         self._last_warning_ts = 0.0
+        add_listener = getattr(manager, "add_activity_listener", None)
+        if add_listener:
+            add_listener(self._on_activity)
 
     def start(self) -> None:
-        if self._thread and self._thread.is_alive():
+        if self._running:
             return
-
-        self._stop_event.clear()
-        self._thread = threading.Thread(
-            target=self._run,
-            name="BaymaxIdleMonitor",
-            daemon=True,
-        )
-        self._thread.start()
+        self._running = True
+        self._arm(self._next_check_in())
 
     def stop(self) -> None:
-        self._stop_event.set()
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=2.0)
-        self._thread = None
+        self._running = False
+        if self._timer is not None:
+            self._timer.cancel()
         self._last_warning_ts = 0.0
 
+    def check(self) -> None:
+        """Act on the thresholds that have passed, then re-arm the timer for the next one."""
+        self._evaluate()
+        if self._running:
+            self._arm(self._next_check_in())
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _run(self) -> None:
-        while not self._stop_event.is_set():
-            time.sleep(self._poll_interval)
-
-            if not self._manager.streaming_enabled:
-                continue
+    def _evaluate(self) -> None:
+        if not self._manager.streaming_enabled:
+            return
 
-            if not self._manager.is_awake:
-                self._last_warning_ts = 0.0
-                continue
+        if not self._manager.is_awake:
+            self._last_warning_ts = 0.0
+            return
 
-            if self._manager.is_speaking:
-                continue
+        if self._manager.is_speaking:
+            return
 
-            idle_seconds = time.time() - self._manager.last_user_activity
+        idle_seconds = self._clock.time() - self._manager.last_user_activity
 
-            if idle_seconds >= self._sleep_after:
-                self._last_warning_ts = 0.0
-                self._manager.queue_idle_sleep_message()
-                continue
+        if idle_seconds >= self._sleep_after:
+            self._last_warning_ts = 0.0
+            self._manager.queue_idle_sleep_message()
+            return
 
-            if idle_seconds >= self._warn_after:
-                now = time.time()
-                if now - self._last_warning_ts >= 10.0:
-                    self._manager.queue_idle_prompt()
-                    self._last_warning_ts = now
\ No newline at end of file
+        if idle_seconds >= self._warn_after:
+            now = self._clock.time()
+            if now - self._last_warning_ts >= _WARNING_INTERVAL:
+                self._manager.queue_idle_prompt()
+                self._last_warning_ts = now
+
+    def _next_check_in(self) -> Optional[float]:
+        """Seconds until the next threshold, or None while nothing can go idle."""
+        manager = self._manager
+        if not manager.streaming_enabled or not manager.is_awake:
+            return None  # waking up counts as activity and re-arms the timer
+        if manager.is_speaking:
+            return _SPEAKING_RETRY
+        now = self._clock.time()
+        idle_seconds = now - manager.last_user_activity
+        if idle_seconds < self._warn_after:
+            return self._warn_after - idle_seconds
+        next_warning = self._last_warning_ts + _WARNING_INTERVAL - now
+        return max(min(self._sleep_after - idle_seconds, next_warning), 0.0) or _SPEAKING_RETRY
+
+    def _arm(self, delay: Optional[float]) -> None:
+        if delay is None:
+            if self._timer is not None:
+                self._timer.cancel()
+        elif self._timer is None:
+            self._timer = self._timers.call_later(delay, self._fire)
+        else:
+            self._timer.reschedule(delay)
+
+    def _on_activity(self) -> None:
+        if self._running:
+            self._arm(self._warn_after)
+
+    def _fire(self) -> None:
+        if not self._running:
+            return
+        call_on_loop = getattr(self._manager, "call_on_loop", None)
+        if call_on_loop is not None:
+            call_on_loop(self._run_check)
+        else:
+            self.check()
+
+    def _run_check(self) -> None:
+        if self._running:
+            self.check()
@@ -0,0 +1,347 @@
+"""In-process metrics: counters, gauges and fixed-bucket histograms.
+
+Updates never take a lock: every writer thread accumulates into its own
+shard (a dict slot keyed by thread ID that only that thread writes), and a
+scrape sums the shards. That keeps `inc()`/`observe()` safe to call from the
+audio sender and capture threads. Queue depths and other values that already
+live elsewhere are exposed as callback gauges evaluated only at scrape time.
+
+`MetricsServer` serves the default registry on `METRICS_PORT`:
+`/metrics` (Prometheus text), `/json`, and `/` (auto-refreshing HTML view).
+
+    python3 -m core.metrics watch --url http://127.0.0.1:9464   # terminal view
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import html
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), labels=()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.label_values: Tuple[Tuple[str, str], ...] = tuple(labels)
+        self._children: Dict[Tuple[str, ...], "_Metric"] = {}
+        self._children_lock = threading.Lock()
+
+    def labels(self, *values: str, **kwargs: str):
+        """Child series for one label combination (created once, then cached)."""
+        key = tuple(values) if values else tuple(str(kwargs[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._children_lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child(tuple(zip(self.labelnames, key)))
+                    self._children[key] = child
+        return child
+
+    def _new_child(self, labels):
+        return type(self)(self.name, self.help, labels=labels)
+
+    def series(self) -> List["_Metric"]:
+        if self.labelnames:
+            return list(self._children.values())
+        return [self]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._shards: Dict[int, float] = {}
+
+    def inc(self, amount: float = 1.0) -> None:
+        ident = threading.get_ident()
+        shards = self._shards
+        shards[ident] = shards.get(ident, 0.0) + amount
+
+    @property
+    def value(self) -> float:
+        return sum(list(self._shards.values()))
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        yield self.name, _format_labels(self.label_values), self.value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Evaluate `function` at scrape time instead of storing a value."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return float("nan")
+        return self._value
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        yield self.name, _format_labels(self.label_values), self.value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per thread: one count per bucket, +Inf overflow, then sum.
+        self._shards: Dict[int, List[float]] = {}
+
+    def _new_child(self, labels):
+        return Histogram(self.name, self.help, labels=labels, buckets=self.buckets)
+
+    def observe(self, value: float) -> None:
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            shard = [0.0] * (len(self.buckets) + 2)
+            self._shards[ident] = shard
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def totals(self) -> Tuple[List[float], float, float]:
+        """(cumulative bucket counts incl. +Inf, sum, count)."""
+        merged = [0.0] * (len(self.buckets) + 2)
+        for shard in list(self._shards.values()):
+            for index, value in enumerate(list(shard)):
+                merged[index] += value
+        cumulative, running = [], 0.0
+        for count in merged[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, merged[-1], running
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing quantile `q` (nan when empty)."""
+        cumulative, _total, count = self.totals()
+        if not count:
+            return float("nan")
+        target = q * count
+        for bound, seen in zip(self.buckets + (float("inf"),), cumulative):
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        cumulative, total, count = self.totals()
+        for bound, seen in zip(self.buckets + (float("inf"),), cumulative):
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            yield f"{self.name}_bucket", _format_labels(self.label_values, f'le="{le}"'), seen
+        yield f"{self.name}_sum", _format_labels(self.label_values), total
+        yield f"{self.name}_count", _format_labels(self.label_values), count
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for series in metric.series():
+                for name, labels, value in series.samples():
+                    lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Readable summary: counters/gauges by label set, histograms as count/p50/p95."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        result: Dict[str, dict] = {}
+        for metric in metrics:
+            rows = {}
+            for series in metric.series():
+                key = ",".join(f"{k}={v}" for k, v in series.label_values) or "-"
+                if isinstance(series, Histogram):
+                    _cumulative, total, count = series.totals()
+                    rows[key] = {
+                        "count": count,
+                        "mean": total / count if count else None,
+                        "p50<=": series.quantile(0.5) if count else None,
+                        "p95<=": series.quantile(0.95) if count else None,
+                    }
+                else:
+                    rows[key] = series.value
+            result[metric.name] = {"type": metric.kind, "help": metric.help, "series": rows}
+        return result
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+metrics = Registry()
+
+
+_PAGE = """<!doctype html><html><head><meta charset="utf-8"><meta http-equiv="refresh" content="1">
+<title>Baymax telemetry</title><style>body{{font:13px monospace;margin:1.5em}}td,th{{padding:2px 10px;text-align:left}}
+tr:nth-child(even){{background:#f3f3f3}}</style></head><body><h3>Baymax telemetry</h3><table>
+<tr><th>metric</th><th>series</th><th>value</th></tr>{rows}</table></body></html>"""
+
+
+def _html(snapshot: Dict[str, dict]) -> str:
+    rows = []
+    for name, metric in snapshot.items():
+        for key, value in metric["series"].items():
+            if isinstance(value, dict):
+                value = " ".join(f"{k}={_short(v)}" for k, v in value.items())
+            rows.append(
+                f"<tr><td>{html.escape(name)}</td><td>{html.escape(key)}</td><td>{html.escape(_short(value))}</td></tr>"
+            )
+    return _PAGE.format(rows="".join(rows))
+
+
+def _short(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
+
+
+class MetricsServer:
+    """Serves a registry over HTTP on a daemon thread."""
+
+    def __init__(self, registry: Registry = metrics, host: str = "127.0.0.1", port: int = 9464) -> None:
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 - http.server API
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    body, content_type = registry_ref.render_prometheus(), "text/plain; version=0.0.4"
+                elif path == "/json":
+                    body, content_type = json.dumps(registry_ref.snapshot()), "application/json"
+                elif path == "/":
+                    body, content_type = _html(registry_ref.snapshot()), "text/html; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="BaymaxMetrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+
+def _watch(url: str, interval: float) -> None:  # pragma: no cover - interactive
+    while True:
+        with urllib.request.urlopen(f"{url.rstrip('/')}/json", timeout=2.0) as response:
+            snapshot = json.loads(response.read())
+        print("\033[2J\033[H" + time.strftime("%H:%M:%S") + "  Baymax telemetry")
+        for name, metric in snapshot.items():
+            for key, value in metric["series"].items():
+                if isinstance(value, dict):
+                    value = " ".join(f"{k}={_short(v)}" for k, v in value.items())
+                print(f"  {name:<42} {key:<28} {_short(value)}")
+        time.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Baymax metrics tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    watch = sub.add_parser("watch", help="live terminal view of a running instance")
+    watch.add_argument("--url", default="http://127.0.0.1:9464")
+    watch.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args()
+    try:
+        _watch(args.url, args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""Staged turn pipeline: think -> synthesize -> play on worker threads.
+
+Each stage owns a bounded input queue and one or more worker threads, so
+synthesis of the next sentence overlaps playback of the current one and the
+main loop stays free to handle wake/sleep directives. The pipeline never
+changes conversation state itself: it reports progress on a `TurnHandle`
+and calls `on_done`, and `StateManager` decides what happens next.
+Cancelling a turn cancels its `CancelToken`, which closes the LLM and TTS
+streams the stages are reading and stops playback within one wait slice.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from core.cancellation import Cancelled, CancelToken, run_cancellable
+from core.tracing import tracer
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str, *, min_words: int = 3) -> List[str]:
+    """Split a reply into speakable segments, folding very short ones into the next."""
+    segments: List[str] = []
+    carry = ""
+    for piece in _SENTENCE_END.split(text.strip()):
+        piece = f"{carry} {piece}".strip() if carry else piece.strip()
+        if not piece:
+            continue
+        if len(piece.split()) < min_words:
+            carry = piece
+            continue
+        segments.append(piece)
+        carry = ""
+    if carry:
+        if segments:
+            segments[-1] = f"{segments[-1]} {carry}"
+        else:
+            segments.append(carry)
+    return segments
+
+
+@dataclass
+class TurnHandle:
+    """Progress of one spoken turn through the pipeline."""
+
+    turn_id: int
+    text: Optional[str] = None
+    reply: str = ""
+    segments: int = 0
+    spoken_seconds: float = 0.0
+    submitted_at: float = field(default_factory=time.monotonic)
+    first_audio_at: Optional[float] = None
+    token: CancelToken = field(default_factory=CancelToken)
+    done: threading.Event = field(default_factory=threading.Event)
+    trace_turn: Optional[int] = field(default_factory=lambda: tracer.current_turn)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+
+@dataclass
+class _Envelope:
+    handle: TurnHandle
+    payload: object
+    last: bool
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class Stage:
+    """A bounded queue drained by worker threads running `fn(envelope, emit)`."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        *,
+        workers: int = 1,
+        maxsize: int = 4,
+        on_failed: Optional[Callable[[TurnHandle], None]] = None,
+    ) -> None:
+        self.name = name
+        self._fn = fn
+        self._on_failed = on_failed
+        self._workers = max(workers, 1)
+        self._queue: "queue.Queue[Optional[_Envelope]]" = queue.Queue(maxsize=max(maxsize, 1))
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._busy_seconds = 0.0
+        self._waits: List[float] = []
+        self._items = 0
+        self._started_at = 0.0
+        self.downstream: Optional["Stage"] = None
+
+    def start(self) -> None:
+        self._started_at = time.monotonic()
+        for index in range(self._workers):
+            thread = threading.Thread(target=self._run, name=f"BaymaxStage-{self.name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        for _ in self._threads:
+            try:
+                self._queue.put(None, timeout=1.0)
+            except queue.Full:  # pragma: no cover - wedged worker; threads are daemons
+                break
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def put(self, envelope: _Envelope) -> None:
+        """Enqueue, blocking while the queue is full unless the turn is cancelled."""
+        while not envelope.handle.cancelled:
+            try:
+                self._queue.put(envelope, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = np.array(self._waits[-1000:] or [0.0]) * 1000.0
+            elapsed = max(time.monotonic() - self._started_at, 1e-9) if self._started_at else 1e-9
+            return {
+                "items": self._items,
+                "utilization": round(self._busy_seconds / (elapsed * self._workers), 3),
+                "queue_wait_p50_ms": round(float(np.percentile(waits, 50)), 1),
+                "queue_wait_p95_ms": round(float(np.percentile(waits, 95)), 1),
+                "queued": self._queue.qsize(),
+            }
+
+    def _emit(self, source: _Envelope, payload: object, last: bool) -> None:
+        if self.downstream is not None:
+            self.downstream.put(_Envelope(source.handle, payload, last))
+
+    def _run(self) -> None:
+        while True:
+            envelope = self._queue.get()
+            if envelope is None:
+                return
+            waited = time.monotonic() - envelope.enqueued_at
+            if envelope.handle.cancelled:
+                continue
+            started = time.monotonic()
+            try:
+                self._fn(envelope, lambda payload, last: self._emit(envelope, payload, last))
+            except Cancelled:
+                pass  # `TurnPipeline.cancel` already closed the turn
+            except Exception as exc:
+                print(f"[Pipeline] {self.name} stage error:", exc)
+                # Nothing downstream will close the turn if its last item failed here.
+                if envelope.last and self._on_failed:
+                    self._on_failed(envelope.handle)
+            with self._lock:
+                self._busy_seconds += time.monotonic() - started
+                self._waits.append(waited)
+                self._items += 1
+
+
+class TurnPipeline:
+    """Think (LLM) -> synthesize (TTS per sentence) -> play, one turn at a time."""
+
+    def __init__(
+        self,
+        llm,
+        tts,
+        player,
+        *,
+        on_done: Optional[Callable[[TurnHandle], None]] = None,
+        on_playback_start: Optional[Callable[[str], None]] = None,
+        play_audio: bool = True,
+        queue_size: int = 2,
+        audio_dir: str = "audio",
+    ) -> None:
+        self._llm = llm
+        self._tts = tts
+        self._player = player
+        self._on_done = on_done
+        self._on_playback_start = on_playback_start
+        self._play_audio = play_audio
+        self._audio_dir = audio_dir
+        # Enough segment files that none is overwritten while queued or playing.
+        self._slots = queue_size + 3
+        self._next_slot = 0
+        self._turn_counter = 0
+        self._lock = threading.Lock()
+
+        self.think = Stage("think", self._think, maxsize=queue_size, on_failed=self._finish)
+        self.synthesize = Stage("synthesize", self._synthesize, maxsize=queue_size, on_failed=self._finish)
+        self.play = Stage("play", self._play, maxsize=queue_size, on_failed=self._finish)
+        self.think.downstream = self.synthesize
+        self.synthesize.downstream = self.play
+        self._stages = (self.think, self.synthesize, self.play)
+
+    def start(self) -> None:
+        os.makedirs(self._audio_dir, exist_ok=True)
+        for stage in self._stages:
+            stage.start()
+
+    def stop(self) -> None:
+        for stage in self._stages:
+            stage.stop()
+
+    def submit(self, *, text: Optional[str] = None, reply: Optional[str] = None) -> TurnHandle:
+        """Start a turn from user `text` (runs the LLM) or a ready `reply`."""
+        with self._lock:
+            self._turn_counter += 1
+            handle = TurnHandle(self._turn_counter, text=text)
+        # Ready replies still pass through `think` so the caller never blocks on synthesis backpressure.
+        self.think.put(_Envelope(handle, (text or "", reply), True))
+        return handle
+
+    def cancel(self, handle: Optional[TurnHandle]) -> None:
+        """Drop the turn's queued work and cut its playback short."""
+        if handle is None or handle.done.is_set():
+            return
+        handle.token.cancel("turn cancelled")
+        self._finish(handle)
+
+    def stats(self) -> dict:
+        return {stage.name: stage.stats() for stage in self._stages}
+
+    # ------------------------------------------------------------------
+    # Stage bodies
+    # ------------------------------------------------------------------
+    def _think(self, envelope: _Envelope, emit) -> None:
+        handle = envelope.handle
+        text, reply = envelope.payload
+        if reply is None:
+            reply = "Okay."
+            if self._llm:
+                try:
+                    print("[Pipeline] Generating LLM response...")
+                    reply = run_cancellable(self._llm.generate, text, cancel=handle.token, name="BaymaxPipelineLLM")
+                except Cancelled:
+                    raise
+                except Exception as exc:
+                    print("[Pipeline] LLM error:", exc)
+        handle.reply = reply
+
+        segments = split_sentences(reply)
+        handle.segments = len(segments)
+        if not segments:
+            self._finish(handle)
+            return
+        for index, segment in enumerate(segments):
+            emit(segment, index == len(segments) - 1)
+
+    def _synthesize(self, envelope: _Envelope, emit) -> None:
+        with self._lock:
+            path = os.path.join(self._audio_dir, f"segment_{self._next_slot}.wav")
+            self._next_slot = (self._next_slot + 1) % self._slots
+        # Slots are reused: a failed synthesis must not leave an earlier turn's audio to play.
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        # Run off the worker thread: a request still waiting on its first byte when the
+        # turn is cancelled would otherwise hold the only synthesize worker (and delay
+        # the goodbye line) until its 30 s timeout.
+        token = envelope.handle.token
+        synthesize_to = getattr(self._tts, "synthesize_to", None)
+        if synthesize_to:
+            duration = run_cancellable(synthesize_to, envelope.payload, path, cancel=token, name="BaymaxPipelineTTS")
+        else:
+            run_cancellable(self._tts.speak, envelope.payload, cancel=token, name="BaymaxPipelineTTS")
+            duration = getattr(self._tts, "last_duration", 0.0)
+            source = getattr(self._tts, "output_path", None)
+            if duration and source and os.path.exists(source):
+                shutil.copyfile(source, path)
+        if not duration or not os.path.exists(path):
+            print(f"[Pipeline] No audio for segment: {envelope.payload!r}")
+            path, duration = None, 0.0
+        emit((path, duration), envelope.last)
+
+    def _play(self, envelope: _Envelope, _emit) -> None:
+        handle = envelope.handle
+        path, duration = envelope.payload
+        if handle.first_audio_at is None:
+            handle.first_audio_at = time.monotonic()
+        if self._play_audio and path is not None:
+            if self._on_playback_start:
+                self._on_playback_start(path)
+            tracer.mark("playback_start", turn=handle.trace_turn)
+            self._player.play(path)
+            while not self._player.wait(timeout=0.02):
+                if handle.cancelled:
+                    self._player.stop()
+                    tracer.mark("playback_end", turn=handle.trace_turn, interrupted=True)
+                    return
+            tracer.mark("playback_end", turn=handle.trace_turn)
+        handle.spoken_seconds += duration
+        if envelope.last:
+            self._finish(handle)
+
+    def _finish(self, handle: TurnHandle) -> None:
+        with self._lock:
+            if handle.done.is_set():
+                return
+            handle.done.set()
+        if self._on_done:
+            self._on_done(handle)
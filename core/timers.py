@@ -0,0 +1,288 @@
+"""Deadline-driven timers shared by every component of a process.
+
+A `TimerScheduler` keeps one heap of deadlines on a `Clock`. On the system
+clock a single daemon thread sleeps until the earliest deadline and runs
+the callbacks that fell due, so the idle prompts, mute windows, speech
+cooldown and sleep guard of every session cost one heap entry each instead
+of a thread or a timestamp compared on every read. On a `VirtualClock` the
+clock drives the scheduler: advancing time runs each timer exactly at its
+deadline. Cancelling or rescheduling a timer is O(log n); superseded heap
+entries are skipped when they surface and compacted when they pile up.
+
+Callbacks run on the scheduler thread (or the thread advancing a virtual
+clock) and should only flip flags or signal the owner's loop.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import weakref
+from typing import Callable, List, Optional, Tuple
+
+from core.clock import Clock, system_clock
+from core.metrics import metrics
+
+_LATENESS = metrics.histogram("baymax_timer_lateness_seconds", "Timer deadline to callback start")
+
+# Rebuild the heap once superseded entries outnumber live ones (and there are enough to matter).
+_COMPACT_MIN_STALE = 64
+
+
+class TimerHandle:
+    """A scheduled callback; cancel it or move its deadline."""
+
+    __slots__ = ("_scheduler", "callback", "deadline", "_seq", "_pending")
+
+    def __init__(self, scheduler: "TimerScheduler", callback: Callable[[], None]) -> None:
+        self._scheduler = scheduler
+        self.callback = callback
+        self.deadline = 0.0
+        self._seq = -1
+        self._pending = False
+
+    @property
+    def active(self) -> bool:
+        return self._pending
+
+    def remaining(self) -> float:
+        """Seconds until the deadline (0 once fired or cancelled)."""
+        if not self._pending:
+            return 0.0
+        return max(self.deadline - self._scheduler.clock.monotonic(), 0.0)
+
+    def cancel(self) -> bool:
+        """Drop the timer; False when it already fired or was cancelled."""
+        return self._scheduler._cancel(self)
+
+    def reschedule(self, delay: float) -> None:
+        """Fire `delay` seconds from now instead (re-arms a fired or cancelled timer)."""
+        self._scheduler._push(self, self._scheduler.clock.monotonic() + max(delay, 0.0))
+
+    def reschedule_at(self, deadline: float) -> None:
+        self._scheduler._push(self, deadline)
+
+
+class TimerScheduler:
+    """Heap of deadlines on `clock`, fired by one thread or by a virtual clock."""
+
+    def __init__(self, clock: Optional[Clock] = None, *, name: str = "BaymaxTimers") -> None:
+        self.clock = clock or system_clock
+        self._name = name
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._seq = itertools.count()
+        self._live = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.fired = 0
+        self.cancelled = 0
+        self.late_total = 0.0
+        self.late_max = 0.0
+
+        attach = getattr(self.clock, "attach_timers", None)
+        # A virtual clock runs due timers itself as it advances; no thread needed.
+        self._threaded = attach is None
+        if attach is not None:
+            attach(self)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> TimerHandle:
+        """Run `callback()` at `deadline` on `clock.monotonic()`'s timeline."""
+        handle = TimerHandle(self, callback)
+        self._push(handle, deadline)
+        return handle
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        return self.call_at(self.clock.monotonic() + max(delay, 0.0), callback)
+
+    def next_deadline(self) -> Optional[float]:
+        with self._cond:
+            self._skip_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def next_delay(self) -> Optional[float]:
+        deadline = self.next_deadline()
+        return None if deadline is None else max(deadline - self.clock.monotonic(), 0.0)
+
+    def pending(self) -> int:
+        return self._live
+
+    def run_due(self) -> int:
+        """Run every callback whose deadline has passed; returns how many ran."""
+        now = self.clock.monotonic()
+        due: List[Tuple[float, TimerHandle]] = []
+        with self._cond:
+            self._skip_stale()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, _seq, handle = heapq.heappop(self._heap)
+                handle._pending = False
+                self._live -= 1
+                due.append((deadline, handle))
+                self._skip_stale()
+        for deadline, handle in due:
+            late = max(now - deadline, 0.0)
+            self.fired += 1
+            self.late_total += late
+            if late > self.late_max:
+                self.late_max = late
+            _LATENESS.observe(late)
+            try:
+                handle.callback()
+            except Exception as exc:  # pragma: no cover - callback failure
+                print("[Timers] Callback failed:", exc)
+        return len(due)
+
+    # ------------------------------------------------------------------
+    # Dispatcher thread
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Start the dispatcher thread (done on the first timer; no-op on a virtual clock)."""
+        if not self._threaded:
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._live,
+            "heap": len(self._heap),
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "late_avg_ms": 1000.0 * self.late_total / self.fired if self.fired else 0.0,
+            "late_max_ms": 1000.0 * self.late_max,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                self._skip_stale()
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - self.clock.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+            self.run_due()
+
+    def _push(self, handle: TimerHandle, deadline: float) -> None:
+        with self._cond:
+            if not handle._pending:
+                self._live += 1
+            handle._pending = True
+            handle.deadline = deadline
+            handle._seq = next(self._seq)
+            earliest = not self._heap or deadline < self._heap[0][0]
+            heapq.heappush(self._heap, (deadline, handle._seq, handle))
+            self._maybe_compact()
+            if earliest:
+                self._cond.notify()
+        if self._threaded and self._thread is None:
+            self.start()
+
+    def _cancel(self, handle: TimerHandle) -> bool:
+        with self._cond:
+            if not handle._pending:
+                return False
+            handle._pending = False
+            handle._seq = -1
+            self._live -= 1
+            self.cancelled += 1
+            self._maybe_compact()
+            return True
+
+    def _skip_stale(self) -> None:
+        heap = self._heap
+        while heap and heap[0][1] != heap[0][2]._seq:
+            heapq.heappop(heap)
+
+    def _maybe_compact(self) -> None:
+        stale = len(self._heap) - self._live
+        if stale > _COMPACT_MIN_STALE and stale > self._live:
+            self._heap = [entry for entry in self._heap if entry[1] == entry[2]._seq]
+            heapq.heapify(self._heap)
+
+
+class TimedFlag:
+    """True until a deadline; the scheduler clears it, so readers never compare timestamps.
+
+    `set_for` only ever extends the window. `clear()` ends it early without
+    calling `on_expire`, which runs only when the window runs out.
+    """
+
+    def __init__(self, timers: TimerScheduler, on_expire: Optional[Callable[[], None]] = None) -> None:
+        self._timers = timers
+        self._on_expire = on_expire
+        self._lock = threading.Lock()
+        self._timer: Optional[TimerHandle] = None
+        self._set = False
+
+    def __bool__(self) -> bool:
+        return self._set
+
+    def set_for(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        deadline = self._timers.clock.monotonic() + seconds
+        with self._lock:
+            timer = self._timer
+            if timer is not None and timer.active and timer.deadline >= deadline:
+                return
+            self._set = True
+            if timer is None:
+                self._timer = self._timers.call_at(deadline, self._expire)
+            else:
+                timer.reschedule_at(deadline)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._set = False
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def remaining(self) -> float:
+        timer = self._timer
+        return timer.remaining() if self._set and timer is not None else 0.0
+
+    def _expire(self) -> None:
+        with self._lock:
+            if not self._set or self._timer is None or self._timer.active:
+                return  # cleared, or extended after this deadline was popped
+            self._set = False
+        if self._on_expire is not None:
+            self._on_expire()
+
+
+_schedulers: "weakref.WeakKeyDictionary[Clock, TimerScheduler]" = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def timers_for(clock: Optional[Clock] = None) -> TimerScheduler:
+    """The scheduler shared by everything on `clock` (one per process for the system clock)."""
+    clock = clock or system_clock
+    with _schedulers_lock:
+        scheduler = _schedulers.get(clock)
+        if scheduler is None:
+            scheduler = _schedulers[clock] = TimerScheduler(clock)
+        return scheduler
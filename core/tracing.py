@@ -0,0 +1,160 @@
+"""Per-turn latency tracing.
+
+Each user turn gets an ID when its final transcript arrives; subsystems then
+`mark()` named events on a monotonic clock (end of speech, Deepgram final,
+LLM first token, TTS first byte, playback, unmute). Events go to a compact
+JSONL file, one object per line: `{"turn": 3, "ev": "stt_final", "t": 12.345678}`.
+Tracing is off until `tracer.open(path)` is called, and marks are then a
+lock plus one buffered write. Each `open` appends a `clock` record that
+starts a new run; turn IDs restart with every run, so the analyzer keys
+turns by (run, turn).
+
+    python3 -m core.tracing baymax_trace.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# (stage, start event, end event, measure to the last end event instead of the first)
+STAGES = (
+    ("stt_finalize", "end_of_speech", "stt_final", False),
+    ("dispatch", "stt_final", "processing_enter", False),
+    ("llm_first_token", "llm_request", "llm_first_token", False),
+    ("llm_total", "llm_request", "llm_done", False),
+    ("tts_first_byte", "tts_request", "tts_first_byte", False),
+    ("tts_total", "tts_request", "tts_done", False),
+    ("playback", "playback_start", "playback_end", True),
+    ("unmute_gap", "playback_end", "unmute", True),
+    ("response_latency", "end_of_speech", "playback_start", False),
+)
+
+
+class Tracer:
+    """Thread-safe event recorder keyed by turn ID."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._file = None
+        self._turn = 0
+        self._current: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    @property
+    def current_turn(self) -> Optional[int]:
+        return self._current
+
+    def open(self, path: str) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(path, "a", encoding="utf-8")
+            # Lets readers map monotonic stamps back to wall-clock time.
+            self._write({"ev": "clock", "t": round(time.monotonic(), 6), "wall": round(time.time(), 3)})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def begin_turn(self) -> Optional[int]:
+        if self._file is None:
+            return None
+        with self._lock:
+            self._turn += 1
+            self._current = self._turn
+            return self._current
+
+    def end_turn(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            self._current = None
+
+    def mark(self, event: str, *, at: Optional[float] = None, turn: Optional[int] = None, **fields) -> None:
+        """Record `event` at monotonic time `at` (default now) for `turn` (default current)."""
+        if self._file is None:
+            return
+        turn = self._current if turn is None else turn
+        if turn is None:
+            return
+        record = {"turn": turn, "ev": event, "t": round(time.monotonic() if at is None else at, 6)}
+        record.update(fields)
+        with self._lock:
+            if self._file is not None:
+                self._write(record)
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+tracer = Tracer()
+
+
+def load_turns(path: str) -> Dict[Tuple[int, int], Dict[str, List[float]]]:
+    """Group trace events as {(run, turn): {event: [times...]}}; each `clock` record starts a run."""
+    turns: Dict[Tuple[int, int], Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    run = 0
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("ev") == "clock" and "turn" not in record:
+                run += 1
+            elif "turn" in record:
+                turns[(run, record["turn"])][record["ev"]].append(record["t"])
+    return turns
+
+
+def stage_durations(turns: Dict[Tuple[int, int], Dict[str, List[float]]]) -> Dict[str, List[float]]:
+    """Per-stage durations in milliseconds across every turn that has both events."""
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for events in turns.values():
+        for stage, start_event, end_event, use_last in STAGES:
+            starts, ends = events.get(start_event), events.get(end_event)
+            if not starts or not ends:
+                continue
+            start = min(starts)
+            after = [t for t in ends if t >= start]
+            if after:
+                end = max(after) if use_last else min(after)
+                durations[stage].append((end - start) * 1000.0)
+    return durations
+
+
+def summarize(path: str) -> Dict[str, dict]:
+    summary = {}
+    for stage, values in stage_durations(load_turns(path)).items():
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        summary[stage] = {"count": len(values), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-stage latency percentiles from a Baymax trace")
+    parser.add_argument("trace", help="JSONL trace written with TRACE_FILE")
+    args = parser.parse_args()
+
+    summary = summarize(args.trace)
+    print(f"{'stage':<18} {'turns':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for stage, *_ in STAGES:
+        row = summary.get(stage)
+        if row:
+            print(f"{stage:<18} {row['count']:>5} {row['p50_ms']:>7.0f}ms {row['p95_ms']:>7.0f}ms {row['p99_ms']:>7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 class AudioInterface(ABC):
     """Interface for audio input systems."""
@@ -9,8 +10,8 @@ class AudioInterface(ABC):
         pass
 
     @abstractmethod
-    def read_audio_chunk(self) -> bytes:
-        """Read an audio chunk and return raw bytes."""
+    def read_audio_chunk(self, frames: Optional[int] = None) -> bytes:
+        """Read an audio chunk (default size, or `frames` frames) and return raw bytes."""
         pass
 
     @abstractmethod
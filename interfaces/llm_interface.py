@@ -5,8 +5,8 @@ class LLMInterface(ABC):
     """Interface for LLM-based response generation."""
 
     @abstractmethod
-    def generate(self, text: str) -> str:
-        """Generate a reply from raw user text."""
+    def generate(self, text: str, *, cancel=None) -> str:
+        """Generate a reply from raw user text; stop early once `cancel` (a `CancelToken`) fires."""
         pass
 
     def generate_reply(self, messages: List[Dict[str, Any]]) -> str:
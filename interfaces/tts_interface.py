@@ -4,6 +4,6 @@ class TTSInterface(ABC):
     """Interface for text-to-speech engines."""
 
     @abstractmethod
-    def speak(self, text: str) -> None:
-        """Convert text to speech and play the audio."""
+    def speak(self, text: str, *, cancel=None) -> None:
+        """Convert text to speech and play the audio; stop early once `cancel` (a `CancelToken`) fires."""
         pass
@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class WakeWordInterface(ABC):
+    """Interface for wake detectors (energy gate, local keyword spotter, ...)."""
+
+    @abstractmethod
+    def detect(self, audio_chunk: Optional[bytes]) -> bool:
+        """Feed 16-bit mono PCM; return True when the wake phrase was just heard."""
+        pass
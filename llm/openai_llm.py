@@ -1,17 +1,31 @@
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional
 
 from interfaces.llm_interface import LLMInterface
 from config_app.settings import settings
+from core.cancellation import Cancelled, CancelToken
+from core.metrics import metrics
+from core.tracing import tracer
+
+_FIRST_TOKEN = metrics.histogram("baymax_llm_first_token_seconds", "LLM request to first streamed token")
+_COMPLETION = metrics.histogram("baymax_llm_seconds", "LLM request to complete reply")
 
 class OpenAILLM(LLMInterface):
     """OpenAI GPT wrapper with Baymax persona and conversation memory."""
 
-    def __init__(self):
-        """Initialize the OpenAI client, persona prompts, and conversation history."""
+    def __init__(self, client=None, response_cache=None):
+        """Initialize the OpenAI client, persona prompts, and conversation history.
+
+        Pass `client` to share one OpenAI client (and its connection pool) between
+        conversations; otherwise it is created lazily on first use. A
+        `response_cache` (get/put of bytes by key) answers opening questions
+        that another conversation already asked.
+        """
         if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is missing in .env")
 
-        self.client = None  # Lazy loaded on first use
+        self.client = client
+        self.response_cache = response_cache
 
         self.model = "gpt-4o-mini"  # Faster model for lower latency
 
@@ -82,8 +96,12 @@ class OpenAILLM(LLMInterface):
         except Exception as e:
             print("[OpenAI LLM] Warning: SDK import error:", e)
 
-    def generate(self, text: str) -> str:
-        """Generate a simple chat completion from user text."""
+    def generate(self, text: str, *, cancel: Optional[CancelToken] = None) -> str:
+        """Generate a simple chat completion from user text.
+
+        Cancelling `cancel` closes the completion stream and raises `Cancelled`;
+        the unanswered message is dropped from the history.
+        """
         print("[OpenAI LLM] generate() called...")
 
         user_message = text.strip()
@@ -105,36 +123,78 @@ class OpenAILLM(LLMInterface):
             self._append_history("assistant", custom)
             return custom
 
+        # Only an opening question has no context, so only its reply is safe to share.
+        cache_key = f"{self.model}|{text_lower}" if self.response_cache and len(self._conversation_history) == 2 else None
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                reply = cached.decode("utf-8")
+                self._append_history("assistant", reply)
+                return reply
+
         self._ensure_client()
         if not self.client:
             reply = "I'm here, but my LLM brain is offline."
             self._append_history("assistant", reply)
             return reply
 
+        unregister = None
         try:
             messages = self._conversation_history[-(self._max_history_messages + 1):]
+            if cancel is not None:
+                cancel.raise_if_cancelled()
 
-            completion = self.client.chat.completions.create(
+            tracer.mark("llm_request")
+            started = time.monotonic()
+            # Streamed so the first token can be timed; the reply is still returned whole.
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,  # type: ignore[arg-type]
                 max_tokens=120,
                 temperature=0.3,
+                stream=True,
             )
-
-            choice = completion.choices[0]
-            reply = getattr(choice.message, "content", None)
-            if not reply and isinstance(choice.message, dict):
-                reply = choice.message.get("content")
-
-            reply = reply or "I’m having trouble thinking right now."
+            if cancel is not None:
+                # Closing the HTTP response ends the iteration below from the cancelling thread.
+                unregister = cancel.on_cancel(stream.close)
+
+            parts: List[str] = []
+            for chunk in stream:
+                if cancel is not None and cancel.cancelled:
+                    break
+                if not chunk.choices:
+                    continue
+                delta = getattr(chunk.choices[0].delta, "content", None)
+                if delta:
+                    if not parts:
+                        tracer.mark("llm_first_token")
+                        _FIRST_TOKEN.observe(time.monotonic() - started)
+                    parts.append(delta)
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            tracer.mark("llm_done")
+            _COMPLETION.observe(time.monotonic() - started)
+
+            reply = "".join(parts).strip()
+            if not reply:
+                reply = "I’m having trouble thinking right now."
+            elif cache_key:
+                self.response_cache.put(cache_key, reply.encode("utf-8"))
             self._append_history("assistant", reply)
             return reply
 
         except Exception as e:
+            if cancel is not None and cancel.cancelled:
+                print("[OpenAI LLM] Request cancelled")
+                self._drop_unanswered(user_message)
+                raise Cancelled(cancel.reason) from None
             print("[OpenAI LLM] Error generating reply:", e)
             fallback = "I am here to help you. How are you feeling?"
             self._append_history("assistant", fallback)
             return fallback
+        finally:
+            if unregister is not None:
+                unregister()
 
     # ------------------------------------------------------
     # Required by LLMInterface — stub that calls generate()
@@ -147,6 +207,16 @@ class OpenAILLM(LLMInterface):
         user_msg = messages[-1].get("content", "")
         return self.generate(user_msg)
 
+    def history(self) -> List[Dict[str, str]]:
+        """The conversation so far, without the system prompt."""
+        return [dict(message) for message in self._conversation_history[1:]]
+
+    def restore_history(self, messages: List[Dict[str, str]]) -> None:
+        """Continue a conversation saved by `history()` (e.g. on another worker)."""
+        for message in messages:
+            if message.get("role") in ("user", "assistant"):
+                self._append_history(message["role"], message.get("content", ""))
+
     # ------------------------------------------------------
     # Helpers
     # ------------------------------------------------------
@@ -162,6 +232,12 @@ class OpenAILLM(LLMInterface):
             # preserve the system prompt
             self._conversation_history = [self._conversation_history[0]] + self._conversation_history[-self._max_history_messages:]
 
+    def _drop_unanswered(self, content: str) -> None:
+        """Forget a user message whose reply was cancelled."""
+        last = self._conversation_history[-1]
+        if len(self._conversation_history) > 1 and last["role"] == "user" and last["content"] == content:
+            self._conversation_history.pop()
+
     def _custom_responses_lookup(self, text_lower: str) -> str:
         """Return a canned response if input matches a predefined phrase."""
         for phrase, response in self._custom_responses.items():
@@ -4,7 +4,10 @@ import threading
 import time
 from dotenv import load_dotenv
 
+from audio.bus import AudioBus
+from audio.framing import FramingPolicy
 from audio.microphone import Microphone
+from audio.shm_capture import SharedMemoryCapture
 from config_app.settings import settings
 from stt.deepgram_stt import DeepgramSTT
 
@@ -16,7 +19,9 @@ from llm.openai_llm import OpenAILLM
 from tts.elevenlabs_tts import ElevenLabsTTS
 from app_states.state_manager import StateManager
 from core.idle_monitor import IdleMonitor
-from wakeword.wakeword_detector import WakeWordDetector
+from core.metrics import MetricsServer, metrics
+from core.tracing import tracer
+from wakeword.factory import create_wake_detector
 
 # Load .env variables
 load_dotenv()
@@ -37,6 +42,19 @@ def _play_startup_audio(tts: ElevenLabsTTS) -> None:
         subprocess.run(["afplay", _STARTUP_AUDIO], check=False)
 
 
+def _register_audio_gauges(capture, audio_bus) -> None:
+    """Expose capture health and bus lag as scrape-time gauges (nothing on the audio path)."""
+    stats = getattr(capture, "capture_stats", None) or getattr(capture, "stats", None)
+    if stats:
+        health = metrics.gauge("baymax_capture", "Capture health counters and latency", ("field",))
+        for field in stats():
+            health.labels(field).set_function(lambda field=field: stats()[field])
+    if audio_bus:
+        lag = metrics.gauge("baymax_audio_bus_lag_frames", "Frames a bus subscriber is behind", ("subscriber",))
+        for name in audio_bus.stats():
+            lag.labels(name).set_function(lambda name=name: audio_bus.stats()[name]["lag_frames"])
+
+
 def _announce_system_online(tts: ElevenLabsTTS, stt_stream) -> None:
     """Speak a readiness announcement without leaving the state machine."""
     try:
@@ -80,15 +98,48 @@ def main():
     _validate_environment()
 
     # Initialize core modules
-    mic = Microphone()
+    framing = None
+    if settings.ADAPTIVE_FRAMING:
+        framing = FramingPolicy(
+            settings.SAMPLE_RATE,
+            active_ms=settings.FRAME_MS_ACTIVE,
+            muted_ms=settings.FRAME_MS_MUTED,
+            asleep_ms=settings.FRAME_MS_ASLEEP,
+            max_coalesce=settings.FRAME_MAX_COALESCE,
+        )
+    if settings.CAPTURE_PROCESS:
+        # Capture and the wake gate run in a child process, away from this GIL.
+        mic = SharedMemoryCapture(
+            settings.SAMPLE_RATE,
+            block_frames=framing.smallest_frame if framing else 320,
+            chunk_size=settings.CHUNK_SIZE,
+            dsp_factory=create_wake_detector,
+        )
+        wake = mic.wake_detector()
+    else:
+        mic = Microphone(block_size=framing.smallest_frame if framing else None)
+        wake = create_wake_detector()
+    capture = mic
+    audio_bus = None
+    stream_mic = mic
+    if settings.AUDIO_BUS:
+        # One capture thread; the sender and the state machine read separate cursors.
+        audio_bus = AudioBus(mic.sample_rate, mic.channels, capacity_seconds=settings.AUDIO_BUS_SECONDS)
+        audio_bus.start(mic, block_frames=framing.smallest_frame if framing else 320)
+        stream_mic = audio_bus.tap("deepgram")
+        mic = audio_bus.tap("state")
+    metrics_server = None
+    if settings.METRICS_PORT:
+        _register_audio_gauges(capture, audio_bus)
+        metrics_server = MetricsServer(host=settings.METRICS_HOST, port=settings.METRICS_PORT)
+        metrics_server.start()
+        print(f"[Metrics] Telemetry at {metrics_server.url}/ (Prometheus: /metrics)")
+    if settings.TRACE_FILE:
+        tracer.open(settings.TRACE_FILE)
+        print(f"[Trace] Writing per-turn latency events to {settings.TRACE_FILE}")
     stt = DeepgramSTT()
     llm = OpenAILLM()
     tts = ElevenLabsTTS()
-    wake = WakeWordDetector(
-        energy_threshold=settings.WAKE_ENERGY_THRESHOLD,
-        required_hits=settings.WAKE_REQUIRED_HITS,
-        debug_interval=settings.WAKE_DEBUG_INTERVAL,
-    )
 
     # Play startup announcement in background while we set up streaming
     startup_thread = threading.Thread(target=_play_startup_audio, args=(tts,), daemon=True)
@@ -99,7 +150,7 @@ def main():
     idle_monitor = None
     if DeepgramStreamingService is not None:
         try:
-            stt_stream = DeepgramStreamingService(microphone=mic)
+            stt_stream = DeepgramStreamingService(microphone=stream_mic, framing=framing)
             stt_stream.start()
         except Exception as exc:
             print("[STT] Streaming unavailable:", exc)
@@ -136,10 +187,17 @@ def main():
     except KeyboardInterrupt:
         print("\n=== Baymax 2.0 – Shutting down ===")
     finally:
+        manager.shutdown()
+        tracer.close()
+        if metrics_server:
+            metrics_server.stop()
         if stt_stream:
             stt_stream.stop()
         if idle_monitor:
             idle_monitor.stop()
+        if audio_bus:
+            print("[AudioBus] Subscriber stats:", audio_bus.stats())
+            audio_bus.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,265 @@
+"""Multi-session server: many thin-client devices in one process.
+
+Each websocket connection is a device. It sends 16-bit mono PCM as binary
+frames and JSON control messages as text; the server answers with state
+updates and the clips to play. Every connection gets its own `Session`
+(state machine, conversation history, remote mic/player), while the event
+loop, the step worker pool, the provider clients and the phrase cache are
+shared.
+
+Protocol (text frames are JSON). A device may also name its session in the
+URL (`ws://host:8770/session/kitchen`), which is what the sharded
+supervisor routes on:
+
+    device -> server   {"type": "hello", "session": "kitchen", "sample_rate": 16000}
+                       <binary PCM frames>
+                       {"type": "played", "id": 3}        clip finished on the device
+                       {"type": "bye"}
+    server -> device   {"type": "ready", "session": "kitchen"}  (+ "resumed": true after a handover)
+                       {"type": "state", "state": "listening"}
+                       {"type": "play", "id": 3, "seconds": 1.8} then the WAV as a binary frame
+                       {"type": "stop", "id": 3}          cut playback short
+
+    python3 -m server.app --port 8770
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from config_app.settings import settings
+from core.metrics import MetricsServer, metrics
+from server.session import Session, SharedResources
+
+try:
+    from websockets.asyncio.server import serve
+    from websockets.exceptions import ConnectionClosed
+except Exception as exc:  # pragma: no cover - import guard
+    serve = None  # type: ignore
+    ConnectionClosed = Exception  # type: ignore
+    _IMPORT_ERROR = exc
+else:
+    _IMPORT_ERROR = None
+
+_CONNECTIONS = metrics.counter("baymax_server_connections_total", "Device connections accepted")
+_AUDIO_BYTES = metrics.counter("baymax_server_audio_bytes_total", "PCM bytes received from devices")
+_SESSIONS = metrics.gauge("baymax_server_sessions", "Connected sessions by conversation state", ("state",))
+_SESSION_QUEUES = metrics.gauge("baymax_server_queue_depth", "Items waiting across all sessions' queues", ("queue",))
+
+
+def session_from_path(path: str) -> str:
+    """Session ID from `/session/<id>` or `?session=<id>`; empty when absent."""
+    parts = urlsplit(path)
+    query = parse_qs(parts.query).get("session")
+    if query:
+        return query[0]
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if len(segments) == 2 and segments[0] == "session":
+        return unquote(segments[1])
+    return ""
+
+
+def deepgram_stream_factory(mic):
+    """One Deepgram live stream per session, reading the session's remote mic."""
+    from stt.deepgram_live import DeepgramStreamingService
+
+    return DeepgramStreamingService(microphone=mic)
+
+
+class BaymaxServer:
+    """Accepts device websockets and multiplexes their sessions on one event loop."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8770,
+        shared: Optional[SharedResources] = None,
+        stream_factory: Callable = deepgram_stream_factory,
+        workers: int = 16,
+        audio_root: str = "audio/sessions",
+    ) -> None:
+        if serve is None:  # pragma: no cover - import guard
+            raise ImportError("websockets is not available" + (f": {_IMPORT_ERROR}" if _IMPORT_ERROR else ""))
+        self.host = host
+        self.port = port
+        self._shared = shared
+        self._stream_factory = stream_factory
+        self._audio_root = audio_root
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="BaymaxSession")
+        self._server = None
+        self.sessions: Dict[str, Session] = {}
+        for state in ("sleep", "wake", "listening", "processing", "speaking", "idle"):
+            _SESSIONS.labels(state).set_function(lambda state=state: self._count_state(state))
+        _SESSION_QUEUES.labels("wake_events").set_function(lambda: self._sum_sessions(lambda m: m.pending_wake_events()))
+        _SESSION_QUEUES.labels("transcripts").set_function(lambda: self._sum_sessions(lambda m: m.pending_transcripts()))
+
+    async def start(self) -> None:
+        if self._shared is None:
+            self._shared = SharedResources()
+        # PCM barely compresses; permessage-deflate would only burn CPU on every frame.
+        self._server = await serve(self._handle, self.host, self.port, max_size=2**20, compression=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"[Server] Listening on ws://{self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        loop = asyncio.get_running_loop()
+        for session in list(self.sessions.values()):
+            await loop.run_in_executor(self._executor, session.close)
+        self.sessions.clear()
+        self._executor.shutdown(wait=False)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Future()
+        finally:
+            await self.stop()
+
+    def stats(self) -> dict:
+        cache = self._shared.phrase_cache.stats() if self._shared else {}
+        return {"sessions": len(self.sessions), "phrase_cache": cache}
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    async def _handle(self, websocket) -> None:
+        loop = asyncio.get_running_loop()
+        hello, first_audio = await self._read_hello(websocket)
+        request = getattr(websocket, "request", None)
+        session_id = str(
+            hello.get("session") or session_from_path(request.path if request else "") or uuid.uuid4().hex[:12]
+        )
+
+        previous = self.sessions.pop(session_id, None)
+        if previous is not None:
+            # The device reconnected: the old connection's session is stale.
+            print(f"[Server] {session_id}: replacing previous connection")
+            await loop.run_in_executor(self._executor, previous.close)
+
+        outbox: asyncio.Queue = asyncio.Queue()
+
+        def send(message) -> None:
+            loop.call_soon_threadsafe(outbox.put_nowait, message)
+
+        try:
+            session = await loop.run_in_executor(
+                self._executor,
+                lambda: Session(
+                    session_id,
+                    shared=self._shared,
+                    stream_factory=self._stream_factory,
+                    send=send,
+                    loop=loop,
+                    executor=self._executor,
+                    sample_rate=int(hello.get("sample_rate", settings.SAMPLE_RATE)),
+                    channels=int(hello.get("channels", 1)),
+                    audio_root=self._audio_root,
+                ),
+            )
+            ready = {"type": "ready", "session": session_id}
+            if session.resumed:
+                ready["resumed"] = True
+            send(json.dumps(ready))
+            await loop.run_in_executor(self._executor, session.start)
+        except Exception as exc:
+            print(f"[Server] {session_id}: session setup failed:", exc)
+            await websocket.close(1011, "session setup failed")
+            return
+
+        self.sessions[session_id] = session
+        _CONNECTIONS.inc()
+        writer = asyncio.create_task(self._write(websocket, outbox))
+        if first_audio:
+            session.mic.push(first_audio)
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    _AUDIO_BYTES.inc(len(message))
+                    session.mic.push(message)
+                elif not self._control(session, message):
+                    break
+        except ConnectionClosed:
+            pass
+        finally:
+            writer.cancel()
+            if self.sessions.get(session_id) is session:
+                del self.sessions[session_id]
+            await loop.run_in_executor(self._executor, session.close)
+
+    async def _read_hello(self, websocket):
+        """The optional hello message, or the first audio frame when a device skips it."""
+        try:
+            message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
+        except (asyncio.TimeoutError, ConnectionClosed):
+            return {}, b""
+        if isinstance(message, bytes):
+            return {}, message
+        try:
+            hello = json.loads(message)
+        except ValueError:
+            return {}, b""
+        return (hello if isinstance(hello, dict) else {}), b""
+
+    def _control(self, session: Session, message: str) -> bool:
+        """Apply a device control message; False when the device is leaving."""
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return True
+        kind = payload.get("type")
+        if kind == "played":
+            session.player.acknowledge(int(payload.get("id") or 0))
+        elif kind == "bye":
+            return False
+        return True
+
+    async def _write(self, websocket, outbox: asyncio.Queue) -> None:
+        try:
+            while True:
+                await websocket.send(await outbox.get())
+        except (ConnectionClosed, asyncio.CancelledError):
+            pass
+
+    def _count_state(self, state: str) -> int:
+        return sum(1 for session in list(self.sessions.values()) if session.state == state)
+
+    def _sum_sessions(self, value: Callable) -> int:
+        return sum(value(session.manager) for session in list(self.sessions.values()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve many Baymax devices from one process")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="state-machine step threads")
+    args = parser.parse_args()
+
+    metrics_server = None
+    if settings.METRICS_PORT:
+        metrics_server = MetricsServer(host=settings.METRICS_HOST, port=settings.METRICS_PORT)
+        metrics_server.start()
+        print(f"[Metrics] Telemetry at {metrics_server.url}/ (Prometheus: /metrics)")
+
+    server = BaymaxServer(host=args.host, port=args.port, workers=args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n[Server] Shutting down:", server.stats())
+    finally:
+        if metrics_server:
+            metrics_server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Simulated thin-client devices for the multi-session server.
+
+Each simulated device connects, streams 16-bit mono PCM in real time
+(silence by default, or a WAV file spoken once after `--speak-after`
+seconds), acknowledges every clip the server plays after its duration and
+counts what it saw.
+
+    python3 -m server.client_sim --url ws://127.0.0.1:8770 --sessions 200 --seconds 30
+    python3 -m server.client_sim --sessions 1 --wav hey_baymax.wav --speak-after 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import wave
+from collections import Counter
+from typing import Optional
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+
+def load_pcm(path: str, sample_rate: int) -> bytes:
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1 or wf.getframerate() != sample_rate:
+            raise ValueError(f"{path}: expected 16-bit mono {sample_rate} Hz")
+        return wf.readframes(wf.getnframes())
+
+
+class SimulatedDevice:
+    def __init__(
+        self,
+        url: str,
+        name: str,
+        *,
+        sample_rate: int = 16000,
+        frame_ms: float = 100.0,
+        speech: bytes = b"",
+        speak_after: float = 1.0,
+        verbose: bool = False,
+    ) -> None:
+        self.url = url
+        self.name = name
+        self.sample_rate = sample_rate
+        self.frame_bytes = int(sample_rate * frame_ms / 1000.0) * 2
+        self.frame_seconds = frame_ms / 1000.0
+        self.speech = speech
+        self.speak_after = speak_after
+        self.verbose = verbose
+        self.states: Counter = Counter()
+        self.clips = 0
+        self.audio_seconds = 0.0
+        self.connect_ms: Optional[float] = None
+        self.error = ""
+
+    async def run(self, seconds: float) -> None:
+        started = time.monotonic()
+        try:
+            # The session in the URL lets a sharding supervisor route the device.
+            url = f"{self.url.rstrip('/')}/session/{self.name}"
+            async with connect(url, max_size=2**24, compression=None) as websocket:
+                await websocket.send(json.dumps({"type": "hello", "session": self.name, "sample_rate": self.sample_rate}))
+                receiver = asyncio.create_task(self._receive(websocket, started))
+                try:
+                    await self._stream(websocket, started + seconds)
+                    await websocket.send(json.dumps({"type": "bye"}))
+                finally:
+                    receiver.cancel()
+        except (OSError, ConnectionClosed) as exc:
+            self.error = str(exc)
+
+    async def _stream(self, websocket, until: float) -> None:
+        silence = b"\x00" * self.frame_bytes
+        speech_at = time.monotonic() + self.speak_after
+        offset = 0
+        next_send = time.monotonic()
+        while next_send < until:
+            if self.speech and time.monotonic() >= speech_at and offset < len(self.speech):
+                frame = self.speech[offset:offset + self.frame_bytes]
+                offset += len(frame)
+            else:
+                frame = silence
+            await websocket.send(frame)
+            next_send += self.frame_seconds
+            await asyncio.sleep(max(next_send - time.monotonic(), 0.0))
+
+    async def _receive(self, websocket, started: float) -> None:
+        pending_clip = None
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    if pending_clip is not None:
+                        clip_id, seconds = pending_clip
+                        pending_clip = None
+                        self.clips += 1
+                        self.audio_seconds += seconds
+                        asyncio.create_task(self._ack(websocket, clip_id, seconds))
+                    continue
+                payload = json.loads(message)
+                kind = payload.get("type")
+                if kind == "ready" and self.connect_ms is None:
+                    self.connect_ms = (time.monotonic() - started) * 1000.0
+                elif kind == "state":
+                    self.states[payload["state"]] += 1
+                    if self.verbose:
+                        print(f"[{self.name}] state -> {payload['state']}")
+                elif kind == "play":
+                    pending_clip = (payload["id"], float(payload.get("seconds", 0.0)))
+                    if self.verbose:
+                        print(f"[{self.name}] playing clip {payload['id']} ({payload.get('seconds')}s)")
+        except (ConnectionClosed, asyncio.CancelledError):
+            pass
+
+    async def _ack(self, websocket, clip_id: int, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+        try:
+            await websocket.send(json.dumps({"type": "played", "id": clip_id}))
+        except ConnectionClosed:
+            pass
+
+
+async def run_devices(args) -> list:
+    speech = load_pcm(args.wav, args.sample_rate) if args.wav else b""
+    devices = [
+        SimulatedDevice(
+            args.url,
+            f"{args.prefix}{index}",
+            sample_rate=args.sample_rate,
+            frame_ms=args.frame_ms,
+            speech=speech,
+            speak_after=args.speak_after,
+            verbose=args.sessions == 1,
+        )
+        for index in range(args.sessions)
+    ]
+    tasks = []
+    for device in devices:
+        tasks.append(asyncio.create_task(device.run(args.seconds)))
+        # Stagger connects so setup does not arrive as one burst.
+        await asyncio.sleep(args.ramp / max(args.sessions, 1))
+    await asyncio.gather(*tasks)
+    return devices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate Baymax devices against the multi-session server")
+    parser.add_argument("--url", default="ws://127.0.0.1:8770")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long each device stays connected")
+    parser.add_argument("--frame-ms", type=float, default=100.0)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--wav", help="16-bit mono WAV to speak once per device")
+    parser.add_argument("--speak-after", type=float, default=1.0)
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which to open connections")
+    parser.add_argument("--prefix", default="sim-")
+    args = parser.parse_args()
+
+    devices = asyncio.run(run_devices(args))
+    connected = [device for device in devices if device.connect_ms is not None]
+    failed = [device for device in devices if device.error]
+    connect_ms = sorted(device.connect_ms for device in connected) or [0.0]
+    states: Counter = Counter()
+    for device in devices:
+        states.update(device.states)
+    print(f"devices connected: {len(connected)}/{len(devices)}  failed: {len(failed)}")
+    print(f"connect p50 {connect_ms[len(connect_ms) // 2]:.0f} ms  max {connect_ms[-1]:.0f} ms")
+    print(f"clips played: {sum(device.clips for device in devices)}  state changes: {dict(states)}")
+    if failed:
+        print("first error:", failed[0].error)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Audio adapters for a device connected over a websocket.
+
+`RemoteMicrophone` is fed PCM frames by the connection and read by the
+Deepgram sender and wake gate exactly like the local `Microphone`.
+`RemotePlayer` has the `AudioPlayer` interface but ships WAV bytes to the
+device and treats playback as finished when the device acknowledges it (or
+when the clip's duration plus a grace period has passed).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import wave
+from collections import deque
+from typing import Callable, Deque, Optional, Union
+
+from core.clock import Clock, system_clock
+from core.timers import TimedFlag, timers_for
+from interfaces.audio_interface import AudioInterface
+
+Outbound = Union[str, bytes]
+
+
+class RemoteMicrophone(AudioInterface):
+    """Bounded buffer of int16 frames pushed by the network side."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        *,
+        chunk_size: int = 1024,
+        max_buffer_seconds: float = 2.0,
+        read_timeout: float = 0.05,
+        on_audio: Optional[Callable[[], None]] = None,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.clock = clock or system_clock
+        self._frame_bytes = 2 * channels
+        self._chunk_size = chunk_size
+        self._max_bytes = max(int(max_buffer_seconds * sample_rate), chunk_size) * self._frame_bytes
+        self._read_timeout = read_timeout
+        self._on_audio = on_audio
+        self._chunks: Deque[bytes] = deque()
+        self._buffered = 0
+        self._cond = threading.Condition()
+        self._muted = TimedFlag(timers_for(self.clock))
+        self._closed = False
+        self.frames_received = 0
+        self.frames_dropped = 0
+
+    def push(self, pcm: bytes) -> None:
+        """Append frames from the device, dropping the oldest once the buffer is full."""
+        pcm = pcm[: len(pcm) - len(pcm) % self._frame_bytes]
+        if not pcm:
+            return
+        with self._cond:
+            self._chunks.append(pcm)
+            self._buffered += len(pcm)
+            self.frames_received += len(pcm) // self._frame_bytes
+            while self._buffered > self._max_bytes and len(self._chunks) > 1:
+                dropped = self._chunks.popleft()
+                self._buffered -= len(dropped)
+                self.frames_dropped += len(dropped) // self._frame_bytes
+            self._cond.notify_all()
+        if self._on_audio is not None:
+            self._on_audio()
+
+    def start_stream(self):
+        with self._cond:
+            self._closed = False
+
+    def stop_stream(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def read_audio_chunk(self, frames: Optional[int] = None) -> bytes:
+        """Up to `frames` buffered frames; waits briefly only when nothing is buffered."""
+        limit = (frames or self._chunk_size) * self._frame_bytes
+        with self._cond:
+            if not self._chunks and not self._closed:
+                self._cond.wait(self._read_timeout)
+            if self._muted:
+                # Drop what arrived during the mute, like the local mic drains PortAudio.
+                self._chunks.clear()
+                self._buffered = 0
+                return b""
+            parts = []
+            taken = 0
+            while self._chunks and taken < limit:
+                chunk = self._chunks.popleft()
+                if taken + len(chunk) > limit:
+                    keep = limit - taken
+                    self._chunks.appendleft(chunk[keep:])
+                    chunk = chunk[:keep]
+                parts.append(chunk)
+                taken += len(chunk)
+            self._buffered -= taken
+        return b"".join(parts)
+
+    def pending_frames(self) -> int:
+        with self._cond:
+            return self._buffered // self._frame_bytes
+
+    def discard_pending(self) -> None:
+        with self._cond:
+            self._chunks.clear()
+            self._buffered = 0
+
+    def mute_for(self, duration: float) -> None:
+        self._muted.set_for(duration)
+
+    def unmute(self) -> None:
+        self._muted.clear()
+
+    def stats(self) -> dict:
+        return {
+            "frames_received": self.frames_received,
+            "frames_dropped": self.frames_dropped,
+            "buffered_frames": self.pending_frames(),
+        }
+
+
+class RemotePlayer:
+    """`AudioPlayer` look-alike that plays clips on the connected device."""
+
+    def __init__(self, send: Callable[[Outbound], None], *, ack_grace: float = 1.0) -> None:
+        self._send = send
+        self._ack_grace = max(ack_grace, 0.0)
+        self._clip_id = 0
+        self._deadline = 0.0
+        self._finished = threading.Event()
+        self._finished.set()
+
+    @property
+    def is_playing(self) -> bool:
+        return not self._finished.is_set()
+
+    def play(self, path: str) -> None:
+        self.stop()
+        with open(path, "rb") as handle:
+            audio = handle.read()
+        with wave.open(path, "rb") as wf:
+            seconds = wf.getnframes() / wf.getframerate() if wf.getframerate() else 0.0
+        self._clip_id += 1
+        self._deadline = time.monotonic() + seconds + self._ack_grace
+        self._finished.clear()
+        self._send(json.dumps({"type": "play", "id": self._clip_id, "seconds": round(seconds, 3)}))
+        self._send(audio)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block up to `timeout` seconds; True once the device reported the clip done."""
+        if self._finished.is_set():
+            return True
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            self._finished.set()
+            return True
+        return self._finished.wait(remaining if timeout is None else min(timeout, remaining))
+
+    def acknowledge(self, clip_id: int) -> None:
+        """The device finished (or skipped) clip `clip_id`."""
+        if clip_id == self._clip_id:
+            self._finished.set()
+
+    def stop(self) -> None:
+        if self._finished.is_set():
+            return
+        self._finished.set()
+        self._send(json.dumps({"type": "stop", "id": self._clip_id}))
@@ -0,0 +1,280 @@
+"""One connected device: its own state machine, conversation and audio adapters.
+
+Sessions do not own a loop thread. `StateManager` is built in stepped mode:
+every stream event, state change or due timer schedules one `update()` on
+the server's shared worker pool, and states that would have blocked report
+how long they want to wait instead. An idle session therefore costs a
+buffer and a few entries on the process-wide timer heap, not a spinning
+thread. The idle timer hands its inactivity check to the manager, whose
+wake-up schedules the step that runs it at the exact threshold, and a step that plays audio holds its worker until
+the device acknowledges the clip.
+
+With a `SharedStore` a session also keeps a snapshot (conversation and
+whether it was awake) in the store whenever that changes, so the same
+device reconnecting to another worker process picks up where it left off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import shutil
+import threading
+import wave
+from concurrent.futures import Executor
+from typing import Callable, Optional
+
+from app_states.state_manager import StateManager
+from config_app.settings import settings
+from core.cancellation import CancelToken, call_with_cancel
+from core.idle_monitor import IdleMonitor
+from server.remote_io import Outbound, RemoteMicrophone, RemotePlayer
+from server.shared_store import SharedStore, StoreCache
+from tts.phrase_cache import PhraseCache
+from wakeword.factory import create_wake_detector
+
+
+class SharedResources:
+    """Provider clients and caches shared by every session in the process."""
+
+    def __init__(
+        self,
+        *,
+        llm_factory: Optional[Callable[[], object]] = None,
+        tts=None,
+        phrase_cache=None,
+        store: Optional[SharedStore] = None,
+    ) -> None:
+        if llm_factory is None:
+            from llm.openai_llm import OpenAILLM
+
+            # One OpenAI client (one HTTP connection pool); each session keeps its own history.
+            seed = OpenAILLM()
+            seed._ensure_client()
+            replies = StoreCache(store, "llm", ttl=settings.LLM_CACHE_TTL, max_entries=4096) if store else None
+            llm_factory = lambda: OpenAILLM(client=seed.client, response_cache=replies)  # noqa: E731
+        if tts is None:
+            from tts.elevenlabs_tts import ElevenLabsTTS
+
+            tts = ElevenLabsTTS()
+        if phrase_cache is None:
+            phrase_cache = PhraseCache(backing=StoreCache(store, "tts", max_entries=1024) if store else None)
+        self.llm_factory = llm_factory
+        self.tts = tts
+        self.phrase_cache = phrase_cache
+        self.store = store
+
+
+class SessionTTS:
+    """Per-session view of the shared TTS engine with its own output file."""
+
+    def __init__(self, engine, output_path: str, cache: Optional[PhraseCache] = None) -> None:
+        self._engine = engine
+        self._cache = cache
+        self.output_path = output_path
+        self.last_duration = 0.0
+
+    def speak(self, text: str, *, cancel: Optional[CancelToken] = None) -> None:
+        self.last_duration = self.synthesize_to(text, self.output_path, cancel=cancel)
+
+    def synthesize_to(self, text: str, path: str, *, cancel: Optional[CancelToken] = None) -> float:
+        cached = self._cache.get(text) if self._cache and self._cache.cacheable(text) else None
+        if cached is not None:
+            with open(path, "wb") as handle:
+                handle.write(cached)
+            return _wav_seconds(cached)
+        duration = call_with_cancel(self._engine.synthesize_to, text, path, cancel=cancel)
+        if self._cache and duration and self._cache.cacheable(text):
+            with open(path, "rb") as handle:
+                self._cache.put(text, handle.read())
+        return duration
+
+
+def _wav_seconds(audio: bytes) -> float:
+    try:
+        with wave.open(io.BytesIO(audio), "rb") as wf:
+            return wf.getnframes() / wf.getframerate() if wf.getframerate() else 0.0
+    except Exception:
+        return 0.0
+
+
+class Session:
+    """State machine plus remote audio I/O for one websocket connection."""
+
+    def __init__(
+        self,
+        session_id: str,
+        *,
+        shared: SharedResources,
+        stream_factory: Callable[[RemoteMicrophone], object],
+        send: Callable[[Outbound], None],
+        loop: asyncio.AbstractEventLoop,
+        executor: Executor,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        audio_root: str = "audio/sessions",
+    ) -> None:
+        self.session_id = session_id
+        self._loop = loop
+        self._executor = executor
+        self._send = send
+        self._lock = threading.Lock()
+        self._queued = False
+        self._running = False
+        self._again = False
+        self._closed = False
+        self._wake_on_audio = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._last_state = ""
+        self._store = shared.store
+        self._snapshot: Optional[dict] = None
+        self.steps = 0
+
+        self.audio_dir = os.path.join(audio_root, session_id)
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self.mic = RemoteMicrophone(
+            sample_rate,
+            channels,
+            chunk_size=settings.CHUNK_SIZE,
+            max_buffer_seconds=settings.SERVER_MIC_BUFFER_SECONDS,
+            on_audio=self._on_audio,
+        )
+        self.player = RemotePlayer(send)
+        self.stream = stream_factory(self.mic)
+        self.manager = StateManager(
+            mic=self.mic,
+            tts=SessionTTS(shared.tts, os.path.join(self.audio_dir, "output.wav"), shared.phrase_cache),
+            wake=create_wake_detector(),
+            llm=shared.llm_factory(),
+            stt_stream=self.stream,
+            player=self.player,
+            audio_dir=self.audio_dir,
+            on_wakeup=self.schedule,
+            stream_suspend_after=settings.SERVER_STREAM_SUSPEND_AFTER,
+        )
+        # The idle check runs inside a step (`call_on_loop`) like every other transition.
+        self.idle = IdleMonitor(manager=self.manager)
+
+        saved = self._store.load_session(session_id) if self._store else None
+        self.resumed = saved is not None
+        if saved:
+            restore = getattr(self.manager.llm, "restore_history", None)
+            if restore:
+                restore(saved.get("history", []))
+            self._snapshot = saved
+
+    @property
+    def state(self) -> str:
+        return type(self.manager.current_state).__name__.replace("State", "").lower()
+
+    def start(self) -> None:
+        start = getattr(self.stream, "start", None)
+        if start:
+            start()
+        if self._snapshot and self._snapshot.get("awake"):
+            # Mid-conversation handover: skip the wake word, keep listening.
+            self.manager.set_state(self.manager.listening_state)
+        self._save_snapshot()
+        self.idle.start()
+        self.schedule()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self.idle.stop()
+        self._loop.call_soon_threadsafe(self._cancel_timer)
+        self.player.stop()
+        stop = getattr(self.stream, "stop", None)
+        if stop:
+            try:
+                stop()
+            except Exception as exc:
+                print(f"[Server] {self.session_id}: stream stop failed:", exc)
+        self.mic.stop_stream()
+        self.manager.shutdown()
+        self._save_snapshot()
+        shutil.rmtree(self.audio_dir, ignore_errors=True)
+
+    def schedule(self) -> None:
+        """Run one state-machine step on the worker pool (thread-safe, coalesced)."""
+        with self._lock:
+            if self._closed:
+                return
+            if self._running:
+                self._again = True
+                return
+            if self._queued:
+                return
+            self._queued = True
+            self._wake_on_audio = False
+        self._executor.submit(self._step)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _step(self) -> None:
+        with self._lock:
+            self._queued = False
+            self._running = True
+            self._again = False
+        try:
+            self.manager.update()
+            self.steps += 1
+        except Exception as exc:
+            print(f"[Server] {self.session_id}: step failed:", exc)
+        with self._lock:
+            self._running = False
+            again = self._again and not self._closed
+
+        state = self.state
+        if state != self._last_state:
+            self._last_state = state
+            self._send(json.dumps({"type": "state", "state": state}))
+            self._save_snapshot()
+
+        delay = self.manager.consume_next_wakeup()
+        if again or (delay is not None and delay <= 0):
+            self.schedule()
+            return
+        if delay is None:
+            # The state read the mic itself (suspended stream): step again when audio arrives.
+            with self._lock:
+                self._wake_on_audio = True
+            if self._timer is not None:
+                return  # the fallback tick from an earlier step is still pending
+            delay = settings.STATE_LOOP_MAX_WAIT
+        self._loop.call_soon_threadsafe(self._arm_timer, delay)
+
+    def _save_snapshot(self) -> None:
+        """Write the handover snapshot when the conversation or awake flag changed."""
+        if self._store is None:
+            return
+        history = getattr(self.manager.llm, "history", None)
+        snapshot = {"history": history() if callable(history) else [], "awake": self.manager.is_awake}
+        if snapshot == self._snapshot:
+            return
+        try:
+            self._store.save_session(self.session_id, snapshot)
+            self._snapshot = snapshot
+        except Exception as exc:
+            print(f"[Server] {self.session_id}: snapshot failed:", exc)
+
+    def _on_audio(self) -> None:
+        if self._wake_on_audio:
+            self.schedule()
+
+    def _arm_timer(self, delay: float) -> None:
+        self._cancel_timer()
+        if not self._closed:
+            self._timer = self._loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self.schedule()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
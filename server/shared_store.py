@@ -0,0 +1,112 @@
+"""SQLite store shared by every worker process of a sharded server.
+
+One local database file in WAL mode: readers never block the writer and
+each process keeps its own connections, so TTS audio, LLM replies and
+session snapshots written by one worker are visible to the others without
+a broker. Snapshots let a session move to another worker (crash, restart,
+ring change) and keep its conversation.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    snapshot TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+class SharedStore:
+    """Cache entries and session snapshots in one WAL-mode SQLite file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        self.journal_mode = connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            # WAL makes NORMAL durable across process crashes; only power loss can drop the tail.
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, namespace: str, key: str, *, ttl: Optional[float] = None) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value, created FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        if ttl is not None and time.time() - row[1] > ttl:
+            return None
+        return bytes(row[0])
+
+    def put(self, namespace: str, key: str, value: bytes, *, max_entries: int = 0) -> None:
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, created) VALUES (?, ?, ?, ?)",
+            (namespace, key, value, time.time()),
+        )
+        if max_entries > 0:
+            connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key NOT IN "
+                "(SELECT key FROM cache WHERE namespace = ? ORDER BY created DESC LIMIT ?)",
+                (namespace, namespace, max_entries),
+            )
+
+    def load_session(self, session_id: str) -> Optional[dict]:
+        row = self._connection().execute(
+            "SELECT snapshot FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_session(self, session_id: str, snapshot: dict) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, snapshot, updated) VALUES (?, ?, ?)",
+            (session_id, json.dumps(snapshot), time.time()),
+        )
+
+    def prune_sessions(self, max_age: float) -> int:
+        cursor = self._connection().execute("DELETE FROM sessions WHERE updated < ?", (time.time() - max_age,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class StoreCache:
+    """One namespace of a `SharedStore` behind a plain get/put interface."""
+
+    def __init__(self, store: SharedStore, namespace: str, *, ttl: Optional[float] = None, max_entries: int = 0) -> None:
+        self._store = store
+        self._namespace = namespace
+        self._ttl = ttl
+        self._max_entries = max_entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._store.get(self._namespace, key, ttl=self._ttl)
+
+    def put(self, key: str, value: bytes) -> None:
+        self._store.put(self._namespace, key, value, max_entries=self._max_entries)
@@ -0,0 +1,364 @@
+"""Sharded server: a supervisor spreading sessions over worker processes.
+
+Each worker is a full `BaymaxServer` in its own process (its own GIL, event
+loop and step pool) on its own port. The supervisor owns the public port but
+never carries audio: it reads the websocket upgrade request, hashes the
+session ID from the URL (`/session/<id>` or `?session=<id>`) onto a
+consistent-hash ring of live workers and answers with a 307 redirect to that
+worker, which websocket clients follow before the handshake. Adding or losing
+a worker only moves the sessions that hashed to it.
+
+Workers share one SQLite store (WAL mode) for synthesized phrases, opening
+LLM replies and session snapshots. When a worker dies the supervisor drops
+it from the ring, so its devices reconnect to the next worker and resume
+their conversation from the snapshot, and restarts it on the same port;
+once it is ready it takes its sessions back on their next connection.
+
+    python3 -m server.supervisor --port 8770 --processes 4
+    curl http://127.0.0.1:8770/status
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import signal
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+from config_app.settings import settings
+from core.metrics import MetricsServer, metrics
+from server.app import session_from_path
+from server.shared_store import SharedStore
+
+_REDIRECTS = metrics.counter("baymax_supervisor_redirects_total", "Connections routed to a worker", ("worker",))
+_RESTARTS = metrics.counter("baymax_supervisor_restarts_total", "Worker processes restarted after exiting")
+
+
+class HashRing:
+    """Consistent hashing with virtual nodes; keys only move off removed nodes."""
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 64) -> None:
+        self._replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+    @property
+    def nodes(self) -> set:
+        return set(self._owners.values())
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        for replica in range(self._replicas):
+            point = self._hash(f"{node}#{replica}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node: str) -> None:
+        points = [point for point, owner in self._owners.items() if owner == node]
+        for point in points:
+            del self._owners[point]
+        if points:
+            self._points = sorted(self._owners)
+
+    def lookup(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+def _load(spec: str) -> Callable:
+    """`package.module:attribute` -> the attribute (workers get factories by name)."""
+    module, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def _worker_main(index: int, host: str, port, ready, options: dict) -> None:
+    """Entry point of one worker process: a `BaymaxServer` on the shared store."""
+    from server.app import BaymaxServer, deepgram_stream_factory
+    from server.session import SharedResources
+
+    # Ctrl-C reaches the whole process group; the supervisor decides when workers stop.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    store = SharedStore(options["store_path"])
+    shared = _load(options["resources"])(store) if options["resources"] else SharedResources(store=store)
+    stream_factory = _load(options["stream_factory"]) if options["stream_factory"] else deepgram_stream_factory
+    server = BaymaxServer(
+        host=host,
+        port=port.value,
+        shared=shared,
+        stream_factory=stream_factory,
+        workers=options["threads"],
+        audio_root=os.path.join(options["audio_root"], f"worker-{index}"),
+    )
+
+    async def serve() -> None:
+        stopped = asyncio.get_running_loop().create_future()
+        # SIGTERM closes sessions (saving their snapshots) instead of dying mid-turn.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.cancel)
+        await server.start()
+        port.value = server.port
+        ready.set()
+        try:
+            await stopped
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await server.stop()
+
+    asyncio.run(serve())
+
+
+class _Worker:
+    def __init__(self, index: int, context) -> None:
+        self.index = index
+        self.name = f"worker-{index}"
+        self.port = context.Value("i", 0)
+        self.ready = context.Event()
+        self.process = None
+        self.restarts = 0
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.backoff = 0.5
+        self.routed = 0
+
+
+class Supervisor:
+    """Routes device connections to worker processes and keeps the workers running."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8770,
+        processes: int = 2,
+        store_path: str = ".baymax_shared.db",
+        stream_factory: str = "",
+        resources: str = "",
+        threads: int = 16,
+        audio_root: str = "audio/sessions",
+        check_interval: float = 0.2,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self._context = multiprocessing.get_context("spawn")
+        self._options = {
+            "store_path": store_path,
+            "stream_factory": stream_factory,
+            "resources": resources,
+            "threads": threads,
+            "audio_root": audio_root,
+        }
+        self._check_interval = check_interval
+        self.workers = [_Worker(index, self._context) for index in range(max(processes, 1))]
+        self.ring = HashRing()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._monitor: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self, ready_timeout: float = 30.0) -> None:
+        store = SharedStore(self._options["store_path"])
+        pruned = store.prune_sessions(settings.SESSION_SNAPSHOT_TTL)
+        store.close()
+        if pruned:
+            print(f"[Supervisor] Pruned {pruned} stale session snapshots")
+
+        for worker in self.workers:
+            self._spawn(worker)
+        loop = asyncio.get_running_loop()
+        for worker in self.workers:
+            await loop.run_in_executor(None, worker.ready.wait, ready_timeout)
+        self._refresh_ring()
+
+        self._server = await asyncio.start_server(self._route, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._monitor = asyncio.create_task(self._watch())
+        ports = ", ".join(str(worker.port.value) for worker in self.workers)
+        print(f"[Supervisor] Routing ws://{self.host}:{self.port} to {len(self.workers)} workers (ports {ports})")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._monitor:
+            self._monitor.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        loop = asyncio.get_running_loop()
+        for worker in self.workers:
+            if worker.process and worker.process.is_alive():
+                worker.process.terminate()
+        for worker in self.workers:
+            if worker.process:
+                await loop.run_in_executor(None, worker.process.join, 10.0)
+                if worker.process.is_alive():
+                    worker.process.kill()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Future()
+        finally:
+            await self.stop()
+
+    def route(self, session_id: str) -> Optional[_Worker]:
+        name = self.ring.lookup(session_id)
+        return next((worker for worker in self.workers if worker.name == name), None)
+
+    def stats(self) -> dict:
+        return {
+            "port": self.port,
+            "workers": [
+                {
+                    "name": worker.name,
+                    "pid": worker.process.pid if worker.process else None,
+                    "port": worker.port.value,
+                    "alive": bool(worker.process and worker.process.is_alive()),
+                    "in_ring": worker.name in self.ring.nodes,
+                    "restarts": worker.restarts,
+                    "routed": worker.routed,
+                }
+                for worker in self.workers
+            ],
+        }
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+    def _spawn(self, worker: _Worker) -> None:
+        worker.ready.clear()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(worker.index, self.host, worker.port, worker.ready, self._options),
+            name=f"Baymax{worker.name.title().replace('-', '')}",
+            daemon=True,
+        )
+        worker.process.start()
+        worker.started_at = time.monotonic()
+
+    def _refresh_ring(self) -> None:
+        for worker in self.workers:
+            healthy = worker.process is not None and worker.process.is_alive() and worker.ready.is_set()
+            if healthy:
+                self.ring.add(worker.name)
+            else:
+                self.ring.remove(worker.name)
+
+    async def _watch(self) -> None:
+        while not self._stopping:
+            now = time.monotonic()
+            for worker in self.workers:
+                process = worker.process
+                if process is None or process.is_alive():
+                    continue
+                if worker.restart_at == 0.0:
+                    # Quick repeat crashes back off; a worker that ran a while restarts at once.
+                    lived = now - worker.started_at
+                    worker.backoff = 0.5 if lived > 30.0 else min(worker.backoff * 2, 30.0)
+                    worker.restart_at = now + (0.0 if lived > 30.0 else worker.backoff)
+                    print(f"[Supervisor] {worker.name} exited ({process.exitcode}); its sessions fail over")
+                elif now >= worker.restart_at:
+                    worker.restart_at = 0.0
+                    worker.restarts += 1
+                    _RESTARTS.inc()
+                    process.close()
+                    self._spawn(worker)
+                    print(f"[Supervisor] Restarted {worker.name} on port {worker.port.value}")
+            self._refresh_ring()
+            await asyncio.sleep(self._check_interval)
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    async def _route(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5.0)
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            target = request_line.split(" ")[1]
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, IndexError):
+            writer.close()
+            return
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if target == "/status":
+            self._respond(writer, "200 OK", json.dumps(self.stats()), "application/json")
+        else:
+            session_id = session_from_path(target)
+            if not session_id:
+                # Give the device a stable ID so the worker sees the same one we hashed.
+                session_id = uuid.uuid4().hex[:12]
+                target = f"/session/{quote(session_id)}"
+            worker = self.route(session_id)
+            if worker is None:
+                self._respond(writer, "503 Service Unavailable", "no worker available")
+            else:
+                worker.routed += 1
+                _REDIRECTS.labels(worker.name).inc()
+                host = headers.get("host", self.host)
+                if not host.endswith("]"):
+                    host = host.rpartition(":")[0] or host
+                self._respond(writer, "307 Temporary Redirect", "", extra=f"Location: ws://{host}:{worker.port.value}{target}\r\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: str, body: str, content_type: str = "text/plain", extra: str = "") -> None:
+        data = body.encode("utf-8")
+        writer.write(
+            (
+                f"HTTP/1.1 {status}\r\n{extra}Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+            ).encode("latin-1")
+            + data
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shard Baymax devices across worker processes")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--processes", type=int, default=settings.SERVER_PROCESSES)
+    parser.add_argument("--threads", type=int, default=settings.SERVER_WORKERS, help="state-machine step threads per worker")
+    parser.add_argument("--store", default=settings.SHARED_STORE_PATH, help="SQLite file shared by the workers")
+    args = parser.parse_args()
+
+    metrics_server = None
+    if settings.METRICS_PORT:
+        metrics_server = MetricsServer(host=settings.METRICS_HOST, port=settings.METRICS_PORT)
+        metrics_server.start()
+        print(f"[Metrics] Telemetry at {metrics_server.url}/ (Prometheus: /metrics)")
+
+    supervisor = Supervisor(host=args.host, port=args.port, processes=args.processes, threads=args.threads, store_path=args.store)
+    try:
+        asyncio.run(supervisor.serve_forever())
+    except KeyboardInterrupt:
+        print("\n[Supervisor] Shutting down:", supervisor.stats())
+    finally:
+        if metrics_server:
+            metrics_server.stop()
+
+
+if __name__ == "__main__":
+    main()
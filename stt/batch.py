@@ -0,0 +1,236 @@
+"""Batch transcription of recorded sessions.
+
+Takes a directory of audio files or a manifest (`.txt` with one path per line,
+or `.jsonl` with a `"path"` field), transcribes them with a bounded worker pool
+behind a token-bucket rate limiter, caches results by content hash and streams
+one JSON line per file:
+
+    python3 -m stt.batch recordings/ --out results.jsonl --workers 8 --rate 5
+    python3 -m stt.batch manifest.jsonl --base-url http://127.0.0.1:8765
+
+Reruns skip files whose bytes (and model) have not changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Set
+
+from config_app.settings import settings
+from stt.deepgram_http import DeepgramHTTPClient
+from stt.payloads import transcript_from_response
+
+AUDIO_SUFFIXES = {".wav", ".mp3", ".flac", ".m4a", ".ogg", ".webm"}
+
+
+def discover_inputs(source: str) -> List[Path]:
+    """Resolve a directory or manifest into the list of audio files to process."""
+    root = Path(source)
+    if root.is_dir():
+        return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in AUDIO_SUFFIXES)
+
+    paths: List[Path] = []
+    with root.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)["path"] if root.suffix.lower() == ".jsonl" else line
+            path = Path(entry)
+            paths.append(path if path.is_absolute() else root.parent / path)
+    return paths
+
+
+class TokenBucket:
+    """Blocking rate limiter shared by all workers (requests per second)."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.capacity = float(burst or max(int(rate), 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait_for = (1.0 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+class ResultCache:
+    """One JSON file per (model, audio sha256) under `directory`."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(audio: bytes, model: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(audio)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.directory / f"{key}.json"
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        path = self.directory / f"{key}.json"
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(response, handle)
+        os.replace(tmp, path)
+
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    cached: int = 0
+    errors: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    def summary(self) -> str:
+        wall = max(self.wall_seconds, 1e-9)
+        return (
+            f"{self.files} files in {self.wall_seconds:.2f}s "
+            f"({self.files / wall:.2f} files/s, {self.audio_seconds / wall:.1f} audio-s/s), "
+            f"{self.cached} cached, {self.errors} errors"
+        )
+
+
+class BatchTranscriber:
+    """Bounded worker pool that yields one result record per input file."""
+
+    def __init__(
+        self,
+        client: DeepgramHTTPClient,
+        *,
+        workers: int = 4,
+        rate: float = 0.0,
+        cache: Optional[ResultCache] = None,
+    ) -> None:
+        self.client = client
+        self.workers = max(workers, 1)
+        self.limiter = TokenBucket(rate)
+        self.cache = cache
+        self.stats = BatchStats()
+
+    def run(self, paths: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+        """Yield records in completion order; at most 2x workers files are in flight."""
+        start = time.perf_counter()
+        max_in_flight = self.workers * 2
+        pending: Set[Future] = set()
+        source = iter(paths)
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="STT-Batch") as pool:
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_in_flight:
+                    path = next(source, None)
+                    if path is None:
+                        exhausted = True
+                        break
+                    pending.add(pool.submit(self._process, path))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = future.result()
+                    self._account(record)
+                    self.stats.wall_seconds = time.perf_counter() - start
+                    yield record
+
+        self.stats.wall_seconds = time.perf_counter() - start
+
+    def _process(self, path: Path) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"path": str(path)}
+        began = time.perf_counter()
+        try:
+            audio = path.read_bytes()
+            key = ResultCache.key(audio, self.client.model)
+            record["sha256"] = key
+            response = self.cache.get(key) if self.cache else None
+            record["cached"] = response is not None
+            if response is None:
+                self.limiter.acquire()
+                mimetype = mimetypes.guess_type(path.name)[0] or "audio/wav"
+                response = self.client.transcribe_bytes(audio, mimetype=mimetype)
+                if self.cache:
+                    self.cache.put(key, response)
+            record["transcript"] = transcript_from_response(response)
+            record["duration"] = float((response.get("metadata") or {}).get("duration") or 0.0)
+        except Exception as exc:
+            record["error"] = str(exc)
+        record["elapsed"] = round(time.perf_counter() - began, 4)
+        return record
+
+    def _account(self, record: Dict[str, Any]) -> None:
+        self.stats.files += 1
+        if record.get("error"):
+            self.stats.errors += 1
+        if record.get("cached"):
+            self.stats.cached += 1
+        self.stats.audio_seconds += record.get("duration", 0.0)
+
+
+def _write_records(records: Iterable[Dict[str, Any]], out: IO[str]) -> None:
+    for record in records:
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch-transcribe a directory or manifest of recordings")
+    parser.add_argument("source", help="directory of audio files, or a .txt/.jsonl manifest")
+    parser.add_argument("--out", help="JSONL output path (default: stdout)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0.0, help="max requests per second (0 = unlimited)")
+    parser.add_argument("--cache-dir", default=".stt_cache")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--base-url", default=settings.DEEPGRAM_BASE_URL)
+    parser.add_argument("--model", default="nova-2")
+    args = parser.parse_args(argv)
+
+    paths = discover_inputs(args.source)
+    client = DeepgramHTTPClient(settings.DEEPGRAM_API_KEY, base_url=args.base_url, model=args.model)
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    batch = BatchTranscriber(client, workers=args.workers, rate=args.rate, cache=cache)
+
+    print(f"[Batch] Transcribing {len(paths)} files with {batch.workers} workers", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            _write_records(batch.run(paths), out)
+    else:
+        _write_records(batch.run(paths), sys.stdout)
+    print(f"[Batch] {batch.stats.summary()}", file=sys.stderr)
+    return 1 if batch.stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Minimal Deepgram pre-recorded REST client for batch and long-form jobs.
+
+The SDK client in `deepgram_stt.py` is fine for one utterance at a time; batch
+jobs need a thread-safe client whose base URL can point at the local stand-in
+server (`stt/standin_server.py`) for offline runs.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from core.metrics import metrics
+
+_RETRIES = metrics.counter("baymax_retries_total", "Retried external requests", ("component",))
+_LATENCY = metrics.histogram("baymax_stt_http_seconds", "Deepgram pre-recorded request latency")
+
+DEFAULT_BASE_URL = "https://api.deepgram.com"
+
+
+class DeepgramHTTPError(RuntimeError):
+    """Raised when Deepgram keeps rejecting a request after retries."""
+
+
+class DeepgramHTTPClient:
+    """Thread-safe `POST /v1/listen` wrapper with retry/backoff."""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        *,
+        base_url: str = DEFAULT_BASE_URL,
+        model: str = "nova-2",
+        timeout: float = 120.0,
+    ) -> None:
+        self._api_key = api_key or ""
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def transcribe_bytes(
+        self,
+        audio: bytes,
+        *,
+        mimetype: str = "audio/wav",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Upload one buffer and return Deepgram's JSON response."""
+        query: Dict[str, Any] = {"model": self.model, "smart_format": "true"}
+        query.update(params or {})
+        headers = {"Authorization": f"Token {self._api_key}", "Content-Type": mimetype}
+
+        attempts = (0.0, 0.5, 1.5)
+        last_error: Optional[Exception] = None
+        for delay in attempts:
+            if delay:
+                _RETRIES.labels("stt_http").inc()
+                time.sleep(delay)
+            started = time.monotonic()
+            try:
+                response = self._session().post(
+                    f"{self.base_url}/v1/listen",
+                    params=query,
+                    data=audio,
+                    headers=headers,
+                    timeout=self._timeout,
+                )
+                if response.status_code == 429 or response.status_code >= 500:
+                    last_error = DeepgramHTTPError(f"HTTP {response.status_code}: {response.text[:200]}")
+                    continue
+                if response.status_code >= 400:
+                    # Client errors (bad key, unsupported audio) will not improve on retry.
+                    raise DeepgramHTTPError(f"HTTP {response.status_code}: {response.text[:200]}")
+                _LATENCY.observe(time.monotonic() - started)
+                return response.json()
+            except requests.RequestException as exc:
+                last_error = exc
+
+        raise DeepgramHTTPError(f"Deepgram request failed after retries: {last_error}")
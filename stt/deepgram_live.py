@@ -2,14 +2,38 @@
 
 from __future__ import annotations
 
-import json
+import re
 import string
 import threading
 import time
-from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, cast
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, List, Optional, Sequence, Tuple, cast
 
+import numpy as np
+
+from audio.barge_in import BargeInDetector
+from audio.codecs import WireCodec, create_codec
+from audio.framing import FramingMode, FramingPolicy
 from config_app.settings import settings
-from core.events import TranscriptEvent, WakeEvent, WakeEventType
+from core.clock import Clock, clock_of
+from core.events import (
+    CONTROL,
+    INTERIM,
+    STREAM_ERROR,
+    TRANSCRIPT,
+    WAKE,
+    EventBus,
+    TranscriptEvent,
+    WakeEvent,
+    WakeEventType,
+    transcript_topic,
+    wake_topic,
+)
+from core.metrics import metrics
+from core.timers import TimedFlag, timers_for
+from core.tracing import tracer
+from stt.payloads import to_dict_safe
+from stt.turn_end import TurnDecision, TurnEndPredictor
 
 try:
     from deepgram import DeepgramClient, LiveOptions, LiveTranscriptionEvents
@@ -27,6 +51,11 @@ else:  # pragma: no cover - runtime fallback for typing
     LiveOptionsType = Any
 
 
+_BYTES_SENT = metrics.counter("baymax_stt_bytes_sent_total", "Encoded audio bytes sent to Deepgram")
+_RECONNECTS = metrics.counter("baymax_stt_reconnects_total", "Deepgram stream reconnect attempts", ("result",))
+_RETRIES = metrics.counter("baymax_retries_total", "Retried external requests", ("component",))
+_FINALS = metrics.counter("baymax_stt_finals_total", "Final transcripts processed")
+
 WakeCallback = Callable[[WakeEvent], None]
 TranscriptCallback = Callable[[TranscriptEvent], None]
 ErrorCallback = Callable[[Exception], None]
@@ -118,6 +147,27 @@ def _contains_phrase(text: str, phrases) -> bool:
     return any(phrase in normalized for phrase in phrases)
 
 
+def _phrase_pattern(phrases) -> re.Pattern:
+    # Longest phrases first so "hey baymax" wins over a bare "baymax" at the same spot.
+    alternatives = sorted(phrases, key=len, reverse=True)
+    body = "|".join(r"[\s\W]+".join(map(re.escape, phrase.split())) for phrase in alternatives)
+    return re.compile(rf"\b(?:{body})\b", re.IGNORECASE)
+
+
+_WAKE_PATTERN = _phrase_pattern(WAKE_WORDS)
+
+
+def extract_wake_query(transcript: str) -> str:
+    """Return what follows the wake phrase ("Hey Baymax, what is ..." -> "what is ..."), or ""."""
+    match = _WAKE_PATTERN.search(transcript)
+    # Only an utterance that opens with the wake phrase ("okay, hey Baymax ...") carries a query.
+    if not match or len(transcript[:match.start()].split()) > 2:
+        return ""
+    query = transcript[match.end():].lstrip(" \t,.!?;:-")
+    min_words = max(getattr(settings, "WAKE_QUERY_MIN_WORDS", 2), 1)
+    return query if len(query.split()) >= min_words else ""
+
+
 def _should_process_transcript(transcript: str) -> bool:
     words = transcript.split()
     if not words:
@@ -136,28 +186,6 @@ def _should_process_transcript(transcript: str) -> bool:
     return False
 
 
-def _to_dict_safe(obj: Any) -> Optional[dict]:
-    if obj is None:
-        return None
-    if isinstance(obj, dict):
-        return obj
-    if hasattr(obj, "to_dict"):
-        try:
-            data = obj.to_dict()
-            if isinstance(data, dict):
-                return data
-        except Exception:
-            return None
-    if hasattr(obj, "to_json"):
-        try:
-            data = json.loads(obj.to_json())
-            if isinstance(data, dict):
-                return data
-        except Exception:
-            return None
-    return None
-
-
 class DeepgramStreamingService:
     """Wraps Deepgram's websocket client and exposes Baymax-friendly callbacks."""
 
@@ -167,6 +195,11 @@ class DeepgramStreamingService:
         *,
         live_options: Optional[LiveOptionsType] = None,
         min_time_between_responses: float = 3.0,
+        codec: Optional[WireCodec] = None,
+        turn_predictor: Optional[TurnEndPredictor] = None,
+        barge_in: Optional[BargeInDetector] = None,
+        framing: Optional[FramingPolicy] = None,
+        clock: Optional[Clock] = None,
     ) -> None:
         if not settings.DEEPGRAM_API_KEY:
             raise ValueError("DEEPGRAM_API_KEY is missing in .env")
@@ -177,47 +210,92 @@ class DeepgramStreamingService:
             )
 
         self.microphone = microphone
+        # Post-speech mute window; defaults to the microphone's clock so both agree.
+        self._clock = clock or clock_of(microphone)
+        self._response_mute = TimedFlag(timers_for(self._clock))
         self._client = DeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
         self._connection: Any = None
         self._sender_thread: Optional[threading.Thread] = None
         self._sending = threading.Event()
+        self._suspended = False
         self._tts_playing = threading.Event()
         self._last_response_ts = 0.0
         self._min_time_between_responses = max(min_time_between_responses, 0.0)
         self._events = LiveTranscriptionEvents
 
-        # Callbacks
-        self._wake_listeners: List[WakeCallback] = []
-        self._transcript_listeners: List[TranscriptCallback] = []
-        self._error_listeners: List[ErrorCallback] = []
+        # Optional local end-of-turn prediction (see stt/turn_end.py)
+        if turn_predictor is None and settings.TURN_PREDICTOR:
+            turn_predictor = TurnEndPredictor(
+                silence_ms=settings.TURN_SILENCE_MS,
+                stable_ms=settings.TURN_STABLE_MS,
+                speech_rms=settings.TURN_SPEECH_RMS,
+                finalize_confidence=settings.TURN_FINALIZE_CONFIDENCE,
+                commit_confidence=settings.TURN_COMMIT_CONFIDENCE,
+            )
+        self._turn_predictor = turn_predictor
+        # Guards every predictor call: audio is observed on the sender thread,
+        # transcripts and UtteranceEnd on the SDK callback thread.
+        self._turn_lock = threading.Lock()
+        self._committed_words: set = set()
+        self._committed_ts = 0.0
+
+        # Optional barge-in detection while TTS plays (see audio/barge_in.py)
+        if barge_in is None and settings.BARGE_IN_ENABLED:
+            barge_in = BargeInDetector(
+                sample_rate=getattr(microphone, "sample_rate", 16000),
+                margin=settings.BARGE_IN_MARGIN,
+                min_rms=settings.BARGE_IN_MIN_RMS,
+                required_frames=settings.BARGE_IN_FRAMES,
+            )
+        self._barge_in = barge_in
+        self._barge_preroll: Deque[bytes] = deque(maxlen=8)
+        # Last chunk with speech energy; stamps "end_of_speech" on traced turns.
+        self._last_voice_ts = 0.0
+
+        # Listeners subscribe to typed topics; a failing listener is reported as a stream error.
+        self.bus = EventBus(on_subscriber_error=self._emit_error)
 
         sample_rate = getattr(microphone, "sample_rate", 16000)
         channels = getattr(microphone, "channels", 1)
 
         endpoint_window = str(max(settings.DEEPGRAM_ENDPOINT_MS, 0))
 
+        # Transcode on the sender thread; LiveOptions must advertise the wire format.
+        self._codec = codec or create_codec(settings.WIRE_CODEC, sample_rate, channels)
+        self.bytes_captured = 0
+        self.bytes_sent = 0
+        self.messages_sent = 0
+
+        # Optional state-aware read sizes with backlog coalescing (see audio/framing.py)
+        self._framing = framing
+
+        utterance_end = settings.TURN_UTTERANCE_END_MS if self._turn_predictor else 0
+
         self._options = live_options or LiveOptions(
             model="nova-2",
             punctuate=True,
             interim_results=True,
             smart_format=True,
-            encoding="linear16",
+            encoding=self._codec.encoding,
             channels=channels,
-            sample_rate=sample_rate,
+            sample_rate=self._codec.sample_rate,
             endpointing=endpoint_window,
+            utterance_end_ms=str(utterance_end) if utterance_end > 0 else None,
         )
 
     # ------------------------------------------------------------------
     # Callback registration helpers
     # ------------------------------------------------------------------
     def add_wake_listener(self, callback: WakeCallback) -> None:
-        self._wake_listeners.append(callback)
+        self.bus.subscribe(CONTROL, callback)
+        self.bus.subscribe(WAKE, callback)
 
     def add_transcript_listener(self, callback: TranscriptCallback) -> None:
-        self._transcript_listeners.append(callback)
+        self.bus.subscribe(TRANSCRIPT, callback)
+        self.bus.subscribe(INTERIM, callback)
 
     def add_error_listener(self, callback: ErrorCallback) -> None:
-        self._error_listeners.append(callback)
+        self.bus.subscribe(STREAM_ERROR, callback)
 
     # ------------------------------------------------------------------
     # Lifecycle management
@@ -233,17 +311,12 @@ class DeepgramStreamingService:
         self._connection = connection
 
         self.microphone.start_stream()
-        self._sending.set()
-        self._sender_thread = threading.Thread(target=self._stream_audio, name="DG-AudioStreamer", daemon=True)
-        self._sender_thread.start()
+        self._start_sender()
 
     def stop(self) -> None:
-        self._sending.clear()
         self._tts_playing.clear()
-
-        if self._sender_thread and self._sender_thread.is_alive():
-            self._sender_thread.join(timeout=1.0)
-        self._sender_thread = None
+        self._stop_sender()
+        self._suspended = False
 
         try:
             self.microphone.stop_stream()
@@ -258,14 +331,67 @@ class DeepgramStreamingService:
             finally:
                 self._connection = None
 
+    @property
+    def is_suspended(self) -> bool:
+        return self._suspended
+
+    def suspend(self) -> None:
+        """Close the websocket and stop sending, leaving the microphone open."""
+        if self._suspended:
+            return
+        self._stop_sender()
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.finish()  # type: ignore[attr-defined]
+            except Exception as exc:  # pragma: no cover - defensive stop
+                self._emit_error(exc)
+        self._suspended = True
+
+    def resume(self, preroll: Sequence[bytes] = ()) -> bool:
+        """Reconnect after `suspend()`, replaying buffered frames ahead of live audio."""
+        if not self._suspended:
+            return True
+        connection = self._open_connection_with_retry()
+        if connection is None:
+            return False
+
+        self._connection = connection
+        self._codec.reset()
+        try:
+            for frame in preroll:
+                self._send_encoded(frame)
+        except Exception as exc:  # pragma: no cover - network failure
+            self._emit_error(exc)
+
+        # A bus tap kept buffering while suspended; the pre-roll already covers that span.
+        discard = getattr(self.microphone, "discard_pending", None)
+        if discard:
+            discard()
+
+        self._suspended = False
+        self._start_sender()
+        return True
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _start_sender(self) -> None:
+        self._sending.set()
+        self._sender_thread = threading.Thread(target=self._stream_audio, name="DG-AudioStreamer", daemon=True)
+        self._sender_thread.start()
+
+    def _stop_sender(self) -> None:
+        self._sending.clear()
+        if self._sender_thread and self._sender_thread.is_alive():
+            self._sender_thread.join(timeout=1.0)
+        self._sender_thread = None
+
     def _stream_audio(self) -> None:
         consecutive_failures = 0
         while self._sending.is_set():
             try:
-                chunk = self.microphone.read_audio_chunk()
+                chunk = self._read_chunk()
             except Exception as exc:  # pragma: no cover - audio failure
                 self._emit_error(exc)
                 time.sleep(0.05)
@@ -276,6 +402,13 @@ class DeepgramStreamingService:
                 continue
 
             chunk = self._mute_chunk_if_needed(chunk)
+            if tracer.enabled:
+                self._note_voice(chunk)
+
+            if self._turn_predictor is not None:
+                with self._turn_lock:
+                    self._turn_predictor.observe_audio(chunk)
+                self._evaluate_turn()
 
             if self._connection is None:
                 if not self._reconnect_stream():
@@ -284,7 +417,7 @@ class DeepgramStreamingService:
 
             try:
                 if self._connection is not None:
-                    self._connection.send(chunk)  # type: ignore[attr-defined]
+                    self._send_encoded(chunk)
                 consecutive_failures = 0
             except Exception as exc:  # pragma: no cover - network failure
                 self._emit_error(exc)
@@ -301,12 +434,36 @@ class DeepgramStreamingService:
 
         consecutive_failures = 0
 
+    def _note_voice(self, chunk: bytes) -> None:
+        samples = np.frombuffer(chunk[: len(chunk) - len(chunk) % 2], dtype=np.int16).astype(np.float32)
+        if samples.size and float(np.sqrt(np.mean(samples * samples))) >= settings.TURN_SPEECH_RMS:
+            self._last_voice_ts = time.monotonic()
+
+    def _read_chunk(self) -> bytes:
+        if self._framing is None:
+            return self.microphone.read_audio_chunk()
+
+        pending = getattr(self.microphone, "pending_frames", None)
+        backlog = pending() if pending else 0
+        return self.microphone.read_audio_chunk(self._framing.next_read_size(backlog))
+
+    def _send_encoded(self, chunk: bytes) -> None:
+        self.bytes_captured += len(chunk)
+        sent = 0
+        for payload in self._codec.encode_packets(chunk):
+            self._connection.send(payload)  # type: ignore[attr-defined]
+            sent += len(payload)
+            self.messages_sent += 1
+        self.bytes_sent += sent
+        _BYTES_SENT.inc(sent)
+
     def _open_connection_with_retry(self) -> Optional[Any]:
         attempts: Tuple[float, float, float] = (0.0, 1.0, 3.0)
         last_error: Optional[Exception] = None
 
         for delay in attempts:
             if delay:
+                _RETRIES.labels("stt_stream").inc()
                 time.sleep(delay)
 
             connection: Optional[Any] = None
@@ -319,6 +476,10 @@ class DeepgramStreamingService:
                 connection.on(  # type: ignore[attr-defined]
                     self._events.Error, self._handle_connection_error
                 )
+                if self._turn_predictor is not None:
+                    connection.on(  # type: ignore[attr-defined]
+                        self._events.UtteranceEnd, self._handle_utterance_end
+                    )
                 connection.start(self._options)  # type: ignore[attr-defined]
                 return connection
             except Exception as exc:  # pragma: no cover - network setup
@@ -339,10 +500,13 @@ class DeepgramStreamingService:
         print("[STT] Attempting to reconnect Deepgram stream...")
         connection = self._open_connection_with_retry()
         if connection is None:
+            _RECONNECTS.labels("failed").inc()
             print("[STT] Reconnection failed")
             return False
 
+        _RECONNECTS.labels("ok").inc()
         self._connection = connection
+        self._codec.reset()
         print("[STT] Reconnected to Deepgram")
         return True
 
@@ -359,12 +523,12 @@ class DeepgramStreamingService:
         if result is None:
             return
 
-        result_dict = _to_dict_safe(result) or {}
+        result_dict = to_dict_safe(result) or {}
 
-        channel_dict = _to_dict_safe(getattr(result, "channel", None))
+        channel_dict = to_dict_safe(getattr(result, "channel", None))
         if channel_dict is None and result_dict:
             raw_channel = result_dict.get("channel")
-            channel_dict = raw_channel if isinstance(raw_channel, dict) else _to_dict_safe(raw_channel)
+            channel_dict = raw_channel if isinstance(raw_channel, dict) else to_dict_safe(raw_channel)
 
         alternatives: List[Any] = []
 
@@ -382,7 +546,7 @@ class DeepgramStreamingService:
         transcript = ""
         if alternatives:
             first_alt = alternatives[0]
-            alt_dict = _to_dict_safe(first_alt)
+            alt_dict = to_dict_safe(first_alt)
             if alt_dict:
                 transcript = (alt_dict.get("transcript") or "").strip()
             elif isinstance(first_alt, dict):
@@ -396,11 +560,81 @@ class DeepgramStreamingService:
         is_final = bool(result_dict.get("is_final")) if result_dict else bool(getattr(result, "is_final", False))
 
         if is_final:
-            self._process_final_transcript(transcript, raw=result)
+            if self._turn_predictor is not None:
+                ends_turn = any(
+                    bool(result_dict.get(key)) if result_dict else bool(getattr(result, key, False))
+                    for key in ("speech_final", "from_finalize")
+                )
+                self._track_final_transcript(transcript, raw=result, ends_turn=ends_turn)
+            else:
+                self._process_final_transcript(transcript, raw=result)
         else:
+            if self._turn_predictor is not None:
+                with self._turn_lock:
+                    self._turn_predictor.observe_interim(transcript)
             event = TranscriptEvent(text=transcript, is_final=False, should_process=False, raw=result)
             self._emit_transcript(event)
 
+    def _handle_utterance_end(self, *_args, **_kwargs) -> None:  # pragma: no cover - callback path
+        if self._turn_predictor is None:
+            return
+        with self._turn_lock:
+            self._turn_predictor.observe_utterance_end()
+        self._evaluate_turn()
+
+    def _track_final_transcript(self, transcript: str, raw, *, ends_turn: bool) -> None:
+        """Feed a Deepgram final into the predictor instead of processing it directly."""
+        with self._turn_lock:
+            if self._is_committed_echo(transcript):
+                return
+            self._turn_predictor.observe_final(transcript, speech_final=ends_turn)  # type: ignore[union-attr]
+
+        # Interim bookkeeping only; the committed turn carries should_process.
+        self._emit_transcript(TranscriptEvent(text=transcript, is_final=True, should_process=False, raw=raw))
+        self._evaluate_turn()
+
+    def _evaluate_turn(self) -> None:
+        predictor = self._turn_predictor
+        if predictor is None:
+            return
+
+        text = ""
+        with self._turn_lock:
+            decision = predictor.decide()
+            if decision is TurnDecision.FINALIZE:
+                predictor.mark_finalize_requested()
+            elif decision is TurnDecision.COMMIT:
+                text = predictor.commit()
+                self._committed_words = set(_normalize(text).split())
+                self._committed_ts = time.monotonic()
+
+        if decision is TurnDecision.FINALIZE:
+            self._request_finalize()
+        elif decision is TurnDecision.COMMIT and text:
+            self._process_final_transcript(text, raw=None)
+
+    def _request_finalize(self) -> None:
+        connection = self._connection
+        if connection is None or not hasattr(connection, "finalize"):
+            return
+        try:
+            connection.finalize()  # type: ignore[attr-defined]
+        except Exception as exc:  # pragma: no cover - network failure
+            self._emit_error(exc)
+
+    def _is_committed_echo(self, transcript: str) -> bool:
+        """True when a late Deepgram final repeats a turn we already committed locally."""
+        if not self._committed_words:
+            return False
+        words = _normalize(transcript).split()
+        if not words or time.monotonic() - self._committed_ts > 3.0:
+            self._committed_words = set()
+            return False
+        overlap = sum(1 for word in words if word in self._committed_words) / len(words)
+        # One echo per commit: a quick follow-up reusing those words is a new turn.
+        self._committed_words = set()
+        return overlap >= 0.6
+
     def _process_final_transcript(self, transcript: str, raw) -> None:
         has_satisfaction = _contains_phrase(transcript, SATISFACTION_PHRASES)
         has_sleep = _contains_phrase(transcript, SLEEP_WORDS)
@@ -413,12 +647,20 @@ class DeepgramStreamingService:
             self._emit_wake(WakeEventType.SLEEP, transcript)
 
         if has_wake and not (has_sleep or has_satisfaction):
-            self._emit_wake(WakeEventType.WAKE, transcript)
+            self._emit_wake(WakeEventType.WAKE, transcript, query=extract_wake_query(transcript))
+
+        should_process = _should_process_transcript(transcript)
+        _FINALS.inc()
+        if should_process and tracer.enabled:
+            tracer.begin_turn()
+            if self._last_voice_ts:
+                tracer.mark("end_of_speech", at=self._last_voice_ts)
+            tracer.mark("stt_final", words=len(transcript.split()))
 
         event = TranscriptEvent(
             text=transcript,
             is_final=True,
-            should_process=_should_process_transcript(transcript),
+            should_process=should_process,
             raw=raw,
         )
         self._emit_transcript(event)
@@ -436,31 +678,18 @@ class DeepgramStreamingService:
         exc = error if isinstance(error, Exception) else Exception(str(error))
         self._emit_error(exc)
 
-    def _emit_wake(self, event_type: WakeEventType, transcript: str) -> None:
-        event = WakeEvent(event_type=event_type, transcript=transcript)
-        for callback in list(self._wake_listeners):
-            try:
-                callback(event)
-            except Exception as exc:  # pragma: no cover - listener failure
-                self._emit_error(exc)
+    def _emit_wake(self, event_type: WakeEventType, transcript: str, *, query: str = "") -> None:
+        event = WakeEvent(event_type=event_type, transcript=transcript, query=query)
+        self.bus.publish(wake_topic(event), event)
 
     def _emit_transcript(self, event: TranscriptEvent) -> None:
-        for callback in list(self._transcript_listeners):
-            try:
-                callback(event)
-            except Exception as exc:  # pragma: no cover - listener failure
-                self._emit_error(exc)
+        self.bus.publish(transcript_topic(event), event)
 
     def _emit_error(self, exc: Exception) -> None:
-        if not self._error_listeners:
+        if not self.bus.has_subscribers(STREAM_ERROR):
             print("[STT] Streaming error:", exc)
             return
-
-        for callback in list(self._error_listeners):
-            try:
-                callback(exc)
-            except Exception as listener_exc:  # pragma: no cover - listener failure
-                print("[STT] Error listener raised:", listener_exc)
+        self.bus.publish(STREAM_ERROR, exc)
 
     # ------------------------------------------------------------------
     # Speaking coordination helpers
@@ -470,22 +699,69 @@ class DeepgramStreamingService:
             self._tts_playing.set()
         else:
             self._tts_playing.clear()
+            if self._barge_in is not None:
+                self._barge_in.stop()
+
+    def set_framing_mode(self, mode: FramingMode) -> None:
+        """Pick the read size profile for the current conversation state."""
+        if self._framing is None:
+            return
+        if mode is FramingMode.MUTED and self._barge_in is not None:
+            # Barge-in needs fine-grained frames even while Baymax talks.
+            mode = FramingMode.ACTIVE
+        self._framing.mode = mode
+
+    @property
+    def barge_in_enabled(self) -> bool:
+        return self._barge_in is not None
+
+    def arm_barge_in(self, reference=None) -> None:
+        """Start watching for near-field speech over the playback in `reference`."""
+        if self._barge_in is None:
+            return
+        self._barge_preroll.clear()
+        self._barge_in.start(reference)
+
+    def mark_barge_in_false_trigger(self) -> None:
+        if self._barge_in is not None:
+            self._barge_in.mark_false_trigger()
+
+    def barge_in_stats(self) -> dict:
+        return self._barge_in.stats() if self._barge_in is not None else {}
 
     def notify_response_sent(self, duration: float = 0.0, *, buffer_override: Optional[float] = None) -> None:
         """Signal that TTS playback finished; apply the safety buffer before unmuting."""
         buffer = settings.TTS_POST_BUFFER if buffer_override is None else max(buffer_override, 0.0)
         buffer = max(buffer, 0.0)
         # Playback already consumed `duration`, so only keep the short safety buffer.
-        self._mute_until_ts = time.time() + buffer
+        self._response_mute.set_for(buffer)
 
     def _mute_chunk_if_needed(self, chunk: bytes) -> bytes:
         if not chunk:
             return chunk
 
         if self._tts_playing.is_set():
+            detector = self._barge_in
+            if detector is not None and detector.armed:
+                self._barge_preroll.append(bytes(chunk))
+                if detector.process(chunk):
+                    return self._release_barge_in()
             return b"\x00" * len(chunk)
 
-        if time.time() < getattr(self, "_mute_until_ts", 0.0):
+        if self._response_mute:
             return b"\x00" * len(chunk)
 
-        return chunk
\ No newline at end of file
+        return chunk
+
+    def _release_barge_in(self) -> bytes:
+        """Unmute immediately and forward the frames that carried the interruption."""
+        self._tts_playing.clear()
+        self._response_mute.clear()
+        unmute = getattr(self.microphone, "unmute", None)
+        if unmute:
+            unmute()
+
+        preroll = b"".join(self._barge_preroll)
+        self._barge_preroll.clear()
+        self._emit_wake(WakeEventType.BARGE_IN, "")
+        return preroll
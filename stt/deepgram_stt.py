@@ -1,6 +1,8 @@
 from typing import Any, Optional
 
+import io
 import json
+import wave
 
 from interfaces.stt_interface import STTInterface
 from config_app.settings import settings
@@ -15,6 +17,8 @@ class DeepgramSTT(STTInterface):
 
         self._client = None
         self._options_cls = None
+        # Whether the last long-form transcript has gaps from failed chunks.
+        self.last_partial = False
 
     def _ensure_client(self):
         if self._client and self._options_cls:
@@ -32,7 +36,11 @@ class DeepgramSTT(STTInterface):
             print("[STT] SDK import error:", exc)
 
     def transcribe_audio(self, audio_bytes: bytes) -> str:
-        """Convert in-memory WAV bytes to text."""
+        """Convert in-memory WAV bytes to text; long recordings go through `transcribe_long`."""
+        self.last_partial = False
+        if audio_bytes and _wav_duration(audio_bytes) >= settings.LONG_FORM_MIN_SECONDS:
+            return self.transcribe_long(audio_bytes)
+
         self._ensure_client()
         if not self._client or not self._options_cls:
             print("[STT] No client available.")
@@ -64,6 +72,61 @@ class DeepgramSTT(STTInterface):
             print("[STT] Error:", exc)
             return ""
 
+    def open_progressive_session(self, sample_rate: int = 16000, channels: int = 1):
+        """Open a live connection that transcribes audio while it is being recorded."""
+        self._ensure_client()
+        if not self._client:
+            return None
+
+        try:
+            from deepgram import LiveOptions, LiveTranscriptionEvents
+
+            from stt.progressive import ProgressiveTranscription
+
+            options = LiveOptions(
+                model="nova-2",
+                punctuate=True,
+                smart_format=True,
+                encoding="linear16",
+                channels=channels,
+                sample_rate=sample_rate,
+            )
+            connection = self._client.listen.live.v("1")  # type: ignore
+            return ProgressiveTranscription(connection, options, LiveTranscriptionEvents)
+        except Exception as exc:
+            print("[STT] Progressive session unavailable:", exc)
+            return None
+
+    def transcribe_long(self, audio_bytes: bytes, workers: Optional[int] = None) -> str:
+        """Transcribe a long WAV as silence-bounded chunks uploaded in parallel.
+
+        Chunks that fail are marked in the transcript with `GAP_MARKER` and
+        set `last_partial`.
+        """
+        from stt.deepgram_http import DeepgramHTTPClient
+        from stt.long_form import LongFormTranscriber
+
+        client = DeepgramHTTPClient(settings.DEEPGRAM_API_KEY, base_url=settings.DEEPGRAM_BASE_URL)
+        transcriber = LongFormTranscriber(
+            client,
+            workers=workers or settings.LONG_FORM_WORKERS,
+            target_seconds=settings.LONG_FORM_CHUNK_SECONDS,
+            max_seconds=settings.LONG_FORM_CHUNK_SECONDS * 2,
+        )
+        try:
+            result = transcriber.transcribe(audio_bytes)
+        except Exception as exc:
+            print("[STT] Long-form error:", exc)
+            self.last_partial = True
+            return ""
+
+        print(
+            f"[STT] Long-form transcript from {len(result.segments)} chunks "
+            f"({result.failed_segments} failed)"
+        )
+        self.last_partial = result.partial
+        return result.transcript
+
     def transcribe(self, audio_path: str) -> str:
         try:
             with open(audio_path, "rb") as wav_file:
@@ -71,10 +134,18 @@ class DeepgramSTT(STTInterface):
         except Exception as exc:
             print("[STT] Failed to read audio file:", exc)
             return ""
-
         return self.transcribe_audio(audio_bytes)
 
 
+def _wav_duration(audio_bytes: bytes) -> float:
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
+            rate = wf.getframerate()
+            return wf.getnframes() / rate if rate else 0.0
+    except Exception:
+        return 0.0
+
+
 def _extract_transcript(response: Optional[Any]) -> str:
     """Safely traverse Deepgram's nested response payload."""
     if response is None:
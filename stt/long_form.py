@@ -0,0 +1,169 @@
+"""Long-recording transcription: split at silence, transcribe in parallel, stitch.
+
+A single upload of a session archive serializes everything behind one slow
+request. Here the audio is cut in the middle of pauses (found with vectorized
+frame energy), the chunks are transcribed concurrently and the transcripts
+and word timings are re-based onto the original timeline. A chunk whose
+upload failed leaves `GAP_MARKER` in the transcript where its words would
+have been, and the result reports itself as `partial`.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio.recorder import encode_wav, read_wav
+from stt.deepgram_http import DeepgramHTTPClient
+from stt.payloads import transcript_from_response
+
+GAP_MARKER = "[inaudible]"
+
+
+def frame_rms(samples: np.ndarray, frame: int) -> np.ndarray:
+    """RMS per non-overlapping frame (the ragged tail is dropped)."""
+    usable = len(samples) - len(samples) % frame
+    if usable <= 0:
+        return np.zeros(0)
+    frames = samples[:usable].astype(np.float32).reshape(-1, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def silence_midpoints(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    frame_ms: float = 20.0,
+    min_silence_ms: float = 300.0,
+    floor_rms: float = 150.0,
+) -> np.ndarray:
+    """Sample index at the middle of every pause at least `min_silence_ms` long."""
+    frame = max(int(sample_rate * frame_ms / 1000.0), 1)
+    rms = frame_rms(samples, frame)
+    if rms.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Adaptive threshold: a little above the quietest frames, never below the floor.
+    threshold = max(float(np.percentile(rms, 10)) * 2.0, floor_rms)
+    quiet = np.concatenate(([False], rms < threshold, [False]))
+    edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    long_enough = (ends - starts) * frame_ms >= min_silence_ms
+    return ((starts[long_enough] + ends[long_enough]) // 2 * frame).astype(np.int64)
+
+
+def plan_chunks(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    target_seconds: float = 30.0,
+    max_seconds: float = 60.0,
+    min_silence_ms: float = 300.0,
+) -> List[Tuple[int, int]]:
+    """Half-open sample ranges covering the recording, cut at pauses near the target length."""
+    total = len(samples)
+    target = max(int(target_seconds * sample_rate), 1)
+    longest = max(int(max_seconds * sample_rate), target)
+    cuts = silence_midpoints(samples, sample_rate, min_silence_ms=min_silence_ms)
+
+    chunks: List[Tuple[int, int]] = []
+    start = 0
+    while total - start > min(longest, target * 1.5):
+        window = cuts[(cuts > start + target // 2) & (cuts <= start + longest)]
+        if window.size:
+            end = int(window[np.argmin(np.abs(window - (start + target)))])
+        elif total - start > longest:
+            end = start + target  # no usable pause: hard cut
+        else:
+            break
+        chunks.append((start, end))
+        start = end
+    chunks.append((start, total))
+    return chunks
+
+
+@dataclass
+class LongFormResult:
+    transcript: str = ""
+    words: List[Dict[str, Any]] = field(default_factory=list)
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def failed_segments(self) -> int:
+        return sum(1 for segment in self.segments if segment.get("error"))
+
+    @property
+    def partial(self) -> bool:
+        """True when some chunks failed and the transcript has gaps."""
+        return self.failed_segments > 0
+
+
+class LongFormTranscriber:
+    """Transcribes one long WAV as concurrently uploaded silence-bounded chunks."""
+
+    def __init__(
+        self,
+        client: DeepgramHTTPClient,
+        *,
+        workers: int = 4,
+        target_seconds: float = 30.0,
+        max_seconds: float = 60.0,
+    ) -> None:
+        self.client = client
+        self.workers = max(workers, 1)
+        self.target_seconds = target_seconds
+        self.max_seconds = max(max_seconds, target_seconds)
+
+    def transcribe(self, audio: bytes) -> LongFormResult:
+        samples, rate = read_wav(audio)
+        chunks = plan_chunks(
+            samples, rate, target_seconds=self.target_seconds, max_seconds=self.max_seconds
+        )
+
+        def run(bounds: Tuple[int, int]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+            start, end = bounds
+            try:
+                return self.client.transcribe_bytes(encode_wav(samples[start:end], rate)), None
+            except Exception as exc:
+                return None, str(exc)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks)), thread_name_prefix="STT-Long") as pool:
+            responses = list(pool.map(run, chunks))
+
+        return self._stitch(chunks, responses, rate)
+
+    @staticmethod
+    def _stitch(chunks, responses, rate: int) -> LongFormResult:
+        result = LongFormResult()
+        texts: List[str] = []
+        for index, ((start, end), (response, error)) in enumerate(zip(chunks, responses)):
+            offset = start / rate
+            segment: Dict[str, Any] = {"index": index, "start": round(offset, 3), "end": round(end / rate, 3)}
+            if error is not None:
+                print(f"[STT] Long-form chunk {index} failed:", error)
+                segment["error"] = error
+                result.segments.append(segment)
+                texts.append(GAP_MARKER)
+                continue
+
+            text = transcript_from_response(response).strip()
+            segment["transcript"] = text
+            result.segments.append(segment)
+            if text:
+                texts.append(text)
+
+            try:
+                words = response["results"]["channels"][0]["alternatives"][0].get("words") or []
+            except (KeyError, IndexError, TypeError):
+                words = []
+            for word in words:
+                shifted = dict(word)
+                shifted["start"] = round(float(word.get("start", 0.0)) + offset, 3)
+                shifted["end"] = round(float(word.get("end", 0.0)) + offset, 3)
+                result.words.append(shifted)
+
+        result.transcript = " ".join(texts)
+        return result
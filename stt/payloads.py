@@ -0,0 +1,37 @@
+"""Helpers for Deepgram payloads shared by the live, progressive and batch clients."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+
+def to_dict_safe(obj: Any) -> Optional[dict]:
+    """A plain dict for an SDK response object (via `to_dict`/`to_json`), or None."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj
+    if hasattr(obj, "to_dict"):
+        try:
+            data = obj.to_dict()
+            if isinstance(data, dict):
+                return data
+        except Exception:
+            return None
+    if hasattr(obj, "to_json"):
+        try:
+            data = json.loads(obj.to_json())
+            if isinstance(data, dict):
+                return data
+        except Exception:
+            return None
+    return None
+
+
+def transcript_from_response(response: Dict[str, Any]) -> str:
+    """First-alternative transcript from a pre-recorded response."""
+    try:
+        return response["results"]["channels"][0]["alternatives"][0].get("transcript", "") or ""
+    except (KeyError, IndexError, TypeError):
+        return ""
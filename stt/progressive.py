@@ -0,0 +1,98 @@
+"""Progressive transcription for the non-streaming listening path.
+
+When the always-on Deepgram stream is unavailable, `ListeningState` records a
+bounded utterance. Instead of uploading the recording afterwards, each
+captured chunk is pushed through a short-lived live connection while the
+user is still talking, so the transcript is ready moments after recording
+stops.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, List, Optional
+
+from stt.payloads import to_dict_safe
+
+
+def _result_fields(result: Any) -> tuple:
+    """Return (transcript, is_final, from_finalize) from a live result payload."""
+    data = to_dict_safe(result) or {}
+    channel = data.get("channel") or {}
+    alternatives = channel.get("alternatives") if isinstance(channel, dict) else None
+    transcript = ""
+    if isinstance(alternatives, list) and alternatives:
+        first = alternatives[0]
+        transcript = (first.get("transcript") if isinstance(first, dict) else "") or ""
+    return transcript.strip(), bool(data.get("is_final")), bool(data.get("from_finalize"))
+
+
+class ProgressiveTranscription:
+    """One utterance worth of audio streamed to a dedicated live connection."""
+
+    def __init__(self, connection: Any, options: Any, events: Any) -> None:
+        self._connection = connection
+        self._finals: List[str] = []
+        self._lock = threading.Lock()
+        self._finalized = threading.Event()
+        self._failed = False
+
+        connection.on(events.Transcript, self._handle_transcript)
+        connection.on(events.Error, self._handle_error)
+        if connection.start(options) is False:
+            raise RuntimeError("Deepgram live connection refused to start")
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    def send(self, chunk: bytes) -> None:
+        """Forward one captured chunk; errors only mark the session as failed."""
+        if self._failed or not chunk:
+            return
+        try:
+            self._connection.send(chunk)
+        except Exception as exc:
+            print("[STT] Progressive send failed:", exc)
+            self._failed = True
+
+    def finish(self, timeout: float = 2.0) -> Optional[str]:
+        """Flush the tail of the utterance and return the transcript.
+
+        None on failure, including Finalize never being acknowledged: the
+        finals so far may miss the tail, so the caller uploads its recording.
+        """
+        try:
+            if not self._failed:
+                self._connection.finalize()
+                if not self._finalized.wait(timeout):
+                    print("[STT] Progressive finalize timed out")
+                    self._failed = True
+        except Exception as exc:
+            print("[STT] Progressive finalize failed:", exc)
+            self._failed = True
+        finally:
+            try:
+                self._connection.finish()
+            except Exception:
+                pass
+
+        if self._failed:
+            return None
+        with self._lock:
+            return " ".join(self._finals).strip()
+
+    def _handle_transcript(self, *args, **kwargs) -> None:  # pragma: no cover - callback path
+        result = kwargs.get("result", args[-1] if args else None)
+        transcript, is_final, from_finalize = _result_fields(result)
+        if is_final and transcript:
+            with self._lock:
+                self._finals.append(transcript)
+        if from_finalize:
+            self._finalized.set()
+
+    def _handle_error(self, *args, **kwargs) -> None:  # pragma: no cover - callback path
+        error = kwargs.get("error", args[-1] if args else None)
+        print("[STT] Progressive stream error:", error)
+        self._failed = True
+        self._finalized.set()
@@ -0,0 +1,158 @@
+"""Local stand-in for Deepgram's pre-recorded `/v1/listen` endpoint.
+
+Returns Deepgram-shaped JSON (transcript plus word timings) after a
+configurable delay so batch and long-form transcription can be exercised and
+benchmarked offline:
+
+    python3 -m stt.standin_server --port 8765 --latency 0.2 --per-second 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+def _audio_duration(body: bytes) -> float:
+    try:
+        with wave.open(io.BytesIO(body), "rb") as wf:
+            rate = wf.getframerate()
+            return wf.getnframes() / rate if rate else 0.0
+    except Exception:
+        return 0.0
+
+
+def fake_response(body: bytes, word_spacing: float = 0.5) -> Dict[str, Any]:
+    """Deterministic Deepgram-style payload for `body` (same bytes, same words)."""
+    digest = hashlib.sha256(body).hexdigest()
+    duration = _audio_duration(body)
+    count = max(int(duration / word_spacing), 1)
+    words = [
+        {
+            "word": f"{digest[:4]}{index}",
+            "punctuated_word": f"{digest[:4]}{index}",
+            "start": round(index * word_spacing, 3),
+            "end": round(min((index + 0.8) * word_spacing, max(duration, word_spacing)), 3),
+            "confidence": 0.99,
+        }
+        for index in range(count)
+    ]
+    return {
+        "metadata": {"request_id": digest[:16], "duration": duration, "channels": 1},
+        "results": {
+            "channels": [
+                {
+                    "alternatives": [
+                        {
+                            "transcript": " ".join(word["word"] for word in words),
+                            "confidence": 0.99,
+                            "words": words,
+                        }
+                    ]
+                }
+            ]
+        },
+    }
+
+
+class StandInDeepgramServer:
+    """Threaded HTTP server answering `POST /v1/listen` like Deepgram would."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.05,
+        latency_per_audio_second: float = 0.0,
+    ) -> None:
+        self.latency = max(latency, 0.0)
+        self.latency_per_audio_second = max(latency_per_audio_second, 0.0)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInDeepgramServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="DG-StandIn", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def __enter__(self) -> "StandInDeepgramServer":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                if not self.path.startswith("/v1/listen"):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                with owner._lock:
+                    owner.requests += 1
+
+                time.sleep(owner.latency + owner.latency_per_audio_second * _audio_duration(body))
+                payload = json.dumps(fake_response(body)).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *_args) -> None:
+                return
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Deepgram /v1/listen stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="fixed seconds per request")
+    parser.add_argument("--per-second", type=float, default=0.0, help="extra seconds per audio second")
+    args = parser.parse_args()
+
+    server = StandInDeepgramServer(
+        args.host, args.port, latency=args.latency, latency_per_audio_second=args.per_second
+    )
+    print(f"[StandIn] Serving Deepgram stand-in on {server.base_url}")
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Suspend the Deepgram stream while Baymax sleeps; reconnect on an energy burst.
+
+Streaming silence to Deepgram just to catch "Hey Baymax" is most of the STT
+bill on idle units. After `suspend_after` seconds asleep the websocket is
+closed and the microphone is watched locally with the `WakeWordDetector`
+energy gate. A burst reconnects the stream and replays the pre-roll buffer so
+the wake phrase itself is still transcribed. Reconnecting (with its retries)
+runs on a helper thread so it never blocks a state transition; the state loop
+waits for it like any other event and `on_resumed` wakes it when it is done.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+from core.clock import Clock, system_clock
+
+
+class StreamSuspender:
+    """Suspension policy driven from `SleepState` ticks."""
+
+    def __init__(
+        self,
+        stream,
+        mic,
+        wake_detector,
+        *,
+        suspend_after: float = 30.0,
+        preroll_seconds: float = 1.5,
+        wake_confirm_window: float = 4.0,
+        clock: Optional[Clock] = None,
+        on_resumed: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._clock = clock or system_clock
+        self._on_resumed = on_resumed
+        self._lock = threading.Lock()
+        self._resume_thread: Optional[threading.Thread] = None
+        self._stream = stream
+        self._mic = mic
+        self._wake = wake_detector
+        self._suspend_after = max(suspend_after, 0.0)
+        self._confirm_window = max(wake_confirm_window, 0.0)
+
+        sample_rate = getattr(mic, "sample_rate", 16000)
+        channels = getattr(mic, "channels", 1)
+        self._preroll_budget = max(int(preroll_seconds * sample_rate) * channels * 2, 1)
+        self._preroll: Deque[bytes] = deque()
+        self._preroll_bytes = 0
+
+        self._asleep_since: Optional[float] = None
+        self._suspended_at: Optional[float] = None
+        self._awaiting_wake_since: Optional[float] = None
+
+        self.suspended_seconds = 0.0
+        self.bursts = 0
+        self.confirmed_wakes = 0
+        self.reconnect_latencies: List[float] = []
+
+    @property
+    def suspended(self) -> bool:
+        return self._suspended_at is not None
+
+    @property
+    def resuming(self) -> bool:
+        return self._resume_thread is not None
+
+    # ------------------------------------------------------------------
+    # Hooks called by the state machine
+    # ------------------------------------------------------------------
+    def tick(self, now: Optional[float] = None) -> bool:
+        """Advance the policy while asleep; True when the caller should not poll-sleep."""
+        now = self._clock.monotonic() if now is None else now
+        if self._asleep_since is None:
+            self._asleep_since = now
+
+        if self.resuming:
+            return False  # the caller waits; `on_resumed` wakes it
+
+        self._expire_unconfirmed_wake(now)
+
+        if self.suspended:
+            self._watch_locally(now)
+            return True
+
+        if self._awaiting_wake_since is None and now - self._asleep_since >= self._suspend_after:
+            self._suspend(now)
+            return True
+        return False
+
+    def next_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until `tick()` has work to do (suspend, or give up on a wake); None while reconnecting."""
+        now = self._clock.monotonic() if now is None else now
+        if self.resuming:
+            return None
+        if self.suspended or self._asleep_since is None:
+            return 0.0
+        if self._awaiting_wake_since is not None:
+            return max(self._awaiting_wake_since + self._confirm_window - now, 0.0)
+        return max(self._asleep_since + self._suspend_after - now, 0.0)
+
+    def note_wake(self) -> None:
+        """A WAKE event arrived from the stream."""
+        with self._lock:
+            if self._awaiting_wake_since is not None:
+                self.confirmed_wakes += 1
+                self._awaiting_wake_since = None
+
+    def leave_sleep(self) -> None:
+        """Baymax woke up by other means: make sure the stream is live again (in the background)."""
+        with self._lock:
+            self._asleep_since = None
+            self._awaiting_wake_since = None
+        if self.suspended:
+            self._resume(self._clock.monotonic(), preroll=[], from_burst=False)
+
+    def stats(self) -> dict:
+        bursts = max(self.bursts, 1)
+        latencies = sorted(self.reconnect_latencies) or [0.0]
+        return {
+            "suspended_seconds": round(self.suspended_seconds, 1),
+            "bursts": self.bursts,
+            "confirmed_wakes": self.confirmed_wakes,
+            # Resumes that no wake phrase followed (noise, or a wake Deepgram missed).
+            "spurious_resume_rate": round((self.bursts - self.confirmed_wakes) / bursts, 3),
+            "reconnect_p50_s": round(latencies[len(latencies) // 2], 3),
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _suspend(self, now: float) -> None:
+        self._clear_preroll()
+        self._stream.suspend()
+        self._suspended_at = now
+        print("[STT] Stream suspended while asleep; watching mic locally")
+
+    def _watch_locally(self, now: float) -> None:
+        try:
+            chunk = self._mic.read_audio_chunk()
+        except Exception as exc:
+            print("[STT] Mic read error while suspended:", exc)
+            return
+
+        if not chunk:
+            return
+
+        self._remember(bytes(chunk))
+        try:
+            burst = self._wake.detect(chunk)
+        except Exception as exc:
+            print("[STT] Wake gate error while suspended:", exc)
+            return
+
+        if burst:
+            self.bursts += 1
+            self._resume(now, preroll=list(self._preroll), from_burst=True)
+
+    def _resume(self, now: float, preroll: List[bytes], *, from_burst: bool) -> None:
+        if self.resuming:
+            return
+        self._resume_thread = threading.Thread(
+            target=self._reconnect, args=(now, preroll, from_burst), name="DG-Resume", daemon=True
+        )
+        self._resume_thread.start()
+
+    def _reconnect(self, now: float, preroll: List[bytes], from_burst: bool) -> None:
+        started = time.monotonic()
+        try:
+            resumed = self._stream.resume(preroll)
+        except Exception as exc:
+            print("[STT] Reconnect error:", exc)
+            resumed = False
+
+        with self._lock:
+            if resumed:
+                self.reconnect_latencies.append(time.monotonic() - started)
+                if self._suspended_at is not None:
+                    self.suspended_seconds += now - self._suspended_at
+                self._suspended_at = None
+                self._clear_preroll()
+                if from_burst:
+                    self._awaiting_wake_since = now
+            self._resume_thread = None
+        if resumed:
+            print("[STT] Stream resumed:", self.stats())
+        else:
+            print("[STT] Reconnect after suspension failed; staying suspended")
+        if self._on_resumed is not None:
+            self._on_resumed()
+
+    def _remember(self, chunk: bytes) -> None:
+        self._preroll.append(chunk)
+        self._preroll_bytes += len(chunk)
+        while self._preroll_bytes > self._preroll_budget and len(self._preroll) > 1:
+            self._preroll_bytes -= len(self._preroll.popleft())
+
+    def _clear_preroll(self) -> None:
+        self._preroll.clear()
+        self._preroll_bytes = 0
+
+    def _expire_unconfirmed_wake(self, now: float) -> None:
+        if self._awaiting_wake_since is None:
+            return
+        if now - self._awaiting_wake_since < self._confirm_window:
+            return
+        # The burst was not a wake phrase (or Deepgram missed it); start counting again.
+        self._awaiting_wake_since = None
+        self._asleep_since = now - self._suspend_after
@@ -0,0 +1,147 @@
+"""Local end-of-turn prediction for the live Deepgram stream.
+
+Deepgram only finalizes a transcript once its own endpointing window elapses.
+`TurnEndPredictor` watches cheaper local signals (trailing silence from mic
+energy, interim transcript stability, terminal punctuation) together with
+Deepgram's `speech_final`/`UtteranceEnd` hints, and tells the streaming service
+when to request finalization or commit the turn outright.
+"""
+
+from __future__ import annotations
+
+import time
+from enum import Enum, auto
+from typing import List, Optional
+
+import numpy as np
+
+
+class TurnDecision(Enum):
+    """What the streaming service should do with the current turn."""
+
+    WAIT = auto()
+    FINALIZE = auto()
+    COMMIT = auto()
+
+
+def _clamp(value: float) -> float:
+    return min(max(value, 0.0), 1.0)
+
+
+class TurnEndPredictor:
+    """Combines local and provider signals into an end-of-turn confidence."""
+
+    def __init__(
+        self,
+        *,
+        silence_ms: float = 500.0,
+        stable_ms: float = 300.0,
+        min_silence_ms: float = 120.0,
+        speech_rms: float = 250.0,
+        finalize_confidence: float = 0.6,
+        commit_confidence: float = 0.85,
+        silence_weight: float = 0.5,
+        stability_weight: float = 0.3,
+        punctuation_weight: float = 0.2,
+    ) -> None:
+        self._silence_s = max(silence_ms, 1.0) / 1000.0
+        self._stable_s = max(stable_ms, 1.0) / 1000.0
+        self._min_silence_s = max(min_silence_ms, 0.0) / 1000.0
+        self._speech_rms = max(speech_rms, 1.0)
+        self.finalize_confidence = finalize_confidence
+        self.commit_confidence = max(commit_confidence, finalize_confidence)
+
+        total = max(silence_weight + stability_weight + punctuation_weight, 1e-9)
+        self._weights = (silence_weight / total, stability_weight / total, punctuation_weight / total)
+
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Signal intake
+    # ------------------------------------------------------------------
+    def observe_audio(self, pcm: bytes, now: Optional[float] = None) -> None:
+        """Track speech activity from one chunk of int16 PCM."""
+        if not pcm:
+            return
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        rms = float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+        if rms >= self._speech_rms:
+            self._last_voice_ts = time.monotonic() if now is None else now
+
+    def observe_interim(self, text: str, now: Optional[float] = None) -> None:
+        text = text.strip()
+        if not text or text == self._interim:
+            return
+        self._interim = text
+        self._last_change_ts = time.monotonic() if now is None else now
+
+    def observe_final(self, text: str, *, speech_final: bool = False, now: Optional[float] = None) -> None:
+        text = text.strip()
+        if text:
+            self._finals.append(text)
+            self._last_change_ts = time.monotonic() if now is None else now
+        self._interim = ""
+        if speech_final:
+            self._provider_end = True
+
+    def observe_utterance_end(self) -> None:
+        if self.pending_text:
+            self._provider_end = True
+
+    def mark_finalize_requested(self) -> None:
+        self._finalize_requested = True
+
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+    @property
+    def pending_text(self) -> str:
+        """Everything heard since the last commit (finals plus latest interim)."""
+        parts = list(self._finals)
+        if self._interim:
+            parts.append(self._interim)
+        return " ".join(parts)
+
+    def confidence(self, now: Optional[float] = None) -> float:
+        if not self.pending_text:
+            return 0.0
+        if self._provider_end:
+            return 1.0
+
+        now = time.monotonic() if now is None else now
+        silence = now - self._last_voice_ts if self._last_voice_ts else now - self._last_change_ts
+        if silence < self._min_silence_s:
+            return 0.0
+
+        stability = now - self._last_change_ts
+        punctuated = self.pending_text.endswith((".", "!", "?"))
+
+        silence_w, stability_w, punct_w = self._weights
+        return (
+            silence_w * _clamp(silence / self._silence_s)
+            + stability_w * _clamp(stability / self._stable_s)
+            + punct_w * (1.0 if punctuated else 0.0)
+        )
+
+    def decide(self, now: Optional[float] = None) -> TurnDecision:
+        score = self.confidence(now)
+        if score >= self.commit_confidence:
+            return TurnDecision.COMMIT
+        if score >= self.finalize_confidence and not self._finalize_requested:
+            return TurnDecision.FINALIZE
+        return TurnDecision.WAIT
+
+    def commit(self) -> str:
+        """Return the turn text and start tracking a fresh turn."""
+        text = self.pending_text
+        self.reset(keep_voice=True)
+        return text
+
+    def reset(self, *, keep_voice: bool = False) -> None:
+        self._finals: List[str] = []
+        self._interim = ""
+        self._last_change_ts = 0.0
+        self._provider_end = False
+        self._finalize_requested = False
+        if not keep_voice:
+            self._last_voice_ts = 0.0
@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from audio.bus import AudioBus
+from core.clock import VirtualClock
+
+
+class AudioBusTests(unittest.TestCase):
+    def setUp(self):
+        self.bus = AudioBus(16000, 1, capacity_seconds=0.1)  # 1600-frame ring
+
+    def test_views_are_read_only_and_contiguous_across_wrap(self):
+        sub = self.bus.subscribe("reader")
+        signal = np.arange(5000, dtype=np.int16)
+        received = []
+        for start in range(0, len(signal), 250):
+            self.bus.publish(signal[start:start + 250])
+            view = sub.read(250, timeout=0.1)
+            self.assertFalse(view.flags.writeable)
+            self.assertTrue(np.shares_memory(view, self.bus._ring))
+            received.append(view.copy())
+
+        np.testing.assert_array_equal(np.concatenate(received)[:, 0], signal)
+        self.assertEqual(sub.dropped_frames, 0)
+
+    def test_slow_subscriber_drops_without_blocking_fast_one(self):
+        fast = self.bus.subscribe("fast")
+        slow = self.bus.subscribe("slow")
+        signal = np.arange(20000, dtype=np.int16)
+        got = []
+
+        def consume():
+            while sum(len(v) for v in got) < len(signal):
+                view = fast.read(160, timeout=1.0)
+                if view is None:
+                    break
+                got.append(view.copy())
+
+        reader = threading.Thread(target=consume)
+        reader.start()
+        for start in range(0, len(signal), 160):
+            # Pace like a real device: the fast reader keeps up, the slow one never reads.
+            while fast.pending() > 800:
+                time.sleep(0.0005)
+            self.bus.publish(signal[start:start + 160].tobytes())
+        reader.join(timeout=5.0)
+
+        np.testing.assert_array_equal(np.concatenate(got)[:, 0], signal)
+        self.assertEqual(fast.dropped_frames, 0)
+
+        # After an overrun the slow reader resumes at the head, not a window behind it.
+        self.assertIsNone(slow.read(160, timeout=0.05))
+        self.assertGreater(slow.overruns, 0)
+        self.assertEqual(slow.dropped_frames, len(signal))
+        self.bus.publish(np.full(160, 7, dtype=np.int16))
+        self.assertTrue(np.all(slow.read(160, timeout=0.1) == 7))
+
+    def test_tap_skips_audio_while_muted(self):
+        tap = self.bus.tap("state")
+        self.bus.publish(np.ones(320, dtype=np.int16))
+        self.bus.mute_for(10.0)
+        self.assertEqual(tap.read_audio_chunk(320), b"")
+        self.assertEqual(tap.pending_frames(), 0)
+
+        self.bus.unmute()
+        self.bus.publish(np.full(320, 7, dtype=np.int16))
+        chunk = np.frombuffer(tap.read_audio_chunk(320), dtype=np.int16)
+        self.assertTrue(np.all(chunk == 7))
+
+    def test_mute_wait_runs_on_the_bus_clock(self):
+        clock = VirtualClock()
+        bus = AudioBus(16000, 1, capacity_seconds=0.1, clock=clock)
+        tap = bus.tap("state")
+        bus.mute_for(30.0)
+        self.assertEqual(tap.read_audio_chunk(320), b"")
+        self.assertTrue(bus.muted)
+
+        clock.sleep(30.0)
+        self.assertFalse(bus.muted)
+        self.assertAlmostEqual(clock.elapsed, 30.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from audio.barge_in import BargeInDetector
+
+
+def _noise(seconds: float, rms: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, rms, int(seconds * 16000))
+
+
+class BargeInDetectorTestCase(unittest.TestCase):
+    def _feed(self, detector: BargeInDetector, mic: np.ndarray) -> bool:
+        pcm = np.clip(mic, -32768, 32767).astype(np.int16)
+        return any(
+            detector.process(pcm[i:i + 1024].tobytes(), now=(i + 1024) / 16000)
+            for i in range(0, len(pcm), 1024)
+        )
+
+    def test_playback_echo_alone_does_not_trigger(self) -> None:
+        reference = _noise(3.0, 5000, seed=1)
+        detector = BargeInDetector()
+        detector.start(reference.astype(np.int16), now=0.0)
+
+        self.assertFalse(self._feed(detector, 0.2 * reference + _noise(3.0, 50, seed=2)))
+        self.assertEqual(detector.triggers, 0)
+
+    def test_near_field_speech_over_echo_triggers_once(self) -> None:
+        reference = _noise(3.0, 5000, seed=3)
+        mic = 0.2 * reference
+        mic[24000:] += _noise(1.5, 4000, seed=4)
+
+        detector = BargeInDetector()
+        detector.start(reference.astype(np.int16), now=0.0)
+
+        self.assertTrue(self._feed(detector, mic))
+        self.assertEqual(detector.triggers, 1)
+        self.assertFalse(detector.armed)
+        self.assertLess(detector.stats()["latency_p50_ms"], 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
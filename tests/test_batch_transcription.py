@@ -0,0 +1,72 @@
+import json
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from stt.batch import BatchTranscriber, ResultCache, discover_inputs
+from stt.deepgram_http import DeepgramHTTPClient
+from stt.standin_server import StandInDeepgramServer
+
+
+def _write_wav(path: Path, seconds: float, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    samples = (rng.standard_normal(int(16000 * seconds)) * 1000).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(samples.tobytes())
+
+
+class BatchTranscriptionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.audio_dir = self.root / "audio"
+        self.audio_dir.mkdir()
+        for index in range(5):
+            _write_wav(self.audio_dir / f"clip{index}.wav", 1.0 + index * 0.5, index)
+        self.server = StandInDeepgramServer(latency=0.02).start()
+        self.client = DeepgramHTTPClient("test", base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.server.stop()
+        self._tmp.cleanup()
+
+    def test_directory_run_then_rerun_hits_cache(self):
+        cache = ResultCache(str(self.root / "cache"))
+        paths = discover_inputs(str(self.audio_dir))
+        self.assertEqual(len(paths), 5)
+
+        first = list(BatchTranscriber(self.client, workers=3, cache=cache).run(paths))
+        self.assertEqual(len(first), 5)
+        self.assertTrue(all(r["transcript"] and not r["cached"] for r in first))
+        self.assertEqual(self.server.requests, 5)
+
+        rerun = BatchTranscriber(self.client, workers=3, cache=cache)
+        second = list(rerun.run(paths))
+        self.assertTrue(all(r["cached"] for r in second))
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(rerun.stats.cached, 5)
+        by_path = {r["path"]: r["transcript"] for r in first}
+        self.assertEqual({r["path"]: r["transcript"] for r in second}, by_path)
+        self.assertAlmostEqual(rerun.stats.audio_seconds, sum(1.0 + i * 0.5 for i in range(5)), places=3)
+
+    def test_jsonl_manifest_and_missing_file_is_reported(self):
+        manifest = self.root / "manifest.jsonl"
+        with manifest.open("w") as handle:
+            handle.write(json.dumps({"path": "audio/clip0.wav"}) + "\n")
+            handle.write(json.dumps({"path": "audio/missing.wav"}) + "\n")
+
+        batch = BatchTranscriber(self.client, workers=2)
+        records = {Path(r["path"]).name: r for r in batch.run(discover_inputs(str(manifest)))}
+        self.assertIn("transcript", records["clip0.wav"])
+        self.assertIn("error", records["missing.wav"])
+        self.assertEqual(batch.stats.errors, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
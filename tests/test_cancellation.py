@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from config_app.settings import settings
+from core.cancellation import Cancelled, CancelToken, run_cancellable
+from llm.openai_llm import OpenAILLM
+from tts.elevenlabs_tts import ElevenLabsTTS
+
+
+class SlowCompletionStream:
+    """Stands in for the OpenAI SDK stream: one token every 20 ms until closed."""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for _ in range(250):
+            if self.closed.wait(0.02):
+                raise ConnectionError("response closed")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="word "))])
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeOpenAIClient:
+    def __init__(self):
+        self.stream = SlowCompletionStream()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=lambda **_kwargs: self.stream))
+
+
+class CancellationTests(unittest.TestCase):
+    def setUp(self):
+        for name in ("OPENAI_API_KEY", "ELEVENLABS_API_KEY"):
+            previous = getattr(settings, name)
+            setattr(settings, name, previous or "test-key")
+            self.addCleanup(setattr, settings, name, previous)
+
+    def test_token_callbacks_and_run_cancellable(self):
+        token = CancelToken()
+        closed = []
+        token.on_cancel(lambda: closed.append("kept"))
+        token.on_cancel(lambda: closed.append("dropped"))()
+
+        release = threading.Event()
+        threading.Timer(0.05, token.cancel, args=("sleep",)).start()
+        started = time.monotonic()
+        with self.assertRaises(Cancelled):
+            # The blocking call ignores the token; the caller still gets control back.
+            run_cancellable(release.wait, 5.0, cancel=token)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(closed, ["kept"])
+        self.assertEqual(token.reason, "sleep")
+        token.on_cancel(lambda: closed.append("late"))
+        self.assertEqual(closed, ["kept", "late"])
+        release.set()
+
+    def test_cancel_closes_llm_stream_and_forgets_the_question(self):
+        client = FakeOpenAIClient()
+        llm = OpenAILLM(client=client)
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel, args=("sleep",)).start()
+
+        started = time.monotonic()
+        with self.assertRaises(Cancelled):
+            llm.generate("tell me a long story about the sea", cancel=token)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertTrue(client.stream.closed.is_set())
+        self.assertEqual(llm.history(), [])
+
+    def test_abandoned_synthesis_leaves_the_output_file_alone(self):
+        class LateResponse:
+            closed = False
+
+            def iter_content(self, chunk_size=4096):
+                yield b"\x00\x00" * 1600
+
+            def close(self):
+                self.closed = True
+
+        token = CancelToken()
+        response = LateResponse()
+        tts = ElevenLabsTTS()
+
+        def first_byte_after_cancel(text, cancel=None):
+            token.cancel("sleep")
+            return response
+
+        tts._request_audio = first_byte_after_cancel
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "output.wav")
+            with open(path, "wb") as handle:
+                handle.write(b"goodbye line")
+            with self.assertRaises(Cancelled):
+                tts.synthesize_to("tell me a long story", path, cancel=token)
+            with open(path, "rb") as handle:
+                self.assertEqual(handle.read(), b"goodbye line")
+            self.assertEqual(os.listdir(tmp), ["output.wav"])
+        self.assertTrue(response.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from audio.capture_health import CaptureHealth
+
+
+class FakeInputStream:
+    """Blocking-read stand-in: `queued` frames wait in PortAudio's buffer."""
+
+    latency = 0.01
+
+    def __init__(self, capacity: int = 8000):
+        self.capacity = capacity
+        self.queued = 0
+        self.overflow_pending = False
+
+    def capture(self, frames: int) -> None:
+        self.queued += frames
+        if self.queued > self.capacity:
+            self.queued = self.capacity
+            self.overflow_pending = True
+
+    @property
+    def read_available(self) -> int:
+        return self.queued
+
+    def read(self, frames: int):
+        self.queued -= min(frames, self.queued)
+        overflowed, self.overflow_pending = self.overflow_pending, False
+        return np.zeros((frames, 1), dtype=np.int16), overflowed
+
+
+class CaptureHealthTests(unittest.TestCase):
+    def test_drain_keeps_device_from_overflowing_during_mute(self):
+        stream = FakeInputStream()
+        health = CaptureHealth(16000)
+        for _ in range(60):  # 3 s mute, polled every 50 ms
+            stream.capture(800)
+            health.drain(stream)
+        self.assertEqual(health.overflows, 0)
+        self.assertEqual(health.drained_frames, 48000)
+
+        stream.capture(300)  # arrives between the last drain and the unmute
+        health.before_read(stream)
+        self.assertEqual(health.flushed_frames, 300)
+        self.assertEqual(stream.queued, 0)
+
+    def test_backlog_is_trimmed_and_latency_recorded(self):
+        stream = FakeInputStream(capacity=4000)
+        health = CaptureHealth(16000, max_lag_ms=100)
+        stream.capture(6000)  # overflows the fake device buffer
+        health.before_read(stream)
+        self.assertEqual(stream.queued, 1600)
+        self.assertEqual(health.trimmed_frames, 2400)
+        self.assertEqual(health.overflows, 1)
+
+        _, overflowed = stream.read(320)
+        health.after_read(stream, overflowed)
+        self.assertAlmostEqual(health.capture_latency, 1280 / 16000 + 0.01)
+        self.assertAlmostEqual(health.stats()["max_capture_latency_s"], 0.09, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
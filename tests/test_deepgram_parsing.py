@@ -3,7 +3,8 @@ import json
 from typing import Any, Dict, cast
 
 from stt.deepgram_stt import _extract_transcript
-from stt.deepgram_live import _to_dict_safe
+from stt.deepgram_live import extract_wake_query
+from stt.payloads import to_dict_safe
 
 
 class MockSdkObject:
@@ -73,7 +74,7 @@ class TestDeepgramParsing(unittest.TestCase):
             }
         )
 
-        converted = _to_dict_safe(result_obj)
+        converted = to_dict_safe(result_obj)
         self.assertIsInstance(converted, dict)
         converted_dict = cast(Dict[str, Any], converted)
         self.assertTrue(converted_dict.get("is_final"))
@@ -82,6 +83,16 @@ class TestDeepgramParsing(unittest.TestCase):
             "wake up",
         )
 
+    def test_extract_wake_query(self) -> None:
+        self.assertEqual(
+            extract_wake_query("Hey, Baymax! What should I do about a headache?"),
+            "What should I do about a headache?",
+        )
+        self.assertEqual(extract_wake_query("hi bay max what time is it"), "what time is it")
+        self.assertEqual(extract_wake_query("Hey Baymax."), "")
+        # A mention deep inside a sentence is not a wake-with-query.
+        self.assertEqual(extract_wake_query("so I told baymax about my day"), "")
+
 
 if __name__ == "__main__":
     unittest.main()
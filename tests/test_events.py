@@ -0,0 +1,77 @@
+import time
+import unittest
+
+from core.events import (
+    CONTROL,
+    TRANSCRIPT,
+    WAKE,
+    EventBus,
+    Overflow,
+    Priority,
+    QueueFull,
+    Topic,
+    TranscriptEvent,
+    WakeEvent,
+    WakeEventType,
+    wake_topic,
+)
+
+
+def transcript(text):
+    return TranscriptEvent(text=text, is_final=True, should_process=True)
+
+
+class EventBusTests(unittest.TestCase):
+    def test_drain_empties_control_lane_first_in_batches(self):
+        bus = EventBus(queued=(CONTROL, WAKE, TRANSCRIPT))
+        bus.publish(TRANSCRIPT, transcript("one"))
+        bus.publish(WAKE, WakeEvent(WakeEventType.WAKE, "hey baymax"))
+        bus.publish(TRANSCRIPT, transcript("two"))
+        sleep = WakeEvent(WakeEventType.SLEEP, "goodbye")
+        bus.publish(wake_topic(sleep), sleep)
+
+        first = bus.drain(max_items=2)
+        self.assertEqual([topic for topic, _event in first], [CONTROL, WAKE])
+        rest = bus.drain()
+        self.assertEqual([event.text for _topic, event in rest], ["one", "two"])
+        self.assertEqual(bus.depth(), 0)
+
+    def test_full_topics_follow_their_overflow_policy(self):
+        oldest = Topic("oldest", int, capacity=2)
+        newest = Topic("newest", int, capacity=2, overflow=Overflow.DROP_NEWEST)
+        strict = Topic("strict", int, Priority.CONTROL, capacity=1, overflow=Overflow.RAISE)
+        bus = EventBus(queued=(oldest, newest, strict))
+        for value in range(4):
+            bus.publish(oldest, value)
+            bus.publish(newest, value)
+        self.assertEqual([event for _topic, event in bus.drain((oldest,))], [2, 3])
+        self.assertEqual([event for _topic, event in bus.drain((newest,))], [0, 1])
+        self.assertEqual(bus.stats()["oldest"]["dropped"], 2)
+
+        bus.publish(strict, 1)
+        with self.assertRaises(QueueFull):
+            bus.publish(strict, 2)
+
+    def test_subscribers_run_on_publish_and_stats_track_latency(self):
+        bus = EventBus(queued=(TRANSCRIPT,))
+        seen = []
+        unsubscribe = bus.subscribe(TRANSCRIPT, seen.append)
+        event = transcript("hello")
+        self.assertLessEqual(event.timestamp, time.monotonic())
+        bus.publish(TRANSCRIPT, event)
+        unsubscribe()
+        bus.publish(TRANSCRIPT, transcript("unheard"))
+        self.assertEqual(seen, [event])
+
+        time.sleep(0.01)
+        self.assertIs(bus.pop(TRANSCRIPT), event)
+        stats = bus.stats()["transcript"]
+        self.assertEqual((stats["published"], stats["drained"], stats["depth"]), (2, 1, 1))
+        self.assertGreaterEqual(stats["latency_max_ms"], 10.0)
+
+        # Timestamps do not take part in equality.
+        self.assertEqual(transcript("hello"), event)
+
+
+if __name__ == "__main__":
+    unittest.main()
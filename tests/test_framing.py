@@ -0,0 +1,83 @@
+import os
+import unittest
+
+from app_states.state_manager import StateManager
+from audio.framing import FramingMode, FramingPolicy
+
+
+class FramingPolicyTests(unittest.TestCase):
+    def test_each_mode_reads_its_own_frame(self):
+        policy = FramingPolicy(16000, active_ms=20, muted_ms=100, asleep_ms=200)
+        sizes = {}
+        for mode in FramingMode:
+            policy.mode = mode
+            sizes[mode] = policy.next_read_size()
+        self.assertEqual(sizes, {FramingMode.ACTIVE: 320, FramingMode.MUTED: 1600, FramingMode.ASLEEP: 3200})
+        self.assertEqual(policy.smallest_frame, 320)
+
+    def test_backlog_is_coalesced_in_whole_frames(self):
+        policy = FramingPolicy(16000, active_ms=20)
+        self.assertEqual(policy.next_read_size(100), 320)
+        self.assertEqual(policy.next_read_size(320), 320)
+        # 3.5 frames queued: read the three whole ones, leave the partial frame.
+        self.assertEqual(policy.next_read_size(1120), 960)
+
+        policy.mode = FramingMode.ASLEEP
+        self.assertEqual(policy.next_read_size(1120), 3200)
+        self.assertEqual(policy.next_read_size(7000), 6400)
+
+    def test_coalescing_is_capped(self):
+        policy = FramingPolicy(16000, active_ms=20, max_coalesce=4)
+        self.assertEqual(policy.next_read_size(320 * 50), 320 * 4)
+
+        single = FramingPolicy(16000, active_ms=20, max_coalesce=0)
+        self.assertEqual(single.next_read_size(320 * 50), 320)
+
+
+class FramingStream:
+    def __init__(self):
+        self.modes = []
+
+    def add_wake_listener(self, callback):
+        pass
+
+    def add_transcript_listener(self, callback):
+        pass
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+    def set_framing_mode(self, mode: FramingMode) -> None:
+        self.modes.append(mode)
+
+
+class FramingModeTransitionTests(unittest.TestCase):
+    def setUp(self):
+        os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+
+    def test_state_transitions_switch_the_framing_mode(self):
+        stream = FramingStream()
+        manager = StateManager(stt_stream=stream)
+        self.assertEqual(stream.modes, [FramingMode.ASLEEP])
+
+        manager.set_state(manager.wake_state)
+        self.assertEqual(stream.modes[-1], FramingMode.ACTIVE)
+
+        manager.set_state(manager.listening_state)
+        self.assertEqual(stream.modes[-1], FramingMode.ACTIVE)
+
+        manager.set_state(manager.speaking_state)
+        self.assertEqual(stream.modes[-1], FramingMode.MUTED)
+
+        manager.set_state(manager.sleep_state)
+        self.assertEqual(stream.modes[-1], FramingMode.ASLEEP)
+
+
+if __name__ == "__main__":
+    unittest.main()
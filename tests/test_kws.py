@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from wakeword.kws import KeywordModel, KeywordSpotter, MFCC, enroll
+
+RATE = 16000
+KEYWORD = [250, 350, 300, 500, 700, 450, 300]
+
+
+def _tone_word(trajectory, seconds, rng, stretch=1.0):
+    count = int(seconds * stretch * RATE)
+    freq = np.interp(np.linspace(0, 1, count), np.linspace(0, 1, len(trajectory)), trajectory)
+    phase = 2 * np.pi * np.cumsum(freq) / RATE
+    ramp = np.minimum(1.0, np.minimum(np.arange(count), count - np.arange(count)) / 480.0)
+    return sum(np.sin(k * phase) / k for k in range(1, 6)) * ramp * 3000 + rng.standard_normal(count) * 100
+
+
+def _feed(spotter, samples):
+    times = []
+    for start in range(0, len(samples), 1024):
+        if spotter.detect(samples[start:start + 1024].tobytes()):
+            times.append((start + 1024) / RATE)
+    return times
+
+
+class KeywordSpotterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(0)
+        pad = lambda: cls.rng.standard_normal(4800) * 60  # noqa: E731
+        clips = [
+            np.concatenate([pad(), _tone_word(KEYWORD, 0.7, cls.rng, s), pad()]).astype(np.int16)
+            for s in (0.9, 1.0, 1.1)
+        ]
+        cls.model = enroll(clips, RATE)
+
+    def test_streaming_mfcc_matches_whole_clip(self):
+        signal = (self.rng.standard_normal(RATE) * 1000).astype(np.int16)
+        whole = MFCC(RATE).features(signal)
+        streaming = MFCC(RATE)
+        pieces = [streaming.push(signal[s:s + 777]) for s in range(0, len(signal), 777)]
+        np.testing.assert_allclose(np.concatenate(pieces), whole, rtol=1e-4, atol=1e-3)
+
+    def test_detects_keyword_shortly_after_it_ends(self):
+        word = _tone_word(KEYWORD, 0.7, self.rng, 1.05)
+        signal = np.concatenate([self.rng.standard_normal(RATE) * 150, word, self.rng.standard_normal(RATE) * 150])
+        triggers = _feed(KeywordSpotter(self.model), signal.astype(np.int16))
+        keyword_end = (RATE + len(word)) / RATE
+        self.assertEqual(len(triggers), 1)
+        self.assertLess(abs(triggers[0] - keyword_end), 0.3)
+
+    def test_rejects_other_words_and_noise_in_real_time(self):
+        parts = []
+        for index in range(40):
+            if index % 2:
+                parts.append(_tone_word(list(self.rng.uniform(150, 800, 7)), 0.7, self.rng))
+            else:
+                parts.append(self.rng.standard_normal(RATE // 2) * 300)
+        negatives = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+
+        started = time.perf_counter()
+        triggers = _feed(KeywordSpotter(self.model), negatives)
+        rtf = (time.perf_counter() - started) / (len(negatives) / RATE)
+        self.assertEqual(triggers, [])
+        self.assertLess(rtf, 0.1)
+
+    def test_model_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.npz")
+            self.model.save(path)
+            loaded = KeywordModel.load(path)
+        self.assertEqual(len(loaded.templates), 3)
+        self.assertAlmostEqual(loaded.threshold, self.model.threshold)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from config_app.settings import settings
+from stt.deepgram_http import DeepgramHTTPClient
+from stt.deepgram_stt import DeepgramSTT
+from audio.recorder import encode_wav
+from stt.long_form import GAP_MARKER, LongFormTranscriber, plan_chunks, silence_midpoints
+from stt.standin_server import StandInDeepgramServer
+
+RATE = 16000
+
+
+def _speech_with_pauses(bursts: int, burst_s: float = 4.0, pause_s: float = 0.6) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    parts = []
+    for _ in range(bursts):
+        parts.append(rng.standard_normal(int(burst_s * RATE)) * 3000)
+        parts.append(rng.standard_normal(int(pause_s * RATE)) * 20)
+    return np.concatenate(parts).astype(np.int16)
+
+
+class LongFormTests(unittest.TestCase):
+    def test_cuts_land_inside_pauses(self):
+        samples = _speech_with_pauses(10)
+        cycle = int(4.6 * RATE)
+        midpoints = silence_midpoints(samples, RATE)
+        self.assertEqual(len(midpoints), 10)
+
+        chunks = plan_chunks(samples, RATE, target_seconds=10.0, max_seconds=20.0)
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(chunks[0][0], 0)
+        self.assertEqual(chunks[-1][1], len(samples))
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(end, start)
+            self.assertGreaterEqual(end % cycle, int(4.0 * RATE))
+
+    def test_stitched_words_follow_the_original_timeline(self):
+        samples = _speech_with_pauses(8)
+        with StandInDeepgramServer(latency=0.01) as server:
+            client = DeepgramHTTPClient("test", base_url=server.base_url)
+            transcriber = LongFormTranscriber(client, workers=4, target_seconds=8.0, max_seconds=16.0)
+            result = transcriber.transcribe(encode_wav(samples, RATE))
+
+        self.assertGreater(len(result.segments), 1)
+        self.assertEqual(result.failed_segments, 0)
+        starts = [word["start"] for word in result.words]
+        self.assertEqual(starts, sorted(starts))
+        self.assertGreater(starts[-1], result.segments[-1]["start"])
+        self.assertLessEqual(result.words[-1]["end"], len(samples) / RATE + 0.5)
+        self.assertEqual(result.transcript.split(), [word["word"] for word in result.words])
+
+    def test_failed_chunks_leave_a_gap_marker(self):
+        samples = _speech_with_pauses(8)
+        with StandInDeepgramServer(latency=0.01) as server:
+            client = DeepgramHTTPClient("test", base_url=server.base_url)
+            upload = client.transcribe_bytes
+            calls = []
+
+            def flaky(audio: bytes):
+                calls.append(audio)
+                if len(calls) == 2:
+                    raise ConnectionError("chunk lost")
+                return upload(audio)
+
+            client.transcribe_bytes = flaky
+            transcriber = LongFormTranscriber(client, workers=1, target_seconds=8.0, max_seconds=16.0)
+            result = transcriber.transcribe(encode_wav(samples, RATE))
+
+        self.assertTrue(result.partial)
+        self.assertEqual(result.failed_segments, 1)
+        texts = [segment.get("transcript", GAP_MARKER) for segment in result.segments]
+        self.assertEqual(texts[1], GAP_MARKER)
+        self.assertEqual(result.transcript, " ".join(text for text in texts if text))
+
+    def test_long_in_memory_audio_is_routed_through_long_form(self):
+        for name, value in (("DEEPGRAM_API_KEY", "test"), ("LONG_FORM_MIN_SECONDS", 10.0), ("LONG_FORM_CHUNK_SECONDS", 8.0)):
+            self.addCleanup(setattr, settings, name, getattr(settings, name))
+            setattr(settings, name, value)
+        self.addCleanup(setattr, settings, "DEEPGRAM_BASE_URL", settings.DEEPGRAM_BASE_URL)
+
+        with StandInDeepgramServer(latency=0.01) as server:
+            settings.DEEPGRAM_BASE_URL = server.base_url
+            stt = DeepgramSTT()
+            transcript = stt.transcribe_audio(encode_wav(_speech_with_pauses(8), RATE))
+            self.assertGreater(server.requests, 1)
+
+        self.assertTrue(transcript)
+        self.assertFalse(stt.last_partial)
+
+
+if __name__ == "__main__":
+    unittest.main()
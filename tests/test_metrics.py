@@ -0,0 +1,68 @@
+import json
+import threading
+import unittest
+import urllib.request
+
+from core.metrics import MetricsServer, Registry
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_is_exact_across_threads(self):
+        counter = self.registry.counter("test_events_total", "events")
+
+        def work():
+            for _ in range(20000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value, 160000)
+
+    def test_histogram_buckets_and_quantile(self):
+        histogram = self.registry.histogram("test_seconds", "latency", buckets=(0.1, 0.5, 1.0))
+        for value in (0.05, 0.2, 0.3, 0.7, 3.0):
+            histogram.observe(value)
+        cumulative, total, count = histogram.totals()
+        self.assertEqual(cumulative, [1, 3, 4, 5])
+        self.assertAlmostEqual(total, 4.25)
+        self.assertEqual(count, 5)
+        self.assertEqual(histogram.quantile(0.5), 0.5)
+        self.assertEqual(histogram.quantile(0.99), float("inf"))
+
+    def test_prometheus_text_and_labels(self):
+        transitions = self.registry.counter("test_transitions_total", "transitions", ("to",))
+        transitions.labels("sleep").inc()
+        transitions.labels(to="sleep").inc(2)
+        depth = self.registry.gauge("test_depth", "queue depth")
+        depth.set_function(lambda: 7)
+        self.registry.histogram("test_lat_seconds", "lat", buckets=(0.1,)).observe(0.05)
+
+        text = self.registry.render_prometheus()
+        self.assertIn("# TYPE test_transitions_total counter", text)
+        self.assertIn('test_transitions_total{to="sleep"} 3', text)
+        self.assertIn("test_depth 7", text)
+        self.assertIn('test_lat_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIs(self.registry.counter("test_transitions_total", "again", ("to",)), transitions)
+
+    def test_server_endpoints(self):
+        self.registry.counter("test_hits_total", "hits").inc()
+        server = MetricsServer(self.registry, port=0)
+        server.start()
+        self.addCleanup(server.stop)
+
+        with urllib.request.urlopen(f"{server.url}/metrics", timeout=2.0) as response:
+            self.assertIn("test_hits_total 1", response.read().decode())
+        with urllib.request.urlopen(f"{server.url}/json", timeout=2.0) as response:
+            self.assertEqual(json.loads(response.read())["test_hits_total"]["series"]["-"], 1)
+        with urllib.request.urlopen(f"{server.url}/", timeout=2.0) as response:
+            self.assertIn("test_hits_total", response.read().decode())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import unittest
+from types import SimpleNamespace
+
+from app_states.state_manager import StateManager
+from config_app.settings import settings
+from core.clock import VirtualClock
+from stt.progressive import ProgressiveTranscription
+
+EVENTS = SimpleNamespace(Transcript="transcript", Error="error")
+
+
+def _result(text: str, *, is_final: bool = True, from_finalize: bool = False) -> dict:
+    return {
+        "channel": {"alternatives": [{"transcript": text}]},
+        "is_final": is_final,
+        "from_finalize": from_finalize,
+    }
+
+
+class FakeConnection:
+    """Live connection that answers each chunk with a final and acks Finalize if told to."""
+
+    def __init__(self, *, ack_finalize: bool = True, fail_send: bool = False):
+        self.ack_finalize = ack_finalize
+        self.fail_send = fail_send
+        self.handlers = {}
+        self.sent = []
+        self.finished = False
+
+    def on(self, event, callback):
+        self.handlers[event] = callback
+
+    def start(self, options):
+        return True
+
+    def send(self, chunk: bytes) -> None:
+        if self.fail_send:
+            raise ConnectionError("socket closed")
+        self.sent.append(chunk)
+        self.handlers[EVENTS.Transcript](self, result=_result(f"part{len(self.sent)}"))
+
+    def finalize(self) -> None:
+        if self.ack_finalize:
+            self.handlers[EVENTS.Transcript](self, result=_result("tail", from_finalize=True))
+
+    def finish(self) -> None:
+        self.finished = True
+
+
+class ProgressiveTranscriptionTests(unittest.TestCase):
+    def test_finals_are_joined_once_finalize_is_acknowledged(self):
+        connection = FakeConnection()
+        session = ProgressiveTranscription(connection, options=None, events=EVENTS)
+        session.send(b"\x00\x00" * 160)
+        session.send(b"")
+        session.send(b"\x00\x00" * 160)
+
+        self.assertEqual(session.finish(timeout=0.5), "part1 part2 tail")
+        self.assertEqual(len(connection.sent), 2)
+        self.assertTrue(connection.finished)
+
+    def test_unacknowledged_finalize_or_send_error_returns_none(self):
+        silent = FakeConnection(ack_finalize=False)
+        session = ProgressiveTranscription(silent, options=None, events=EVENTS)
+        session.send(b"\x00\x00" * 160)
+        self.assertIsNone(session.finish(timeout=0.05))
+        self.assertTrue(session.failed)
+        self.assertTrue(silent.finished)
+
+        broken = ProgressiveTranscription(FakeConnection(fail_send=True), options=None, events=EVENTS)
+        broken.send(b"\x00\x00" * 160)
+        self.assertIsNone(broken.finish(timeout=0.5))
+
+
+class FakeMic:
+    sample_rate = 16000
+    channels = 1
+
+    def record_to_wav_bytes(self, duration=5, on_chunk=None) -> bytes:
+        if on_chunk:
+            on_chunk(b"\x00\x00" * 160)
+        return b"RIFF-recorded-utterance"
+
+
+class FakeBatchSTT:
+    def __init__(self, connection: FakeConnection):
+        self.connection = connection
+        self.uploads = []
+
+    def open_progressive_session(self, sample_rate: int = 16000, channels: int = 1):
+        return ProgressiveTranscription(self.connection, options=None, events=EVENTS)
+
+    def transcribe_audio(self, wav_bytes: bytes) -> str:
+        self.uploads.append(wav_bytes)
+        return "uploaded transcript"
+
+
+class ListeningFallbackTests(unittest.TestCase):
+    def setUp(self):
+        os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+        previous = settings.PROGRESSIVE_STT
+        settings.PROGRESSIVE_STT = True
+        self.addCleanup(setattr, settings, "PROGRESSIVE_STT", previous)
+
+    def _listen(self, stt: FakeBatchSTT) -> StateManager:
+        manager = StateManager(mic=FakeMic(), stt=stt, clock=VirtualClock())
+        next_state = manager.listening_state.handle(manager, None)
+        self.assertIs(next_state, manager.processing_state)
+        return manager
+
+    def test_progressive_transcript_skips_the_upload(self):
+        stt = FakeBatchSTT(FakeConnection())
+        manager = self._listen(stt)
+        self.assertEqual(manager.last_user_text, "part1 tail")
+        self.assertEqual(stt.uploads, [])
+
+    def test_failed_progressive_session_uploads_the_recording(self):
+        stt = FakeBatchSTT(FakeConnection(ack_finalize=False))
+        manager = self._listen(stt)
+        self.assertEqual(stt.uploads, [b"RIFF-recorded-utterance"])
+        self.assertEqual(manager.last_user_text, "uploaded transcript")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from audio.recorder import EarlyStopRecorder
+
+RATE = 16000
+
+
+def _legacy_stop_length(signal: np.ndarray, duration: float) -> int:
+    """The pre-stream `Microphone.record` chunk loop, kept as the reference."""
+    chunk = int(0.1 * RATE)
+    speech = silence = 0
+    for index in range(int(duration / 0.1)):
+        piece = signal[index * chunk:(index + 1) * chunk]
+        rms = np.sqrt(np.mean(piece.astype(np.float32) ** 2))
+        if rms > 50:
+            speech += 1
+            silence = 0
+        elif speech >= 5:
+            silence += 1
+            if silence >= 12:
+                return (index + 1) * chunk
+    return int(duration / 0.1) * chunk
+
+
+def _feed(recorder: EarlyStopRecorder, signal: np.ndarray, block: int, on_chunk=None) -> None:
+    for start in range(0, len(signal), block):
+        recorder.write(signal[start:start + block].reshape(-1, 1))
+        if recorder.process_ready(on_chunk):
+            break
+
+
+class EarlyStopRecorderTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.signal = np.concatenate([
+            rng.standard_normal(int(0.3 * RATE)) * 10,
+            rng.standard_normal(int(1.4 * RATE)) * 2000,
+            rng.standard_normal(int(4.0 * RATE)) * 10,
+        ]).astype(np.int16)
+
+    def test_early_stop_matches_legacy_chunk_loop(self):
+        chunks = []
+        recorder = EarlyStopRecorder(RATE, 1, 5.0)
+        _feed(recorder, self.signal, block=700, on_chunk=chunks.append)
+
+        expected = _legacy_stop_length(self.signal, 5.0)
+        self.assertTrue(recorder.stopped_early)
+        self.assertEqual(len(recorder.audio()), expected)
+        np.testing.assert_array_equal(recorder.audio()[:, 0], self.signal[:expected])
+        self.assertEqual(len(chunks), expected // 1600)
+        self.assertTrue(all(len(c) == 3200 for c in chunks))
+
+    def test_full_duration_without_pause(self):
+        loud = (np.random.default_rng(4).standard_normal(3 * RATE) * 2000).astype(np.int16)
+        recorder = EarlyStopRecorder(RATE, 1, 2.0)
+        _feed(recorder, loud, block=1024)
+
+        self.assertTrue(recorder.finished)
+        self.assertFalse(recorder.stopped_early)
+        self.assertEqual(len(recorder.audio()), 2 * RATE)
+
+
+if __name__ == "__main__":
+    unittest.main()
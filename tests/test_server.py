@@ -0,0 +1,221 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import wave
+
+from websockets.sync.client import connect
+
+from core.events import TRANSCRIPT, TranscriptEvent, WakeEvent, WakeEventType
+from core.metrics import metrics
+from server.app import BaymaxServer
+from server.remote_io import RemoteMicrophone, RemotePlayer
+from server.session import SharedResources
+from tts.phrase_cache import PhraseCache
+
+
+class FakeStream:
+    def __init__(self, mic):
+        self.mic = mic
+        self.started = False
+        self.stopped = False
+        self._wake = []
+        self._transcript = []
+
+    def add_wake_listener(self, callback):
+        self._wake.append(callback)
+
+    def add_transcript_listener(self, callback):
+        self._transcript.append(callback)
+
+    def add_error_listener(self, callback):
+        pass
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+    def emit_wake(self, event: WakeEvent) -> None:
+        for callback in self._wake:
+            callback(event)
+
+    def emit_transcript(self, text: str) -> None:
+        for callback in self._transcript:
+            callback(TranscriptEvent(text=text, is_final=True, should_process=True))
+
+
+class EchoLLM:
+    def __init__(self):
+        self.history = []
+
+    def generate(self, text: str) -> str:
+        self.history.append(text)
+        return f"You said {text}."
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = []
+
+    def synthesize_to(self, text: str, path: str) -> float:
+        self.calls.append(text)
+        with wave.open(path, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(b"\x00\x00" * 1600)
+        return 0.1
+
+
+class RemoteIOTests(unittest.TestCase):
+    def test_microphone_buffers_reads_and_mutes(self):
+        mic = RemoteMicrophone(16000, chunk_size=4, max_buffer_seconds=0.001, read_timeout=0.01)
+        mic.push(b"\x01\x00" * 10)
+        self.assertEqual(mic.read_audio_chunk(), b"\x01\x00" * 4)
+        self.assertEqual(mic.pending_frames(), 6)
+        mic.mute_for(1.0)
+        self.assertEqual(mic.read_audio_chunk(), b"")
+        self.assertEqual(mic.pending_frames(), 0)
+        mic.unmute()
+        self.assertEqual(mic.read_audio_chunk(), b"")
+
+        # Oldest frames go first once the buffer is full (16 frames here).
+        for _ in range(3):
+            mic.push(b"\x02\x00" * 10)
+        self.assertEqual(mic.frames_dropped, 20)
+        self.assertEqual(mic.pending_frames(), 10)
+
+    def test_player_waits_for_device_acknowledgement(self):
+        sent = []
+        player = RemotePlayer(sent.append, ack_grace=5.0)
+        with tempfile.NamedTemporaryFile(suffix=".wav") as handle:
+            FakeEngine().synthesize_to("hi", handle.name)
+            player.play(handle.name)
+        header = json.loads(sent[0])
+        self.assertEqual((header["type"], header["seconds"]), ("play", 0.1))
+        self.assertIsInstance(sent[1], bytes)
+        self.assertFalse(player.wait(timeout=0.01))
+        player.acknowledge(header["id"])
+        self.assertTrue(player.wait(timeout=0.01))
+
+
+class ServerTests(unittest.TestCase):
+    def setUp(self):
+        previous = os.environ.pop("BAYMAX_SKIP_AUDIO", None)
+        if previous is not None:
+            self.addCleanup(os.environ.__setitem__, "BAYMAX_SKIP_AUDIO", previous)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.streams = []
+        self.llms = []
+        self.clip_ids = {}
+        self.engine = FakeEngine()
+
+        def new_llm():
+            llm = EchoLLM()
+            self.llms.append(llm)
+            return llm
+
+        def new_stream(mic):
+            stream = FakeStream(mic)
+            self.streams.append(stream)
+            return stream
+
+        shared = SharedResources(llm_factory=new_llm, tts=self.engine, phrase_cache=PhraseCache())
+        self.server = BaymaxServer(port=0, shared=shared, stream_factory=new_stream, workers=4, audio_root=self.tmp.name)
+        self.loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result(5.0)
+
+        def shutdown():
+            asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result(5.0)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            thread.join(2.0)
+
+        self.addCleanup(shutdown)
+
+    def _device(self, name):
+        websocket = self.enterContext(connect(f"ws://127.0.0.1:{self.server.port}"))
+        websocket.send(json.dumps({"type": "hello", "session": name}))
+        self.assertEqual(json.loads(websocket.recv(timeout=5.0)), {"type": "ready", "session": name})
+        return websocket
+
+    def _until(self, websocket, predicate, timeout=5.0):
+        """Read messages (acknowledging clips) until `predicate(message)` holds."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            message = websocket.recv(timeout=deadline - time.monotonic())
+            if isinstance(message, bytes):
+                websocket.send(json.dumps({"type": "played", "id": self.clip_ids[websocket]}))
+                continue
+            payload = json.loads(message)
+            if payload["type"] == "play":
+                self.clip_ids[websocket] = payload["id"]
+            if predicate(payload):
+                return payload
+        self.fail("expected message never arrived")
+
+    def test_sessions_hold_separate_conversations(self):
+        kitchen = self._device("kitchen")
+        bedroom = self._device("bedroom")
+        self.assertEqual(len(self.streams), 2)
+        self.assertTrue(all(stream.started for stream in self.streams))
+        self.assertEqual(set(self.server.sessions), {"kitchen", "bedroom"})
+
+        kitchen.send(b"\x00\x00" * 320)
+        self.streams[0].emit_wake(WakeEvent(event_type=WakeEventType.WAKE, transcript="hey baymax what time is it", query="what time is it"))
+        self._until(kitchen, lambda message: message == {"type": "state", "state": "listening"})
+
+        self.streams[0].emit_transcript("tell me a story")
+        self._until(kitchen, lambda message: message["type"] == "play")
+        self._until(kitchen, lambda message: message == {"type": "state", "state": "listening"})
+
+        self.assertEqual(self.llms[0].history, ["what time is it", "tell me a story"])
+        self.assertEqual(self.llms[1].history, [])
+        self.assertEqual(self.server.sessions["bedroom"].state, "sleep")
+
+        kitchen.send(json.dumps({"type": "bye"}))
+        deadline = time.monotonic() + 2.0
+        while "kitchen" in self.server.sessions and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertNotIn("kitchen", self.server.sessions)
+        self.assertTrue(self.streams[0].stopped)
+
+    def test_sessions_report_queues_per_server_not_through_process_gauges(self):
+        process_queue = metrics.gauge("baymax_queue_depth", "", ("queue",)).labels("transcripts")
+        process_queue.set_function(lambda: -1)
+        self.addCleanup(process_queue.set_function, lambda: 0)
+
+        self._device("kitchen")
+        self._device("bedroom")
+        self.assertEqual(process_queue.value, -1)
+
+        server_queue = metrics.gauge("baymax_server_queue_depth", "", ("queue",)).labels("transcripts")
+        self.server.sessions["kitchen"].manager.events.publish(TRANSCRIPT, TranscriptEvent(text="hi", is_final=True, should_process=True))
+        self.assertEqual(server_queue.value, 1)
+
+    def test_repeated_lines_come_from_the_phrase_cache(self):
+        for name in ("one", "two"):
+            device = self._device(name)
+            stream = self.streams[-1]
+            stream.emit_wake(WakeEvent(event_type=WakeEventType.WAKE, transcript="hey baymax"))
+            self._until(device, lambda message: message == {"type": "state", "state": "listening"})
+        # Both devices heard the greeting; it was synthesized once.
+        self.assertEqual(len(self.engine.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
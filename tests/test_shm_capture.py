@@ -0,0 +1,72 @@
+import os
+import signal
+import threading
+import unittest
+
+import numpy as np
+
+from audio.shm_capture import SharedMemoryCapture, SyntheticSource
+
+
+class SharedMemoryCaptureTests(unittest.TestCase):
+    def setUp(self):
+        self.capture = SharedMemoryCapture(
+            16000,
+            capacity_seconds=1.0,
+            source_factory=SyntheticSource,
+            heartbeat_timeout=0.5,
+            supervise_interval=3600,  # the test drives supervise() itself
+        )
+        self.capture.start_stream()
+
+    def tearDown(self):
+        self.capture.stop_stream()
+
+    def test_frames_arrive_in_order_as_shared_views(self):
+        first = self.capture.read(320, timeout=20.0)
+        self.assertIsNotNone(first)
+        self.assertFalse(first.flags.writeable)
+        ramp = [first[:, 0].copy()]
+        for _ in range(10):
+            ramp.append(self.capture.read(320, timeout=2.0)[:, 0].copy())
+        np.testing.assert_array_equal(np.diff(np.concatenate(ramp)), 1)
+
+    def test_supervisor_restarts_killed_child_and_reader_continues(self):
+        self.assertIsNotNone(self.capture.read(320, timeout=20.0))
+        self.assertFalse(self.capture.supervise())
+
+        os.kill(self.capture._process.pid, signal.SIGKILL)
+        self.capture._process.join(timeout=2.0)
+        self.assertTrue(self.capture.supervise())
+        self.assertEqual(self.capture.restarts, 1)
+
+        self.capture.discard_pending()
+        self.assertIsNotNone(self.capture.read(320, timeout=20.0))
+        stamps = self.capture.capture_stamps()
+        self.assertGreater(len(stamps), 1)
+        self.assertTrue(np.all(np.diff(stamps[:, 0]) > 0))
+
+    def test_overrun_resumes_at_the_head(self):
+        self.assertIsNotNone(self.capture.read(320, timeout=20.0))
+        ring = self.capture._ring
+        # Pretend the reader stalled for more than a window.
+        written = ring.written
+        self.capture.cursor = written - self.capture.window - 100
+        self.assertLess(self.capture.pending_frames(), 320 * 2)
+        self.assertEqual(self.capture.overruns, 1)
+        self.assertGreaterEqual(self.capture.dropped_frames, self.capture.window + 100)
+
+    def test_blocked_reader_is_released_by_stop(self):
+        self.assertIsNotNone(self.capture.read(320, timeout=20.0))
+        results = []
+        # More than the ring holds: the reader blocks on the writer's event until stopped.
+        reader = threading.Thread(target=lambda: results.append(self.capture.read(self.capture.window, timeout=30.0)))
+        reader.start()
+        self.capture.stop_stream()
+        reader.join(timeout=2.0)
+        self.assertFalse(reader.is_alive())
+        self.assertEqual(results, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 import os
+import threading
+import time
 import unittest
 
 from app_states.state_manager import StateManager
+from app_states.wake_state import WELCOME_LINE
 from core.events import TranscriptEvent, WakeEvent, WakeEventType
 
 
@@ -57,6 +60,29 @@ class FakeLLM:
         return f"LLM:{text}"
 
 
+class BlockingLLM:
+    """An LLM request that only ends when its cancel token fires (or after 5 s)."""
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def generate(self, text: str, *, cancel=None) -> str:
+        if cancel is not None and cancel.wait(5.0):
+            self.cancelled.set()
+        return f"LLM:{text}"
+
+
+class BlockingTTS(FakeTTS):
+    def __init__(self):
+        super().__init__()
+        self.cancelled = []
+
+    def speak(self, text: str, *, cancel=None) -> None:
+        self.calls.append(text)
+        if text.startswith("LLM:") and cancel is not None and cancel.wait(5.0):
+            self.cancelled.append(text)
+
+
 class FakeTranscript(TranscriptEvent):
     def __init__(self, text: str, is_final: bool = True, should_process: bool = True):
         super().__init__(text=text, is_final=is_final, should_process=should_process, raw=None)
@@ -125,6 +151,119 @@ class StateFlowTestCase(unittest.TestCase):
         self.assertEqual(self.tts.last_text, "LLM:How are you?")
         self.assertTrue(self.streaming.response_notified)
 
+    def test_wake_with_query_skips_greeting(self):
+        self.manager.set_state(self.manager.sleep_state)
+        transcript = "Hey Baymax, what should I do about a headache?"
+        self.streaming.emit_wake(
+            WakeEvent(WakeEventType.WAKE, transcript, query="what should I do about a headache?")
+        )
+        self.streaming.emit_transcript(FakeTranscript(transcript))
+
+        # sleep -> processing -> speaking -> listening
+        self._advance_state(steps=3)
+
+        self.assertIs(self.manager.current_state, self.manager.listening_state)
+        self.assertEqual(self.tts.calls, ["LLM:what should I do about a headache?"])
+        # The wake utterance itself must not be answered a second time.
+        self.assertIsNone(self.manager.consume_transcript())
+
+    def test_wake_query_transcript_arriving_after_the_fast_path_is_dropped(self):
+        self.manager.set_state(self.manager.sleep_state)
+        transcript = "Hey Baymax, what should I do about a headache?"
+        self.streaming.emit_wake(
+            WakeEvent(WakeEventType.WAKE, transcript, query="what should I do about a headache?")
+        )
+        # The stream publishes the final only after the wake event has woken the loop.
+        self.manager.update()
+        self.streaming.emit_transcript(FakeTranscript(transcript))
+        self._advance_state(steps=2)
+
+        self.assertIs(self.manager.current_state, self.manager.listening_state)
+        self.assertEqual(self.tts.calls, ["LLM:what should I do about a headache?"])
+        self.assertIsNone(self.manager.consume_transcript())
+
+        # Only that one final is dropped; the next question is answered.
+        self.streaming.emit_transcript(FakeTranscript(transcript))
+        self._advance_state(steps=3)
+        self.assertEqual(self.tts.calls[-1], f"LLM:{transcript}")
+
+    def test_transcript_releases_blocked_listening_tick(self):
+        self.manager.set_state(self.manager.listening_state)
+        self.manager.wait_for_event(0.0)  # consume the signal left by set_state
+        threading.Timer(0.05, self.streaming.emit_transcript, args=(FakeTranscript("How are you?"),)).start()
+
+        started = time.monotonic()
+        self.manager.update()
+        if self.manager.current_state is self.manager.listening_state:
+            self.manager.update()
+        elapsed = time.monotonic() - started
+
+        self.assertIs(self.manager.current_state, self.manager.processing_state)
+        # Woken by the transcript itself, well before the event-mode wait cap.
+        self.assertLess(elapsed, 1.0)
+
+    def test_sleep_preempts_queued_wake_and_transcript(self):
+        self.manager.set_state(self.manager.listening_state)
+        self.streaming.emit_wake(WakeEvent(WakeEventType.WAKE, "hey baymax"))
+        self.streaming.emit_transcript(FakeTranscript("tell me a story"))
+        self.streaming.emit_wake(WakeEvent(WakeEventType.SLEEP, "goodbye baymax"))
+
+        self._advance_state()
+
+        self.assertIs(self.manager.current_state, self.manager.sleep_state)
+        self.assertEqual(self.tts.calls, ["I cannot deactivate until you say 'you are satisfied with my care'."])
+        self.assertEqual(self.manager.events.depth(), 0)
+
+    def test_goodbye_cancels_blocked_llm_request(self):
+        llm = BlockingLLM()
+        self.manager.llm = llm
+        self.manager.processing_state.llm = llm
+        self.manager.set_state(self.manager.listening_state)
+        self.streaming.emit_transcript(FakeTranscript("tell me a long story"))
+        self.manager.update()
+        self.assertIs(self.manager.current_state, self.manager.processing_state)
+
+        goodbye = threading.Timer(0.1, self.streaming.emit_wake, args=(WakeEvent(WakeEventType.SLEEP, "goodbye baymax"),))
+        goodbye.start()
+        started = time.monotonic()
+        self.manager.update()
+        elapsed = time.monotonic() - started
+
+        self.assertTrue(llm.cancelled.wait(1.0))
+        self.assertLess(elapsed, 0.5)
+        self.assertIs(self.manager.current_state, self.manager.speaking_state)
+        self._advance_state(steps=1)
+        self.assertIs(self.manager.current_state, self.manager.sleep_state)
+        self.assertEqual(self.tts.calls, ["I cannot deactivate until you say 'you are satisfied with my care'."])
+
+    def test_satisfied_cancels_speech_in_flight(self):
+        tts = BlockingTTS()
+        self.manager.tts = tts
+        self.manager.speaking_state.tts = tts
+        self.manager.set_state(self.manager.listening_state)
+        self.streaming.emit_transcript(FakeTranscript("how are you"))
+        self._advance_state(steps=2)
+        self.assertIs(self.manager.current_state, self.manager.speaking_state)
+
+        satisfied = WakeEvent(WakeEventType.SATISFIED, "you are satisfied with my care")
+        threading.Timer(0.1, self.streaming.emit_wake, args=(satisfied,)).start()
+        started = time.monotonic()
+        self.manager.update()
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        self._advance_state(steps=2)
+        self.assertIs(self.manager.current_state, self.manager.sleep_state)
+        self.assertEqual(tts.cancelled, ["LLM:how are you"])
+        self.assertEqual(tts.calls[-1], "Thank you. I am grateful that you are satisfied with my care. Entering sleep mode.")
+
+    def test_bare_wake_still_greets(self):
+        self.manager.set_state(self.manager.sleep_state)
+        self.streaming.emit_wake(WakeEvent(WakeEventType.WAKE, "hey baymax"))
+
+        self._advance_state(steps=3)
+
+        self.assertEqual(self.tts.calls, [WELCOME_LINE])
+
 
 if __name__ == "__main__":
     unittest.main()
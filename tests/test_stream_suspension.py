@@ -0,0 +1,124 @@
+import threading
+import unittest
+
+from stt.stream_suspension import StreamSuspender
+
+
+class FakeStream:
+    def __init__(self):
+        self.suspended = False
+        self.replayed = []
+        self.connect = threading.Event()
+        self.connect.set()
+
+    def suspend(self) -> None:
+        self.suspended = True
+
+    def resume(self, preroll) -> bool:
+        self.connect.wait(timeout=5.0)
+        self.suspended = False
+        self.replayed = list(preroll)
+        return True
+
+
+class FakeMic:
+    sample_rate = 16000
+    channels = 1
+
+    def __init__(self):
+        self.next_chunk = b"\x00" * 2048
+
+    def read_audio_chunk(self) -> bytes:
+        return self.next_chunk
+
+
+class FakeGate:
+    def __init__(self):
+        self.fire = False
+
+    def detect(self, chunk) -> bool:
+        return self.fire
+
+
+class StreamSuspenderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.stream = FakeStream()
+        self.mic = FakeMic()
+        self.gate = FakeGate()
+        self.resumed = threading.Event()
+        self.suspender = StreamSuspender(
+            self.stream,
+            self.mic,
+            self.gate,
+            suspend_after=30.0,
+            preroll_seconds=0.512,
+            wake_confirm_window=4.0,
+            on_resumed=self.resumed.set,
+        )
+
+    def wait_resumed(self):
+        self.assertTrue(self.resumed.wait(timeout=2.0))
+        self.resumed.clear()
+
+    def test_suspends_after_threshold_and_replays_preroll_on_burst(self):
+        self.assertFalse(self.suspender.tick(now=0.0))
+        self.assertTrue(self.suspender.tick(now=30.0))
+        self.assertTrue(self.stream.suspended)
+
+        for step in range(10):
+            self.suspender.tick(now=30.1 + step * 0.064)
+        self.gate.fire = True
+        self.mic.next_chunk = b"\x10" * 2048
+        self.suspender.tick(now=31.0)
+        self.wait_resumed()
+
+        self.assertFalse(self.stream.suspended)
+        # 0.512 s of 16 kHz int16 audio is exactly 8 chunks of 2048 bytes.
+        self.assertEqual(len(self.stream.replayed), 8)
+        self.assertEqual(self.stream.replayed[-1], b"\x10" * 2048)
+
+        self.suspender.note_wake()
+        stats = self.suspender.stats()
+        self.assertEqual(stats["bursts"], 1)
+        self.assertEqual(stats["spurious_resume_rate"], 0.0)
+        self.assertAlmostEqual(stats["suspended_seconds"], 1.0)
+
+    def test_unconfirmed_burst_counts_as_spurious_and_resuspends(self):
+        self.suspender.tick(now=0.0)
+        self.suspender.tick(now=30.0)
+        self.gate.fire = True
+        self.suspender.tick(now=40.0)
+        self.wait_resumed()
+        self.gate.fire = False
+
+        self.suspender.tick(now=45.0)
+        self.assertTrue(self.suspender.tick(now=45.1))
+        self.assertTrue(self.stream.suspended)
+        self.assertEqual(self.suspender.stats()["spurious_resume_rate"], 1.0)
+
+    def test_leave_sleep_reconnects_without_blocking_the_caller(self):
+        self.suspender.tick(now=0.0)
+        self.suspender.tick(now=30.0)
+        self.stream.connect.clear()
+
+        self.suspender.leave_sleep()
+        # The state loop carries on and waits for `on_resumed` instead of the connect.
+        self.assertTrue(self.stream.suspended)
+        self.assertTrue(self.suspender.resuming)
+        self.assertFalse(self.suspender.tick(now=31.0))
+        self.assertIsNone(self.suspender.next_due(now=31.0))
+
+        self.stream.connect.set()
+        self.wait_resumed()
+        self.assertFalse(self.stream.suspended)
+        self.assertFalse(self.suspender.suspended)
+
+    def test_next_due_tracks_suspend_deadline(self):
+        self.suspender.tick(now=0.0)
+        self.assertAlmostEqual(self.suspender.next_due(now=12.0), 18.0)
+        self.suspender.tick(now=30.0)
+        self.assertEqual(self.suspender.next_due(now=30.5), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from websockets.sync.client import connect
+
+from server.session import SharedResources
+from server.shared_store import SharedStore, StoreCache
+from server.supervisor import HashRing, Supervisor
+from tts.phrase_cache import PhraseCache
+
+
+class QuietStream:
+    """STT stand-in for worker processes: no events, nothing to drain."""
+
+    def __init__(self, mic):
+        self.mic = mic
+
+    def add_wake_listener(self, callback):
+        pass
+
+    def add_transcript_listener(self, callback):
+        pass
+
+    def add_error_listener(self, callback):
+        pass
+
+
+def offline_resources(store):
+    return SharedResources(llm_factory=lambda: None, tts=object(), store=store)
+
+
+class HashRingTests(unittest.TestCase):
+    def test_keys_spread_and_only_move_off_a_removed_node(self):
+        ring = HashRing(["worker-0", "worker-1", "worker-2"])
+        keys = [f"device-{index}" for index in range(3000)]
+        before = {key: ring.lookup(key) for key in keys}
+        counts = [list(before.values()).count(node) for node in ring.nodes]
+        self.assertGreater(min(counts), 600)
+
+        ring.remove("worker-1")
+        after = {key: ring.lookup(key) for key in keys}
+        moved = [key for key in keys if before[key] != after[key]]
+        self.assertTrue(all(before[key] == "worker-1" for key in moved))
+        self.assertNotIn("worker-1", after.values())
+
+        ring.add("worker-1")
+        self.assertEqual({key: ring.lookup(key) for key in keys}, before)
+
+
+class SharedStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "shared.db")
+
+    def test_entries_written_by_one_connection_are_read_by_another(self):
+        writer, reader = SharedStore(self.path), SharedStore(self.path)
+        self.addCleanup(writer.close)
+        self.addCleanup(reader.close)
+        self.assertEqual(writer.journal_mode, "wal")
+
+        StoreCache(writer, "tts").put("Hello.", b"RIFF")
+        self.assertEqual(StoreCache(reader, "tts").get("Hello."), b"RIFF")
+        self.assertIsNone(StoreCache(reader, "llm").get("Hello."))
+        self.assertIsNone(StoreCache(reader, "tts", ttl=-1.0).get("Hello."))
+
+        for index in range(5):
+            writer.put("llm", f"q{index}", b"a", max_entries=3)
+        self.assertIsNone(reader.get("llm", "q0"))
+        self.assertEqual(reader.get("llm", "q4"), b"a")
+
+        writer.save_session("kitchen", {"history": [{"role": "user", "content": "hi"}], "awake": True})
+        self.assertEqual(reader.load_session("kitchen")["history"][0]["content"], "hi")
+        self.assertEqual(reader.prune_sessions(-1.0), 1)
+        self.assertIsNone(reader.load_session("kitchen"))
+
+    def test_phrase_cache_falls_back_to_the_shared_store(self):
+        store = SharedStore(self.path)
+        self.addCleanup(store.close)
+        PhraseCache(backing=StoreCache(store, "tts")).put("Goodbye.", b"RIFF")
+        other = PhraseCache(backing=StoreCache(store, "tts"))
+        self.assertEqual(other.get("Goodbye."), b"RIFF")
+        self.assertEqual(other.stats(), {"entries": 1, "hits": 1, "misses": 0})
+
+
+class SupervisorTests(unittest.TestCase):
+    def setUp(self):
+        previous = os.environ.pop("BAYMAX_SKIP_AUDIO", None)
+        if previous is not None:
+            self.addCleanup(os.environ.__setitem__, "BAYMAX_SKIP_AUDIO", previous)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.supervisor = Supervisor(
+            port=0,
+            processes=2,
+            store_path=os.path.join(self.tmp.name, "shared.db"),
+            stream_factory=f"{__name__}:QuietStream",
+            resources=f"{__name__}:offline_resources",
+            threads=2,
+            audio_root=self.tmp.name,
+            check_interval=0.05,
+        )
+        self.loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        thread.start()
+        asyncio.run_coroutine_threadsafe(self.supervisor.start(), self.loop).result(60.0)
+
+        def shutdown():
+            asyncio.run_coroutine_threadsafe(self.supervisor.stop(), self.loop).result(30.0)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            thread.join(2.0)
+
+        self.addCleanup(shutdown)
+
+    def _hello(self, name):
+        with connect(f"ws://127.0.0.1:{self.supervisor.port}/session/{name}") as websocket:
+            websocket.send(json.dumps({"type": "hello"}))
+            ready = json.loads(websocket.recv(timeout=10.0))
+            port = websocket.remote_address[1]
+            websocket.send(json.dumps({"type": "bye"}))
+        return ready, port
+
+    def _wait_for(self, predicate, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline, "condition never held")
+            time.sleep(0.05)
+
+    def test_sessions_fail_over_and_resume_after_a_worker_dies(self):
+        ready, port = self._hello("kitchen")
+        self.assertEqual(ready, {"type": "ready", "session": "kitchen"})
+        owner = self.supervisor.route("kitchen")
+        self.assertEqual(port, owner.port.value)
+
+        owner.process.kill()
+        self._wait_for(lambda: owner.name not in self.supervisor.ring.nodes)
+        ready, port = self._hello("kitchen")
+        self.assertEqual(ready, {"type": "ready", "session": "kitchen", "resumed": True})
+        self.assertNotEqual(port, owner.port.value)
+
+        # Restarted on the same port, the worker takes its sessions back.
+        self._wait_for(lambda: owner.name in self.supervisor.ring.nodes)
+        self.assertEqual(owner.restarts, 1)
+        self.assertEqual(self._hello("kitchen")[1], owner.port.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+import unittest
+
+from app_states.state_manager import StateManager
+from core.clock import VirtualClock
+from core.idle_monitor import IdleMonitor
+from core.timers import TimedFlag, TimerScheduler
+
+
+class TimerSchedulerTests(unittest.TestCase):
+    def test_virtual_clock_fires_in_deadline_order_with_cancel_and_reschedule(self):
+        clock = VirtualClock()
+        timers = TimerScheduler(clock)
+        fired = []
+
+        timers.call_later(5.0, lambda: fired.append(("a", clock.elapsed)))
+        cancelled = timers.call_later(2.0, lambda: fired.append(("cancelled", clock.elapsed)))
+        moved = timers.call_later(1.0, lambda: fired.append(("moved", clock.elapsed)))
+        self.assertTrue(cancelled.cancel())
+        self.assertFalse(cancelled.cancel())
+        moved.reschedule(7.0)
+        self.assertEqual(timers.pending(), 2)
+
+        clock.advance(6.0)
+        self.assertEqual(fired, [("a", 5.0)])
+        self.assertAlmostEqual(moved.remaining(), 1.0)
+        clock.advance(10.0)
+        self.assertEqual(fired, [("a", 5.0), ("moved", 7.0)])
+        self.assertEqual(clock.elapsed, 16.0)
+        self.assertEqual(timers.pending(), 0)
+
+        # Constant rescheduling (activity pushing an idle timer back) keeps the heap small.
+        idle = timers.call_later(45.0, lambda: fired.append(("idle", clock.elapsed)))
+        for _ in range(1000):
+            idle.reschedule(45.0)
+        self.assertLess(timers.stats()["heap"], 200)
+        clock.advance(60.0)
+        self.assertEqual(fired[-1], ("idle", 61.0))
+
+    def test_timed_flag_extends_and_clears(self):
+        clock = VirtualClock()
+        timers = TimerScheduler(clock)
+        expired = []
+        flag = TimedFlag(timers, on_expire=lambda: expired.append(clock.elapsed))
+
+        flag.set_for(1.0)
+        flag.set_for(0.5)  # shorter windows never cut an active one short
+        self.assertTrue(flag)
+        clock.advance(0.75)
+        self.assertTrue(flag)
+        self.assertAlmostEqual(flag.remaining(), 0.25)
+        clock.advance(0.5)
+        self.assertFalse(flag)
+        self.assertEqual(expired, [1.0])
+
+        flag.set_for(2.0)
+        flag.clear()
+        clock.advance(5.0)
+        self.assertFalse(flag)
+        self.assertEqual(expired, [1.0])
+
+    def test_dispatcher_thread_fires_at_deadline(self):
+        timers = TimerScheduler()
+        done = threading.Event()
+        try:
+            started = time.monotonic()
+            timers.call_later(10.0, done.set).cancel()
+            timers.call_later(0.05, done.set)
+            self.assertTrue(done.wait(2.0))
+            self.assertGreaterEqual(time.monotonic() - started, 0.05)
+            self.assertEqual(timers.stats()["fired"], 1)
+        finally:
+            timers.stop()
+
+
+class _Stream:
+    def add_wake_listener(self, callback):
+        pass
+
+    def add_transcript_listener(self, callback):
+        pass
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+
+class IdleMonitorThreadTests(unittest.TestCase):
+    def test_idle_check_runs_on_the_state_loop_not_the_timer_thread(self):
+        os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+        manager = StateManager(stt_stream=_Stream())
+        manager.set_state(manager.listening_state)
+        manager.wait_for_event(0.0)
+        prompted_on = []
+
+        def prompt():
+            prompted_on.append(threading.current_thread())
+            manager.set_state(manager.sleep_state)
+
+        manager.queue_idle_prompt = prompt
+        idle = IdleMonitor(manager=manager, warn_after=0.05, sleep_after=10.0)
+        idle.start()
+        self.addCleanup(idle.stop)
+
+        # The timer only wakes the loop; the check waits for the loop's next tick.
+        self.assertTrue(manager.wait_for_event(2.0))
+        self.assertEqual(prompted_on, [])
+        manager.update()
+        self.assertEqual(prompted_on, [threading.current_thread()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from core.tracing import Tracer, load_turns, stage_durations, summarize
+
+
+class TracerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "trace.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_turn(self, tracer, base, llm_ms):
+        tracer.begin_turn()
+        tracer.mark("end_of_speech", at=base)
+        tracer.mark("stt_final", at=base + 0.3)
+        tracer.mark("llm_request", at=base + 0.31)
+        tracer.mark("llm_first_token", at=base + 0.31 + llm_ms / 1000.0)
+        tracer.mark("playback_start", at=base + 1.0)
+        tracer.mark("playback_end", at=base + 1.5)
+        tracer.mark("playback_start", at=base + 1.6)
+        tracer.mark("playback_end", at=base + 2.0)
+        tracer.end_turn()
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        self.assertIsNone(tracer.begin_turn())
+        tracer.mark("stt_final")
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_marks_outside_a_turn_are_dropped(self):
+        tracer = Tracer()
+        tracer.open(self.path)
+        tracer.mark("playback_start")
+        tracer.close()
+        self.assertEqual(load_turns(self.path), {})
+
+    def test_stage_percentiles(self):
+        tracer = Tracer()
+        tracer.open(self.path)
+        for index in range(100):
+            self._write_turn(tracer, base=10.0 * index, llm_ms=index + 1)
+        tracer.close()
+
+        durations = stage_durations(load_turns(self.path))
+        self.assertEqual(len(durations["llm_first_token"]), 100)
+        # Multi-segment playback spans first start to last end.
+        self.assertAlmostEqual(durations["playback"][0], 1000.0, places=3)
+
+        summary = summarize(self.path)
+        self.assertAlmostEqual(summary["stt_finalize"]["p50_ms"], 300.0, places=3)
+        self.assertAlmostEqual(summary["llm_first_token"]["p95_ms"], 95.05, places=2)
+        self.assertAlmostEqual(summary["response_latency"]["p99_ms"], 1000.0, places=3)
+        self.assertNotIn("tts_first_byte", summary)
+
+    def test_appended_runs_keep_their_turns_apart(self):
+        # Two processes appending to the same file: both number their first turn 1.
+        for base in (100.0, 5.0):
+            tracer = Tracer()
+            tracer.open(self.path)
+            tracer.begin_turn()
+            tracer.mark("playback_start", at=base)
+            tracer.mark("playback_end", at=base + 0.05)
+            tracer.end_turn()
+            tracer.close()
+
+        self.assertEqual(sorted(load_turns(self.path)), [(1, 1), (2, 1)])
+        summary = summarize(self.path)
+        self.assertEqual(summary["playback"]["count"], 2)
+        self.assertAlmostEqual(summary["playback"]["p50_ms"], 50.0, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
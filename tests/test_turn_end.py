@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from stt.turn_end import TurnDecision, TurnEndPredictor
+
+
+def _frame(amplitude: float) -> bytes:
+    return np.full(320, amplitude, dtype=np.int16).tobytes()
+
+
+class TurnEndPredictorTestCase(unittest.TestCase):
+    def test_waits_while_user_is_still_speaking(self) -> None:
+        predictor = TurnEndPredictor()
+        predictor.observe_interim("how are you", now=0.0)
+        predictor.observe_audio(_frame(3000), now=0.5)
+
+        self.assertIs(predictor.decide(now=0.55), TurnDecision.WAIT)
+
+    def test_finalize_then_commit_as_silence_grows(self) -> None:
+        predictor = TurnEndPredictor(silence_ms=500, stable_ms=300)
+        predictor.observe_audio(_frame(3000), now=0.0)
+        predictor.observe_interim("how are you today", now=0.0)
+
+        self.assertIs(predictor.decide(now=0.35), TurnDecision.FINALIZE)
+        predictor.mark_finalize_requested()
+        self.assertIs(predictor.decide(now=0.4), TurnDecision.WAIT)
+
+        predictor.observe_interim("How are you today?", now=0.4)
+        self.assertIs(predictor.decide(now=0.9), TurnDecision.COMMIT)
+        self.assertEqual(predictor.commit(), "How are you today?")
+        self.assertEqual(predictor.pending_text, "")
+
+    def test_speech_final_commits_accumulated_finals(self) -> None:
+        predictor = TurnEndPredictor()
+        predictor.observe_final("I have a", now=0.0)
+        predictor.observe_final("headache.", speech_final=True, now=0.1)
+
+        self.assertIs(predictor.decide(now=0.1), TurnDecision.COMMIT)
+        self.assertEqual(predictor.commit(), "I have a headache.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+import os
+import tempfile
+import time
+import unittest
+import wave
+
+from app_states.state_manager import StateManager
+from config_app.settings import settings
+from core.events import TranscriptEvent
+from core.pipeline import TurnPipeline, split_sentences
+
+
+def _write_wav(path: str, seconds: float) -> None:
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(b"\x00\x00" * int(16000 * seconds))
+
+
+class FakeLLM:
+    def __init__(self, reply: str):
+        self.reply = reply
+
+    def generate(self, text: str) -> str:
+        return self.reply
+
+
+class StreamingLLM:
+    """Holds its request open until the turn's token is cancelled."""
+
+    def __init__(self):
+        self.closed_at = None
+
+    def generate(self, text: str, *, cancel=None) -> str:
+        cancel.on_cancel(lambda: setattr(self, "closed_at", time.monotonic()))
+        cancel.wait(5.0)
+        return "Too late to matter."
+
+
+class SegmentTTS:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.started = []
+
+    def synthesize_to(self, text: str, path: str) -> float:
+        self.started.append((text, time.monotonic()))
+        time.sleep(self.delay)
+        _write_wav(path, 0.1)
+        return 0.1
+
+
+class FakePlayer:
+    def __init__(self, seconds: float = 0.1):
+        self.seconds = seconds
+        self.plays = []
+        self.stopped = 0
+        self._ends_at = 0.0
+
+    def play(self, path: str) -> None:
+        now = time.monotonic()
+        self._ends_at = now + self.seconds
+        self.plays.append((now, self._ends_at))
+
+    def wait(self, timeout=None) -> bool:
+        remaining = self._ends_at - time.monotonic()
+        if remaining <= 0:
+            return True
+        time.sleep(min(remaining, timeout or remaining))
+        return self._ends_at <= time.monotonic()
+
+    def stop(self) -> None:
+        self.stopped += 1
+        self._ends_at = 0.0
+
+
+class TurnPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.done = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _pipeline(self, reply, player, tts=None):
+        pipeline = TurnPipeline(
+            FakeLLM(reply), tts or SegmentTTS(), player, on_done=self.done.append, audio_dir=self.tmp.name
+        )
+        pipeline.start()
+        self.addCleanup(pipeline.stop)
+        return pipeline
+
+    def test_split_sentences_folds_short_fragments(self):
+        self.assertEqual(
+            split_sentences("Hello. I am Baymax, your companion. How are you feeling today?"),
+            ["Hello. I am Baymax, your companion.", "How are you feeling today?"],
+        )
+        self.assertEqual(split_sentences("Okay."), ["Okay."])
+
+    def test_synthesis_overlaps_playback(self):
+        tts, player = SegmentTTS(), FakePlayer(seconds=0.15)
+        pipeline = self._pipeline("First sentence is here. Second one follows now. Third wraps it up.", player, tts)
+
+        handle = pipeline.submit(text="hi")
+        self.assertTrue(handle.done.wait(3.0))
+
+        self.assertEqual(len(player.plays), 3)
+        self.assertEqual(self.done, [handle])
+        self.assertAlmostEqual(handle.spoken_seconds, 0.3, places=2)
+        # Segment 2 was synthesized while segment 1 was still playing.
+        self.assertLess(tts.started[1][1], player.plays[0][1])
+        stats = pipeline.stats()
+        self.assertEqual(stats["synthesize"]["items"], 3)
+        self.assertIn("queue_wait_p95_ms", stats["play"])
+
+    def test_cancel_stops_playback_and_drops_queued_segments(self):
+        player = FakePlayer(seconds=5.0)
+        pipeline = self._pipeline("A long first sentence. Another long sentence. And a final one here.", player)
+
+        handle = pipeline.submit(text="hi")
+        deadline = time.monotonic() + 2.0
+        while not player.plays and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pipeline.cancel(handle)
+        time.sleep(0.2)
+
+        self.assertTrue(handle.done.is_set())
+        self.assertEqual(player.stopped, 1)
+        self.assertEqual(len(player.plays), 1)
+        self.assertEqual(self.done, [handle])
+
+    def test_failed_synthesis_does_not_replay_an_older_segment(self):
+        class FailingTTS(SegmentTTS):
+            def synthesize_to(self, text: str, path: str) -> float:
+                return 0.0 if text.startswith("Broken") else super().synthesize_to(text, path)
+
+        player = FakePlayer(seconds=0.01)
+        pipeline = self._pipeline("unused", player, tts=FailingTTS(delay=0.0))
+        for index in range(5):
+            self.assertTrue(pipeline.submit(reply=f"Sentence number {index} here.").done.wait(2.0))
+        failed = pipeline.submit(reply="Broken sentence right here.")
+
+        self.assertTrue(failed.done.wait(2.0))
+        self.assertEqual(len(player.plays), 5)
+        self.assertEqual(failed.spoken_seconds, 0.0)
+
+    def test_cancel_closes_llm_request_and_frees_the_stage(self):
+        llm = StreamingLLM()
+        player = FakePlayer(seconds=0.05)
+        pipeline = TurnPipeline(llm, SegmentTTS(delay=0.0), player, on_done=self.done.append, audio_dir=self.tmp.name)
+        pipeline.start()
+        self.addCleanup(pipeline.stop)
+
+        stuck = pipeline.submit(text="tell me everything")
+        time.sleep(0.05)
+        cancelled_at = time.monotonic()
+        pipeline.cancel(stuck)
+        goodbye = pipeline.submit(reply="Goodbye for now, friend.")
+
+        self.assertTrue(goodbye.done.wait(1.0))
+        self.assertLess(llm.closed_at - cancelled_at, 0.05)
+        self.assertEqual(stuck.reply, "")
+        self.assertEqual(goodbye.reply, "Goodbye for now, friend.")
+        self.assertEqual(self.done, [stuck, goodbye])
+
+
+class FakeStream:
+    def __init__(self):
+        self._transcript = []
+
+    def add_wake_listener(self, callback):
+        pass
+
+    def add_transcript_listener(self, callback):
+        self._transcript.append(callback)
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+
+class FakeTTS:
+    output_path = "tests/_fake_output.wav"
+    last_duration = 0.0
+
+    def __init__(self):
+        self.calls = []
+
+    def speak(self, text: str) -> None:
+        self.calls.append(text)
+
+
+class PipelinedStateFlowTests(unittest.TestCase):
+    def setUp(self):
+        os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+        previous = settings.TURN_PIPELINE
+        settings.TURN_PIPELINE = True
+        self.addCleanup(setattr, settings, "TURN_PIPELINE", previous)
+        self.stream = FakeStream()
+        self.tts = FakeTTS()
+        self.manager = StateManager(tts=self.tts, llm=FakeLLM("I hear you. Let me help with that."), stt_stream=self.stream)
+        self.addCleanup(self.manager.shutdown)
+
+    def test_turn_runs_through_pipeline_and_returns_to_listening(self):
+        self.manager.set_state(self.manager.listening_state)
+        for callback in self.stream._transcript:
+            callback(TranscriptEvent(text="I feel unwell", is_final=True, should_process=True))
+
+        deadline = time.monotonic() + 3.0
+        seen_speaking = False
+        while time.monotonic() < deadline:
+            self.manager.update()
+            seen_speaking = seen_speaking or self.manager.current_state is self.manager.speaking_state
+            if seen_speaking and self.manager.current_state is self.manager.listening_state:
+                break
+
+        self.assertIs(self.manager.current_state, self.manager.listening_state)
+        # Spoken sentence by sentence.
+        self.assertEqual(self.tts.calls, ["I hear you.", "Let me help with that."])
+        self.assertIsNone(self.manager.active_turn)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+import unittest
+
+from app_states.state_manager import StateManager
+from app_states.wake_state import WELCOME_LINE
+from core.clock import VirtualClock
+from core.events import TranscriptEvent, WakeEvent, WakeEventType
+from core.idle_monitor import IdleMonitor
+
+IDLE_PROMPT = "I'm here if you need me."
+IDLE_SLEEP = "Let me know if you need me."
+
+
+class FakeStreamingService:
+    def __init__(self):
+        self._wake = []
+        self._transcript = []
+
+    def add_wake_listener(self, callback):
+        self._wake.append(callback)
+
+    def add_transcript_listener(self, callback):
+        self._transcript.append(callback)
+
+    def add_error_listener(self, callback):
+        pass
+
+    def set_speaking(self, is_speaking: bool) -> None:
+        pass
+
+    def notify_response_sent(self, duration: float = 0.0, *, buffer_override=None) -> None:
+        pass
+
+    def emit_wake(self, text: str) -> None:
+        for callback in self._wake:
+            callback(WakeEvent(WakeEventType.WAKE, text))
+
+    def emit_transcript(self, text: str) -> None:
+        for callback in self._transcript:
+            callback(TranscriptEvent(text=text, is_final=True, should_process=True))
+
+
+class FakeTTS:
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+        self.spoken_at = []
+        self.output_path = "tests/_fake_output.wav"
+        self.last_duration = 0.0
+
+    def speak(self, text: str) -> None:
+        self.calls.append(text)
+        self.spoken_at.append(self.clock.elapsed)
+
+
+class FakeLLM:
+    def generate(self, text: str) -> str:
+        return f"LLM:{text}"
+
+
+class VirtualClockTests(unittest.TestCase):
+    def setUp(self):
+        os.environ["BAYMAX_SKIP_AUDIO"] = "1"
+        self.clock = VirtualClock()
+        self.stream = FakeStreamingService()
+        self.tts = FakeTTS(self.clock)
+        self.manager = StateManager(tts=self.tts, llm=FakeLLM(), stt_stream=self.stream, clock=self.clock)
+        self.idle = IdleMonitor(manager=self.manager)
+        self.idle.start()
+
+    def run_for(self, seconds: float) -> None:
+        """Drive the loop the way `main.py` would; idle timers fire as virtual time passes."""
+        until = self.clock.elapsed + seconds
+        while self.clock.elapsed < until:
+            self.manager.update()
+
+    def test_waits_and_sleeps_advance_virtual_time_only(self):
+        condition = threading.Condition()
+        started = time.monotonic()
+        with condition:
+            self.assertFalse(self.clock.wait(condition, 30.0))
+        self.clock.sleep(15.0)
+        self.assertEqual(self.clock.monotonic(), 45.0)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        self.manager.notify_speaking_end(0.0, interrupted=False)
+        self.assertTrue(self.manager.speaking_cooldown_active())
+        self.clock.advance(1.0)
+        self.assertFalse(self.manager.speaking_cooldown_active())
+
+    def test_hour_of_conversations_with_idle_warnings(self):
+        started = time.monotonic()
+        cycles = 8
+        for cycle in range(cycles):
+            before = len(self.tts.calls)
+            self.stream.emit_wake("hey baymax")
+            self.run_for(2.0)
+            self.assertIs(self.manager.current_state, self.manager.listening_state)
+
+            for turn in range(3):
+                self.run_for(20.0)
+                self.stream.emit_transcript(f"question {cycle}.{turn}")
+                self.run_for(1.0)
+
+            # Silence: a warning after 45 s, then the sleep line at 60 s.
+            self.run_for(70.0)
+            self.assertIs(self.manager.current_state, self.manager.sleep_state)
+            spoken = self.tts.calls[before:]
+            self.assertEqual(spoken[0], WELCOME_LINE)
+            self.assertEqual(spoken[1:4], [f"LLM:question {cycle}.{turn}" for turn in range(3)])
+            self.assertIn(IDLE_PROMPT, spoken[4:-1])
+            self.assertEqual(spoken[-1], IDLE_SLEEP)
+
+            self.run_for(330.0)
+            self.assertIs(self.manager.current_state, self.manager.sleep_state)
+
+        self.assertGreaterEqual(self.clock.elapsed, 3600.0)
+        self.assertLess(time.monotonic() - started, 5.0)
+
+    def test_idle_prompts_fire_exactly_at_thresholds(self):
+        self.stream.emit_wake("hey baymax")
+        self.run_for(2.0)
+        self.run_for(10.0)
+        # Activity pushes the idle deadline back to 45 s after this transcript.
+        asked_at = self.clock.elapsed
+        self.stream.emit_transcript("one question")
+        self.run_for(80.0)
+
+        def first(text):
+            return self.tts.spoken_at[self.tts.calls.index(text)] - asked_at
+
+        self.assertAlmostEqual(first(IDLE_PROMPT), 45.0, delta=1e-3)
+        self.assertAlmostEqual(first(IDLE_SLEEP), 60.0, delta=1e-3)
+        self.assertIs(self.manager.current_state, self.manager.sleep_state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from wakeword.wakeword_detector import WakeWordDetector
+
+RATE = 16000
+
+
+def _noise(seconds: float, rms: float, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(int(seconds * RATE)) * rms
+
+
+def _chunks(signal: np.ndarray, size: int = 1024):
+    pcm = np.clip(signal, -32768, 32767).astype(np.int16)
+    for start in range(0, len(pcm), size):
+        yield pcm[start:start + size].tobytes()
+
+
+def _count_triggers(detector: WakeWordDetector, signal: np.ndarray) -> int:
+    return sum(detector.detect(chunk) for chunk in _chunks(signal))
+
+
+class WakeWordDetectorTests(unittest.TestCase):
+    def test_quiet_room_wakes_on_modest_speech(self):
+        detector = WakeWordDetector(energy_threshold=120, required_hits=2)
+        signal = np.concatenate([_noise(2.0, 15), _noise(0.5, 250, seed=1), _noise(1.0, 15, seed=2)])
+        self.assertEqual(_count_triggers(detector, signal), 1)
+        self.assertLess(detector.noise_floor, 30)
+
+    def test_noisy_room_needs_speech_above_the_floor(self):
+        detector = WakeWordDetector(energy_threshold=120, required_hits=2)
+        self.assertEqual(_count_triggers(detector, _noise(10.0, 800)), 0)
+        self.assertGreater(detector.noise_floor, 500)
+
+        burst = np.concatenate([_noise(0.5, 4000, seed=3), _noise(0.5, 800, seed=4)])
+        self.assertEqual(_count_triggers(detector, burst), 1)
+
+    def test_cooldown_and_batch_equivalence(self):
+        speech = np.concatenate([_noise(1.0, 20)] + [_noise(0.4, 2000, seed=s) for s in range(5)])
+        chunked = WakeWordDetector(cooldown_seconds=2.0)
+        self.assertEqual(_count_triggers(chunked, speech), 1)
+
+        frames = np.clip(speech, -32768, 32767).astype(np.int16)
+        frames = frames[: len(frames) - len(frames) % 320].reshape(-1, 320)
+        batched = WakeWordDetector(cooldown_seconds=2.0)
+        self.assertEqual(int(batched.detect_frames(frames).sum()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from audio.codecs import (
+    DownsampledLinear16Codec,
+    MulawCodec,
+    WireCodec,
+    create_codec,
+    mulaw_decode,
+    register_codec,
+)
+
+
+def _tone(seconds: float = 0.5, sample_rate: int = 16000, freq: float = 440.0) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (np.sin(2 * np.pi * freq * t) * 8000).astype(np.int16)
+
+
+class WireCodecTestCase(unittest.TestCase):
+    def test_mulaw_halves_bytes_and_round_trips(self) -> None:
+        pcm = _tone()
+        encoded = MulawCodec().encode(pcm.tobytes())
+
+        self.assertEqual(len(encoded), len(pcm))
+        decoded = mulaw_decode(encoded).astype(np.int32)
+        # mu-law quantization error stays within a few percent of full scale
+        self.assertLess(np.abs(decoded - pcm).max(), 300)
+
+    def test_downsampler_is_chunking_invariant(self) -> None:
+        pcm = _tone().tobytes()
+        codec = DownsampledLinear16Codec()
+        one_shot = codec.encode(pcm)
+
+        codec.reset()
+        pieces = b"".join(codec.encode(pcm[i:i + 2000]) for i in range(0, len(pcm), 2000))
+
+        self.assertEqual(codec.sample_rate, 8000)
+        self.assertEqual(len(one_shot), len(pcm) // 2)
+        self.assertEqual(one_shot, pieces)
+
+    def test_registry_and_unknown_codec(self) -> None:
+        register_codec("test_passthrough", WireCodec)
+        self.assertEqual(create_codec("TEST_PASSTHROUGH").encoding, "linear16")
+        with self.assertRaises(ValueError):
+            create_codec("does-not-exist")
+
+
+if __name__ == "__main__":
+    unittest.main()
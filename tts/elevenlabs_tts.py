@@ -1,13 +1,22 @@
 import os
+import threading
 import time
 import wave
 from typing import Iterator, Optional
 
 from config_app.settings import settings
+from core.cancellation import Cancelled, CancelToken
+from core.metrics import metrics
+from core.tracing import tracer
 from interfaces.tts_interface import TTSInterface
 import requests
 
 
+_RETRIES = metrics.counter("baymax_retries_total", "Retried external requests", ("component",))
+_FIRST_BYTE = metrics.histogram("baymax_tts_first_byte_seconds", "TTS request to first audio byte")
+_SYNTH = metrics.histogram("baymax_tts_seconds", "TTS request to complete audio")
+
+
 class ElevenLabsTTS(TTSInterface):
     """ElevenLabs TTS using Baymax voice settings."""
 
@@ -37,33 +46,68 @@ class ElevenLabsTTS(TTSInterface):
         """Return the duration (seconds) of the most recently generated audio."""
         return self._last_duration
 
-    def speak(self, text: str) -> None:
+    def speak(self, text: str, *, cancel: Optional[CancelToken] = None) -> None:
         """Convert `text` into speech and persist the PCM stream as a WAV file."""
+        self._last_duration = self.synthesize_to(text, self.output_path, cancel=cancel)
+
+    def synthesize_to(self, text: str, path: str, *, cancel: Optional[CancelToken] = None) -> float:
+        """Write speech for `text` to `path`; returns its duration (0.0 on failure).
+
+        Cancelling `cancel` closes the audio stream and raises `Cancelled`.
+        Audio is written to a private file and moved onto `path` only once
+        complete, so a request abandoned mid-flight never truncates a line
+        that is being synthesized or played from the same path.
+        """
         print("[TTS] Generating speech...")
 
-        response = self._request_audio(text)
+        tracer.mark("tts_request", chars=len(text))
+        started = time.monotonic()
+        response = self._request_audio(text, cancel)
         if response is None:
             print("[TTS] Failed to fetch audio after retries.")
-            return
+            return 0.0
 
+        unregister = cancel.on_cancel(response.close) if cancel is not None else None
+        partial = f"{path}.{threading.get_ident()}.part"
         try:
-            with wave.open(self.output_path, "wb") as wav_file:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            with wave.open(partial, "wb") as wav_file:
                 wav_file.setnchannels(self.num_channels)
                 wav_file.setsampwidth(self.sample_width)
                 wav_file.setframerate(self.sample_rate)
 
+                first = True
                 for chunk in self._iterate_audio_chunks(response):
+                    if cancel is not None and cancel.cancelled:
+                        break
                     if not chunk:
                         continue
+                    if first:
+                        tracer.mark("tts_first_byte")
+                        _FIRST_BYTE.observe(time.monotonic() - started)
+                        first = False
                     wav_file.writeframes(chunk)
 
-            print(f"[TTS] Saved WAV -> {self.output_path}")
-            self._last_duration = self._compute_wav_duration(self.output_path)
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            os.replace(partial, path)
+            tracer.mark("tts_done")
+            _SYNTH.observe(time.monotonic() - started)
+            print(f"[TTS] Saved WAV -> {path}")
+            return self._compute_wav_duration(path)
         except Exception as e:
+            if cancel is not None and cancel.cancelled:
+                print("[TTS] Synthesis cancelled")
+                raise Cancelled(cancel.reason) from None
             print("[TTS] Error writing audio:", e)
-            self._last_duration = 0.0
+            return 0.0
         finally:
+            if unregister is not None:
+                unregister()
             response.close()
+            if os.path.exists(partial):
+                os.remove(partial)
 
     # ------------------------------------------------------------------
     # Helpers
@@ -86,7 +130,7 @@ class ElevenLabsTTS(TTSInterface):
             if chunk:
                 yield chunk
 
-    def _request_audio(self, text: str) -> Optional[requests.Response]:
+    def _request_audio(self, text: str, cancel: Optional[CancelToken] = None) -> Optional[requests.Response]:
         """Fetch streaming audio frames, retrying on transient API failures."""
         attempts = (0.0, 0.3)
         last_error: Optional[Exception] = None
@@ -112,7 +156,13 @@ class ElevenLabsTTS(TTSInterface):
 
         for delay in attempts:
             if delay:
-                time.sleep(delay)
+                _RETRIES.labels("tts").inc()
+                if cancel is not None:
+                    cancel.wait(delay)
+                else:
+                    time.sleep(delay)
+            if cancel is not None:
+                cancel.raise_if_cancelled()
 
             try:
                 response = self._session.post(
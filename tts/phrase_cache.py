@@ -0,0 +1,65 @@
+"""Synthesized audio for lines that repeat across conversations.
+
+Greetings, sleep confirmations and idle prompts are the same for every
+device, so a multi-session server keeps their WAV bytes instead of asking
+ElevenLabs for them again. Long, one-off replies are not worth keeping.
+With a `backing` store (see `server.shared_store.StoreCache`) the LRU is a
+front for a cache shared by every worker process.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class PhraseCache:
+    """Thread-safe LRU of WAV bytes keyed by the spoken text."""
+
+    def __init__(self, max_entries: int = 64, max_chars: int = 160, *, backing=None) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._max_chars = max_chars
+        self._backing = backing
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cacheable(self, text: str) -> bool:
+        return 0 < len(text.strip()) <= self._max_chars
+
+    def get(self, text: str) -> Optional[bytes]:
+        key = text.strip()
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+        audio = self._backing.get(key) if self._backing is not None else None
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, audio)
+            return audio
+
+    def put(self, text: str, audio: bytes) -> None:
+        if not audio or not self.cacheable(text):
+            return
+        with self._lock:
+            self._remember(text.strip(), audio)
+        if self._backing is not None:
+            self._backing.put(text.strip(), audio)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        self._entries[key] = audio
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,68 @@
+"""Enroll "Hey Baymax" templates for the local keyword spotter.
+
+    python3 -m wakeword.enroll clip1.wav clip2.wav clip3.wav
+    python3 -m wakeword.enroll --record 4          # say the phrase 4 times
+
+The model (templates + calibrated threshold) is written to `WAKE_KWS_MODEL`
+unless `--out` is given; set `WAKE_ENGINE=kws` to use it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from typing import List
+
+import numpy as np
+
+from audio.recorder import read_wav
+from config_app.settings import settings
+from wakeword.kws import enroll
+
+
+def _load_clips(paths: List[str], sample_rate: int) -> List[np.ndarray]:
+    clips = []
+    for path in paths:
+        with open(path, "rb") as handle:
+            samples, rate = read_wav(handle.read())
+        if rate != sample_rate:
+            raise SystemExit(f"{path}: expected {sample_rate} Hz audio, got {rate} Hz")
+        clips.append(samples)
+    return clips
+
+
+def _record_clips(count: int, sample_rate: int) -> List[np.ndarray]:  # pragma: no cover - needs device
+    from audio.microphone import Microphone
+
+    mic = Microphone(sample_rate=sample_rate)
+    clips = []
+    for index in range(count):
+        input(f"[Enroll] Press Enter, then say 'Hey Baymax' ({index + 1}/{count})")
+        audio = mic.record(duration=2.5)
+        if audio is not None and len(audio):
+            clips.append(audio[:, 0].copy())
+    return clips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Enroll wake-phrase templates")
+    parser.add_argument("clips", nargs="*", help="16-bit mono WAV recordings of the wake phrase")
+    parser.add_argument("--record", type=int, default=0, help="record N takes from the microphone instead")
+    parser.add_argument("--out", default=settings.WAKE_KWS_MODEL)
+    parser.add_argument("--margin", type=float, default=1.25, help="threshold = worst enrollment match x margin")
+    parser.add_argument("--sample-rate", type=int, default=settings.SAMPLE_RATE)
+    args = parser.parse_args()
+
+    clips = _record_clips(args.record, args.sample_rate) if args.record else _load_clips(args.clips, args.sample_rate)
+    model = enroll(clips, args.sample_rate, margin=args.margin)
+
+    directory = os.path.dirname(args.out)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    model.save(args.out)
+    lengths = ", ".join(f"{len(t) * 10} ms" for t in model.templates)
+    print(f"[Enroll] Saved {len(model.templates)} templates ({lengths}), threshold {model.threshold:.4f} -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Builds the configured wake detector (`WAKE_ENGINE`)."""
+
+import os
+from typing import Optional
+
+from config_app.settings import settings
+from interfaces.wakeword_interface import WakeWordInterface
+from wakeword.wakeword_detector import WakeWordDetector
+
+
+def create_wake_detector(engine: Optional[str] = None) -> WakeWordInterface:
+    """`kws` loads the enrolled keyword model; anything else uses the energy gate."""
+    engine = (engine or settings.WAKE_ENGINE).lower()
+    if engine == "kws":
+        if os.path.exists(settings.WAKE_KWS_MODEL):
+            from wakeword.kws import KeywordSpotter
+
+            print(f"[WakeWord] Using local keyword spotter ({settings.WAKE_KWS_MODEL})")
+            return KeywordSpotter.load(settings.WAKE_KWS_MODEL)
+        print(f"[WakeWord] No keyword model at {settings.WAKE_KWS_MODEL}; run `python3 -m wakeword.enroll`")
+
+    return WakeWordDetector(
+        energy_threshold=settings.WAKE_ENERGY_THRESHOLD,
+        required_hits=settings.WAKE_REQUIRED_HITS,
+        debug_interval=settings.WAKE_DEBUG_INTERVAL,
+        on_ratio=settings.WAKE_ON_RATIO,
+        off_ratio=settings.WAKE_OFF_RATIO,
+    )
@@ -0,0 +1,256 @@
+"""On-device keyword spotting for "Hey Baymax".
+
+MFCC features are matched against a handful of enrollment templates with
+streaming subsequence DTW. All templates are concatenated into one array so
+each incoming 10 ms frame costs one matrix product (frame vs every template
+frame) and one vectorized DTW column update. The step pattern only looks at
+the previous column (stay, diagonal, skip-one), which is what makes the
+column update vectorizable.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from interfaces.wakeword_interface import WakeWordInterface
+
+
+def _mel(freq):
+    return 2595.0 * np.log10(1.0 + np.asarray(freq) / 700.0)
+
+
+def _mel_inv(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+class MFCC:
+    """Streaming MFCC extractor (25 ms window, 10 ms hop, c1..c12, liftered)."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        *,
+        window_ms: float = 25.0,
+        hop_ms: float = 10.0,
+        n_mels: int = 26,
+        n_ceps: int = 12,
+        n_fft: int = 512,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.window = int(sample_rate * window_ms / 1000.0)
+        self.hop = int(sample_rate * hop_ms / 1000.0)
+        self.n_fft = n_fft
+        self._hamming = np.hamming(self.window).astype(np.float32)
+
+        edges = _mel_inv(np.linspace(_mel(60.0), _mel(sample_rate / 2.0 * 0.95), n_mels + 2))
+        bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+        lower, centre, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+        rising = (bins - lower) / (centre - lower)
+        falling = (upper - bins) / (upper - centre)
+        self._mel_bank = np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32).T
+
+        k = np.arange(n_mels)
+        dct = np.cos(np.pi / n_mels * (k[None, :] + 0.5) * np.arange(1, n_ceps + 1)[:, None])
+        lifter = 1.0 + (22 / 2.0) * np.sin(np.pi * np.arange(1, n_ceps + 1) / 22)
+        self._dct = (dct * lifter[:, None]).astype(np.float32).T
+
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._last_sample = 0.0
+
+    def reset(self) -> None:
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._last_sample = 0.0
+
+    def features(self, samples: np.ndarray) -> np.ndarray:
+        """MFCCs of a whole clip (stateless)."""
+        self.reset()
+        out = self.push(samples)
+        self.reset()
+        return out
+
+    def push(self, samples: np.ndarray) -> np.ndarray:
+        """Append int16/float samples; return features for every newly complete frame."""
+        samples = np.asarray(samples, dtype=np.float32)
+        # Pre-emphasis, carrying the previous sample across calls.
+        emphasized = np.empty_like(samples)
+        if samples.size:
+            emphasized[0] = samples[0] - 0.97 * self._last_sample
+            emphasized[1:] = samples[1:] - 0.97 * samples[:-1]
+            self._last_sample = float(samples[-1])
+        buffer = np.concatenate((self._tail, emphasized))
+        if buffer.size < self.window:
+            self._tail = buffer
+            return np.zeros((0, self._dct.shape[1]), dtype=np.float32)
+
+        frames = sliding_window_view(buffer, self.window)[:: self.hop]
+        consumed = frames.shape[0] * self.hop
+        self._tail = buffer[consumed:]
+
+        spectrum = np.abs(np.fft.rfft(frames * self._hamming, self.n_fft)) ** 2
+        mel = np.log(spectrum.astype(np.float32) @ self._mel_bank + 1e-3)
+        return mel @ self._dct
+
+
+def _normalize(features: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-6)
+
+
+def voiced_bounds(samples: np.ndarray, sample_rate: int, *, frame_ms: float = 10.0, ratio: float = 0.1):
+    """(start, end) sample indices of the region louder than `ratio` of the loudest frame."""
+    frame = max(int(sample_rate * frame_ms / 1000.0), 1)
+    usable = samples.size - samples.size % frame
+    if not usable:
+        return 0, samples.size
+    energy = np.sqrt(np.mean(samples[:usable].astype(np.float32).reshape(-1, frame) ** 2, axis=1))
+    voiced = np.flatnonzero(energy >= energy.max() * ratio)
+    if not voiced.size:
+        return 0, samples.size
+    return int(voiced[0] * frame), int((voiced[-1] + 1) * frame)
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    start, end = voiced_bounds(samples, sample_rate)
+    return samples[start:end]
+
+
+@dataclass
+class KeywordModel:
+    templates: List[np.ndarray]
+    threshold: float
+    sample_rate: int = 16000
+
+    def save(self, path: str) -> None:
+        arrays = {f"template_{i}": t for i, t in enumerate(self.templates)}
+        np.savez(path, threshold=self.threshold, sample_rate=self.sample_rate, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "KeywordModel":
+        data = np.load(path)
+        names = sorted((n for n in data.files if n.startswith("template_")), key=lambda n: int(n.split("_")[1]))
+        return cls([data[n] for n in names], float(data["threshold"]), int(data["sample_rate"]))
+
+
+class SubsequenceDTW:
+    """Streaming subsequence DTW of one input stream against concatenated templates."""
+
+    def __init__(self, templates: Sequence[np.ndarray]) -> None:
+        normalized = [_normalize(t.astype(np.float32)) for t in templates]
+        self.lengths = np.array([len(t) for t in normalized])
+        self._frames = np.concatenate(normalized)
+        ends = np.cumsum(self.lengths)
+        starts = ends - self.lengths
+        self._starts = starts
+        self._ends = ends - 1
+        total = len(self._frames)
+        self._is_start = np.zeros(total, dtype=bool)
+        self._is_start[starts] = True
+        # Skip-one transitions must not cross into the previous template either.
+        self._second = np.zeros(total, dtype=bool)
+        self._second[np.minimum(starts + 1, total - 1)] = True
+        self.reset()
+
+    def reset(self) -> None:
+        total = len(self._frames)
+        self._cost = np.full(total, np.inf, dtype=np.float32)
+        self._length = np.ones(total, dtype=np.float32)
+
+    def step(self, frame: np.ndarray) -> np.ndarray:
+        """Advance one input frame; return the normalized match cost per template."""
+        frame = frame / max(float(np.linalg.norm(frame)), 1e-6)
+        local = 1.0 - self._frames @ frame  # cosine distance to every template frame
+
+        stay = self._cost
+        diag = np.concatenate(([np.inf], self._cost[:-1]))
+        skip = np.concatenate(([np.inf, np.inf], self._cost[:-2]))
+        diag[self._is_start] = np.inf
+        skip[self._is_start | self._second] = np.inf
+
+        stay_len = self._length + 1
+        diag_len = np.concatenate(([1.0], self._length[:-1])) + 1
+        skip_len = np.concatenate(([1.0, 1.0], self._length[:-2])) + 1
+        # Compare candidates by average cost so long and short paths are comparable.
+        candidates = np.stack((stay / stay_len, diag / diag_len, skip / skip_len))
+        best = np.argmin(candidates, axis=0)
+        prev_cost = np.choose(best, (stay, diag, skip))
+        prev_len = np.choose(best, (stay_len, diag_len, skip_len))
+
+        cost = prev_cost + local
+        length = prev_len
+        # A match may begin at any input frame: template starts restart for free.
+        cost[self._is_start] = local[self._is_start]
+        length[self._is_start] = 1.0
+
+        self._cost = cost.astype(np.float32)
+        self._length = length.astype(np.float32)
+        return self._cost[self._ends] / self._length[self._ends]
+
+
+def best_match_cost(templates: Sequence[np.ndarray], features: np.ndarray) -> float:
+    """Lowest normalized DTW cost of any template ending anywhere in `features`."""
+    dtw = SubsequenceDTW(templates)
+    best = np.inf
+    for frame in features:
+        best = min(best, float(dtw.step(frame).min()))
+    return best
+
+
+def enroll(clips: Sequence[np.ndarray], sample_rate: int = 16000, *, margin: float = 1.25) -> KeywordModel:
+    """Build templates from enrollment clips and calibrate the accept threshold.
+
+    The threshold is the worst leave-one-out match between enrollment clips,
+    widened by `margin`.
+    """
+    if len(clips) < 2:
+        raise ValueError("enrollment needs at least two recordings")
+    extractor = MFCC(sample_rate)
+    templates = [extractor.features(trim_silence(np.asarray(clip), sample_rate)) for clip in clips]
+    scores = [
+        best_match_cost(templates[:index] + templates[index + 1:], template)
+        for index, template in enumerate(templates)
+    ]
+    return KeywordModel(templates, float(max(scores) * margin), sample_rate)
+
+
+class KeywordSpotter(WakeWordInterface):
+    """Streaming `detect()` over a `KeywordModel`; drop-in for `WakeWordDetector`."""
+
+    def __init__(self, model: KeywordModel, *, cooldown_seconds: float = 1.5) -> None:
+        self.model = model
+        self._mfcc = MFCC(model.sample_rate)
+        self._dtw = SubsequenceDTW(model.templates)
+        self._cooldown_frames = int(cooldown_seconds * model.sample_rate / self._mfcc.hop)
+        self._frames_seen = 0
+        self._last_trigger = -self._cooldown_frames - 1
+        self.last_score = float("inf")
+        self.trigger_frames: List[int] = []
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "KeywordSpotter":
+        return cls(KeywordModel.load(path), **kwargs)
+
+    @property
+    def frame_seconds(self) -> float:
+        return self._mfcc.hop / self.model.sample_rate
+
+    def detect(self, audio_chunk: Optional[bytes]) -> bool:
+        if not audio_chunk:
+            return False
+        return self.detect_samples(np.frombuffer(audio_chunk, dtype=np.int16))
+
+    def detect_samples(self, samples: np.ndarray) -> bool:
+        triggered = False
+        for frame in self._mfcc.push(samples):
+            self._frames_seen += 1
+            score = float(self._dtw.step(frame).min())
+            self.last_score = score
+            if score <= self.model.threshold and self._frames_seen - self._last_trigger > self._cooldown_frames:
+                self._last_trigger = self._frames_seen
+                self.trigger_frames.append(self._frames_seen)
+                self._dtw.reset()
+                triggered = True
+        return triggered
@@ -1,15 +1,31 @@
-import audioop
 import time
 from typing import Optional
 
+import numpy as np
 
-class WakeWordDetector:
-    """Very lightweight energy-based wake detector.
+from interfaces.wakeword_interface import WakeWordInterface
+
+
+def _percentile(values: np.ndarray, q: float) -> float:
+    """`np.percentile` (linear interpolation) via a partial sort: ~10x cheaper on short windows."""
+    position = q / 100.0 * (values.size - 1)
+    lower = int(position)
+    if lower + 1 >= values.size:
+        return float(np.partition(values, lower)[lower])
+    part = np.partition(values, (lower, lower + 1))
+    return float(part[lower] + (part[lower + 1] - part[lower]) * (position - lower))
+
+
+class WakeWordDetector(WakeWordInterface):
+    """Lightweight energy-based wake gate with an adaptive noise floor.
 
     This is **not** a production wake-word model, but it gives the state machine
-    a concrete signal to react to. The detector analyses the average energy of
-    incoming audio chunks and triggers when it observes a burst that looks like
-    a spoken phrase. Cool-down tracking avoids repeated triggers while the user
+    a concrete signal to react to. Incoming audio is cut into short frames whose
+    RMS is computed in one vectorized pass. A rolling percentile of recent frame
+    energies tracks the room's noise floor, and a burst must rise `on_ratio`
+    above that floor to start and stay above `off_ratio` to continue
+    (hysteresis), so a noisy room does not fire constantly and a quiet one
+    still wakes. Cool-down tracking avoids repeated triggers while the user
     keeps talking. Replace this with a proper keyword spotter when available.
     """
 
@@ -17,19 +33,48 @@ class WakeWordDetector:
         self,
         wakeword: str = "hey baymax",
         debug_interval: float = 0.0,
-        energy_threshold: int = 300,
+        energy_threshold: int = 120,
         required_hits: int = 3,
         cooldown_seconds: float = 2.0,
+        *,
+        sample_rate: int = 16000,
+        frame_ms: float = 20.0,
+        hit_ms: float = 64.0,
+        floor_window_seconds: float = 3.0,
+        floor_percentile: float = 20.0,
+        on_ratio: float = 3.0,
+        off_ratio: float = 1.8,
+        max_gap_ms: float = 160.0,
     ):
         self.wakeword = wakeword.lower()
         self._debug_interval = max(debug_interval, 0.0)
-        self._energy_threshold = max(energy_threshold, 1)
-        self._required_hits = max(required_hits, 1)
-        self._cooldown = max(cooldown_seconds, 0.0)
+        # Absolute minimum onset level, so digital silence cannot make a cough look loud.
+        self._min_onset = float(max(energy_threshold, 1))
+        self._frame = max(int(sample_rate * frame_ms / 1000.0), 1)
+        frames_per_second = sample_rate / self._frame
+        # One "hit" is roughly one 1024-sample chunk of voiced audio, as before.
+        self._required_frames = max(int(round(max(required_hits, 1) * hit_ms / frame_ms)), 1)
+        self._cooldown_frames = int(max(cooldown_seconds, 0.0) * frames_per_second)
+        self._max_gap_frames = max(int(max_gap_ms / frame_ms), 1)
+        self._on_ratio = on_ratio
+        self._off_ratio = min(off_ratio, on_ratio)
+        self._floor_percentile = floor_percentile
 
+        self._history = np.zeros(max(int(floor_window_seconds * frames_per_second), 8), dtype=np.float32)
+        self._history_count = 0
+        # Do not fire until the floor has been measured (about half a second).
+        self._warmup_frames = min(int(0.5 * frames_per_second), self._history.size)
+        self._history_pos = 0
+        self._block_frames = max(int(0.1 * frames_per_second), 1)
+        self._residual = np.zeros(0, dtype=np.int16)
+
+        self._frames_seen = 0
+        self._last_trigger_frame = -self._cooldown_frames - 1
+        self._in_burst = False
+        self._voiced = 0
+        self._gap = 0
         self._last_debug_ts = 0.0
-        self._last_trigger_ts = 0.0
-        self._consecutive_hits = 0
+        self.noise_floor = self._min_onset / self._on_ratio
 
     def _maybe_debug(self, message: str) -> None:
         if self._debug_interval <= 0:
@@ -40,33 +85,92 @@ class WakeWordDetector:
             print(message)
             self._last_debug_ts = now
 
+    def thresholds(self):
+        """Current (onset, release) RMS levels derived from the noise floor."""
+        onset = max(self.noise_floor * self._on_ratio, self._min_onset)
+        release = max(self.noise_floor * self._off_ratio, self._min_onset * self._off_ratio / self._on_ratio)
+        return onset, release
+
     def detect(self, audio_chunk: Optional[bytes]) -> bool:
         if not audio_chunk:
             self._maybe_debug("[WakeWord] Waiting for audio input …")
-            self._consecutive_hits = 0
+            self._in_burst = False
+            self._voiced = 0
             return False
 
-        try:
-            energy = audioop.rms(audio_chunk, 2)  # assumes 16-bit audio
-        except Exception as exc:
-            self._maybe_debug(f"[WakeWord] Energy calc error: {exc}")
+        samples = np.frombuffer(audio_chunk, dtype=np.int16)  # assumes 16-bit audio
+        if self._residual.size:
+            samples = np.concatenate((self._residual, samples))
+        usable = samples.size - samples.size % self._frame
+        self._residual = samples[usable:].copy()
+        if not usable:
             return False
+        return bool(self.detect_frames(samples[:usable].reshape(-1, self._frame)).any())
+
+    def detect_frames(self, frames: np.ndarray) -> np.ndarray:
+        """Process a (n_frames, frame_len) batch; returns a per-frame trigger mask."""
+        as_float = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(as_float * as_float, axis=1))
+        triggers = np.zeros(len(rms), dtype=bool)
 
-        if energy >= self._energy_threshold:
-            self._consecutive_hits += 1
-            self._maybe_debug(f"[WakeWord] Energy spike detected ({energy})")
+        # Long batches (whole files) are walked in ~100 ms blocks so the floor keeps up.
+        for start in range(0, len(rms), self._block_frames):
+            block = rms[start:start + self._block_frames]
+            onset, release = self.thresholds()
+            loud = block >= release
+            warmed_up = self._history_count >= self._warmup_frames
+            if warmed_up and (self._in_burst or loud.any()):
+                for index in range(len(block)):
+                    if self._step(block[index], onset, loud[index], self._frames_seen + index):
+                        triggers[start + index] = True
+            self._frames_seen += len(block)
+            self._update_floor(block)
+        return triggers
+
+    def _step(self, level: float, onset: float, loud: bool, frame_index: int) -> bool:
+        if not self._in_burst:
+            if level < onset:
+                return False
+            self._in_burst = True
+            self._voiced = 0
+            self._gap = 0
+            self._maybe_debug(f"[WakeWord] Energy spike detected ({level:.0f}, floor {self.noise_floor:.0f})")
+
+        if loud:
+            self._voiced += 1
+            self._gap = 0
         else:
-            # decay the counter slowly so short pauses are tolerated
-            self._consecutive_hits = max(self._consecutive_hits - 1, 0)
+            # tolerate short pauses between syllables before closing the burst
+            self._gap += 1
+            if self._gap > self._max_gap_frames:
+                self._in_burst = False
+                self._voiced = 0
+                return False
 
-        now = time.monotonic()
         if (
-            self._consecutive_hits >= self._required_hits
-            and (now - self._last_trigger_ts) >= self._cooldown
+            self._voiced >= self._required_frames
+            and frame_index - self._last_trigger_frame > self._cooldown_frames
         ):
-            self._last_trigger_ts = now
-            self._consecutive_hits = 0
+            self._last_trigger_frame = frame_index
+            self._in_burst = False
+            self._voiced = 0
             self._maybe_debug("[WakeWord] Triggered wake event")
             return True
-
         return False
+
+    def _update_floor(self, rms: np.ndarray) -> None:
+        size = self._history.size
+        rms = rms[-size:]
+        end = self._history_pos + rms.size
+        if end <= size:
+            self._history[self._history_pos:end] = rms
+        else:
+            split = size - self._history_pos
+            self._history[self._history_pos:] = rms[:split]
+            self._history[:end - size] = rms[split:]
+        self._history_pos = end % size
+        self._history_count = min(self._history_count + rms.size, size)
+
+        if self._history_count:
+            window = self._history[: self._history_count]
+            self.noise_floor = max(_percentile(window, self._floor_percentile), 1.0)